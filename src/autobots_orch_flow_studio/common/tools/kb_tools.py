@@ -0,0 +1,50 @@
+# ABOUTME: Common knowledge-base tools — search_kb over the SQLite FTS5 KB index.
+# ABOUTME: Registered by the chat app and by every codegen generator whose agents list it.
+
+from autobots_devtools_shared_lib.common.observability import get_logger, set_conversation_id
+from autobots_devtools_shared_lib.dynagent import Dynagent
+from langchain.tools import ToolRuntime, tool
+
+from autobots_orch_flow_studio.domains.codegen.utils.kb_index import format_hits, get_kb_index
+
+logger = get_logger(__name__)
+
+
+@tool
+def search_kb(
+    runtime: ToolRuntime[None, Dynagent], query: str, kind: str = "", limit: int = 8
+) -> str:
+    """Search the knowledge base and designer flows, returning only matching snippets.
+
+    Prefer this over listing folders and reading whole files: each hit gives the file path
+    (usable with read_file_tool) and a short snippet around the match.
+
+    Args:
+        query: Search terms, e.g. a model, node, interface or flow name. All terms must match.
+        kind: Optional filter: model, lld_models, interface, processing_unit,
+            lld_behaviours, flow, designer_flow or document.
+        limit: Maximum number of hits (default 8).
+
+    Returns:
+        One line per hit: path, kind and snippet.
+    """
+    session_id = runtime.state.get("session_id", "default")
+    set_conversation_id(session_id)
+    logger.info(f"Searching KB for session {session_id}, query: {query!r}, kind: {kind!r}")
+
+    hits = get_kb_index().search(query, limit=limit, kind=kind or None)
+    return format_hits(hits)
+
+
+# --- Registration entry-point (called by every process that builds agents using search_kb) ---
+
+
+def register_kb_tools() -> None:
+    """Register the knowledge-base tools into the dynagent usecase pool.
+
+    The codegen generators call this at import, because AgentMeta resolves the tools of
+    every agent in agents.yaml, including search_kb, whichever agent the process runs.
+    """
+    from autobots_devtools_shared_lib.dynagent import register_usecase_tools
+
+    register_usecase_tools([search_kb])
@@ -0,0 +1,416 @@
+# ABOUTME: Record/replay harness for chat model calls, plus a scripted fake chat model for tests.
+# ABOUTME: Cassettes are JSONL request->response pairs, so pipelines run offline and deterministically.
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict, Field
+
+if TYPE_CHECKING:
+    from autobots_orch_flow_studio.configs.settings import AppSettings
+
+logger = get_logger(__name__)
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# exact: the request must match a recorded one; sequence: serve responses in recorded
+# order whatever the request; auto: exact, else the next response not served yet.
+MATCH_EXACT = "exact"
+MATCH_SEQUENCE = "sequence"
+MATCH_AUTO = "auto"
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(LookupError):
+    """Replay found no recorded response for a request."""
+
+
+def _tool_names(tools: Sequence[Any] | None) -> list[str]:
+    names = []
+    for tool in tools or ():
+        try:
+            names.append(convert_to_openai_tool(tool)["function"]["name"])
+        except (ValueError, KeyError, TypeError):
+            names.append(str(getattr(tool, "name", tool)))
+    return sorted(names)
+
+
+def _normalize(message: BaseMessage) -> dict[str, Any]:
+    """The parts of a message that determine a response (ids and metadata vary per run)."""
+    data: dict[str, Any] = {"type": message.type, "content": message.content}
+    if isinstance(message, AIMessage) and message.tool_calls:
+        data["tool_calls"] = [{"name": c["name"], "args": c["args"]} for c in message.tool_calls]
+    if getattr(message, "name", None):
+        data["name"] = message.name
+    return data
+
+
+def request_key(
+    messages: Sequence[BaseMessage],
+    tools: Sequence[Any] | None = None,
+    tool_choice: Any = None,
+) -> str:
+    """Stable hash of a chat request: normalized messages, bound tool names and tool choice."""
+    payload = {
+        "messages": [_normalize(m) for m in messages],
+        "tools": _tool_names(tools),
+        "tool_choice": tool_choice,
+    }
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _usage(message: AIMessage, messages: Sequence[BaseMessage]) -> dict[str, int]:
+    """Recorded usage metadata, else a chars/4 estimate."""
+    if message.usage_metadata:
+        return dict(message.usage_metadata)
+    prompt = sum(len(str(m.content)) for m in messages) // 4
+    output = max(1, len(str(message.content)) // 4)
+    return {"input_tokens": prompt, "output_tokens": output, "total_tokens": prompt + output}
+
+
+class Cassette:
+    """Append-only JSONL file of recorded chat interactions.
+
+    Each line holds the request key, the normalized request (for humans and diffs), the
+    response message and its token usage. Safe to share across threads.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.interactions: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._unserved: dict[str, deque[int]] = defaultdict(deque)
+        self._last: dict[str, int] = {}
+        self._served: set[int] = set()
+        self._cursor = 0
+        if self.path.is_file():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def _index(self, interaction: dict[str, Any]) -> None:
+        i = len(self.interactions)
+        self.interactions.append(interaction)
+        self._unserved[interaction["key"]].append(i)
+        self._last[interaction["key"]] = i
+
+    def record(
+        self,
+        messages: Sequence[BaseMessage],
+        response: AIMessage,
+        tools: Sequence[Any] | None = None,
+        tool_choice: Any = None,
+    ) -> None:
+        """Append one interaction to memory and to the cassette file."""
+        interaction = {
+            "version": CASSETTE_VERSION,
+            "key": request_key(messages, tools, tool_choice),
+            "request": {
+                "messages": [_normalize(m) for m in messages],
+                "tools": _tool_names(tools),
+            },
+            "response": message_to_dict(response),
+            "usage": _usage(response, messages),
+        }
+        line = json.dumps(interaction, ensure_ascii=False, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._index(interaction)
+
+    def lookup(self, key: str, match: str = MATCH_AUTO) -> dict[str, Any]:
+        """Next recorded interaction for a request key.
+
+        Identical requests are answered in the order they were recorded; once those run
+        out, the last one is repeated.
+
+        Raises:
+            CassetteMissError: If nothing matches (exact) or the cassette is exhausted.
+        """
+        with self._lock:
+            if match != MATCH_SEQUENCE:
+                queue = self._unserved.get(key) or deque()
+                while queue:
+                    i = queue.popleft()
+                    if i not in self._served:
+                        self._served.add(i)
+                        return self.interactions[i]
+                if key in self._last:
+                    return self.interactions[self._last[key]]
+                if match == MATCH_EXACT:
+                    raise CassetteMissError(f"No recorded response for request {key[:12]}")
+            while self._cursor < len(self.interactions):
+                i = self._cursor
+                self._cursor += 1
+                if i not in self._served:
+                    self._served.add(i)
+                    return self.interactions[i]
+            raise CassetteMissError(f"Cassette {self.path} has no unserved responses left")
+
+
+class _ToolBindingChatModel(BaseChatModel):
+    """Chat model that accepts bind_tools and receives the tools as _generate kwargs."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any = None, **kwargs: Any):
+        return self.bind(tools=list(tools), tool_choice=tool_choice, **kwargs)
+
+
+class RecordingChatModel(_ToolBindingChatModel):
+    """Delegate every call to a real chat model and append it to a cassette."""
+
+    inner: BaseChatModel
+    cassette: Cassette
+
+    @property
+    def _llm_type(self) -> str:
+        return f"recording-{self.inner._llm_type}"
+
+    def _bound(self, tools: Sequence[Any] | None, tool_choice: Any, kwargs: dict[str, Any]):
+        if tools:
+            return self.inner.bind_tools(tools, tool_choice=tool_choice, **kwargs)
+        return self.inner.bind(**kwargs) if kwargs else self.inner
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,  # noqa: ARG002
+        tools: Sequence[Any] | None = None,
+        tool_choice: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        response = self._bound(tools, tool_choice, kwargs).invoke(messages, stop=stop)
+        self.cassette.record(messages, response, tools, tool_choice)
+        return ChatResult(generations=[ChatGeneration(message=response)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,  # noqa: ARG002
+        tools: Sequence[Any] | None = None,
+        tool_choice: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        response = await self._bound(tools, tool_choice, kwargs).ainvoke(messages, stop=stop)
+        self.cassette.record(messages, response, tools, tool_choice)
+        return ChatResult(generations=[ChatGeneration(message=response)])
+
+
+class ReplayChatModel(_ToolBindingChatModel):
+    """Serve recorded responses with synthetic latency instead of calling a provider.
+
+    Latency per call is latency_ms + ms_per_token * output tokens, using the recorded
+    token usage so benchmarks keep the shape of real traffic.
+    """
+
+    cassette: Cassette
+    match: str = MATCH_AUTO
+    latency_ms: float = 0.0
+    ms_per_token: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _replay(
+        self, messages: list[BaseMessage], tools: Sequence[Any] | None, tool_choice: Any
+    ) -> tuple[ChatResult, float]:
+        interaction = self.cassette.lookup(request_key(messages, tools, tool_choice), self.match)
+        message = messages_from_dict([interaction["response"]])[0]
+        usage = interaction.get("usage") or {}
+        if isinstance(message, AIMessage) and usage and not message.usage_metadata:
+            message.usage_metadata = usage  # type: ignore[assignment]
+        delay = (self.latency_ms + self.ms_per_token * usage.get("output_tokens", 0)) / 1000
+        return ChatResult(generations=[ChatGeneration(message=message)]), delay
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: Any = None,  # noqa: ARG002
+        tools: Sequence[Any] | None = None,
+        tool_choice: Any = None,
+        **kwargs: Any,  # noqa: ARG002
+    ) -> ChatResult:
+        result, delay = self._replay(messages, tools, tool_choice)
+        if delay > 0:
+            time.sleep(delay)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: Any = None,  # noqa: ARG002
+        tools: Sequence[Any] | None = None,
+        tool_choice: Any = None,
+        **kwargs: Any,  # noqa: ARG002
+    ) -> ChatResult:
+        result, delay = self._replay(messages, tools, tool_choice)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return result
+
+
+class FakeChatModel(_ToolBindingChatModel):
+    """Scripted chat model for unit tests: returns responses in order and records calls.
+
+    A response is a string, an AIMessage (e.g. with tool_calls) or a callable taking the
+    messages. After the script runs out the last response is repeated.
+    """
+
+    responses: list[Any] = Field(default_factory=lambda: ["ok"])
+    latency_ms: float = 0.0
+    calls: list[list[BaseMessage]] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _next(self, messages: list[BaseMessage]) -> ChatResult:
+        i = min(len(self.calls), len(self.responses) - 1)
+        self.calls.append(list(messages))
+        response = self.responses[i]
+        if callable(response):
+            response = response(messages)
+        message = response if isinstance(response, AIMessage) else AIMessage(content=response)
+        message = message.model_copy(deep=True)
+        if not message.usage_metadata:
+            message.usage_metadata = _usage(message, messages)  # type: ignore[assignment]
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: Any = None,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ARG002
+    ) -> ChatResult:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._next(messages)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: Any = None,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ARG002
+    ) -> ChatResult:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._next(messages)
+
+
+# --- Installing a model into the shared dynagent factory ----------------------------
+
+_original_lm: Callable[[], BaseChatModel] | None = None
+# (mode, cassette, match, latency, ms per token) of what install_llm_replay installed
+_installed: tuple[tuple[Any, ...], BaseChatModel] | None = None
+_install_lock = threading.Lock()
+
+
+def _lm_modules() -> list[Any]:
+    import autobots_devtools_shared_lib.dynagent as dynagent
+    import autobots_devtools_shared_lib.dynagent.agents.base_agent as base_agent
+    import autobots_devtools_shared_lib.dynagent.llm.llm as llm_module
+
+    return [llm_module, base_agent, dynagent]
+
+
+def set_chat_model(factory: Callable[[], BaseChatModel] | None) -> None:
+    """Make dynagent's lm() return factory() (None restores the provider-backed lm)."""
+    global _original_lm, _installed
+    _installed = None
+    modules = _lm_modules()
+    if _original_lm is None:
+        _original_lm = modules[0].lm
+    for module in modules:
+        module.lm = factory or _original_lm
+
+
+@contextmanager
+def chat_model_override(model: BaseChatModel) -> Iterator[BaseChatModel]:
+    """Use model for every agent built inside the block."""
+    set_chat_model(lambda: model)
+    try:
+        yield model
+    finally:
+        set_chat_model(None)
+
+
+def install_llm_replay(
+    mode: str | None = None,
+    cassette_path: str | None = None,
+    match: str | None = None,
+    latency_ms: float | None = None,
+    ms_per_token: float | None = None,
+    settings: "AppSettings | None" = None,
+) -> BaseChatModel | None:
+    """Install record or replay according to the arguments, falling back to settings.
+
+    settings defaults to a fresh AppSettings, i.e. LLM_REPLAY_MODE (off|record|replay),
+    LLM_CASSETTE_PATH, LLM_REPLAY_MATCH, LLM_REPLAY_LATENCY_MS and
+    LLM_REPLAY_MS_PER_TOKEN. Calling again with the same effective configuration
+    returns the model already installed without reloading the cassette. Returns the
+    installed model, or None when the mode is off.
+    """
+    global _installed
+    if settings is None:
+        from autobots_orch_flow_studio.configs.settings import get_app_settings
+
+        settings = get_app_settings()
+    mode = (mode or settings.llm_replay_mode).lower()
+    if mode == MODE_OFF:
+        return None
+    key = (
+        mode,
+        str(Path(cassette_path or settings.llm_cassette_path).resolve()),
+        match or settings.llm_replay_match,
+        settings.llm_replay_latency_ms if latency_ms is None else latency_ms,
+        settings.llm_replay_ms_per_token if ms_per_token is None else ms_per_token,
+    )
+    with _install_lock:
+        if _installed is not None and _installed[0] == key:
+            return _installed[1]
+        _, cassette_file, match, latency_ms, ms_per_token = key
+        cassette = Cassette(cassette_file)
+        model: BaseChatModel
+        if mode == MODE_RECORD:
+            set_chat_model(None)
+            model = RecordingChatModel(inner=_original_lm(), cassette=cassette)  # type: ignore[misc]
+        elif mode == MODE_REPLAY:
+            model = ReplayChatModel(
+                cassette=cassette, match=match, latency_ms=latency_ms, ms_per_token=ms_per_token
+            )
+        else:
+            raise ValueError(f"Unknown LLM replay mode: {mode!r}")
+        set_chat_model(lambda: model)
+        _installed = (key, model)
+    logger.info(f"LLM {mode} enabled with cassette {cassette.path} ({len(cassette)} recorded)")
+    return model
@@ -0,0 +1,366 @@
+# ABOUTME: Tracing export pipeline: one bounded span queue drained by a background thread.
+# ABOUTME: Per-app root sampling, Langfuse or local JSONL sink, and drop-on-overflow counters.
+
+import inspect
+import json
+import os
+import threading
+from collections import Counter, deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger, init_tracing
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanKind
+from opentelemetry.util.types import Attributes
+
+logger = get_logger(__name__)
+
+# Export sink: "langfuse" (default), "jsonl" (spans written locally, nothing sent) or "off"
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "langfuse").strip().lower()
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", "logs/traces.jsonl")
+TRACE_QUEUE_SIZE = int(os.getenv("TRACE_QUEUE_SIZE", "2048"))
+TRACE_EXPORT_BATCH_SIZE = int(os.getenv("TRACE_EXPORT_BATCH_SIZE", "256"))
+TRACE_EXPORT_INTERVAL_SECONDS = float(os.getenv("TRACE_EXPORT_INTERVAL", "1.0"))
+# Share of root traces kept: TRACE_SAMPLE_RATE for every app, TRACE_SAMPLE_RATES per app,
+# e.g. "orch_flow_studio=0.1,codegen=1"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+TRACE_SAMPLE_RATES = os.getenv("TRACE_SAMPLE_RATES", "")
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """Parse "app=rate,app2=rate" into {app: rate}.
+
+    Raises:
+        ValueError: If an entry is not app=rate or a rate is outside 0..1.
+    """
+    rates: dict[str, float] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        app, sep, rate = entry.partition("=")
+        if not sep or not app.strip():
+            raise ValueError(f"Invalid sample rate entry '{entry}', expected app=rate")
+        value = float(rate)
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"Sample rate for '{app.strip()}' must be between 0 and 1")
+        rates[app.strip()] = value
+    return rates
+
+
+@dataclass
+class TraceExportStats:
+    """Counters of the export pipeline since the process started."""
+
+    queued: int = 0
+    exported: int = 0  # handed to the sink processors
+    dropped: int = 0  # queue was full, span discarded
+    export_errors: int = 0
+    sampled_out: Counter[str] = field(default_factory=Counter)  # root traces by app
+
+
+class AppSampler(Sampler):
+    """Keep a fixed share of root traces per app, decided from the trace id.
+
+    Root spans are named "<app_name>-<agent>..." by the shared-lib invokers, so the app
+    is the longest configured name the span name starts with. Children follow their
+    root when wrapped in ParentBased (see app_sampler()).
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, float] | None = None,
+        default_rate: float = 1.0,
+        stats: TraceExportStats | None = None,
+    ) -> None:
+        self.rates = dict(sorted((rates or {}).items(), key=lambda kv: -len(kv[0])))
+        self.default_rate = default_rate
+        self.stats = stats or TraceExportStats()
+
+    def app_for(self, name: str) -> str | None:
+        return next((app for app in self.rates if name.startswith(app)), None)
+
+    def should_sample(
+        self,
+        parent_context: Context | None,  # noqa: ARG002
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,  # noqa: ARG002
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,  # noqa: ARG002
+        trace_state: Any = None,  # noqa: ARG002
+    ) -> SamplingResult:
+        app = self.app_for(name)
+        rate = self.rates[app] if app else self.default_rate
+        limit = TraceIdRatioBased.TRACE_ID_LIMIT
+        if trace_id & limit < TraceIdRatioBased.get_bound_for_rate(rate):
+            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
+        self.stats.sampled_out[app or name] += 1
+        return SamplingResult(Decision.DROP)
+
+    def get_description(self) -> str:
+        return f"AppSampler{{default={self.default_rate}, rates={self.rates}}}"
+
+
+def app_sampler(sampler: AppSampler) -> Sampler:
+    """Sample roots with sampler; children inherit the decision of their parent."""
+    return ParentBased(root=sampler)
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Append finished spans to a local JSONL file, one OTLP-style JSON object per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(json.loads(s.to_json(indent=None))) + "\n" for s in spans)
+        with self._lock:
+            if self._file.closed:
+                return SpanExportResult.FAILURE
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:  # noqa: ARG002
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class SpanExportQueue(SpanProcessor):
+    """Front for span processors that keeps their export work off the request path.
+
+    on_start is forwarded inline (processors such as Langfuse's read the current
+    context there). on_end only appends to a bounded queue; a background thread hands
+    spans to the processors in batches. When the queue is full the span is dropped and
+    counted rather than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = TRACE_QUEUE_SIZE,
+        max_batch_size: int = TRACE_EXPORT_BATCH_SIZE,
+        schedule_delay: float = TRACE_EXPORT_INTERVAL_SECONDS,
+        stats: TraceExportStats | None = None,
+    ) -> None:
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.schedule_delay = schedule_delay
+        self.stats = stats or TraceExportStats()
+        self._processors: list[SpanProcessor] = []
+        self._queue: deque[ReadableSpan] = deque()
+        self._cond = threading.Condition()
+        self._flush_requested = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self._shutdown = False
+        self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+        self._thread.start()
+
+    def add(self, processor: SpanProcessor) -> None:
+        self._processors = [*self._processors, processor]
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        for processor in self._processors:
+            processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if self._shutdown or not span.context or not span.context.trace_flags.sampled:
+            return
+        with self._cond:
+            if len(self._queue) >= self.max_queue_size:
+                self.stats.dropped += 1
+                return
+            self._queue.append(span)
+            self.stats.queued += 1
+            self._idle.clear()
+            if len(self._queue) >= self.max_batch_size:
+                self._cond.notify()
+
+    def request_flush(self) -> None:
+        """Export what is queued and flush the processors, on the export thread."""
+        with self._cond:
+            if self._shutdown:
+                return
+            self._flush_requested = True
+            self._idle.clear()
+            self._cond.notify()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Block until the queue is drained and the processors flushed, or the timeout."""
+        if self._shutdown:
+            self._thread.join(timeout_millis / 1000)
+            return not self._thread.is_alive()
+        self.request_flush()
+        return self._idle.wait(timeout_millis / 1000)
+
+    def shutdown(self) -> None:
+        with self._cond:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            self._cond.notify()
+        self._thread.join()
+        for processor in self._processors:
+            processor.shutdown()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not (self._queue or self._flush_requested or self._shutdown):
+                    self._cond.wait(self.schedule_delay)
+                batch = [
+                    self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch_size))
+                ]
+                flush = self._flush_requested and not self._queue
+                if flush:
+                    self._flush_requested = False
+                done = self._shutdown and not self._queue
+            if batch or flush or done:
+                self._export(batch, flush or done)
+            with self._cond:
+                if not (self._queue or self._flush_requested):
+                    self._idle.set()
+            if done:
+                return
+
+    def _export(self, batch: list[ReadableSpan], flush: bool) -> None:
+        for processor in self._processors:
+            try:
+                for span in batch:
+                    processor.on_end(span)
+                if flush:
+                    processor.force_flush()
+            except Exception:
+                self.stats.export_errors += 1
+                logger.exception(f"Trace export to {type(processor).__name__} failed")
+        self.stats.exported += len(batch)
+
+
+class QueuedTracerProvider(TracerProvider):
+    """TracerProvider whose span processors all sit behind one SpanExportQueue.
+
+    Langfuse attaches its processor through add_span_processor, so it is queued too.
+    """
+
+    def __init__(self, queue: SpanExportQueue | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.export_queue = queue or SpanExportQueue()
+        super().add_span_processor(self.export_queue)
+
+    def add_span_processor(self, span_processor: SpanProcessor) -> None:
+        self.export_queue.add(span_processor)
+
+
+_provider: QueuedTracerProvider | None = None
+_enabled = False
+_setup_lock = threading.Lock()
+
+
+def _langfuse_accepts_span_exporter() -> bool:
+    """True if the installed Langfuse client takes span_exporter (not in the locked 3.x)."""
+    from langfuse import Langfuse
+
+    return "span_exporter" in inspect.signature(Langfuse.__init__).parameters
+
+
+def setup_tracing() -> bool:
+    """Set up tracing once per process; later calls return the first result.
+
+    Creates the Langfuse client on a QueuedTracerProvider, installs that provider as the
+    global one and then runs the shared-lib init_tracing(), whose client shares the same
+    per-key Langfuse resources. Exports to Langfuse or, with TRACE_EXPORT=jsonl, to
+    TRACE_JSONL_PATH; jsonl needs a Langfuse release that accepts span_exporter. Langfuse
+    keys are still needed for jsonl, since the Langfuse callback handler looks its client
+    up by public key; nothing is sent to LANGFUSE_HOST.
+
+    A failed setup leaves nothing installed, so a later call tries again.
+
+    Returns:
+        True if spans are exported, False if tracing is off or not configured.
+    """
+    global _provider, _enabled
+    with _setup_lock:
+        if _provider is not None or TRACE_EXPORT == "off":
+            return _enabled
+        from autobots_devtools_shared_lib.dynagent.config.dynagent_settings import (
+            get_dynagent_settings,
+        )
+
+        settings = get_dynagent_settings()
+        if not settings.is_langfuse_configured():
+            logger.info("Langfuse not configured, tracing disabled")
+            return False
+        if TRACE_EXPORT == "jsonl" and not _langfuse_accepts_span_exporter():
+            logger.warning(
+                "TRACE_EXPORT=jsonl needs a Langfuse client with span_exporter, tracing disabled"
+            )
+            return False
+        stats = TraceExportStats()
+        sampler = AppSampler(parse_sample_rates(TRACE_SAMPLE_RATES), TRACE_SAMPLE_RATE, stats)
+        provider = QueuedTracerProvider(SpanExportQueue(stats=stats), sampler=app_sampler(sampler))
+        client_kwargs: dict[str, Any] = {}
+        if TRACE_EXPORT == "jsonl":
+            client_kwargs["span_exporter"] = JsonlSpanExporter(TRACE_JSONL_PATH)
+        try:
+            from langfuse import Langfuse
+
+            # Langfuse keeps one set of resources per public key: this first client binds
+            # them to the queued provider and init_tracing() below reuses them.
+            Langfuse(
+                public_key=settings.langfuse_public_key,
+                secret_key=settings.langfuse_secret_key,
+                host=settings.langfuse_host,
+                tracer_provider=provider,
+                **client_kwargs,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to initialize Langfuse tracing: {e}")
+            provider.shutdown()
+            return False
+        if isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+            trace.set_tracer_provider(provider)
+        else:
+            logger.warning(
+                "A global tracer provider is already set; only Langfuse spans are queued"
+            )
+        _provider = provider
+        _enabled = init_tracing()
+        if _enabled:
+            sink = TRACE_JSONL_PATH if client_kwargs else settings.langfuse_host
+            logger.info(f"Tracing initialized, exporting to {sink} in the background")
+        return _enabled
+
+
+def request_trace_flush() -> None:
+    """Ask the export thread to send everything queued now; returns immediately."""
+    if _provider is not None:
+        _provider.export_queue.request_flush()
+
+
+def flush_tracing(timeout: float = 10.0) -> bool:
+    """Block until queued spans are exported; for CLIs and batch jobs about to exit."""
+    if _provider is None:
+        return True
+    return _provider.export_queue.force_flush(int(timeout * 1000))
+
+
+def get_trace_export_stats() -> TraceExportStats:
+    """Counters of the process-wide pipeline (all zero before setup_tracing())."""
+    return _provider.export_queue.stats if _provider is not None else TraceExportStats()
@@ -8,6 +8,7 @@ from autobots_orch_flow_studio.configs.settings import AppSettings
 # ---------------------------------------------------------------------------
 _settings = AppSettings()
 KB_PATH: str = str(_settings.dynagent_config_root_dir)
+AGENT_SCHEMAS_DIR = f"{_settings.dynagent_config_root_dir}/schemas"
 
 # ---------------------------------------------------------------------------
 # Output directory components
@@ -77,10 +78,25 @@ KB_PATH = "knowledge_base/payments"
 PROCESSING_UNITS_DIR = "processing-units"
 NODE_REGISTRY_FILE = "node-registry.json"
 
+# Generator input data: one folder per feature (e.g. data/MER-12345---Party-Feature/json/1-models.json)
+INPUT_DATA_BASE_PATH = "/Users/saurabh/Documents/server/orch-ai-studio/data"
+LLD_JSON_SUBDIR = "json"
+MODEL_OAS_OUTPUT_SUBDIR = "generate_model"
+SYNC_OAS_OUTPUT_SUBDIR = "generate_sync_methods"
+# Last successfully generated copy of each LLD JSON, diffed to skip unchanged models/endpoints
+GENERATION_SNAPSHOT_SUBDIR = ".generated-snapshots"
+# Node-RED flows: converted (designer_flows), actual (sample_flows), merged (generated_flows),
+# and the flow KGs derived from them
+DESIGNER_FLOWS_SUBDIR = "designer_flows"
+SAMPLE_FLOWS_SUBDIR = "sample_flows"
+GENERATED_FLOWS_SUBDIR = "generated_flows"
+FLOW_KG_OUTPUT_SUBDIR = "flows"
+
 # LLD processor: base directory for split MD output (one subfolder per source MD)
 LLD_SPLIT_MD_SUBDIR = "lld-split"
 # LLD_SPLIT_OUTPUT_BASE_DIR = f"{KB_PATH}/{OEPY_DOCS_DIR}/{AGENTIC_GENERATOR_META_DIR}/{LLD_SPLIT_MD_SUBDIR}"
-LLD_SPLIT_OUTPUT_BASE_DIR = (
-    f"/Users/saurabh/Documents/server/orch-ai-studio/data/{LLD_SPLIT_MD_SUBDIR}"
-)
+LLD_SPLIT_OUTPUT_BASE_DIR = f"{INPUT_DATA_BASE_PATH}/{LLD_SPLIT_MD_SUBDIR}"
 INPUT_LLD_DIR = "/Users/saurabh/Documents/server/orch-ai-studio/orch-flow-studio/docs/sample_md"
+
+# KB search index (SQLite FTS5) over the data workspace, including designer_flows
+KB_INDEX_DB_PATH = f"{INPUT_DATA_BASE_PATH}/.kb-index.sqlite"
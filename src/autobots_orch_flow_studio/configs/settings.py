@@ -19,6 +19,17 @@ class AppSettings(DynagentSettings):
     port: int = Field(default=2337, description="Application port")
     debug: bool = Field(default=False, description="Enable debug mode")
 
+    # Offline LLM record/replay (see common.utils.llm_replay)
+    llm_replay_mode: str = Field(default="off", description="LLM calls: off, record or replay")
+    llm_cassette_path: str = Field(
+        default="tests/cassettes/llm.jsonl", description="Record/replay cassette (JSONL)"
+    )
+    llm_replay_match: str = Field(default="auto", description="Replay match: exact, sequence, auto")
+    llm_replay_latency_ms: float = Field(default=0.0, description="Synthetic latency per call")
+    llm_replay_ms_per_token: float = Field(
+        default=0.0, description="Synthetic latency per output token"
+    )
+
     def is_oauth_configured(self) -> bool:
         """Check if GitHub OAuth is properly configured."""
         return bool(
@@ -46,4 +57,8 @@ def init_app_settings(settings: AppSettings | None = None) -> AppSettings:
     """
     s = settings if settings is not None else get_app_settings()
     set_dynagent_settings(s)
+    if s.llm_replay_mode != "off":
+        from autobots_orch_flow_studio.common.utils.llm_replay import install_llm_replay
+
+        install_llm_replay(settings=s)
     return s
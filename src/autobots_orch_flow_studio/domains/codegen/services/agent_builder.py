@@ -1,17 +1,33 @@
 # ABOUTME: Agent builder services for creating new agent configurations.
 # ABOUTME: Provides functions for validating, generating, and writing agent configuration files.
 
+import asyncio
 import json
 import os
 import re
+import threading
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
+import yaml
 from langchain_core.messages import HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from autobots_devtools_shared_lib.common.observability import get_logger
 
+from autobots_orch_flow_studio.domains.codegen.utils.agent_registry import (
+    AgentConfig,
+    AgentsYamlDocument,
+    get_agent_registry,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.tool_index import (
+    ToolModuleIndex,
+    get_tool_index,
+)
+
 logger = get_logger(__name__)
 
 # Name validation regex: lowercase letters, numbers, hyphens, underscores
@@ -36,6 +52,16 @@ def _get_new_repo_base() -> Path:
 NEW_REPO_BASE = _get_new_repo_base()
 AGENT_CONFIGS_BASE = NEW_REPO_BASE / "agent_configs"
 AGENTS_YAML_FILENAME = "agents.yaml"
+AGENT_BUILDER_LOCK_FILENAME = ".agent-builder.lock"
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+    logger.warning(
+        "fcntl is not available: agent creation cannot lock domain directories, so "
+        "concurrent creators in one domain may overwrite each other's agents.yaml"
+    )
 
 
 def validate_agent_name(name: str) -> tuple[bool, str]:
@@ -97,20 +123,8 @@ def get_prompt_number(domain: str) -> int:
     Returns:
         Next available prompt number (e.g., 03, 04)
     """
-    domain_path = get_domain_path(domain)
-    prompts_dir = domain_path / "prompts"
-
-    if not prompts_dir.exists():
-        return 0
-
-    existing_numbers = []
-    for file in prompts_dir.glob("*.md"):
-        # Extract number from filename like "00-welcome.md"
-        match = re.match(r"^(\d+)-", file.name)
-        if match:
-            existing_numbers.append(int(match.group(1)))
-
-    return max(existing_numbers, default=-1) + 1
+    # Cached per domain; the prompts directory is only re-scanned when it changes
+    return get_agent_registry(get_domain_path(domain)).next_prompt_number()
 
 
 def validate_agent_config(
@@ -121,6 +135,9 @@ def validate_agent_config(
 ) -> tuple[bool, str]:
     """Validate agent configuration before creation.
 
+    Reads only: tools missing from tools.py are reported in the log and generated when
+    the agent is created (see AgentCreationTransaction.stage_tools).
+
     Args:
         domain: Domain name
         agent_name: Agent name
@@ -141,12 +158,12 @@ def validate_agent_config(
         return False, error
 
     # Check if agent already exists
-    domain_path = get_domain_path(domain)
-    agents_yaml = domain_path / AGENTS_YAML_FILENAME
-    if agents_yaml.exists():
-        content = agents_yaml.read_text()
-        if f"{agent_name}:" in content or f'"{agent_name}"' in content:
-            return False, f"Agent '{agent_name}' already exists in domain '{domain}'"
+    try:
+        exists = agent_name in get_agent_registry(get_domain_path(domain))
+    except ValueError as e:
+        return False, str(e)
+    if exists:
+        return False, f"Agent '{agent_name}' already exists in domain '{domain}'"
 
     # Validate prompt content
     if not prompt_content or not prompt_content.strip():
@@ -160,62 +177,87 @@ def validate_agent_config(
     if "handoff" not in tools:
         logger.warning(f"Agent '{agent_name}' does not have 'handoff' tool - recommended for multi-agent systems")
 
-    # Auto-generate missing tools
-    created_tools, _ = ensure_tools_exist(tools)
-    if created_tools:
-        logger.info(f"Auto-generated {len(created_tools)} missing tools: {', '.join(created_tools)}")
+    # Missing tools are generated on creation, inside the agent's transaction
+    tools_file = get_tools_file_path()
+    if tools_file.exists():
+        _, missing = _split_missing_tools(tools, get_tool_index(tools_file))
+        if missing:
+            logger.info(f"Tools to be generated on creation: {', '.join(missing)}")
 
     return True, ""
 
 
-def _get_llm_client() -> ChatGoogleGenerativeAI | None:
-    """Get LLM client configured from environment variables.
-    
+# Prompt generation limits, shared by every chat session in the process
+PROMPT_LLM_TIMEOUT_SECONDS = float(os.getenv("AGENT_PROMPT_LLM_TIMEOUT", "30"))
+PROMPT_LLM_MAX_CONCURRENCY = max(1, int(os.getenv("AGENT_PROMPT_LLM_CONCURRENCY", "4")))
+
+_llm_clients: dict[tuple[str, float, str], ChatGoogleGenerativeAI] = {}
+_llm_clients_lock = threading.Lock()
+# One cap for threads and event loops alike, so sync and async callers together stay under it
+_prompt_slots = threading.BoundedSemaphore(PROMPT_LLM_MAX_CONCURRENCY)
+# How often a coroutine waiting for a prompt slot checks for a free one
+PROMPT_SLOT_POLL_SECONDS = 0.05
+
+
+def get_llm_client(
+    model: str | None = None, temperature: float = 0.7
+) -> ChatGoogleGenerativeAI | None:
+    """Get the shared LLM client for a model and temperature.
+
+    Clients are created on first use and reused by every later call with the same
+    model, temperature and API key, so their HTTP connections are pooled.
+
+    Args:
+        model: Model name; defaults to the LLM_MODEL environment variable
+        temperature: Sampling temperature (0.7 is balanced creativity for prompt generation)
+
     Returns:
         ChatGoogleGenerativeAI instance if GOOGLE_API_KEY is set, None otherwise
     """
     google_api_key = os.getenv("GOOGLE_API_KEY")
     if not google_api_key:
         return None
-    
-    model_name = os.getenv("LLM_MODEL", "gemini-2.0-flash")
-    
-    try:
-        return ChatGoogleGenerativeAI(
-            model=model_name,
-            google_api_key=google_api_key,
-            temperature=0.7,  # Balanced creativity for prompt generation
-        )
-    except Exception as e:
-        logger.warning(f"Failed to create LLM client: {e}")
-        return None
 
+    model_name = model or os.getenv("LLM_MODEL", "gemini-2.0-flash")
+    key = (model_name, temperature, google_api_key)
 
-def create_agent_prompt_content(
-    agent_name: str,
-    purpose: str,
-    instructions: str | None = None,
-) -> str:
-    """Generate agent prompt content from user requirements using LLM.
+    with _llm_clients_lock:
+        client = _llm_clients.get(key)
+        if client is not None:
+            return client
+        try:
+            client = ChatGoogleGenerativeAI(
+                model=model_name,
+                google_api_key=google_api_key,
+                temperature=temperature,
+                timeout=PROMPT_LLM_TIMEOUT_SECONDS,
+            )
+        except Exception as e:
+            # Not cached, so a later call can retry
+            logger.warning(f"Failed to create LLM client: {e}")
+            return None
+        _llm_clients[key] = client
+        return client
 
-    Args:
-        agent_name: Agent name (e.g., "joke_agent")
-        purpose: Agent's main purpose/role
-        instructions: Optional additional instructions
 
-    Returns:
-        Formatted prompt content (LLM-generated if available, otherwise template-based)
+@asynccontextmanager
+async def _prompt_slot() -> AsyncIterator[None]:
+    """Hold a prompt generation slot, waiting for one without blocking the event loop.
+
+    Polls instead of parking a worker thread on the semaphore, so a wait cancelled at
+    the deadline leaves no slot taken.
     """
-    # Convert agent_name to display name (e.g., "joke_agent" -> "Joke Agent")
-    display_name = " ".join(word.capitalize() for word in agent_name.replace("_", "-").split("-"))
+    while not _prompt_slots.acquire(blocking=False):
+        await asyncio.sleep(PROMPT_SLOT_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        _prompt_slots.release()
 
-    # Try to use LLM for enhanced prompt generation
-    llm_client = _get_llm_client()
-    
-    if llm_client:
-        try:
-            # Create LLM prompt for generating the agent prompt
-            llm_prompt = f"""You are an expert at writing AI agent prompts. Generate a comprehensive, professional prompt for an AI agent with the following details:
+
+def _prompt_generation_request(display_name: str, purpose: str, instructions: str | None) -> str:
+    """Build the LLM request that asks for an agent prompt."""
+    return f"""You are an expert at writing AI agent prompts. Generate a comprehensive, professional prompt for an AI agent with the following details:
 
 Agent Name: {display_name}
 Purpose: {purpose}
@@ -230,43 +272,33 @@ The prompt should be in markdown format and include:
 
 Make it clear, actionable, and professional. The guidelines should emphasize being helpful, using tools effectively, and proper agent handoff procedures. Return only the markdown content, no additional explanation."""
 
-            # Call LLM
-            messages = [HumanMessage(content=llm_prompt)]
-            response = llm_client.invoke(messages)
-            
-            # Extract content from response
-            # LangChain AIMessage.content can be a string or list of content blocks
-            if hasattr(response, 'content') and response.content:
-                # Handle both string and list content types
-                if isinstance(response.content, str):
-                    generated_prompt = response.content.strip()
-                elif isinstance(response.content, list):
-                    # Join list of content blocks (usually strings or dicts)
-                    content_parts = []
-                    for part in response.content:
-                        if isinstance(part, str):
-                            content_parts.append(part)
-                        elif isinstance(part, dict) and 'text' in part:
-                            content_parts.append(part['text'])
-                        else:
-                            content_parts.append(str(part))
-                    generated_prompt = '\n'.join(content_parts).strip()
-                else:
-                    generated_prompt = str(response.content).strip()
-                
-                # Ensure we have valid content
-                if isinstance(generated_prompt, str) and len(generated_prompt) > 0:
-                    logger.info(f"Successfully generated prompt for '{agent_name}' using LLM")
-                    return generated_prompt
-                else:
-                    logger.warning(f"LLM returned empty or invalid response for '{agent_name}', falling back to template")
+
+def _response_text(response: Any) -> str:
+    """Extract stripped text from an LLM response.
+
+    LangChain AIMessage.content can be a string or a list of content blocks.
+    """
+    content = getattr(response, "content", None)
+    if not content:
+        return ""
+    if isinstance(content, str):
+        return content.strip()
+    if isinstance(content, list):
+        # Join list of content blocks (usually strings or dicts)
+        content_parts = []
+        for part in content:
+            if isinstance(part, str):
+                content_parts.append(part)
+            elif isinstance(part, dict) and 'text' in part:
+                content_parts.append(part['text'])
             else:
-                logger.warning(f"LLM response missing content for '{agent_name}', falling back to template")
-                
-        except Exception as e:
-            logger.warning(f"Failed to generate prompt using LLM for '{agent_name}': {e}. Falling back to template.")
-    
-    # Fallback to template-based generation
+                content_parts.append(str(part))
+        return '\n'.join(content_parts).strip()
+    return str(content).strip()
+
+
+def _template_prompt_content(display_name: str, purpose: str, instructions: str | None) -> str:
+    """Template-based prompt used when no LLM is available or it fails."""
     prompt = f"# {display_name}\n\n"
     prompt += f"You are **{display_name}**, {purpose}.\n\n"
 
@@ -285,6 +317,110 @@ Make it clear, actionable, and professional. The guidelines should emphasize bei
     return prompt
 
 
+def _display_name(agent_name: str) -> str:
+    """Convert agent_name to display name (e.g., "joke_agent" -> "Joke Agent")."""
+    return " ".join(word.capitalize() for word in agent_name.replace("_", "-").split("-"))
+
+
+def _generated_or_template(
+    agent_name: str, display_name: str, purpose: str, instructions: str | None, response: Any
+) -> str:
+    generated_prompt = _response_text(response)
+    if generated_prompt:
+        logger.info(f"Successfully generated prompt for '{agent_name}' using LLM")
+        return generated_prompt
+    logger.warning(f"LLM returned empty or invalid response for '{agent_name}', falling back to template")
+    return _template_prompt_content(display_name, purpose, instructions)
+
+
+def create_agent_prompt_content(
+    agent_name: str,
+    purpose: str,
+    instructions: str | None = None,
+    timeout: float | None = None,
+) -> str:
+    """Generate agent prompt content from user requirements using LLM.
+
+    Blocks the calling thread; code running on an event loop should await
+    acreate_agent_prompt_content instead.
+
+    Args:
+        agent_name: Agent name (e.g., "joke_agent")
+        purpose: Agent's main purpose/role
+        instructions: Optional additional instructions
+        timeout: Seconds to wait for a free LLM slot and the response
+            (default PROMPT_LLM_TIMEOUT_SECONDS)
+
+    Returns:
+        Formatted prompt content (LLM-generated if available, otherwise template-based)
+    """
+    display_name = _display_name(agent_name)
+    llm_client = get_llm_client()
+    if not llm_client:
+        return _template_prompt_content(display_name, purpose, instructions)
+
+    # The client enforces its own request timeout; this bounds the wait for a slot
+    if not _prompt_slots.acquire(timeout=timeout or PROMPT_LLM_TIMEOUT_SECONDS):
+        logger.warning(f"No free LLM slot for '{agent_name}' in time, falling back to template")
+        return _template_prompt_content(display_name, purpose, instructions)
+    try:
+        llm_prompt = _prompt_generation_request(display_name, purpose, instructions)
+        response = llm_client.invoke([HumanMessage(content=llm_prompt)])
+    except Exception as e:
+        logger.warning(f"Failed to generate prompt using LLM for '{agent_name}': {e}. Falling back to template.")
+        return _template_prompt_content(display_name, purpose, instructions)
+    finally:
+        _prompt_slots.release()
+    return _generated_or_template(agent_name, display_name, purpose, instructions, response)
+
+
+async def acreate_agent_prompt_content(
+    agent_name: str,
+    purpose: str,
+    instructions: str | None = None,
+    use_llm: bool = True,
+    timeout: float | None = None,
+) -> str:
+    """Async create_agent_prompt_content for tools and bulk callers on an event loop.
+
+    Uses the shared client from get_llm_client. At most PROMPT_LLM_MAX_CONCURRENCY
+    generations run at once in the process, sync and async together, so concurrent
+    chat sessions queue for a slot instead of all hitting the LLM together. Waiting
+    for the slot counts against the deadline.
+
+    Args:
+        agent_name: Agent name (e.g., "joke_agent")
+        purpose: Agent's main purpose/role
+        instructions: Optional additional instructions
+        use_llm: False skips the LLM and returns the template-based prompt
+        timeout: Deadline in seconds (default PROMPT_LLM_TIMEOUT_SECONDS); the
+            template-based prompt is returned when it passes
+
+    Returns:
+        Formatted prompt content (LLM-generated if available, otherwise template-based)
+    """
+    display_name = _display_name(agent_name)
+    llm_client = get_llm_client() if use_llm else None
+    if not llm_client:
+        return _template_prompt_content(display_name, purpose, instructions)
+
+    async def generate() -> Any:
+        async with _prompt_slot():
+            llm_prompt = _prompt_generation_request(display_name, purpose, instructions)
+            return await llm_client.ainvoke([HumanMessage(content=llm_prompt)])
+
+    deadline = timeout or PROMPT_LLM_TIMEOUT_SECONDS
+    try:
+        response = await asyncio.wait_for(generate(), deadline)
+    except TimeoutError:
+        logger.warning(f"LLM prompt generation for '{agent_name}' exceeded {deadline:g}s, falling back to template")
+        return _template_prompt_content(display_name, purpose, instructions)
+    except Exception as e:
+        logger.warning(f"Failed to generate prompt using LLM for '{agent_name}': {e}. Falling back to template.")
+        return _template_prompt_content(display_name, purpose, instructions)
+    return _generated_or_template(agent_name, display_name, purpose, instructions, response)
+
+
 def create_agent_yaml_entry(
     agent_name: str,
     prompt_number: int,
@@ -309,25 +445,14 @@ def create_agent_yaml_entry(
     # Format prompt number as zero-padded string
     prompt_str = f"{prompt_number:02d}-{agent_name.replace('_', '-')}"
 
-    yaml = f"  {agent_name}:\n"
-    yaml += f"    prompt: \"{prompt_str}\"\n"
-
-    if batch_enabled:
-        yaml += "    batch_enabled: true\n"
-    else:
-        yaml += "    batch_enabled: false\n"
-
-    if is_default:
-        yaml += "    is_default: true\n"
-
-    if output_schema:
-        yaml += f"    output_schema: \"{output_schema}\"\n"
-
-    yaml += "    tools:\n"
-    for tool in tools:
-        yaml += f"      - \"{tool}\"\n"
-
-    return yaml
+    return AgentConfig(
+        name=agent_name,
+        prompt=prompt_str,
+        tools=list(tools),
+        batch_enabled=batch_enabled,
+        is_default=is_default,
+        output_schema=output_schema,
+    ).to_yaml()
 
 
 def create_output_schema(agent_name: str, fields: dict[str, Any] | None = None) -> dict[str, Any]:
@@ -377,6 +502,15 @@ def create_output_schema(agent_name: str, fields: dict[str, Any] | None = None)
     return schema
 
 
+def _new_agents_yaml(domain: str) -> str:
+    """Initial agents.yaml content for a domain that has none yet."""
+    return (
+        f"# ABOUTME: {domain.title()} agent configuration\n"
+        f"# ABOUTME: Defines agents for the {domain} domain\n\n"
+        "agents:\n"
+    )
+
+
 def ensure_domain_structure(domain: str) -> tuple[bool, str]:
     """Ensure domain directory structure exists in new-repo.
 
@@ -401,11 +535,7 @@ def ensure_domain_structure(domain: str) -> tuple[bool, str]:
         # Create agents.yaml if it doesn't exist
         agents_yaml = domain_path / AGENTS_YAML_FILENAME
         if not agents_yaml.exists():
-            agents_yaml.write_text(
-                f"# ABOUTME: {domain.title()} agent configuration\n"
-                f"# ABOUTME: Defines agents for the {domain} domain\n\n"
-                "agents:\n"
-            )
+            agents_yaml.write_text(_new_agents_yaml(domain))
 
         return True, ""
     except Exception as e:
@@ -428,15 +558,20 @@ def add_agent_to_yaml(domain: str, yaml_entry: str) -> tuple[bool, str]:
     if not agents_yaml.exists():
         return False, f"{AGENTS_YAML_FILENAME} does not exist for domain '{domain}'"
 
+    registry = get_agent_registry(domain_path)
     try:
-        content = agents_yaml.read_text()
-        # Check if agents: section exists
-        if "agents:" not in content:
-            content = f"# ABOUTME: Agent configuration\n\nagents:\n{content}"
-
-        # Append the new agent entry
-        content = content.rstrip() + "\n" + yaml_entry + "\n"
-        agents_yaml.write_text(content)
+        entries = yaml.safe_load(f"agents:\n{yaml_entry}")["agents"] or {}
+        document = registry.document()
+        for name, entry in entries.items():
+            if name in document:
+                return False, f"Agent '{name}' already exists in domain '{domain}'"
+            document.set(AgentConfig.from_yaml(name, entry))
+
+        # Write through a temp file so readers never see a half-written agents.yaml
+        tmp = agents_yaml.with_name(f".{AGENTS_YAML_FILENAME}.tmp")
+        tmp.write_text(document.render(), encoding="utf-8")
+        tmp.replace(agents_yaml)
+        registry.update(document)
         return True, ""
     except Exception as e:
         return False, f"Failed to add agent to {AGENTS_YAML_FILENAME}: {str(e)}"
@@ -516,9 +651,165 @@ def create_services_file_content(
         return _create_standard_services_file_content(domain, agent_name)
 
 
+def _services_init_block(domain: str) -> str:
+    """Generated code for one-time, lazy process setup shared by every services entry point."""
+    return f'''_init_lock = threading.Lock()
+_initialized = False
+
+
+def _ensure_initialized() -> None:
+    """Load .env, start tracing and register tools once per process, on first use."""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        load_dotenv()
+        init_tracing()
+        # Register domain tools if needed
+        # register_{domain}_tools()
+        _initialized = True
+'''
+
+
+def _services_async_batch_block(agent_name: str, func_name: str) -> str:
+    """Generated async batch API: bounded concurrency, as_completed streaming and a batch call."""
+    return f'''
+
+def _last_ai_content(state: dict) -> str | None:
+    for msg in reversed(state.get("messages") or []):
+        if isinstance(msg, dict):
+            if msg.get("role") in ("ai", "assistant"):
+                return msg.get("content")
+        elif getattr(msg, "type", None) == "ai":
+            return getattr(msg, "content", None)
+    return None
+
+
+async def _ainvoke_record(
+    index: int,
+    record: str,
+    session_id: str,
+    trace_metadata: TraceMetadata,
+    enable_tracing: bool,
+) -> RecordResult:
+    # Each record gets its own thread so records never share conversation state
+    config: RunnableConfig = {{
+        "configurable": {{
+            "thread_id": f"{{session_id}}-{{index}}",
+            "agent_name": AGENT_NAME,
+            "app_name": APP_NAME,
+        }},
+    }}
+    input_state: dict = {{
+        "messages": [{{"role": "user", "content": record}}],
+        "agent_name": AGENT_NAME,
+        "session_id": session_id,
+    }}
+    try:
+        state = await ainvoke_agent(
+            agent_name=AGENT_NAME,
+            input_state=input_state,
+            config=config,
+            trace_metadata=trace_metadata,
+            enable_tracing=enable_tracing,
+        )
+    except Exception as e:
+        logger.warning(f"Record {{index}} failed: {{e}}")
+        return RecordResult(index=index, success=False, error=str(e))
+    return RecordResult(index=index, success=True, output=_last_ai_content(state))
+
+
+async def {func_name}_as_completed(
+    records: list[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    user_id: str = "default",
+    session_id: str | None = None,
+    enable_tracing: bool = True,
+) -> AsyncIterator[RecordResult]:
+    """Run {agent_name} over records, yielding each result as soon as it is ready.
+
+    Args:
+        records: List of input strings to process
+        concurrency: Most records in flight at once
+        user_id: User ID for tracing
+        session_id: Optional session ID (auto-generated if None)
+        enable_tracing: Whether to enable tracing
+
+    Yields:
+        RecordResult per record, in completion order (RecordResult.index is its position)
+    """
+    _ensure_initialized()
+    if not session_id:
+        session_id = str(uuid.uuid4())
+    set_session_id(session_id)
+    trace_metadata = TraceMetadata.create(
+        session_id=session_id,
+        app_name=APP_NAME,
+        user_id=user_id,
+        tags=[APP_NAME, AGENT_NAME, "async-batch"],
+    )
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(index: int, record: str) -> RecordResult:
+        async with semaphore:
+            return await _ainvoke_record(index, record, session_id, trace_metadata, enable_tracing)
+
+    tasks = [asyncio.create_task(run(index, record)) for index, record in enumerate(records)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The caller stopped early or was cancelled: do not leave records running
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def {func_name}_abatch(
+    records: list[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    user_id: str = "default",
+    session_id: str | None = None,
+    enable_tracing: bool = True,
+) -> BatchResult:
+    """Run {agent_name} over records with at most `concurrency` in flight.
+
+    Args:
+        records: List of input strings to process
+        concurrency: Most records in flight at once
+        user_id: User ID for tracing
+        session_id: Optional session ID (auto-generated if None)
+        enable_tracing: Whether to enable tracing
+
+    Returns:
+        BatchResult with results in input order
+    """
+    logger.info(
+        f"Invoking agent '{{AGENT_NAME}}' on {{len(records)}} records (concurrency={{concurrency}})"
+    )
+    results = [
+        result
+        async for result in {func_name}_as_completed(
+            records, concurrency, user_id, session_id, enable_tracing
+        )
+    ]
+    results.sort(key=lambda r: r.index)
+    result = BatchResult(agent_name=AGENT_NAME, total=len(records), results=results)
+    logger.info(
+        f"Batch complete: successes={{len(result.successes)}} failures={{len(result.failures)}}"
+    )
+    return result
+'''
+
+
 def _create_batch_services_file_content(domain: str, agent_name: str) -> str:
     """Generate services file content for a batch-enabled agent.
 
+    The module has a sync batch (batch_invoker), an async batch and an as_completed
+    iterator with a concurrency limit, and sets up tracing once on first use.
+
     Args:
         domain: Domain name
         agent_name: Agent name
@@ -530,24 +821,41 @@ def _create_batch_services_file_content(domain: str, agent_name: str) -> str:
     func_name = agent_name
     
     content = f'''# ABOUTME: Service file for {agent_name} - batch-enabled agent
+# ABOUTME: Sync batch via batch_invoker; async batch and as_completed with bounded concurrency.
+import asyncio
+import threading
 import uuid
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
     init_tracing,
     set_session_id,
 )
-from autobots_devtools_shared_lib.dynagent import batch_invoker, BatchResult
+from autobots_devtools_shared_lib.dynagent import (
+    BatchResult,
+    RecordResult,
+    ainvoke_agent,
+    batch_invoker,
+)
 from dotenv import load_dotenv
 
 # Import domain tools registration (adjust based on domain)
 # from autobots_agents_jarvis.domains.{domain}.tools import register_{domain}_tools
 
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+
 logger = get_logger(__name__)
-load_dotenv()
-init_tracing()
 
 APP_NAME = "{domain}-{agent_name}-batch"
+AGENT_NAME = "{agent_name}"
+# Records in flight at once in the async API
+DEFAULT_CONCURRENCY = 8
+
+{_services_init_block(domain)}
 
 def {func_name}_batch(
     records: list[str],
@@ -564,13 +872,11 @@ def {func_name}_batch(
     Returns:
         BatchResult with successes and failures
     """
+    _ensure_initialized()
     if not session_id:
         session_id = str(uuid.uuid4())
     set_session_id(session_id)
     
-    # Register domain tools if needed
-    # register_{domain}_tools()
-    
     trace_metadata = TraceMetadata.create(
         session_id=session_id,
         app_name=APP_NAME,
@@ -589,13 +895,16 @@ def {func_name}_batch(
         f"Batch complete: successes={{len(result.successes)}} failures={{len(result.failures)}}"
     )
     return result
-'''
+{_services_async_batch_block(agent_name, func_name)}'''
     return content
 
 
 def _create_standard_services_file_content(domain: str, agent_name: str) -> str:
     """Generate services file content for a standard (non-batch) agent.
 
+    Besides single sync/async calls the module has an async batch and an as_completed
+    iterator with a concurrency limit, and sets up tracing once on first use.
+
     Args:
         domain: Domain name
         agent_name: Agent name
@@ -607,15 +916,25 @@ def _create_standard_services_file_content(domain: str, agent_name: str) -> str:
     func_name = agent_name
     
     content = f'''# ABOUTME: Service file for {agent_name} - standard agent invocation
+# ABOUTME: Single sync/async calls plus async batch and as_completed with bounded concurrency.
+import asyncio
+import threading
 import uuid
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING
+
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
     init_tracing,
     set_session_id,
 )
-from autobots_devtools_shared_lib.dynagent import invoke_agent, ainvoke_agent
+from autobots_devtools_shared_lib.dynagent import (
+    BatchResult,
+    RecordResult,
+    ainvoke_agent,
+    invoke_agent,
+)
 from dotenv import load_dotenv
 
 # Import domain tools registration (adjust based on domain)
@@ -625,10 +944,13 @@ if TYPE_CHECKING:
     from langchain_core.runnables import RunnableConfig
 
 logger = get_logger(__name__)
-load_dotenv()
-init_tracing()
 
 APP_NAME = "{domain}-{agent_name}"
+AGENT_NAME = "{agent_name}"
+# Messages in flight at once in the async batch API
+DEFAULT_CONCURRENCY = 8
+
+{_services_init_block(domain)}
 
 def call_{func_name}_sync(
     user_message: str,
@@ -645,13 +967,11 @@ def call_{func_name}_sync(
     Returns:
         dict: Complete final state from agent execution
     """
+    _ensure_initialized()
     if not session_id:
         session_id = str(uuid.uuid4())
     set_session_id(session_id)
     
-    # Register domain tools if needed
-    # register_{domain}_tools()
-    
     config: RunnableConfig = {{
         "configurable": {{
             "thread_id": session_id,
@@ -699,13 +1019,11 @@ async def call_{func_name}_async(
     Returns:
         dict: Complete final state from agent execution
     """
+    _ensure_initialized()
     if not session_id:
         session_id = str(uuid.uuid4())
     set_session_id(session_id)
     
-    # Register domain tools if needed
-    # register_{domain}_tools()
-    
     config: RunnableConfig = {{
         "configurable": {{
             "thread_id": session_id,
@@ -737,7 +1055,7 @@ async def call_{func_name}_async(
     )
     
     return result
-'''
+{_services_async_batch_block(agent_name, func_name)}'''
     return content
 
 
@@ -770,6 +1088,293 @@ def write_services_file(
         return False, f"Failed to write services file: {str(e)}"
 
 
+# ==================== TRANSACTIONAL AGENT CREATION ====================
+
+
+class AgentCreationError(Exception):
+    """Raised when staged agent files fail validation or cannot be committed."""
+
+
+class AgentCreationTransaction:
+    """Stage every file of one or more new agents and write all of them or none.
+
+    Holds an advisory lock on the domain directory for its lifetime, edits a copy of the
+    domain's cached AgentRegistry document, allocates prompt numbers from the registry
+    and keeps staged files in memory. commit()
+    validates them together, then writes each through a temp file and an atomic rename, with
+    agents.yaml last so an agent is only registered once its files exist. A failed
+    commit restores the files it already replaced; leaving the block without
+    committing discards everything staged and gives back its prompt numbers.
+
+    Usage:
+        with AgentCreationTransaction("concierge") as txn:
+            prompt_number = txn.add_agent("joke_agent", prompt, ["handoff"])
+            written = txn.commit()
+    """
+
+    def __init__(self, domain: str) -> None:
+        self.domain = domain
+        self.domain_path = get_domain_path(domain)
+        self.agents_yaml_path = self.domain_path / AGENTS_YAML_FILENAME
+        self.committed = False
+        self._files: dict[Path, str] = {}
+        self._agents: list[str] = []
+        self._existing_agents: set[str] = set()
+        self._tool_code: dict[str, str] = {}
+        self._prompt_numbers: list[int] = []
+        self._registry = get_agent_registry(self.domain_path)
+        self._document: AgentsYamlDocument | None = None
+        self._lock_file = None
+
+    def __enter__(self) -> "AgentCreationTransaction":
+        is_valid, error = validate_domain_name(self.domain)
+        if not is_valid:
+            raise AgentCreationError(error)
+        self.domain_path.mkdir(parents=True, exist_ok=True)
+        self._lock_file = (self.domain_path / AGENT_BUILDER_LOCK_FILENAME).open("a")
+        if fcntl is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        # Read under the lock so concurrent creators see each other's committed agents
+        try:
+            if self.agents_yaml_path.exists():
+                self._document = self._registry.document()
+            else:
+                self._document = AgentsYamlDocument(_new_agents_yaml(self.domain))
+        except ValueError as e:
+            self.__exit__(None, None, None)
+            raise AgentCreationError(str(e)) from e
+        self._existing_agents = set(self._document.agents)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.committed and self._files:
+            logger.info(f"Discarded {len(self._files)} staged file(s) for domain '{self.domain}'")
+        self._files.clear()
+        self._tool_code.clear()
+        # Committed prompts now exist as files; abandoned numbers can be handed out again
+        for number in self._prompt_numbers:
+            self._registry.release_prompt_number(number)
+        self._prompt_numbers.clear()
+        if self._lock_file is not None:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _entered(self) -> AgentsYamlDocument:
+        """The agents.yaml document being edited; only available inside the with block."""
+        if self._lock_file is None or self._document is None:
+            raise AgentCreationError("AgentCreationTransaction must be used as a context manager")
+        return self._document
+
+    def agent_names(self) -> set[str]:
+        """Agents in agents.yaml as read on entering the transaction, plus staged ones."""
+        return set(self._existing_agents) | set(self._agents)
+
+    def stage_file(self, path: Path, content: str) -> None:
+        """Stage an extra file to be written with the agents (e.g. a bookkeeping file)."""
+        self._files[path] = content
+
+    def stage_tools(self, tools: list[str]) -> list[str]:
+        """Stage tools.py with skeletons for the tools it does not define yet.
+
+        Like ensure_tools_exist, but tools.py is only written by commit(), together with
+        the agents, and restored if the commit fails.
+
+        Args:
+            tools: Tool names the staged agents use
+
+        Returns:
+            Names of the tools that will be generated on commit
+
+        Raises:
+            AgentCreationError: If the tools cannot be added to tools.py
+        """
+        tools_file = get_tools_file_path()
+        if not tools_file.exists():
+            logger.warning(f"Failed to auto-generate tools {', '.join(tools)}: tools.py file not found")
+            return []
+        index = get_tool_index(tools_file)
+        _, missing = _split_missing_tools(tools, index)
+        missing = [name for name in missing if name not in self._tool_code]
+        if not missing:
+            return []
+        tool_code = {**self._tool_code, **{name: generate_tool_code(name) for name in missing}}
+        try:
+            # Re-rendered from the file on disk with every tool staged so far
+            text, _ = index.render_with_tools(tool_code)
+        except (OSError, ValueError) as e:
+            raise AgentCreationError(f"Failed to generate tools {', '.join(missing)}: {e}") from e
+        self._tool_code = tool_code
+        if text is not None:
+            self._files[tools_file] = text
+        return missing
+
+    def add_agent(
+        self,
+        agent_name: str,
+        prompt_content: str,
+        tools: list[str],
+        batch_enabled: bool = False,
+        is_default: bool = False,
+        output_schema_fields: dict[str, Any] | None = None,
+        replace: bool = False,
+    ) -> int:
+        """Stage the agents.yaml entry, prompt, optional schema and services file.
+
+        Args:
+            agent_name: Agent name
+            prompt_content: Prompt content
+            tools: List of tool names
+            batch_enabled: Whether batch processing is enabled
+            is_default: Whether this is the default agent
+            output_schema_fields: Optional schema field definitions (see create_output_schema)
+            replace: Replace an existing agent's entry and files, keeping its prompt number
+
+        Returns:
+            Prompt number assigned to the agent
+
+        Raises:
+            AgentCreationError: If the name is invalid or the agent already exists (and
+                replace is False) or is already staged
+        """
+        document = self._entered()
+        is_valid, error = validate_agent_name(agent_name)
+        if not is_valid:
+            raise AgentCreationError(error)
+        exists = agent_name in self._existing_agents
+        if agent_name in self._agents or (exists and not replace):
+            raise AgentCreationError(
+                f"Agent '{agent_name}' already exists in domain '{self.domain}'"
+            )
+
+        existing = document.get(agent_name)
+        prompt_number = existing.prompt_number if existing is not None else None
+        if prompt_number is None:
+            prompt_number = self._registry.reserve_prompt_number()
+            self._prompt_numbers.append(prompt_number)
+        file_stem = agent_name.replace("_", "-")
+
+        output_schema = None
+        if output_schema_fields:
+            output_schema = f"{file_stem}-output.json"
+            schema = create_output_schema(agent_name, output_schema_fields)
+            self._files[self.domain_path / "schemas" / output_schema] = (
+                json.dumps(schema, indent=2) + "\n"
+            )
+        self._files[self.domain_path / "prompts" / f"{prompt_number:02d}-{file_stem}.md"] = (
+            prompt_content
+        )
+        self._files[self.domain_path / f"{agent_name}.py"] = create_services_file_content(
+            self.domain, agent_name, batch_enabled
+        )
+
+        document.set(
+            AgentConfig(
+                name=agent_name,
+                prompt=f"{prompt_number:02d}-{file_stem}",
+                tools=list(tools),
+                batch_enabled=batch_enabled,
+                is_default=is_default,
+                output_schema=output_schema,
+            )
+        )
+        self._agents.append(agent_name)
+        return prompt_number
+
+    def validate(self) -> None:
+        """Check the staged files against each other.
+
+        Raises:
+            AgentCreationError: On the first problem found
+        """
+        rendered = self._entered().render()
+        if self._agents:
+            self._files[self.agents_yaml_path] = rendered
+        try:
+            # Re-parse the text that will be written, not the in-memory model
+            agents = AgentsYamlDocument(rendered).agents
+        except ValueError as e:
+            raise AgentCreationError(f"Staged {e}") from e
+        for name in self._agents:
+            entry = agents.get(name)
+            if entry is None:
+                raise AgentCreationError(f"Staged {AGENTS_YAML_FILENAME} has no entry for '{name}'")
+            if not entry.tools:
+                raise AgentCreationError(f"Agent '{name}' must have at least one tool")
+            prompt_path = self.domain_path / "prompts" / f"{entry.prompt}.md"
+            if not self._files.get(prompt_path, "").strip():
+                raise AgentCreationError(f"Prompt content for agent '{name}' cannot be empty")
+            schema = entry.output_schema
+            if schema and self.domain_path / "schemas" / schema not in self._files:
+                raise AgentCreationError(f"Output schema '{schema}' for '{name}' is not staged")
+        for path, content in self._files.items():
+            if path.suffix == ".py":
+                try:
+                    compile(content, str(path), "exec")
+                except SyntaxError as e:
+                    raise AgentCreationError(
+                        f"Generated services file {path.name} does not compile: {e}"
+                    ) from e
+
+    def commit(self) -> list[Path]:
+        """Validate, then atomically write every staged file.
+
+        Returns:
+            Paths written, agents.yaml last
+
+        Raises:
+            AgentCreationError: If validation fails or a file cannot be written; files
+                already replaced are restored first
+        """
+        document = self._entered()
+        if self.committed:
+            raise AgentCreationError("Transaction has already been committed")
+        self.validate()
+
+        paths = sorted(self._files, key=lambda p: p == self.agents_yaml_path)
+        token = uuid.uuid4().hex[:8]
+        temps: list[Path] = []
+        originals: dict[Path, bytes | None] = {}
+        try:
+            for path in paths:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f".{path.name}.{token}.tmp")
+                temps.append(tmp)
+                tmp.write_text(self._files[path], encoding="utf-8")
+            for path, tmp in zip(paths, temps, strict=True):
+                originals[path] = path.read_bytes() if path.exists() else None
+                tmp.replace(path)
+        except OSError as e:
+            self._rollback(originals)
+            raise AgentCreationError(
+                f"Failed to commit agent files for domain '{self.domain}': {e}"
+            ) from e
+        finally:
+            for tmp in temps:
+                tmp.unlink(missing_ok=True)
+
+        self.committed = True
+        self._registry.update(document)
+        logger.info(
+            f"Committed {len(self._agents)} agent(s) to domain '{self.domain}': "
+            f"{', '.join(self._agents)}"
+        )
+        return paths
+
+    def _rollback(self, originals: dict[Path, bytes | None]) -> None:
+        """Restore files replaced by a failed commit, newest first."""
+        for path, data in reversed(originals.items()):
+            try:
+                if data is None:
+                    path.unlink(missing_ok=True)
+                else:
+                    path.write_bytes(data)
+            except OSError as e:
+                logger.warning(f"Rollback could not restore {path}: {e}")
+        logger.warning(f"Rolled back {len(originals)} file(s) in domain '{self.domain}'")
+
+
 # ==================== TOOL AUTO-GENERATION ====================
 
 def check_tool_exists(tool_name: str) -> bool:
@@ -781,14 +1386,12 @@ def check_tool_exists(tool_name: str) -> bool:
     Returns:
         True if tool exists, False otherwise
     """
-    tools_file = Path(__file__).parent / "tools.py"
+    tools_file = get_tools_file_path()
     if not tools_file.exists():
         return False
-    
-    content = tools_file.read_text(encoding="utf-8")
-    # Check for function definition: @tool followed by def tool_name
-    pattern = rf"@tool\s+def\s+{tool_name}\s*\("
-    return bool(re.search(pattern, content))
+
+    # Parsed once per change of tools.py; lookups are a set membership test
+    return tool_name in get_tool_index(tools_file)
 
 
 def get_tools_file_path() -> Path:
@@ -855,100 +1458,8 @@ def add_tool_to_file(tool_name: str, tool_code: str) -> tuple[bool, str]:
         return False, "tools.py file not found"
     
     try:
-        content = tools_file.read_text(encoding="utf-8")
-        
-        # Find the registration function
-        registration_pattern = r"def register_concierge_tools\(\) -> None:"
-        match = re.search(registration_pattern, content)
-        
-        if not match:
-            return False, "Could not find register_concierge_tools function"
-        
-        # Find where to insert the tool (before the registration function)
-        insert_pos = match.start()
-        
-        # Insert the tool code before the registration section
-        # Look for the last @tool before registration
-        before_registration = content[:insert_pos]
-        
-        # Find the last @tool or last function before registration
-        last_tool_match = list(re.finditer(r"@tool\s+def\s+\w+", before_registration))
-        
-        if last_tool_match:
-            # Insert after the last tool
-            last_tool_end = last_tool_match[-1].end()
-            # Find the end of that function (next blank line or end of function)
-            remaining = before_registration[last_tool_end:]
-            # Find the next double newline (end of function)
-            next_double_newline = remaining.find("\n\n")
-            if next_double_newline != -1:
-                insert_pos = last_tool_end + next_double_newline + 2
-            else:
-                insert_pos = last_tool_end
-        else:
-            # Insert before registration function
-            insert_pos = match.start()
-        
-        # Insert the tool code
-        new_content = content[:insert_pos] + tool_code + content[insert_pos:]
-        
-        # Now update the registration function to include the new tool
-        # Find the register_usecase_tools call
-        reg_pattern = r"register_usecase_tools\(\s*\["
-        reg_match = re.search(reg_pattern, new_content)
-        
-        if reg_match:
-            # Find the closing bracket of the list
-            bracket_pos = reg_match.end()
-            # Find the last item in the list before the closing bracket
-            # Look for the last line with a tool name before the closing bracket
-            list_start = bracket_pos
-            list_end = new_content.find("]", bracket_pos)
-            if list_end == -1:
-                return False, "Could not find end of register_usecase_tools list"
-            
-            list_content = new_content[list_start:list_end]
-            # Find the last tool in the list (last non-comment, non-empty line)
-            lines = list_content.split("\n")
-            last_tool_line_idx = None
-            for i in range(len(lines) - 1, -1, -1):
-                line = lines[i].strip()
-                if line and not line.startswith("#") and not line.startswith("]"):
-                    # Extract tool name (remove trailing comma)
-                    tool_match = re.search(r"(\w+),?\s*$", line)
-                    if tool_match:
-                        last_tool_line_idx = i
-                        break
-            
-            if last_tool_line_idx is not None:
-                # Insert after the last tool line
-                line_start = new_content.rfind(lines[last_tool_line_idx], list_start, list_end)
-                if line_start != -1:
-                    line_end = line_start + len(lines[last_tool_line_idx])
-                    # Add the new tool to the list
-                    new_content = (
-                        new_content[:line_end] +
-                        f",\n            {tool_name},  # Auto-generated tool" +
-                        new_content[line_end:]
-                    )
-                else:
-                    # Fallback: add before closing bracket
-                    new_content = (
-                        new_content[:list_end] +
-                        f",\n            {tool_name},  # Auto-generated tool" +
-                        new_content[list_end:]
-                    )
-            else:
-                # Empty list or no tools found, add as first item
-                new_content = (
-                    new_content[:bracket_pos] +
-                    f"\n            {tool_name},  # Auto-generated tool" +
-                    new_content[bracket_pos:]
-                )
-        else:
-            return False, "Could not find register_usecase_tools call"
-        
-        tools_file.write_text(new_content, encoding="utf-8")
+        if not get_tool_index(tools_file).add_tools({tool_name: tool_code}):
+            return False, f"Tool '{tool_name}' already exists in tools.py"
         return True, f"Tool '{tool_name}' added to tools.py"
         
     except Exception as e:
@@ -956,9 +1467,36 @@ def add_tool_to_file(tool_name: str, tool_code: str) -> tuple[bool, str]:
         return False, f"Failed to add tool to tools.py: {str(e)}"
 
 
+# Standard tools that are always available (from shared lib or common)
+STANDARD_TOOLS = frozenset({
+    "handoff", "get_agent_list", "get_context_tool", "set_context_tool",
+    "update_context_tool", "clear_context_tool", "read_file_tool",
+    "write_file_tool", "list_files_tool", "output_format_converter_tool",
+    "validate_email"
+})
+
+
+def _split_missing_tools(
+    tools: list[str], index: ToolModuleIndex | None
+) -> tuple[list[str], list[str]]:
+    """(tools that exist, tools to generate), skipping standard tools and duplicates."""
+    existing_tools = []
+    missing = []
+    for tool_name in tools:
+        # Skip standard tools and tools already defined in tools.py
+        if tool_name in STANDARD_TOOLS or (index is not None and tool_name in index):
+            existing_tools.append(tool_name)
+        elif tool_name not in missing:
+            missing.append(tool_name)
+    return existing_tools, missing
+
+
 def ensure_tools_exist(tools: list[str]) -> tuple[list[str], list[str]]:
     """Ensure all required tools exist, creating missing ones.
 
+    tools.py is parsed once and, if any tool was generated, written once, so a bulk
+    caller can pass the tools of many agents in one call.
+
     Args:
         tools: List of tool names required
 
@@ -966,35 +1504,21 @@ def ensure_tools_exist(tools: list[str]) -> tuple[list[str], list[str]]:
         Tuple of (created_tools, existing_tools)
     """
     created_tools = []
-    existing_tools = []
-    
-    # Standard tools that are always available (from shared lib or common)
-    standard_tools = {
-        "handoff", "get_agent_list", "get_context_tool", "set_context_tool",
-        "update_context_tool", "clear_context_tool", "read_file_tool",
-        "write_file_tool", "list_files_tool", "output_format_converter_tool",
-        "validate_email"
-    }
-    
-    for tool_name in tools:
-        # Skip standard tools
-        if tool_name in standard_tools:
-            existing_tools.append(tool_name)
-            continue
-        
-        # Check if tool exists
-        if check_tool_exists(tool_name):
-            existing_tools.append(tool_name)
-        else:
-            # Generate and add the tool
-            tool_code = generate_tool_code(tool_name)
-            success, error_msg = add_tool_to_file(tool_name, tool_code)
-            if success:
-                created_tools.append(tool_name)
+    tools_file = get_tools_file_path()
+    index = get_tool_index(tools_file) if tools_file.exists() else None
+    existing_tools, missing = _split_missing_tools(tools, index)
+
+    if missing and index is None:
+        logger.warning(f"Failed to auto-generate tools {', '.join(missing)}: tools.py file not found")
+    elif missing and index is not None:
+        # Generate all missing tools with one parse and one write of tools.py
+        try:
+            created_tools = index.add_tools({name: generate_tool_code(name) for name in missing})
+            for tool_name in created_tools:
                 logger.info(f"Auto-generated tool: {tool_name}")
-            else:
-                logger.warning(f"Failed to auto-generate tool '{tool_name}': {error_msg}")
-                # Still add to existing to avoid blocking agent creation
-                existing_tools.append(tool_name)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to auto-generate tools {', '.join(missing)}: {e}")
+    # Still add failures to existing to avoid blocking agent creation
+    existing_tools.extend(name for name in missing if name not in created_tools)
     
     return created_tools, existing_tools
@@ -0,0 +1,379 @@
+# ABOUTME: Bulk agent scaffolding for one domain from a YAML or CSV spec file.
+# ABOUTME: Generates prompts concurrently on the shared LLM client and commits all agents at once.
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from autobots_devtools_shared_lib.common.observability import get_logger
+from dotenv import load_dotenv
+
+from autobots_orch_flow_studio.domains.codegen.services.agent_builder import (
+    AgentCreationError,
+    AgentCreationTransaction,
+    acreate_agent_prompt_content,
+    validate_agent_name,
+    validate_domain_name,
+)
+
+logger = get_logger(__name__)
+
+# {domain dir}/.agent-specs.json maps agent name -> sha256 of the spec it was built from
+SPEC_HASHES_FILENAME = ".agent-specs.json"
+DEFAULT_CONCURRENCY = 8
+
+STATUS_CREATED = "created"
+STATUS_UPDATED = "updated"
+STATUS_UNCHANGED = "unchanged"
+STATUS_FAILED = "failed"
+
+_LIST_SPLIT_RE = re.compile(r"[;,]")
+_TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+@dataclass
+class AgentSpec:
+    """One agent to scaffold: the inputs of create_agent_config_tool plus a purpose."""
+
+    name: str
+    purpose: str
+    tools: list[str]
+    instructions: str | None = None
+    batch_enabled: bool = False
+    is_default: bool = False
+    output_schema_fields: dict[str, Any] | None = None
+
+    def spec_hash(self) -> str:
+        """sha256 of the canonical JSON of the spec."""
+        canonical = json.dumps(asdict(self), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AgentSpec":
+        """Build a spec from a YAML mapping or CSV row.
+
+        tools may be a list or a "a, b" / "a; b" string; output_schema_fields may be a
+        mapping, a JSON object string or "field:type; field:type".
+        """
+        tools = data.get("tools") or []
+        if isinstance(tools, str):
+            tools = _LIST_SPLIT_RE.split(tools)
+        return cls(
+            name=str(data.get("name") or "").strip(),
+            purpose=str(data.get("purpose") or "").strip(),
+            tools=[str(t).strip() for t in tools if str(t).strip()],
+            instructions=str(data["instructions"]).strip() if data.get("instructions") else None,
+            batch_enabled=_as_bool(data.get("batch_enabled")),
+            is_default=_as_bool(data.get("is_default")),
+            output_schema_fields=_as_schema_fields(data.get("output_schema_fields")),
+        )
+
+
+@dataclass
+class AgentScaffoldResult:
+    """Outcome of scaffolding one agent."""
+
+    name: str
+    status: str
+    prompt_number: int | None = None
+    prompt_seconds: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class ScaffoldReport:
+    """Per-agent results of one bulk run, in spec order."""
+
+    domain: str
+    results: list[AgentScaffoldResult] = field(default_factory=list)
+    created_tools: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(r.status == status for r in self.results)
+
+    def summary(self) -> str:
+        return (
+            f"{self.domain}: {self.count(STATUS_CREATED)} created, "
+            f"{self.count(STATUS_UPDATED)} updated, {self.count(STATUS_UNCHANGED)} unchanged, "
+            f"{self.count(STATUS_FAILED)} failed in {self.seconds:.2f}s"
+        )
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_VALUES
+    return bool(value)
+
+
+def _as_schema_fields(value: Any) -> dict[str, Any] | None:
+    if not value:
+        return None
+    if isinstance(value, dict):
+        return value
+    text = str(value).strip()
+    if text.startswith("{"):
+        return json.loads(text)
+    fields: dict[str, Any] = {}
+    for item in _LIST_SPLIT_RE.split(text):
+        name, _, type_ = item.partition(":")
+        if name.strip():
+            fields[name.strip()] = type_.strip() or "string"
+    return fields or None
+
+
+def load_agent_specs(path: str | Path) -> tuple[str | None, list[AgentSpec]]:
+    """Read agent specs from a .yaml/.yml or .csv file.
+
+    YAML is either a list of agents or a mapping with an optional "domain" and "agents"
+    as a list or as {name: fields}. CSV has a header row with name, purpose, tools and
+    optionally instructions, batch_enabled, is_default, output_schema_fields.
+
+    Returns:
+        Tuple of (domain from the file or None, specs in file order)
+
+    Raises:
+        ValueError: If the file type or layout is not supported.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            return None, [AgentSpec.from_dict(row) for row in csv.DictReader(f)]
+    if suffix not in (".yaml", ".yml"):
+        raise ValueError(f"Unsupported agent spec file type: {path.name} (use .yaml or .csv)")
+
+    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    domain = None
+    agents = data
+    if isinstance(data, dict):
+        domain = data.get("domain")
+        agents = data.get("agents") or []
+    if isinstance(agents, dict):
+        agents = [{"name": name, **(fields or {})} for name, fields in agents.items()]
+    if not isinstance(agents, list) or not all(isinstance(a, dict) for a in agents):
+        raise ValueError(f"{path.name}: expected a list of agents or an 'agents' mapping")
+    return domain, [AgentSpec.from_dict(a) for a in agents]
+
+
+def _spec_error(spec: AgentSpec, seen: set[str]) -> str | None:
+    is_valid, error = validate_agent_name(spec.name)
+    if not is_valid:
+        return error
+    if spec.name in seen:
+        return f"Agent '{spec.name}' is listed more than once"
+    if not spec.purpose:
+        return "Purpose cannot be empty"
+    if not spec.tools:
+        return "Agent must have at least one tool"
+    return None
+
+
+def _clash_error(
+    spec: AgentSpec, existing: set[str], hashes: dict[str, str], force: bool
+) -> str | None:
+    """Error for an existing agent that was not scaffolded from a spec, unless force."""
+    if spec.name in existing and spec.name not in hashes and not force:
+        return (
+            f"Agent '{spec.name}' already exists and was not created from a spec; "
+            "pass --force to replace it"
+        )
+    return None
+
+
+def _load_spec_hashes(domain_path: Path) -> dict[str, str]:
+    try:
+        data = json.loads((domain_path / SPEC_HASHES_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def _generate_prompts(
+    specs: list[AgentSpec], use_llm: bool, concurrency: int
+) -> list[tuple[str, float]]:
+    """Generate every prompt with at most `concurrency` calls in flight.
+
+    acreate_agent_prompt_content also caps the LLM calls of the whole process at
+    PROMPT_LLM_MAX_CONCURRENCY, whichever is lower.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def generate(spec: AgentSpec) -> tuple[str, float]:
+        async with semaphore:
+            started = time.perf_counter()
+            content = await acreate_agent_prompt_content(
+                spec.name, spec.purpose, spec.instructions, use_llm=use_llm
+            )
+            return content, time.perf_counter() - started
+
+    return await asyncio.gather(*(generate(spec) for spec in specs))
+
+
+async def ascaffold_agents(
+    domain: str,
+    specs: list[AgentSpec],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    use_llm: bool = True,
+    force: bool = False,
+) -> ScaffoldReport:
+    """Create or update every agent in specs, skipping those whose spec hash is unchanged.
+
+    Prompts are generated concurrently on the shared LLM client. All agents and the
+    tools.py skeletons for missing tools go through a single AgentCreationTransaction,
+    so agents.yaml and tools.py are each written once, or not at all. A spec for an
+    agent recorded in .agent-specs.json with a different hash replaces it, keeping its
+    prompt number. Any other agent of the same name (e.g. one built through chat) is
+    reported as failed unless force is set.
+
+    Raises:
+        AgentCreationError: If the domain name is invalid.
+    """
+    started = time.perf_counter()
+    is_valid, error = validate_domain_name(domain)
+    if not is_valid:
+        raise AgentCreationError(error)
+
+    report = ScaffoldReport(domain=domain)
+    results: dict[str, AgentScaffoldResult] = {}
+    valid: list[AgentSpec] = []
+    for spec in specs:
+        spec_error = _spec_error(spec, set(results))
+        result = AgentScaffoldResult(spec.name, STATUS_FAILED, error=spec_error)
+        report.results.append(result)
+        if spec_error is None:
+            results[spec.name] = result
+            valid.append(spec)
+
+    # Peek without holding the lock across LLM calls; the commit below re-reads under it
+    with AgentCreationTransaction(domain) as txn:
+        existing = txn.agent_names()
+        hashes = _load_spec_hashes(txn.domain_path)
+    pending: list[AgentSpec] = []
+    for spec in valid:
+        if spec.name in existing and hashes.get(spec.name) == spec.spec_hash():
+            results[spec.name].status = STATUS_UNCHANGED
+        elif clash := _clash_error(spec, existing, hashes, force):
+            results[spec.name].error = clash
+        else:
+            pending.append(spec)
+
+    if pending:
+        prompts = await _generate_prompts(pending, use_llm, concurrency)
+        report.created_tools = _commit_specs(domain, pending, prompts, results, force)
+
+    report.seconds = time.perf_counter() - started
+    logger.info(f"Agent scaffold {report.summary()}")
+    return report
+
+
+def _commit_specs(
+    domain: str,
+    specs: list[AgentSpec],
+    prompts: list[tuple[str, float]],
+    results: dict[str, AgentScaffoldResult],
+    force: bool = False,
+) -> list[str]:
+    """Stage every spec, its missing tools and the spec hashes in one transaction and commit.
+
+    Returns:
+        Tools generated in tools.py (empty unless the commit succeeded)
+    """
+    staged: list[AgentScaffoldResult] = []
+    created_tools: list[str] = []
+    try:
+        with AgentCreationTransaction(domain) as txn:
+            existing = txn.agent_names()
+            hashes = _load_spec_hashes(txn.domain_path)
+            tools: list[str] = []
+            for spec, (prompt_content, seconds) in zip(specs, prompts, strict=True):
+                result = results[spec.name]
+                result.prompt_seconds = seconds
+                # Re-checked under the lock: the agent may have been created meanwhile
+                if clash := _clash_error(spec, existing, hashes, force):
+                    result.error = clash
+                    continue
+                try:
+                    result.prompt_number = txn.add_agent(
+                        spec.name,
+                        prompt_content,
+                        spec.tools,
+                        batch_enabled=spec.batch_enabled,
+                        is_default=spec.is_default,
+                        output_schema_fields=spec.output_schema_fields,
+                        replace=True,
+                    )
+                except AgentCreationError as e:
+                    result.error = str(e)
+                    continue
+                result.status = STATUS_UPDATED if spec.name in existing else STATUS_CREATED
+                hashes[spec.name] = spec.spec_hash()
+                tools.extend(spec.tools)
+                staged.append(result)
+            if staged:
+                new_tools = txn.stage_tools(list(dict.fromkeys(tools)))
+                txn.stage_file(
+                    txn.domain_path / SPEC_HASHES_FILENAME,
+                    json.dumps(hashes, indent=2, sort_keys=True) + "\n",
+                )
+                txn.commit()
+                created_tools = new_tools
+    except AgentCreationError as e:
+        for result in staged:
+            result.status = STATUS_FAILED
+            result.error = str(e)
+    return created_tools
+
+
+def scaffold_agents(
+    domain: str,
+    specs: list[AgentSpec],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    use_llm: bool = True,
+    force: bool = False,
+) -> ScaffoldReport:
+    """Synchronous wrapper around ascaffold_agents."""
+    return asyncio.run(ascaffold_agents(domain, specs, concurrency, use_llm, force))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI: scaffold the agents in a spec file and print per-agent timings."""
+    parser = argparse.ArgumentParser(description="Create many agents from a YAML or CSV spec.")
+    parser.add_argument("spec", help="Agent spec file (.yaml or .csv)")
+    parser.add_argument("--domain", help="Domain name (overrides 'domain' in a YAML spec)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--no-llm", action="store_true", help="Use template prompts only")
+    parser.add_argument(
+        "--force", action="store_true", help="Replace existing agents not created from a spec"
+    )
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    spec_domain, specs = load_agent_specs(args.spec)
+    domain = args.domain or spec_domain
+    if not domain:
+        parser.error("no domain: pass --domain or set 'domain' in the YAML spec")
+
+    report = scaffold_agents(
+        domain, specs, args.concurrency, use_llm=not args.no_llm, force=args.force
+    )
+    for r in report.results:
+        number = f"{r.prompt_number:02d}" if r.prompt_number is not None else "--"
+        detail = f"  ({r.error})" if r.error else ""
+        print(f"{r.status:<10} {number}  {r.prompt_seconds:7.2f}s  {r.name}{detail}")
+    if report.created_tools:
+        print(f"Generated tools: {', '.join(report.created_tools)}")
+    print(report.summary())
+    return 1 if report.count(STATUS_FAILED) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+# ABOUTME: Streaming behaviour -> processing-unit -> flow generation for one feature.
+# ABOUTME: Each flow starts as soon as the processing units it uses are generated.
+
+import json
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+from autobots_devtools_shared_lib.common.observability import (
+    TraceMetadata,
+    get_logger,
+    set_conversation_id,
+)
+from autobots_devtools_shared_lib.dynagent import batch_invoker
+from dotenv import load_dotenv
+
+from autobots_orch_flow_studio.common.tools.kb_tools import register_kb_tools
+from autobots_orch_flow_studio.common.utils.llm_replay import install_llm_replay
+from autobots_orch_flow_studio.common.utils.trace_export import setup_tracing
+from autobots_orch_flow_studio.configs.constants import (
+    DESIGNER_FLOWS_SUBDIR,
+    INPUT_DATA_BASE_PATH,
+    LLD_JSON_SUBDIR,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.stage_pipeline import (
+    StageArtifact,
+    StageTask,
+    run_streaming_stages,
+)
+
+logger = get_logger(__name__)
+load_dotenv()
+register_kb_tools()
+setup_tracing()
+
+APP_NAME = "orch-flow-studio"
+PU_AGENT_NAME = "processing_unit_oas_generator"
+FLOW_AGENT_NAME = "flow_generator"
+
+PU_STAGE = "processing_unit"
+FLOW_STAGE = "flow"
+
+
+def _processing_unit_names(filename: str) -> list[str]:
+    """Processing unit names (nodeName, else behaviourName) from 4-behaviours.json."""
+    path = Path(INPUT_DATA_BASE_PATH, filename, LLD_JSON_SUBDIR, "4-behaviours.json")
+    with path.open(encoding="utf-8") as f:
+        nodes = json.load(f).get("nodes") or []
+    names = [n.get("nodeName") or n.get("behaviourName") for n in nodes]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def _flow_processing_units(flow_path: Path, pu_names: set[str]) -> set[str]:
+    """Processing units a Node-RED flow file uses (node types or names matching a PU).
+
+    An unreadable flow gets no dependencies so it is generated straight away, as the
+    phase-barriered pipeline would have done.
+    """
+    try:
+        data = json.loads(flow_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("Could not read flow %s for dependencies: %s", flow_path, e)
+        return set()
+    nodes = data.get("flows", []) if isinstance(data, dict) else data
+    used: set[str] = set()
+    for node in nodes if isinstance(nodes, list) else []:
+        if isinstance(node, dict):
+            used.update(v for v in (node.get("type"), node.get("name")) if v in pu_names)
+    return used
+
+
+def _single_record_runner(agent_name: str, trace_metadata: TraceMetadata) -> Callable[[str], str]:
+    """Wrap batch_invoker so one record is generated (and published) on its own."""
+
+    def run(record: str) -> str:
+        result = batch_invoker(agent_name, [record], trace_metadata=trace_metadata).results[0]
+        if not result.success:
+            raise RuntimeError(result.error or f"{agent_name} failed")
+        return result.output or ""
+
+    return run
+
+
+def build_feature_tasks(filename: str) -> list[StageTask]:
+    """Processing-unit tasks from 4-behaviours.json plus one flow task per designer flow.
+
+    Flow tasks need exactly the processing units their flow file references.
+    """
+    pu_names = _processing_unit_names(filename)
+    tasks = [
+        StageTask(key=f"pu:{name}", stage=PU_STAGE, record=f"file: {filename}, model: {name}")
+        for name in pu_names
+    ]
+
+    flows_dir = Path(INPUT_DATA_BASE_PATH, DESIGNER_FLOWS_SUBDIR)
+    if not flows_dir.is_dir():
+        logger.warning("Designer flows path is not a directory: %s", flows_dir)
+        return tasks
+    for flow_path in sorted(p for p in flows_dir.iterdir() if p.is_file()):
+        used = _flow_processing_units(flow_path, set(pu_names))
+        tasks.append(
+            StageTask(
+                key=f"flow:{flow_path.name}",
+                stage=FLOW_STAGE,
+                record=f"folder_name: {filename}, file_name: {flow_path.name}",
+                needs={f"pu:{name}" for name in used},
+            )
+        )
+    return tasks
+
+
+def build_feature_streaming(
+    session_id: str | None = None,
+    filename: str = "",
+    max_workers: int = 8,
+    on_artifact: Callable[[StageArtifact], None] | None = None,
+) -> dict[str, StageArtifact]:
+    """Generate processing-unit OAS specs and flows for a feature without stage barriers.
+
+    Processing units are generated one record per call and published as they finish;
+    each flow is generated as soon as the processing units it references are published,
+    so end-to-end latency follows the critical path instead of the slowest stage.
+
+    Args:
+        session_id: Optional session ID for tracing (auto-generated if None).
+        filename: Feature folder under INPUT_DATA_BASE_PATH (e.g. MER-12345---Party-Feature).
+        max_workers: Agent calls in flight at once across both stages.
+        on_artifact: Optional callback for each artifact as it is published.
+
+    Returns:
+        Artifacts keyed by "pu:<name>" / "flow:<file name>", processing units first.
+    """
+    if session_id is None:
+        session_id = str(uuid.uuid4())
+    set_conversation_id(session_id)
+
+    def trace(agent_name: str) -> TraceMetadata:
+        return TraceMetadata(
+            session_id=session_id,
+            app_name=APP_NAME,
+            user_id=agent_name,
+            tags=[APP_NAME, agent_name, "sync", "streaming"],
+        )
+
+    tasks = build_feature_tasks(filename)
+    logger.info(f"Streaming {len(tasks)} generator tasks for {filename}")
+    artifacts = run_streaming_stages(
+        tasks,
+        runners={
+            PU_STAGE: _single_record_runner(PU_AGENT_NAME, trace(PU_AGENT_NAME)),
+            FLOW_STAGE: _single_record_runner(FLOW_AGENT_NAME, trace(FLOW_AGENT_NAME)),
+        },
+        max_workers=max_workers,
+        on_artifact=on_artifact,
+    )
+    failed = [key for key, a in artifacts.items() if not a.success]
+    logger.info(f"Feature {filename}: {len(artifacts) - len(failed)} generated, failed={failed}")
+    return artifacts
+
+
+if __name__ == "__main__":
+    install_llm_replay()
+    build_feature_streaming(filename="MER-12345---Party-Feature")
@@ -2,31 +2,52 @@
 
 import json
 import uuid
+from collections.abc import Iterable
 from pathlib import Path
 
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
-    init_tracing,
     set_conversation_id,
 )
 from autobots_devtools_shared_lib.dynagent import (
     AgentMeta,
     BatchResult,
+    RecordResult,
     batch_invoker,
     get_batch_enabled_agents,
 )
 from dotenv import load_dotenv
 
+from autobots_orch_flow_studio.common.tools.kb_tools import register_kb_tools
+from autobots_orch_flow_studio.common.utils.llm_replay import install_llm_replay
+from autobots_orch_flow_studio.common.utils.trace_export import setup_tracing
 from autobots_orch_flow_studio.configs.constants import (
+    DESIGNER_FLOWS_SUBDIR,
+    FLOW_KG_OUTPUT_SUBDIR,
+    GENERATED_FLOWS_SUBDIR,
+    INPUT_DATA_BASE_PATH,
     KB_PATH,
+    SAMPLE_FLOWS_SUBDIR,
 )
+from autobots_orch_flow_studio.domains.codegen.utils.artifact_validation import default_registry
+from autobots_orch_flow_studio.domains.codegen.utils.flow_kg import (
+    extract_flow_kgs,
+    kg_file_names,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_diff import remove_outputs
+from autobots_orch_flow_studio.domains.codegen.utils.lld_pipeline import write_text_if_changed
+from autobots_orch_flow_studio.domains.orch_flow_studio.flow_merge import merge_actual_converted
 
 logger = get_logger(__name__)
 load_dotenv()
-init_tracing()
+register_kb_tools()
+setup_tracing()
 
 APP_NAME = "orch-flow-studio"
+AGENT_NAME = "flow_generator"
+PURPOSE_AGENT_NAME = "flow_purpose_writer"
+FLOW_KG_KIND = "flow_kg"
 
 
 def _compose_user_message(schema: dict, kb_path: str) -> str:
@@ -91,8 +112,6 @@ def build_flow(
 
     logger.info(f"🔑 Generated session_id: {session_id}")
 
-    init_tracing()
-
     # Prepare trace metadata
     trace_metadata = TraceMetadata(
         session_id=session_id,
@@ -113,7 +132,245 @@ def build_flow(
     return result
 
 
+def _reuse_previous(kg: dict, path: Path) -> None:
+    """Keep businessPurpose and generatedAt from path when the derived structure is unchanged."""
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if not isinstance(previous, dict) or not previous.get("businessPurpose"):
+        return
+
+    def structure(doc: dict) -> dict:
+        meta = {k: v for k, v in (doc.get("metadata") or {}).items() if k != "generatedAt"}
+        return {**doc, "businessPurpose": "", "metadata": meta}
+
+    if structure(previous) == structure(kg):
+        kg["businessPurpose"] = previous["businessPurpose"]
+        kg["metadata"] = previous["metadata"]
+
+
+def _purpose_record(kg: dict) -> str:
+    """Compact KG view for flow_purpose_writer (paths are left out; nodes carry the meaning)."""
+    return json.dumps(
+        {
+            "componentName": kg["componentName"],
+            "pathType": kg["pathType"],
+            "entryPoint": kg["entryPoint"],
+            "exitPoint": kg["exitPoint"],
+            "processingNodes": [
+                {"name": n["name"], "type": n["type"]} for n in kg["processingNodes"]
+            ],
+            "processingFlows": [f["kgId"] for f in kg["processingFlows"]],
+        }
+    )
+
+
+def _describe_purposes(kgs: list[dict], trace_metadata: TraceMetadata) -> None:
+    """Fill empty businessPurpose fields with one flow_purpose_writer batch."""
+    pending = [kg for kg in kgs if not kg["businessPurpose"]]
+    if not pending:
+        return
+    logger.info(f"Invoking '{PURPOSE_AGENT_NAME}' for {len(pending)} flow KGs")
+    records = [_purpose_record(kg) for kg in pending]
+    result = batch_invoker(PURPOSE_AGENT_NAME, records, trace_metadata=trace_metadata)
+    for kg, r in zip(pending, result.results, strict=True):
+        if r.success and r.output and r.output.strip():
+            kg["businessPurpose"] = r.output.strip()
+        else:
+            logger.warning(f"No business purpose for {kg['componentName']}: {r.error}")
+
+
+def flow_kg_sources(filename: str) -> dict[Path, str]:
+    """sourceFile of each flow KG written under <filename>/flows, by KG path."""
+    out_dir = Path(INPUT_DATA_BASE_PATH, filename, FLOW_KG_OUTPUT_SUBDIR)
+    sources: dict[Path, str] = {}
+    for path in sorted(out_dir.glob("*.json")) if out_dir.is_dir() else []:
+        try:
+            kg = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(kg, dict) and isinstance(kg.get("sourceFile"), str):
+            sources[path] = kg["sourceFile"]
+    return sources
+
+
+def remove_flow_outputs(
+    filename: str, designer_files: Iterable[str] = (), actual_files: Iterable[str] = ()
+) -> list[Path]:
+    """Delete what was generated from flow files that no longer exist.
+
+    A removed designer flow loses its merged flow and its flow KGs; a removed sample
+    (actual) flow loses only the merged flow, which needs both sides.
+
+    Returns:
+        The files that existed and were deleted.
+    """
+    designer, actual = set(designer_files), set(actual_files)
+    merged_dir = Path(INPUT_DATA_BASE_PATH, GENERATED_FLOWS_SUBDIR)
+    kgs = [p for p, source in flow_kg_sources(filename).items() if source in designer]
+    return remove_outputs([*(merged_dir / name for name in sorted(designer | actual)), *kgs])
+
+
+def build_flow_kgs_deterministic(
+    session_id: str | None = None,
+    filename: str = "",
+    describe_purpose: bool = True,
+    files: Iterable[str] | None = None,
+) -> BatchResult:
+    """Extract flow KGs from the designer_flows Node-RED exports without an LLM per flow.
+
+    Entry/exit points, processing nodes, subflows and paths are computed by flow_kg from
+    the wire graph. The LLM is only asked for businessPurpose, batched across all KGs,
+    and KGs whose structure has not changed since the last run keep their previous
+    purpose. Each KG is validated against node-red-kg-schema-spec.json and written to
+    <filename>/flows/<flow file stem>--<componentName>.json (see kg_file_names);
+    invalid KGs are failures and are not written. Earlier KGs of the extracted flow
+    files whose entry -> exit pair is gone are deleted.
+
+    Args:
+        session_id: Optional session ID for tracing (auto-generated if None).
+        filename: Feature folder under INPUT_DATA_BASE_PATH (e.g. MER-12345---Party-Feature).
+        describe_purpose: Ask flow_purpose_writer for missing business purposes.
+        files: Only extract from these designer flow file names; default is every file.
+
+    Returns:
+        BatchResult with one record per KG (output = KG JSON), in flow file order.
+    """
+    if session_id is None:
+        session_id = str(uuid.uuid4())
+    set_conversation_id(session_id)
+
+    flows_dir = Path(INPUT_DATA_BASE_PATH, DESIGNER_FLOWS_SUBDIR)
+    out_dir = Path(INPUT_DATA_BASE_PATH, filename, FLOW_KG_OUTPUT_SUBDIR)
+    flow_files = sorted(flows_dir.glob("*.json")) if flows_dir.is_dir() else []
+    if files is not None:
+        wanted = set(files)
+        flow_files = [p for p in flow_files if p.name in wanted]
+    if not flow_files:
+        logger.warning("No designer flows found in %s", flows_dir)
+
+    kgs: list[dict] = []
+    for flow_path in flow_files:
+        try:
+            data = json.loads(flow_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable flow file {flow_path}: {e}")
+            continue
+        kgs.extend(extract_flow_kgs(data, flow_path.name, generated_from=str(flow_path)))
+    out_paths = [out_dir / name for name in kg_file_names(kgs)]
+    for kg, out_path in zip(kgs, out_paths, strict=True):
+        _reuse_previous(kg, out_path)
+
+    if describe_purpose:
+        trace_metadata = TraceMetadata(
+            session_id=session_id,
+            app_name=APP_NAME,
+            user_id=PURPOSE_AGENT_NAME,
+            tags=[APP_NAME, PURPOSE_AGENT_NAME, "sync", "deterministic"],
+        )
+        _describe_purposes(kgs, trace_metadata)
+
+    registry = default_registry()
+    results: list[RecordResult] = []
+    for i, (kg, out_path) in enumerate(zip(kgs, out_paths, strict=True)):
+        errors = registry.validate(FLOW_KG_KIND, kg)
+        if errors:
+            logger.error(f"Flow KG {kg['componentName']} failed validation: {errors}")
+            results.append(RecordResult(index=i, success=False, error="; ".join(errors)))
+            continue
+        text = json.dumps(kg, indent=2, ensure_ascii=False)
+        write_text_if_changed(out_path, text)
+        results.append(RecordResult(index=i, success=True, output=text))
+
+    extracted, current = {p.name for p in flow_files}, set(out_paths)
+    remove_outputs(
+        p
+        for p, source in flow_kg_sources(filename).items()
+        if source in extracted and p not in current
+    )
+
+    logger.info(
+        f"Deterministic flow KGs for {filename}: {len(results)} from {len(flow_files)} files"
+    )
+    return BatchResult(agent_name=AGENT_NAME, total=len(results), results=results)
+
+
+def merge_flows_deterministic(
+    session_id: str | None = None,
+    filename: str = "",
+    resolve_conflicts: bool = True,
+    files: Iterable[str] | None = None,
+) -> BatchResult:
+    """Merge sample_flows (actual) into designer_flows (converted) without an LLM per flow.
+
+    Each designer flow with an actual counterpart is merged by flow_merge and written to
+    generated_flows/<file_name>. Only flows with conflicts are sent to flow_generator,
+    whose record lists the conflicting node ids so it edits just those nodes.
+
+    Args:
+        session_id: Optional session ID for tracing (auto-generated if None).
+        filename: Feature folder name passed through in agent records.
+        resolve_conflicts: Invoke flow_generator for flows with conflicts.
+        files: Only merge these designer flow file names; default is every file.
+
+    Returns:
+        BatchResult with one record per flow file; output is the merge report JSON, or
+        the agent's reply for flows sent for conflict resolution.
+    """
+    if session_id is None:
+        session_id = str(uuid.uuid4())
+    set_conversation_id(session_id)
+
+    base = Path(INPUT_DATA_BASE_PATH)
+    designer_files = sorted((base / DESIGNER_FLOWS_SUBDIR).glob("*.json"))
+    if files is not None:
+        wanted = set(files)
+        designer_files = [p for p in designer_files if p.name in wanted]
+    results: list[RecordResult] = []
+    conflicted: list[tuple[int, str]] = []
+    for i, designer_path in enumerate(designer_files):
+        actual_path = base / SAMPLE_FLOWS_SUBDIR / designer_path.name
+        try:
+            converted = json.loads(designer_path.read_text(encoding="utf-8"))
+            actual = json.loads(actual_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot merge {designer_path.name}: {e}")
+            results.append(RecordResult(index=i, success=False, error=str(e)))
+            continue
+
+        merge = merge_actual_converted(actual, converted)
+        out_path = base / GENERATED_FLOWS_SUBDIR / designer_path.name
+        write_text_if_changed(out_path, json.dumps(merge.flow, indent=2, ensure_ascii=False))
+        report = merge.report()
+        logger.info(f"Merged {designer_path.name}: {report['stats']}")
+        results.append(RecordResult(index=i, success=True, output=json.dumps(report)))
+        if merge.conflicts:
+            record = (
+                f"folder_name: {filename}, file_name: {designer_path.name}, "
+                f"conflicts: {json.dumps(report['conflicts'])}"
+            )
+            conflicted.append((i, record))
+
+    if resolve_conflicts and conflicted:
+        trace_metadata = TraceMetadata(
+            session_id=session_id,
+            app_name=APP_NAME,
+            user_id=AGENT_NAME,
+            tags=[APP_NAME, AGENT_NAME, "sync", "conflicts"],
+        )
+        logger.info(f"Invoking '{AGENT_NAME}' for {len(conflicted)} flows with conflicts")
+        agent_result = batch_invoker(
+            AGENT_NAME, [record for _, record in conflicted], trace_metadata=trace_metadata
+        )
+        for (i, _), r in zip(conflicted, agent_result.results, strict=True):
+            results[i] = RecordResult(index=i, success=r.success, output=r.output, error=r.error)
+
+    return BatchResult(agent_name=AGENT_NAME, total=len(results), results=results)
+
+
 if __name__ == "__main__":
+    install_llm_replay()
     logger.info("Running flow-kb-builder")
     build_flow(filename="MER-12345---Party-Feature")
     # models_list = _fetch_flows_list("MER-12345---Party-Feature")
@@ -2,30 +2,63 @@
 
 import json
 import uuid
+from collections.abc import Iterable
 from pathlib import Path
 
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
-    init_tracing,
     set_conversation_id,
 )
 from autobots_devtools_shared_lib.dynagent import (
     AgentMeta,
     BatchResult,
+    RecordResult,
     batch_invoker,
 )
 from dotenv import load_dotenv
 
+from autobots_orch_flow_studio.common.tools.kb_tools import register_kb_tools
+from autobots_orch_flow_studio.common.utils.llm_replay import install_llm_replay
+from autobots_orch_flow_studio.common.utils.trace_export import setup_tracing
 from autobots_orch_flow_studio.configs.constants import (
+    INPUT_DATA_BASE_PATH,
     KB_PATH,
+    LLD_JSON_SUBDIR,
+    MODEL_OAS_OUTPUT_SUBDIR,
 )
+from autobots_orch_flow_studio.domains.codegen.utils.artifact_validation import (
+    validated_batch_invoker,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_diff import (
+    diff_models,
+    remove_outputs,
+    start_incremental,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_pipeline import write_text_if_changed
+from autobots_orch_flow_studio.domains.codegen.utils.model_graph import schedule_models
+from autobots_orch_flow_studio.domains.codegen.utils.model_oas_template import (
+    MODEL_OAS_KIND,
+    apply_descriptions,
+    build_model_oas_specs,
+    missing_descriptions,
+    validate_model_oas_spec,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.record_context import RecordContextBuilder
+from autobots_orch_flow_studio.domains.codegen.utils.record_packing import parse_json_reply
 
 logger = get_logger(__name__)
 load_dotenv()
-init_tracing()
+register_kb_tools()
+setup_tracing()
 
 APP_NAME = "orch-flow-studio"
+AGENT_NAME = "model_oas_generator"
+DESCRIPTION_AGENT_NAME = "model_description_writer"
+
+# Cap on each already-generated spec embedded into a dependant model's record.
+MAX_REFERENCED_SPEC_CHARS = 4000
+MODELS_JSON = "1-models.json"
 
 
 def _compose_user_message(schema: dict, kb_path: str) -> str:
@@ -33,7 +66,29 @@ def _compose_user_message(schema: dict, kb_path: str) -> str:
     return json.dumps({"kb_path": kb_path, "schema": schema})
 
 
-def _fetch_models_list(filename: str) -> list[str]:
+def _load_models_json(filename: str) -> dict:
+    """Load data/<filename>/json/1-models.json as a dict keyed by model name."""
+    models_path = Path(INPUT_DATA_BASE_PATH, filename, LLD_JSON_SUBDIR, MODELS_JSON)
+    with models_path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _model_record(filename: str, model: str, referenced_specs: dict[str, str] | None = None) -> str:
+    """Build the batch record for one model, embedding already-generated referenced specs."""
+    text = f"file: {filename}, model: {model}"
+    if referenced_specs:
+        text += (
+            "\n\nSpecs already generated for models referenced by this model "
+            "(reuse them as-is, do not regenerate them):"
+        )
+        for name, spec in referenced_specs.items():
+            text += f"\n\n### {name}\n{spec[:MAX_REFERENCED_SPEC_CHARS]}"
+    return text
+
+
+def _fetch_models_list(
+    filename: str, embed_context: bool = False, models: Iterable[str] | None = None
+) -> list[str]:
     """Fetch the list of model names from the input JSON file.
 
     Reads 1-models.json from data/<filename>/json/ and returns the top-level
@@ -41,26 +96,27 @@ def _fetch_models_list(filename: str) -> list[str]:
 
     Args:
         filename: Directory name under INPUT_DATA_BASE_PATH (e.g. MER-12345---Party-Feature).
+        embed_context: Embed each model's slice of 1-models.json in its record.
+        models: Only build records for these model names, in this order.
 
     Returns:
         List of first-level keys from the JSON (model names).
     """
-    models_path = Path(
-        "/Users/saurabh/Documents/server/orch-ai-studio/data", filename, "json", "1-models.json"
-    )
-    with models_path.open(encoding="utf-8") as f:
-        data = json.load(f)
+    data = _load_models_json(filename)
     logger.info(f"Models list: {data}")
-    records = []
-    for model in data.keys():
-        text = f"file: {filename}, model: {model}"
-        records.append(text)
-    return records
+    names = list(data) if models is None else [m for m in models if m in data]
+    if not embed_context:
+        return [_model_record(filename, model) for model in names]
+    context = RecordContextBuilder(filename)
+    return [context.model_record(_model_record(filename, model), model) for model in names]
 
 
 def build_model_oas(
     session_id: str | None = None,
     filename: str = "",
+    embed_context: bool = False,
+    validate_output: bool = False,
+    incremental: bool = False,
 ) -> BatchResult:
     """Orchestrate the Node KG build pipeline (steps 1-2).
 
@@ -72,6 +128,12 @@ def build_model_oas(
     Args:
         session_id: Optional session ID for tracing (auto-generated if None).
         enable_tracing: Whether to enable Langfuse tracing (default True).
+        embed_context: Embed each record's pre-sliced source JSON (see record_context)
+            so the agent does not have to read the whole source file.
+        validate_output: Validate each reply against model_oas_spec.json and requeue
+            invalid records with their errors (see artifact_validation).
+        incremental: Only generate models added or changed since the last successful
+            run (see lld_diff), and delete the specs of models that were removed.
 
     Returns:
         The complete final state dict from the schema_processor agent execution.
@@ -108,18 +170,174 @@ def build_model_oas(
     )
 
     logger.info(f"Invoking SYNC agent '{agent_name}' for {APP_NAME}")
-    records = _fetch_models_list(filename)
-    result = batch_invoker(
-        agent_name,
-        records,
-        trace_metadata=trace_metadata,
+    run = None
+    if incremental:
+        run = start_incremental(filename, MODELS_JSON, _load_models_json(filename), diff_models)
+        out_dir = Path(INPUT_DATA_BASE_PATH, filename, MODEL_OAS_OUTPUT_SUBDIR)
+        remove_outputs(out_dir / f"{name}.json" for name in run.diff.removed)
+    records = _fetch_models_list(
+        filename, embed_context=embed_context, models=run.diff.regenerate if run else None
     )
+    if not records:
+        logger.info(f"No models to generate for {filename}")
+        result = BatchResult(agent_name=agent_name, total=0, results=[])
+    elif validate_output:
+        result = validated_batch_invoker(
+            agent_name, records, MODEL_OAS_KIND, trace_metadata=trace_metadata
+        )
+    else:
+        result = batch_invoker(agent_name, records, trace_metadata=trace_metadata)
+    if run is not None:
+        run.finish(result)
 
     logger.info(f"Prompt generated successfully for {APP_NAME}")
     return result
 
 
+def build_model_oas_in_dependency_order(
+    session_id: str | None = None,
+    filename: str = "",
+) -> BatchResult:
+    """Generate model OAS specs level by level along the model reference graph.
+
+    Models whose fields reference other models (e.g. a field typed as another DTO) are
+    generated only after those models, and the referenced specs produced earlier are
+    embedded in their records. Models within one level run in parallel in a single
+    batch. Reference cycles are logged and their models generated together last.
+
+    Args:
+        session_id: Optional session ID for tracing (auto-generated if None).
+        filename: Feature folder under INPUT_DATA_BASE_PATH (e.g. MER-12345---Party-Feature).
+
+    Returns:
+        BatchResult with one record per model, indexed in 1-models.json order.
+    """
+    if session_id is None:
+        session_id = str(uuid.uuid4())
+    set_conversation_id(session_id)
+
+    trace_metadata = TraceMetadata(
+        session_id=session_id,
+        app_name=APP_NAME,
+        user_id=AGENT_NAME,
+        tags=[APP_NAME, AGENT_NAME, "sync", "topological"],
+    )
+
+    models = _load_models_json(filename)
+    schedule = schedule_models(models)
+    if schedule.cycles:
+        logger.warning(
+            f"Model reference cycle among {schedule.cycles}; generating them in the last level"
+        )
+    logger.info(f"Model generation levels for {filename}: {schedule.levels}")
+
+    index_of = {name: i for i, name in enumerate(models)}
+    generated: dict[str, str] = {}
+    results: dict[int, RecordResult] = {}
+    for level_no, level in enumerate(schedule.levels):
+        records = [
+            _model_record(
+                filename,
+                model,
+                {d: generated[d] for d in sorted(schedule.dependencies[model]) if d in generated},
+            )
+            for model in level
+        ]
+        logger.info(f"Level {level_no}: invoking '{AGENT_NAME}' for {len(level)} models")
+        level_result = batch_invoker(AGENT_NAME, records, trace_metadata=trace_metadata)
+        for model, r in zip(level, level_result.results, strict=True):
+            idx = index_of[model]
+            results[idx] = RecordResult(
+                index=idx, success=r.success, output=r.output, error=r.error
+            )
+            if r.success and r.output:
+                generated[model] = r.output
+
+    return BatchResult(
+        agent_name=AGENT_NAME,
+        total=len(models),
+        results=[results[i] for i in range(len(models))],
+    )
+
+
+def _describe_missing(models: dict, specs: dict[str, dict], trace_metadata: TraceMetadata) -> None:
+    """Fill empty descriptions in specs with one model_description_writer batch."""
+    gaps = {name: missing_descriptions(spec) for name, spec in specs.items()}
+    gaps = {name: g for name, g in gaps.items() if g}
+    if not gaps:
+        return
+    names = list(gaps)
+    records = [json.dumps({"modelName": n, "model": models[n], "describe": gaps[n]}) for n in names]
+    logger.info(f"Invoking '{DESCRIPTION_AGENT_NAME}' for {len(records)} models")
+    result = batch_invoker(DESCRIPTION_AGENT_NAME, records, trace_metadata=trace_metadata)
+    for name, r in zip(names, result.results, strict=True):
+        descriptions = parse_json_reply(r.output) if r.success else None
+        if isinstance(descriptions, dict):
+            apply_descriptions(specs[name], {str(k): str(v) for k, v in descriptions.items()})
+        else:
+            logger.warning(f"No usable descriptions for {name}: {r.error or r.output!r}")
+
+
+def build_model_oas_deterministic(
+    session_id: str | None = None,
+    filename: str = "",
+    describe_missing: bool = True,
+    models: Iterable[str] | None = None,
+) -> BatchResult:
+    """Generate model OAS specs from 1-models.json without an LLM call per model.
+
+    Types, constraints, required lists and x-fbp-params are derived by
+    model_oas_template. The LLM is only asked for descriptions the LLD leaves empty,
+    batched across all models. Each spec is validated against model_oas_spec.json and
+    written to <filename>/generate_model/<model>.json (unchanged files are not rewritten).
+
+    Args:
+        session_id: Optional session ID for tracing (auto-generated if None).
+        filename: Feature folder under INPUT_DATA_BASE_PATH (e.g. MER-12345---Party-Feature).
+        describe_missing: Ask model_description_writer for empty descriptions.
+        models: Only (re)generate these model names; default is every model. Specs are
+            still built against the full model list so cross-model references resolve.
+
+    Returns:
+        BatchResult with one record per model (output = spec JSON), in 1-models.json order.
+        Records that fail schema validation are failures and are not written.
+    """
+    if session_id is None:
+        session_id = str(uuid.uuid4())
+    set_conversation_id(session_id)
+
+    source = _load_models_json(filename)
+    specs = build_model_oas_specs(source)
+    if models is not None:
+        wanted = set(models)
+        specs = {name: spec for name, spec in specs.items() if name in wanted}
+    if describe_missing:
+        trace_metadata = TraceMetadata(
+            session_id=session_id,
+            app_name=APP_NAME,
+            user_id=DESCRIPTION_AGENT_NAME,
+            tags=[APP_NAME, DESCRIPTION_AGENT_NAME, "sync", "deterministic"],
+        )
+        _describe_missing(source, specs, trace_metadata)
+
+    out_dir = Path(INPUT_DATA_BASE_PATH, filename, MODEL_OAS_OUTPUT_SUBDIR)
+    results: list[RecordResult] = []
+    for i, (name, spec) in enumerate(specs.items()):
+        errors = validate_model_oas_spec(spec)
+        if errors:
+            logger.error(f"Model OAS for {name} failed validation: {errors}")
+            results.append(RecordResult(index=i, success=False, error="; ".join(errors)))
+            continue
+        text = json.dumps(spec, indent=2, ensure_ascii=False)
+        write_text_if_changed(out_dir / f"{name}.json", text)
+        results.append(RecordResult(index=i, success=True, output=text))
+
+    logger.info(f"Deterministic model OAS for {filename}: {len(results)} models")
+    return BatchResult(agent_name=AGENT_NAME, total=len(results), results=results)
+
+
 if __name__ == "__main__":
+    install_llm_replay()
     logger.info("Running node-kb-builder")
     build_result = build_model_oas(filename="MER-12345---Party-Feature")
     # models_list = _fetch_models_list("MER-12345---Party-Feature")
@@ -7,7 +7,6 @@ from pathlib import Path
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
-    init_tracing,
     set_conversation_id,
 )
 from autobots_devtools_shared_lib.dynagent import (
@@ -18,13 +17,21 @@ from autobots_devtools_shared_lib.dynagent import (
 )
 from dotenv import load_dotenv
 
+from autobots_orch_flow_studio.common.tools.kb_tools import register_kb_tools
+from autobots_orch_flow_studio.common.utils.llm_replay import install_llm_replay
+from autobots_orch_flow_studio.common.utils.trace_export import setup_tracing
 from autobots_orch_flow_studio.configs.constants import (
+    INPUT_DATA_BASE_PATH,
     KB_PATH,
+    LLD_JSON_SUBDIR,
 )
+from autobots_orch_flow_studio.domains.codegen.utils.record_context import RecordContextBuilder
+from autobots_orch_flow_studio.domains.codegen.utils.record_packing import packed_batch_invoker
 
 logger = get_logger(__name__)
 load_dotenv()
-init_tracing()
+register_kb_tools()
+setup_tracing()
 
 APP_NAME = "orch-flow-studio"
 
@@ -34,7 +41,7 @@ def _compose_user_message(schema: dict, kb_path: str) -> str:
     return json.dumps({"kb_path": kb_path, "schema": schema})
 
 
-def _fetch_models_list(filename: str) -> list[str]:
+def _fetch_models_list(filename: str, embed_context: bool = False) -> list[str]:
     """Fetch the list of processing unit names from the nodes in 4-behaviours.json.
 
     Reads 4-behaviours.json and returns one record per node in the "nodes" array,
@@ -42,21 +49,22 @@ def _fetch_models_list(filename: str) -> list[str]:
 
     Args:
         filename: Directory name under data workspace (e.g. MER-12345---Party-Feature).
+        embed_context: Embed each behaviour node in its record.
 
     Returns:
         List of "file: <filename>, model: <nodeName>" strings for each node.
     """
-    behaviours_path = Path(
-        "/Users/saurabh/Documents/server/orch-ai-studio/data", filename, "json", "4-behaviours.json"
-    )
+    behaviours_path = Path(INPUT_DATA_BASE_PATH, filename, LLD_JSON_SUBDIR, "4-behaviours.json")
     with behaviours_path.open(encoding="utf-8") as f:
         data = json.load(f)
     nodes = data.get("nodes") or []
+    context = RecordContextBuilder(filename) if embed_context else None
     records = []
     for node in nodes:
         name = node.get("nodeName") or node.get("behaviourName")
         if name:
-            records.append(f"file: {filename}, model: {name}")
+            text = f"file: {filename}, model: {name}"
+            records.append(context.behaviour_record(text, name) if context else text)
     logger.info(f"Processing unit records for {filename}: {records}")
     return records
 
@@ -92,8 +100,6 @@ def model_oas_batch(agent_name: str, records: list[str], user_id: str) -> BatchR
     if not records:
         raise ValueError("records must not be empty")
 
-    init_tracing()
-
     trace_metadata = TraceMetadata.create(
         session_id=session_id,
         app_name=f"{APP_NAME}_{agent_name}-batch_invoker",
@@ -118,6 +124,8 @@ def model_oas_batch(agent_name: str, records: list[str], user_id: str) -> BatchR
 def build_model_oas(
     session_id: str | None = None,
     filename: str = "",
+    pack_records: bool = False,
+    embed_context: bool = False,
 ) -> BatchResult:
     """Orchestrate the Node KG build pipeline (steps 1-2).
 
@@ -129,6 +137,10 @@ def build_model_oas(
     Args:
         session_id: Optional session ID for tracing (auto-generated if None).
         enable_tracing: Whether to enable Langfuse tracing (default True).
+        pack_records: Group several small records into one agent call up to a token
+            budget (see record_packing); unsplittable replies fall back to single calls.
+        embed_context: Embed each record's pre-sliced source JSON (see record_context)
+            so the agent does not have to read the whole source file.
 
     Returns:
         The complete final state dict from the schema_processor agent execution.
@@ -165,18 +177,22 @@ def build_model_oas(
     )
 
     logger.info(f"Invoking SYNC agent '{agent_name}' for {APP_NAME}")
-    records = _fetch_models_list(filename)
-    result = batch_invoker(
-        agent_name,
-        records,
-        trace_metadata=trace_metadata,
-    )
+    records = _fetch_models_list(filename, embed_context=embed_context)
+    if pack_records:
+        result = packed_batch_invoker(agent_name, records, trace_metadata=trace_metadata)
+    else:
+        result = batch_invoker(
+            agent_name,
+            records,
+            trace_metadata=trace_metadata,
+        )
 
     logger.info(f"Prompt generated successfully for {APP_NAME}")
     return result
 
 
 if __name__ == "__main__":
+    install_llm_replay()
     logger.info("Running node-kb-builder")
     build_result = build_model_oas(filename="MER-12345---Party-Feature")
     # models_list = _fetch_models_list("MER-12345---Party-Feature")
@@ -1,26 +1,33 @@
 # ABOUTME: Concierge-specific Chainlit entry point for the concierge_chat use case.
 # ABOUTME: Wires tracing, OAuth, and the shared streaming helper.
 
+import asyncio
 import os
-import re
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import chainlit as cl
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
-    flush_tracing,
     get_logger,
-    init_tracing,
     set_session_id,
 )
-from autobots_devtools_shared_lib.dynagent import create_base_agent
 from autobots_devtools_shared_lib.dynagent.ui import stream_agent_events
 from dotenv import load_dotenv
 
 from autobots_agents_jarvis.common.utils.formatting import format_structured_output
 from autobots_agents_jarvis.domains.concierge.settings import init_concierge_settings
 from autobots_agents_jarvis.domains.concierge.tools import register_concierge_tools
+from autobots_orch_flow_studio.common.utils.trace_export import request_trace_flush, setup_tracing
+from autobots_orch_flow_studio.domains.codegen.utils.agent_cache import (
+    agent_turn,
+    aget_shared_agent,
+    forget_session,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.agent_reload import (
+    start_agent_config_reloader,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.tool_index import get_tool_index
 # Removed direct imports from agent_builder - agent_builder agent handles everything via its tools
 
 if TYPE_CHECKING:
@@ -41,7 +48,7 @@ init_concierge_settings()
 
 # Initialise write-through context store (Postgres + Redis).
 
-# Registration must precede AgentMeta.instance() (called inside create_base_agent).
+# Registration must precede AgentMeta.instance() (called when the shared agent is built).
 register_concierge_tools()
 
 
@@ -106,10 +113,12 @@ def _get_user_identifier() -> str:
 @cl.on_chat_start
 async def start():
     """Initialize the chat session with the welcome agent."""
-    # Create agent instance once and store it in session
-    init_tracing()
-    base_agent = create_base_agent()
-    cl.user_session.set("base_agent", base_agent)
+    setup_tracing()
+    # One compiled graph serves every session (built on first use, rebuilt when the
+    # agent config changes); session state lives in the checkpoint of the thread_id
+    await aget_shared_agent()
+    # New agents and prompt/schema edits are hot-swapped in; no restart needed
+    await asyncio.to_thread(start_agent_config_reloader)
 
     # Prepare trace metadata for Langfuse observability (session-level)
     user_id = _get_user_identifier()
@@ -162,10 +171,8 @@ def get_available_tools() -> list[str]:
         return ["handoff", "get_agent_list"]
     
     try:
-        content = tools_file.read_text(encoding="utf-8")
-        # Find all @tool decorated functions
-        pattern = r"@tool\s+def\s+(\w+)\s*\("
-        matches = re.findall(pattern, content)
+        # All @tool decorated functions; re-parsed only when tools.py changes
+        matches = get_tool_index(tools_file).tools()
         
         # Filter out agent-builder specific tools (they're not for agents to use)
         agent_builder_tools = {
@@ -216,11 +223,6 @@ async def collect_agent_info_step_by_step():
         "run_name": "agent_builder_chat",
     }
     
-    base_agent = cl.user_session.get("base_agent")
-    if not base_agent:
-        await cl.Message(content="Error: Session initialization failed. Please refresh.").send()
-        return
-    
     user_id = cl.user_session.get("user_id")
     trace_metadata = cl.user_session.get("trace_metadata")
     
@@ -233,14 +235,16 @@ async def collect_agent_info_step_by_step():
         "agent_name": "agent_builder",
     }
     
-    await stream_agent_events(
-        agent=base_agent,
-        input_state=input_state,
-        config=config,
-        on_structured_output=format_structured_output,
-        enable_tracing=True,
-        trace_metadata=trace_metadata,
-    )
+    # Config hot reloads wait for the turn to end
+    async with agent_turn() as base_agent:
+        await stream_agent_events(
+            agent=base_agent,
+            input_state=input_state,
+            config=config,
+            on_structured_output=format_structured_output,
+            enable_tracing=True,
+            trace_metadata=trace_metadata,
+        )
 
 
 @cl.on_message
@@ -276,12 +280,6 @@ async def on_message(message: cl.Message):
     if agent_name:
         config["configurable"]["agent_name"] = agent_name
 
-    # Reuse the same agent instance from session
-    base_agent = cl.user_session.get("base_agent")
-    if not base_agent:
-        await cl.Message(content="Error: Session initialization failed. Please refresh.").send()
-        return
-
     user_id = cl.user_session.get("user_id")
 
     input_state: dict[str, Any] = {
@@ -298,14 +296,16 @@ async def on_message(message: cl.Message):
     # Retrieve trace metadata from session
     trace_metadata = cl.user_session.get("trace_metadata")
 
-    result = await stream_agent_events(
-        agent=base_agent,
-        input_state=input_state,
-        config=config,
-        on_structured_output=format_structured_output,
-        enable_tracing=True,
-        trace_metadata=trace_metadata,
-    )
+    # Shared across sessions; agent config changes are swapped in between turns only
+    async with agent_turn() as base_agent:
+        result = await stream_agent_events(
+            agent=base_agent,
+            input_state=input_state,
+            config=config,
+            on_structured_output=format_structured_output,
+            enable_tracing=True,
+            trace_metadata=trace_metadata,
+        )
     logger.debug(f"Agent execution completed with result: {result}")
     
     # Check if agent_builder has completed agent creation (by checking if it called create_agent_config_tool)
@@ -320,10 +320,16 @@ async def on_message(message: cl.Message):
 # The agent_builder uses create_agent_config_tool to create agents
 
 
+@cl.on_chat_end
+async def on_chat_end() -> None:
+    """Drop the session's checkpoints; the shared checkpointer would otherwise keep them."""
+    await forget_session(cl.context.session.thread_id)
+
+
 @cl.on_stop
 def on_stop() -> None:
     """Handle chat stop."""
-    flush_tracing()
+    request_trace_flush()
     logger.info("Chat session stopped")
 
 
@@ -2,12 +2,12 @@
 
 import json
 import uuid
+from collections.abc import Iterable
 from pathlib import Path
 
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
-    init_tracing,
     set_conversation_id,
 )
 from autobots_devtools_shared_lib.dynagent import (
@@ -17,15 +17,30 @@ from autobots_devtools_shared_lib.dynagent import (
 )
 from dotenv import load_dotenv
 
+from autobots_orch_flow_studio.common.tools.kb_tools import register_kb_tools
+from autobots_orch_flow_studio.common.utils.llm_replay import install_llm_replay
+from autobots_orch_flow_studio.common.utils.trace_export import setup_tracing
 from autobots_orch_flow_studio.configs.constants import (
+    INPUT_DATA_BASE_PATH,
     KB_PATH,
+    LLD_JSON_SUBDIR,
+    SYNC_OAS_OUTPUT_SUBDIR,
 )
+from autobots_orch_flow_studio.domains.codegen.utils.lld_diff import (
+    IncrementalRun,
+    remove_outputs,
+    start_incremental,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.record_context import RecordContextBuilder
+from autobots_orch_flow_studio.domains.codegen.utils.record_packing import packed_batch_invoker
 
 logger = get_logger(__name__)
 load_dotenv()
-init_tracing()
+register_kb_tools()
+setup_tracing()
 
 APP_NAME = "orch-flow-studio"
+SYNC_METHODS_JSON = "2-sync-methods.json"
 
 
 def _compose_user_message(schema: dict, kb_path: str) -> str:
@@ -33,7 +48,37 @@ def _compose_user_message(schema: dict, kb_path: str) -> str:
     return json.dumps({"kb_path": kb_path, "schema": schema})
 
 
-def _fetch_models_list(filename: str) -> list[str]:
+def _load_sync_methods_json(filename: str) -> dict:
+    """Load data/<filename>/json/2-sync-methods.json as a dict keyed by endpoint."""
+    path = Path(INPUT_DATA_BASE_PATH, filename, LLD_JSON_SUBDIR, SYNC_METHODS_JSON)
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _sync_output_path(filename: str, endpoint: str, row: object) -> Path | None:
+    """generate_sync_methods/<modelName>_<endpoint>.json for an endpoint row, if it has a model."""
+    model_name = row.get("modelName") if isinstance(row, dict) else None
+    if not model_name:
+        return None
+    return Path(
+        INPUT_DATA_BASE_PATH, filename, SYNC_OAS_OUTPUT_SUBDIR, f"{model_name}_{endpoint}.json"
+    )
+
+
+def _stale_outputs(filename: str, run: IncrementalRun) -> list[Path]:
+    """Outputs of removed endpoints, and of changed ones whose modelName (so path) changed."""
+    previous = run.previous or {}
+    stale = [_sync_output_path(filename, e, previous[e]) for e in run.diff.removed]
+    for endpoint in run.diff.changed:
+        old = _sync_output_path(filename, endpoint, previous[endpoint])
+        if old != _sync_output_path(filename, endpoint, run.current[endpoint]):
+            stale.append(old)
+    return [p for p in stale if p is not None]
+
+
+def _fetch_models_list(
+    filename: str, embed_context: bool = False, endpoints: Iterable[str] | None = None
+) -> list[str]:
     """Fetch the list of model names from the input JSON file.
 
     Reads 1-models.json from data/<filename>/json/ and returns the top-level
@@ -41,23 +86,22 @@ def _fetch_models_list(filename: str) -> list[str]:
 
     Args:
         filename: Directory name under INPUT_DATA_BASE_PATH (e.g. MER-12345---Party-Feature).
+        embed_context: Embed each endpoint row (and its model) in its record.
+        endpoints: Only build records for these endpoints, in this order.
 
     Returns:
         List of first-level keys from the JSON (model names).
     """
-    models_path = Path(
-        "/Users/saurabh/Documents/server/orch-ai-studio/data",
-        filename,
-        "json",
-        "2-sync-methods.json",
-    )
-    with models_path.open(encoding="utf-8") as f:
-        data = json.load(f)
+    data = _load_sync_methods_json(filename)
     logger.info(f"Models list: {data}")
+    context = RecordContextBuilder(filename) if embed_context else None
     records = []
-    for endpoint in data.keys():
+    selected = data.keys() if endpoints is None else [e for e in endpoints if e in data]
+    for endpoint in selected:
         model_name = data[endpoint]["modelName"]
         text = f"folder_name: {filename}, model: {model_name} and endpoint: {endpoint}"
+        if context is not None:
+            text = context.endpoint_record(text, endpoint)
         records.append(text)
     return records
 
@@ -65,6 +109,9 @@ def _fetch_models_list(filename: str) -> list[str]:
 def build_sync_oas(
     session_id: str | None = None,
     filename: str = "",
+    pack_records: bool = False,
+    embed_context: bool = False,
+    incremental: bool = False,
 ) -> BatchResult:
     """Orchestrate the Node KG build pipeline (steps 1-2).
 
@@ -76,6 +123,12 @@ def build_sync_oas(
     Args:
         session_id: Optional session ID for tracing (auto-generated if None).
         enable_tracing: Whether to enable Langfuse tracing (default True).
+        pack_records: Group several small records into one agent call up to a token
+            budget (see record_packing); unsplittable replies fall back to single calls.
+        embed_context: Embed each record's pre-sliced source JSON (see record_context)
+            so the agent does not have to read the whole source file.
+        incremental: Only generate endpoints added or changed since the last successful
+            run (see lld_diff), and delete the specs of endpoints that were removed.
 
     Returns:
         The complete final state dict from the schema_processor agent execution.
@@ -105,18 +158,33 @@ def build_sync_oas(
     )
 
     logger.info(f"Invoking SYNC agent '{agent_name}' for {APP_NAME}")
-    records = _fetch_models_list(filename)
-    result = batch_invoker(
-        agent_name,
-        records,
-        trace_metadata=trace_metadata,
+    run = None
+    if incremental:
+        run = start_incremental(filename, SYNC_METHODS_JSON, _load_sync_methods_json(filename))
+        remove_outputs(_stale_outputs(filename, run))
+    records = _fetch_models_list(
+        filename, embed_context=embed_context, endpoints=run.diff.regenerate if run else None
     )
+    if not records:
+        logger.info(f"No sync methods to generate for {filename}")
+        result = BatchResult(agent_name=agent_name, total=0, results=[])
+    elif pack_records:
+        result = packed_batch_invoker(agent_name, records, trace_metadata=trace_metadata)
+    else:
+        result = batch_invoker(
+            agent_name,
+            records,
+            trace_metadata=trace_metadata,
+        )
+    if run is not None:
+        run.finish(result)
 
     logger.info(f"Prompt generated successfully for {APP_NAME}")
     return result
 
 
 if __name__ == "__main__":
+    install_llm_replay()
     logger.info("Running node-kb-builder")
     build_result = build_sync_oas(filename="MER-12345---Party-Feature")
     # models_list = _fetch_models_list("MER-12345---Party-Feature")
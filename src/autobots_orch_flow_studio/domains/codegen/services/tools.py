@@ -1,24 +1,23 @@
 # ABOUTME: Concierge use-case tools — the tools that Concierge registers.
 # ABOUTME: Provides joke and weather functionality for demonstration purposes.
 
+import asyncio
+
 from autobots_devtools_shared_lib.common.observability import get_logger, set_session_id
 from autobots_devtools_shared_lib.dynagent import Dynagent
 from langchain.tools import ToolRuntime, tool
 
 from autobots_agents_jarvis.common.tools.validation_tools import validate_email
 from autobots_agents_jarvis.domains.concierge.agent_builder import (
-    add_agent_to_yaml,
-    create_agent_prompt_content,
+    AgentCreationError,
+    AgentCreationTransaction,
+    acreate_agent_prompt_content,
     create_agent_yaml_entry,
-    create_output_schema,
     ensure_domain_structure,
-    ensure_tools_exist,
     get_prompt_number,
     validate_agent_config,
     validate_agent_name,
     validate_domain_name,
-    write_prompt_file,
-    write_schema_file,
     write_services_file,
 )
 from autobots_agents_jarvis.domains.concierge.services import (
@@ -210,7 +209,7 @@ def get_prompt_number_tool(runtime: ToolRuntime[None, Dynagent], domain: str) ->
 
 
 @tool
-def create_agent_prompt_content_tool(
+async def create_agent_prompt_content_tool(
     runtime: ToolRuntime[None, Dynagent],
     agent_name: str,
     purpose: str,
@@ -230,7 +229,7 @@ def create_agent_prompt_content_tool(
     set_session_id(session_id)
     logger.info(f"Creating prompt content for session {session_id}, agent: {agent_name}")
 
-    prompt_content = create_agent_prompt_content(agent_name, purpose, instructions)
+    prompt_content = await acreate_agent_prompt_content(agent_name, purpose, instructions)
     return prompt_content
 
 
@@ -288,7 +287,7 @@ def ensure_domain_structure_tool(runtime: ToolRuntime[None, Dynagent], domain: s
 
 
 @tool
-def create_agent(
+async def create_agent(
     runtime: ToolRuntime[None, Dynagent],
     domain: str,
     agent_name: str,
@@ -342,49 +341,36 @@ def create_agent(
             return f"Validation failed: {error}"
 
         # Generate prompt content
-        prompt_content = create_agent_prompt_content(
+        prompt_content = await acreate_agent_prompt_content(
             agent_name=agent_name,
             purpose=purpose,
             instructions=instructions,
         )
 
-        # Validate complete configuration
-        is_valid, error = validate_agent_config(domain, agent_name, prompt_content, tools_list)
+        # Validation and the transaction read files and wait on the domain lock; both
+        # run on a worker thread so other sessions keep streaming meanwhile
+        is_valid, error = await asyncio.to_thread(
+            validate_agent_config, domain, agent_name, prompt_content, tools_list
+        )
         if not is_valid:
             return f"Validation failed: {error}"
 
-        # Ensure domain structure exists
-        success, error_msg = ensure_domain_structure(domain)
-        if not success:
-            return f"Failed to create domain structure: {error_msg}"
-
-        # Get prompt number
-        prompt_num = get_prompt_number(domain)
-
-        # Create YAML entry
-        yaml_entry = create_agent_yaml_entry(
-            agent_name=agent_name,
-            prompt_number=prompt_num,
-            tools=tools_list,
-            batch_enabled=batch_enabled,
-            is_default=is_default,
-            output_schema=None,  # Can be added later if needed
-        )
-
-        # Add to agents.yaml
-        success, error_msg = add_agent_to_yaml(domain, yaml_entry)
-        if not success:
-            return f"Failed to add agent to agents.yaml: {error_msg}"
-
-        # Write prompt file
-        success, error_msg = write_prompt_file(domain, prompt_num, agent_name, prompt_content)
-        if not success:
-            return f"Failed to write prompt file: {error_msg}"
-
-        # Write services file
-        success, error_msg = write_services_file(domain, agent_name, batch_enabled)
-        if not success:
-            return f"Failed to write services file: {error_msg}"
+        def write_agent() -> tuple[int, list[str]]:
+            # Stage missing tools, agents.yaml entry, prompt and services file; write all
+            # of them or none
+            with AgentCreationTransaction(domain) as txn:
+                new_tools = txn.stage_tools(tools_list)
+                prompt_num = txn.add_agent(
+                    agent_name=agent_name,
+                    prompt_content=prompt_content,
+                    tools=tools_list,
+                    batch_enabled=batch_enabled,
+                    is_default=is_default,
+                )
+                txn.commit()
+            return prompt_num, new_tools
+
+        prompt_num, new_tools = await asyncio.to_thread(write_agent)
 
         # Success!
         files_created = [
@@ -392,6 +378,8 @@ def create_agent(
             f"new-repo/agent_configs/{domain}/prompts/{prompt_num:02d}-{agent_name.replace('_', '-')}.md",
             f"new-repo/agent_configs/{domain}/{agent_name}.py",
         ]
+        if new_tools:
+            files_created.append(f"tools.py (generated: {', '.join(new_tools)})")
 
         return (
             f"✅ Agent '{agent_name}' created successfully in domain '{domain}'!\n\n"
@@ -403,6 +391,8 @@ def create_agent(
             f"**Files Created:**\n" + "\n".join(f"- {f}" for f in files_created)
         )
 
+    except AgentCreationError as e:
+        return f"Failed to create agent: {e}"
     except Exception as e:
         logger.exception("Error creating agent")
         return f"❌ An error occurred while creating the agent: {str(e)}"
@@ -446,43 +436,26 @@ def create_agent_config_tool(
     if not is_valid:
         return f"Validation failed: {error}"
 
-    # Step 2: Ensure domain structure
-    success, error = ensure_domain_structure(domain)
-    if not success:
-        return f"Failed to create domain structure: {error}"
-
-    # Step 3: Get prompt number
-    prompt_number = get_prompt_number(domain)
-
-    # Step 4: Create YAML entry
-    output_schema_filename = None
-    if output_schema_fields:
-        schema = create_output_schema(agent_name, output_schema_fields)
-        output_schema_filename = f"{agent_name.replace('_', '-')}-output.json"
-        # Write schema file
-        success, error = write_schema_file(domain, agent_name, schema)
-        if not success:
-            return f"Failed to write schema file: {error}"
-
-    yaml_entry = create_agent_yaml_entry(
-        agent_name, prompt_number, tools, batch_enabled, is_default, output_schema_filename
+    # Step 2: Stage missing tools, schema, agents.yaml entry, prompt and services file,
+    # then commit them together under the domain lock; nothing is written if any step fails
+    try:
+        with AgentCreationTransaction(domain) as txn:
+            new_tools = txn.stage_tools(tools)
+            prompt_number = txn.add_agent(
+                agent_name,
+                prompt_content,
+                tools,
+                batch_enabled=batch_enabled,
+                is_default=is_default,
+                output_schema_fields=output_schema_fields,
+            )
+            txn.commit()
+    except AgentCreationError as e:
+        return f"Failed to create agent: {e}"
+
+    output_schema_filename = (
+        f"{agent_name.replace('_', '-')}-output.json" if output_schema_fields else None
     )
-
-    # Step 5: Add to agents.yaml
-    success, error = add_agent_to_yaml(domain, yaml_entry)
-    if not success:
-        return f"Failed to add agent to agents.yaml: {error}"
-
-    # Step 6: Write prompt file
-    success, error = write_prompt_file(domain, prompt_number, agent_name, prompt_content)
-    if not success:
-        return f"Failed to write prompt file: {error}"
-
-    # Step 7: Write services file
-    success, error = write_services_file(domain, agent_name, batch_enabled)
-    if not success:
-        return f"Failed to write services file: {error}"
-
     files_created = [
         f"new-repo/agent_configs/{domain}/agents.yaml (updated)",
         f"new-repo/agent_configs/{domain}/prompts/{prompt_number:02d}-{agent_name.replace('_', '-')}.md",
@@ -492,6 +465,8 @@ def create_agent_config_tool(
         files_created.append(
             f"new-repo/agent_configs/{domain}/schemas/{output_schema_filename}"
         )
+    if new_tools:
+        files_created.append(f"tools.py (generated: {', '.join(new_tools)})")
 
     return (
         f"Successfully created agent '{agent_name}' in domain '{domain}'.\n"
@@ -0,0 +1,244 @@
+# ABOUTME: Watch LLD markdown and both flow folders; on save re-run only the affected generators.
+# ABOUTME: LLD edits are converted section by section and diffed per model before regeneration.
+
+import argparse
+import json
+import threading
+import uuid
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from autobots_devtools_shared_lib.common.observability import (
+    get_logger,
+    set_conversation_id,
+)
+from dotenv import load_dotenv
+
+from autobots_orch_flow_studio.common.tools.kb_tools import register_kb_tools
+from autobots_orch_flow_studio.common.utils.llm_replay import install_llm_replay
+from autobots_orch_flow_studio.common.utils.trace_export import setup_tracing
+from autobots_orch_flow_studio.configs.constants import (
+    DESIGNER_FLOWS_SUBDIR,
+    INPUT_DATA_BASE_PATH,
+    INPUT_LLD_DIR,
+    LLD_JSON_SUBDIR,
+    MODEL_OAS_OUTPUT_SUBDIR,
+    SAMPLE_FLOWS_SUBDIR,
+)
+from autobots_orch_flow_studio.domains.codegen.services.feature_pipeline import (
+    build_feature_streaming,
+)
+from autobots_orch_flow_studio.domains.codegen.services.flow_generator import (
+    build_flow_kgs_deterministic,
+    merge_flows_deterministic,
+    remove_flow_outputs,
+)
+from autobots_orch_flow_studio.domains.codegen.services.model_oas_generator import (
+    build_model_oas_deterministic,
+)
+from autobots_orch_flow_studio.domains.codegen.services.sync_methods_oas_generator import (
+    build_sync_oas,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.file_watch import (
+    CHANGE_DELETED,
+    DEFAULT_DEBOUNCE_SECONDS,
+    DebouncedWatcher,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_batch import (
+    STATUS_FAILED,
+    convert_lld_source,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_diff import diff_models, remove_outputs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = get_logger(__name__)
+load_dotenv()
+register_kb_tools()
+setup_tracing()
+
+MODELS_SECTION = "1-models"
+SYNC_METHODS_SECTION = "2-sync-methods"
+BEHAVIOURS_SECTION = "4-behaviours"
+
+
+@dataclass
+class RegenerationPlan:
+    """What one batch of saves invalidated, per feature folder."""
+
+    sections: dict[str, set[str]] = field(default_factory=dict)
+    models: dict[str, set[str]] = field(default_factory=dict)
+    removed_models: dict[str, list[str]] = field(default_factory=dict)
+    flow_files: set[str] = field(default_factory=set)
+    actual_files: set[str] = field(default_factory=set)
+    deleted_flows: set[str] = field(default_factory=set)
+    deleted_actual: set[str] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        return not (
+            any(self.sections.values())
+            or self.flow_files
+            or self.actual_files
+            or self.deleted_flows
+            or self.deleted_actual
+        )
+
+
+def _load_json(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class WatchService:
+    """Debounced watcher that keeps one feature's generated artifacts up to date.
+
+    LLD markdown files under lld_dir are converted to INPUT_DATA_BASE_PATH/{stem}/json when
+    they are saved; only sections whose JSON changed count as changed. Designer flow
+    files are re-merged and re-extracted one file at a time; sample (actual) flow files
+    are only re-merged. Deleting a flow file deletes what was generated from it.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        lld_dir: str | Path = INPUT_LLD_DIR,
+        use_llm: bool = True,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    ) -> None:
+        self.filename = filename
+        self.lld_dir = Path(lld_dir)
+        self.data_root = Path(INPUT_DATA_BASE_PATH)
+        self.flows_dir = self.data_root / DESIGNER_FLOWS_SUBDIR
+        self.actual_dir = self.data_root / SAMPLE_FLOWS_SUBDIR
+        self.use_llm = use_llm
+        self.watcher = DebouncedWatcher(
+            [self.lld_dir, self.flows_dir, self.actual_dir], debounce_seconds=debounce_seconds
+        )
+
+    def plan(self, changes: dict[Path, str]) -> RegenerationPlan:
+        """Convert changed LLD files and work out which sections, models and flows changed."""
+        plan = RegenerationPlan()
+        for path, kind in sorted(changes.items()):
+            if path.suffix == ".json" and path.parent == self.flows_dir:
+                deleted = kind == CHANGE_DELETED
+                (plan.deleted_flows if deleted else plan.flow_files).add(path.name)
+            elif path.suffix == ".json" and path.parent == self.actual_dir:
+                deleted = kind == CHANGE_DELETED
+                (plan.deleted_actual if deleted else plan.actual_files).add(path.name)
+            elif path.suffix == ".md" and kind != CHANGE_DELETED:
+                self._plan_lld(path, plan)
+        return plan
+
+    def _plan_lld(self, source: Path, plan: RegenerationPlan) -> None:
+        feature = source.stem
+        models_path = self.data_root / feature / LLD_JSON_SUBDIR / f"{MODELS_SECTION}.json"
+        old_models = _load_json(models_path)
+        result = convert_lld_source(str(source), str(self.data_root))
+        if result.status == STATUS_FAILED:
+            logger.error(f"Watch: converting {source.name} failed: {result.error}")
+            return
+        sections = {Path(p).stem for p in result.written}
+        plan.sections[feature] = sections
+        if MODELS_SECTION in sections | {Path(p).stem for p in result.removed}:
+            diff = diff_models(old_models, _load_json(models_path))
+            plan.models[feature] = set(diff.regenerate)
+            plan.removed_models[feature] = diff.removed
+        logger.info(f"Watch: {source.name} changed sections {sorted(sections)}")
+
+    def regenerate(self, plan: RegenerationPlan, session_id: str | None = None) -> None:
+        """Run only the generator steps the plan needs; a failing step does not stop the rest."""
+        session_id = session_id or str(uuid.uuid4())
+        set_conversation_id(session_id)
+        steps: list[tuple[str, Callable[[], object]]] = []
+        for feature, sections in plan.sections.items():
+            out_dir = self.data_root / feature / MODEL_OAS_OUTPUT_SUBDIR
+            remove_outputs(
+                out_dir / f"{name}.json" for name in plan.removed_models.get(feature, [])
+            )
+            if plan.models.get(feature):
+                names = sorted(plan.models[feature])
+                step = partial(
+                    build_model_oas_deterministic,
+                    session_id,
+                    feature,
+                    describe_missing=self.use_llm,
+                    models=names,
+                )
+                steps.append((f"model OAS {feature} {names}", step))
+            if self.use_llm and SYNC_METHODS_SECTION in sections:
+                steps.append((f"sync OAS {feature}", partial(build_sync_oas, session_id, feature)))
+            if self.use_llm and BEHAVIOURS_SECTION in sections:
+                step = partial(build_feature_streaming, session_id, feature)
+                steps.append((f"processing units and flows {feature}", step))
+        if plan.deleted_flows or plan.deleted_actual:
+            remove_flow_outputs(self.filename, plan.deleted_flows, plan.deleted_actual)
+        if plan.flow_files or plan.actual_files:
+            files = sorted(plan.flow_files | plan.actual_files)
+            merge = partial(
+                merge_flows_deterministic,
+                session_id,
+                self.filename,
+                resolve_conflicts=self.use_llm,
+                files=files,
+            )
+            steps.append((f"flow merge {files}", merge))
+        if plan.flow_files:
+            files = sorted(plan.flow_files)
+            kgs = partial(
+                build_flow_kgs_deterministic,
+                session_id,
+                self.filename,
+                describe_purpose=self.use_llm,
+                files=files,
+            )
+            steps.append((f"flow KGs {files}", kgs))
+
+        for name, step in steps:
+            try:
+                step()
+                logger.info(f"Watch: regenerated {name}")
+            except Exception:
+                logger.exception(f"Watch: regenerating {name} failed")
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """Block, regenerating after each debounced batch of saves until stop is set."""
+        logger.info(
+            f"Watching {self.lld_dir}, {self.flows_dir} and {self.actual_dir} for {self.filename}"
+        )
+        for changes in self.watcher.batches(stop):
+            plan = self.plan(changes)
+            if not plan.is_empty():
+                self.regenerate(plan)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI entry point: watch until interrupted."""
+    parser = argparse.ArgumentParser(description="Regenerate artifacts when LLD or flows change.")
+    parser.add_argument("feature", help="Feature folder (e.g. MER-12345---Party-Feature)")
+    parser.add_argument("--lld-dir", default=INPUT_LLD_DIR, help="Folder of LLD markdown files")
+    parser.add_argument("--no-llm", action="store_true", help="Deterministic steps only")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE_SECONDS)
+    args = parser.parse_args(argv)
+
+    install_llm_replay()
+    service = WatchService(
+        args.feature,
+        lld_dir=args.lld_dir,
+        use_llm=not args.no_llm,
+        debounce_seconds=args.debounce,
+    )
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        logger.info("Watch stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,23 @@
 # Codegen utilities (e.g. LLD processor).
 
+from autobots_orch_flow_studio.domains.codegen.utils.flow_kg import extract_flow_kgs
+from autobots_orch_flow_studio.domains.codegen.utils.kb_refs import KbRefResolver
+from autobots_orch_flow_studio.domains.codegen.utils.lld_pipeline import (
+    convert_lld_content,
+    convert_lld_md,
+)
 from autobots_orch_flow_studio.domains.codegen.utils.lld_processor import (
     process_lld_md,
     split_by_first_level_headers,
+    split_lld_md_content,
 )
 
-__all__ = ["process_lld_md", "split_by_first_level_headers"]
+__all__ = [
+    "KbRefResolver",
+    "convert_lld_content",
+    "convert_lld_md",
+    "extract_flow_kgs",
+    "process_lld_md",
+    "split_by_first_level_headers",
+    "split_lld_md_content",
+]
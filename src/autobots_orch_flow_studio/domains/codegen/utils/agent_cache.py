@@ -0,0 +1,288 @@
+# ABOUTME: Process-wide cache of the compiled dynagent graph, shared by every chat session.
+# ABOUTME: Keyed by a fingerprint of agents.yaml, prompts, schemas and registered tools.
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+from autobots_devtools_shared_lib.dynagent import AgentMeta, create_base_agent
+from autobots_devtools_shared_lib.dynagent.agents.agent_config_utils import (
+    AgentConfig,
+    load_agents_config,
+)
+from autobots_devtools_shared_lib.dynagent.config.dynagent_settings import get_dynagent_settings
+from autobots_devtools_shared_lib.dynagent.tools.tool_registry import get_usecase_tools
+from langgraph.checkpoint.memory import InMemorySaver
+
+from autobots_orch_flow_studio.domains.codegen.utils.file_watch import scan
+
+logger = get_logger(__name__)
+
+CONFIG_SUFFIXES = (".yaml", ".yml", ".md", ".json")
+# How long get() trusts the last fingerprint before stat-ing the config files again
+DEFAULT_CHECK_INTERVAL_SECONDS = 2.0
+
+AgentFactory = Callable[[Any], Any]
+
+
+def config_fingerprint(config_dir: str | Path, tool_names: Iterable[str]) -> str:
+    """sha256 over the (path, mtime, size) of every config file and the registered tool names.
+
+    Only files are stat-ed, none are read, so checking is cheap enough to do on every
+    session start.
+    """
+    root = Path(config_dir)
+    digest = hashlib.sha256()
+    for path, (mtime_ns, size) in sorted(scan([root], CONFIG_SUFFIXES).items()):
+        digest.update(f"{path.relative_to(root)}\0{mtime_ns}\0{size}\n".encode())
+    digest.update("\0".join(sorted(tool_names)).encode())
+    return digest.hexdigest()
+
+
+def _default_factory(checkpointer: Any) -> Any:
+    return create_base_agent(checkpointer=checkpointer)
+
+
+def _reset_shared_config(configs: dict[str, AgentConfig] | None = None) -> None:
+    """Make shared-lib use configs (None: agents.yaml on disk) and drop its AgentMeta.
+
+    shared-lib has no public reset for its agents.yaml cache, but load_agents_config()
+    returns the cached dict itself, so it is refilled in place; an empty cache is
+    reloaded from disk on next use.
+    """
+    cached = load_agents_config()
+    cached.clear()
+    cached.update(configs or {})
+    AgentMeta.reset()
+
+
+class TurnGate:
+    """Lets config swaps happen only between chat turns, never in the middle of one.
+
+    Turns are many concurrent readers on the event loop; a swap is the single writer,
+    on whichever thread reloads the config. A swap waits for the turns in flight to end
+    and holds back new ones until it is done. A turn held back waits on a worker thread,
+    so the event loop keeps running the turns the swap is waiting for.
+
+    Nothing inside a turn may start a swap (e.g. call AgentGraphCache.get()); it would
+    wait for its own turn to end.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._turns = 0
+        self._swapping = False
+
+    async def enter(self) -> None:
+        with self._cond:
+            if not self._swapping:
+                self._turns += 1
+                return
+        entered = asyncio.ensure_future(asyncio.to_thread(self._enter_after_swap))
+        try:
+            await asyncio.shield(entered)
+        except asyncio.CancelledError:
+            # The worker still enters once the swap is done; leave again on its behalf
+            entered.add_done_callback(lambda _future: self.exit())
+            raise
+
+    def _enter_after_swap(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: not self._swapping)
+            self._turns += 1
+
+    def exit(self) -> None:
+        with self._cond:
+            self._turns -= 1
+            if not self._turns:
+                self._cond.notify_all()
+
+    @contextmanager
+    def swap(self) -> Iterator[None]:
+        """Block until no turn is running and keep new turns out until the block exits."""
+        with self._cond:
+            self._cond.wait_for(lambda: not self._swapping)
+            self._swapping = True
+            self._cond.wait_for(lambda: not self._turns)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._swapping = False
+                self._cond.notify_all()
+
+
+class AgentGraphCache:
+    """One compiled agent graph for the process, rebuilt only when its config changes.
+
+    Sessions share the graph and a single checkpointer; everything per session lives in
+    the checkpoint of its thread_id, so the graph, tool bindings and prompts are built
+    once instead of once per chat. The checkpointer outlives rebuilds, so conversations
+    keep their history when the config changes under them; a session's checkpoints are
+    dropped with aforget() when it ends.
+
+    While an AgentConfigReloader watches the config (watched is True), get() skips the
+    fingerprint check and the reloader swaps new metadata in through reload_config().
+    Either way a swap only happens between turns (see turn()).
+    """
+
+    def __init__(
+        self,
+        factory: AgentFactory = _default_factory,
+        config_dir: str | Path | None = None,
+        check_interval: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+        checkpointer: Any = None,
+    ) -> None:
+        self._factory = factory
+        self._config_dir = Path(config_dir) if config_dir else None
+        self.check_interval = check_interval
+        self.checkpointer = checkpointer if checkpointer is not None else InMemorySaver()
+        self._lock = threading.Lock()
+        self.gate = TurnGate()
+        self._agent: Any = None
+        self._fingerprint: str | None = None
+        self._checked_at = 0.0
+        self.builds = 0
+        self.watched = False
+
+    @property
+    def config_dir(self) -> Path:
+        """The configured directory, else DYNAGENT_CONFIG_ROOT_DIR."""
+        return self._config_dir or Path(get_dynagent_settings().dynagent_config_root_dir)
+
+    def fingerprint(self) -> str:
+        # Built-in dynagent tools are fixed per shared-lib version; only use-case
+        # registrations can change while the process runs
+        return config_fingerprint(self.config_dir, (t.name for t in get_usecase_tools()))
+
+    def _current(self) -> Any:
+        """The graph if it can be returned without re-checking the config, else None."""
+        agent = self._agent
+        if agent is not None and (
+            self.watched or time.monotonic() - self._checked_at < self.check_interval
+        ):
+            return agent
+        return None
+
+    def get(self) -> Any:
+        """The shared graph, rebuilt first if the config changed since it was built."""
+        agent = self._current()
+        if agent is not None:
+            return agent
+        with self._lock:
+            fingerprint = self.fingerprint()
+            self._checked_at = time.monotonic()
+            if self._agent is None or fingerprint != self._fingerprint:
+                with self.gate.swap():
+                    self._agent = self._build(fingerprint)
+            return self._agent
+
+    async def aget(self) -> Any:
+        """get() for the event loop; the config scan and any rebuild run on a worker thread."""
+        agent = self._current()
+        if agent is not None:
+            return agent
+        return await asyncio.to_thread(self.get)
+
+    @asynccontextmanager
+    async def turn(self) -> AsyncIterator[Any]:
+        """Run one chat turn on the shared graph; config swaps wait until it ends."""
+        agent = await self.aget()
+        await self.gate.enter()
+        try:
+            # A swap may have landed between aget() and entering
+            yield self._agent or agent
+        finally:
+            self.gate.exit()
+
+    async def aforget(self, thread_id: str) -> None:
+        """Delete every checkpoint of a session's thread."""
+        await self.checkpointer.adelete_thread(thread_id)
+
+    def reload_config(
+        self, configs: dict[str, AgentConfig] | None = None, rebuild_graph: bool = False
+    ) -> None:
+        """Swap in agent metadata for configs between turns, and the graph if it depends on it.
+
+        The shared-lib middleware reads AgentMeta on every model call, so prompts, tools
+        and schemas take effect on the next turn without a new graph. The graph is only
+        rebuilt when rebuild_graph is set (e.g. the default agent changed).
+
+        AgentMeta has no per-agent update, so the metadata of every agent is rebuilt,
+        not only of the agents a change touched; that re-reads each prompt and schema
+        once. configs are the already parsed agents.yaml entries (None: read the file).
+
+        Raises:
+            ValueError: If an agent references a tool that is not registered.
+            FileNotFoundError: If a referenced schema does not exist.
+        """
+        with self._lock, self.gate.swap():
+            _reset_shared_config(configs)
+            started = time.perf_counter()
+            AgentMeta.instance()
+            if rebuild_graph or self._agent is None:
+                self._agent = self._factory(self.checkpointer)
+                self.builds += 1
+            logger.info(f"Reloaded agent metadata in {time.perf_counter() - started:.2f}s")
+            self._fingerprint = self.fingerprint()
+            self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the graph; the next get() rebuilds it."""
+        with self._lock:
+            self._agent = None
+            self._fingerprint = None
+
+    def _build(self, fingerprint: str) -> Any:
+        if self._agent is not None:
+            logger.info("Agent config changed, rebuilding the shared agent graph")
+        # shared-lib caches agents.yaml and AgentMeta globally; make it load the new config
+        _reset_shared_config()
+        started = time.perf_counter()
+        agent = self._factory(self.checkpointer)
+        self._fingerprint = fingerprint
+        self.builds += 1
+        logger.info(
+            f"Built shared agent graph in {time.perf_counter() - started:.2f}s "
+            f"(config {fingerprint[:12]})"
+        )
+        return agent
+
+
+_cache: AgentGraphCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_agent_cache() -> AgentGraphCache:
+    """The process-wide AgentGraphCache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AgentGraphCache()
+        return _cache
+
+
+def get_shared_agent() -> Any:
+    """The compiled agent graph shared by every session of this process."""
+    return get_agent_cache().get()
+
+
+async def aget_shared_agent() -> Any:
+    """get_shared_agent() for async callers, without blocking the event loop."""
+    return await get_agent_cache().aget()
+
+
+def agent_turn() -> AbstractAsyncContextManager[Any]:
+    """One chat turn on the shared graph; hot reloads wait until the turn ends."""
+    return get_agent_cache().turn()
+
+
+async def forget_session(thread_id: str) -> None:
+    """Drop the checkpoints a finished session left in the shared checkpointer."""
+    await get_agent_cache().aforget(thread_id)
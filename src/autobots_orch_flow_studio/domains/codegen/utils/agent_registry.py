@@ -0,0 +1,300 @@
+# ABOUTME: Parsed, mtime-cached view of a domain's agents.yaml with O(1) agent lookup.
+# ABOUTME: Allocates prompt numbers in memory and rewrites only the agent entries that change.
+
+import copy
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+AGENTS_YAML_FILENAME = "agents.yaml"
+
+_AGENTS_KEY_RE = re.compile(r"^agents:\s*(?P<inline>[^#\s][^#]*?)?\s*(#.*)?$")
+_ENTRY_KEY_RE = re.compile(r"^(?P<indent> +)(?P<q>[\"']?)(?P<name>[^\"':#\s]+)(?P=q)\s*:\s*(#.*)?$")
+_PROMPT_NUMBER_RE = re.compile(r"^(\d+)-")
+_KNOWN_KEYS = ("prompt", "batch_enabled", "is_default", "output_schema", "tools")
+_TRUE_VALUES = {"true", "y", "yes", "on", "1"}
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_VALUES
+    return bool(value)
+
+
+@dataclass
+class AgentConfig:
+    """One entry of agents.yaml; keys this model does not know are kept in extra."""
+
+    name: str
+    prompt: str
+    tools: list[str] = field(default_factory=list)
+    batch_enabled: bool = False
+    is_default: bool = False
+    output_schema: str | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def prompt_number(self) -> int | None:
+        """The 3 of prompt "03-joke-agent", or None for unnumbered prompts."""
+        match = _PROMPT_NUMBER_RE.match(self.prompt)
+        return int(match.group(1)) if match else None
+
+    @classmethod
+    def from_yaml(cls, name: str, data: Any) -> "AgentConfig":
+        data = data if isinstance(data, dict) else {}
+        tools = data.get("tools") or []
+        return cls(
+            name=name,
+            prompt=str(data.get("prompt") or ""),
+            tools=[str(t) for t in tools] if isinstance(tools, list) else [str(tools)],
+            batch_enabled=_as_bool(data.get("batch_enabled")),
+            is_default=_as_bool(data.get("is_default")),
+            output_schema=data.get("output_schema"),
+            extra={k: v for k, v in data.items() if k not in _KNOWN_KEYS},
+        )
+
+    def to_yaml(self, indent: str = "  ") -> str:
+        """Render the entry as an agents.yaml block (the format agent_builder writes)."""
+        inner = indent * 2
+        text = f"{indent}{self.name}:\n"
+        text += f"{inner}prompt: {json.dumps(self.prompt)}\n"
+        text += f"{inner}batch_enabled: {'true' if self.batch_enabled else 'false'}\n"
+        if self.is_default:
+            text += f"{inner}is_default: true\n"
+        if self.output_schema:
+            text += f"{inner}output_schema: {json.dumps(self.output_schema)}\n"
+        text += f"{inner}tools:\n"
+        for tool in self.tools:
+            text += f"{inner}{indent}- {json.dumps(tool)}\n"
+        if self.extra:
+            dumped = yaml.safe_dump(self.extra, default_flow_style=False, sort_keys=False)
+            text += "".join(f"{inner}{line}\n" for line in dumped.splitlines())
+        return text
+
+
+class AgentsYamlDocument:
+    """agents.yaml split into the text before the entries, one raw block per agent and the
+    text after the agents section.
+
+    Untouched blocks are written back verbatim, so comments and hand formatting survive
+    an update; only set() and remove() change the rendered text.
+
+    Raises:
+        ValueError: If the text is not valid YAML or its agents mapping cannot be split
+            into blocks (e.g. an inline flow mapping).
+    """
+
+    def __init__(self, text: str) -> None:
+        try:
+            data = yaml.safe_load(text) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"{AGENTS_YAML_FILENAME} is not valid YAML: {e}") from e
+        agents = data.get("agents") if isinstance(data, dict) else None
+        self.agents: dict[str, AgentConfig] = {
+            str(name): AgentConfig.from_yaml(str(name), entry)
+            for name, entry in (agents or {}).items()
+        }
+        self.indent = "  "
+        self._blocks: dict[str, str] = {}
+        self._split(text)
+        if set(self._blocks) != set(self.agents):
+            raise ValueError(f"Could not split the agents mapping of {AGENTS_YAML_FILENAME}")
+
+    def _split(self, text: str) -> None:
+        lines = text.splitlines(keepends=True)
+        start = next((i for i, line in enumerate(lines) if _AGENTS_KEY_RE.match(line)), None)
+        if start is None:
+            self.header = text if not text or text.endswith("\n") else text + "\n"
+            self.header += "agents:\n"
+            self.trailer = ""
+            return
+        inline = _AGENTS_KEY_RE.match(lines[start]).group("inline")
+        if inline and inline.strip() != "{}":
+            raise ValueError(
+                f"Inline 'agents:' mappings in {AGENTS_YAML_FILENAME} are not supported"
+            )
+        if inline:
+            lines[start] = "agents:\n"
+
+        header = lines[: start + 1]
+        blocks: dict[str, list[str]] = {}
+        current: list[str] | None = None
+        entry_indent = None
+        end = len(lines)
+        for i in range(start + 1, len(lines)):
+            line = lines[i]
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                (current if current is not None else header).append(line)
+                continue
+            if not line[0].isspace():
+                end = i
+                break
+            match = _ENTRY_KEY_RE.match(line)
+            if match and entry_indent in (None, match.group("indent")):
+                entry_indent = match.group("indent")
+                current = blocks[match.group("name")] = [line]
+            elif current is not None:
+                current.append(line)
+            else:
+                header.append(line)
+        if entry_indent:
+            self.indent = entry_indent
+        self.header = "".join(header)
+        self._blocks = {name: "".join(block) for name, block in blocks.items()}
+        self.trailer = "".join(lines[end:])
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.agents
+
+    def get(self, name: str) -> AgentConfig | None:
+        return self.agents.get(name)
+
+    def set(self, config: AgentConfig) -> None:
+        """Add the agent, or replace its block in place.
+
+        A replaced block keeps its trailing blank and comment lines, which usually
+        separate it from (or describe) the next entry.
+        """
+        text = config.to_yaml(self.indent)
+        old = self._blocks.get(config.name)
+        if old is not None:
+            old_lines = old.splitlines(keepends=True)
+            keep = len(old_lines)
+            while keep > 1 and (
+                not old_lines[keep - 1].strip() or old_lines[keep - 1].lstrip().startswith("#")
+            ):
+                keep -= 1
+            text += "".join(old_lines[keep:])
+        self._blocks[config.name] = text
+        self.agents[config.name] = config
+
+    def remove(self, name: str) -> None:
+        self._blocks.pop(name, None)
+        self.agents.pop(name, None)
+
+    def render(self) -> str:
+        parts = [self.header]
+        for block in self._blocks.values():
+            if parts[-1] and not parts[-1].endswith("\n"):
+                parts.append("\n")
+            parts.append(block)
+        if self.trailer and parts[-1] and not parts[-1].endswith("\n"):
+            parts.append("\n")
+        parts.append(self.trailer)
+        return "".join(parts)
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class AgentRegistry:
+    """Cached agents.yaml and prompt-number index of one domain directory.
+
+    agents.yaml is re-parsed only when its mtime or size changes and the prompts
+    directory is re-scanned only when its mtime changes, so lookups and prompt-number
+    allocation are O(1) between edits. Thread safe; use get_agent_registry to share one
+    instance per directory.
+    """
+
+    def __init__(self, domain_path: str | Path) -> None:
+        self.domain_path = Path(domain_path)
+        self.path = self.domain_path / AGENTS_YAML_FILENAME
+        self.prompts_dir = self.domain_path / "prompts"
+        self._lock = threading.RLock()
+        self._document: AgentsYamlDocument | None = None
+        self._stamp: tuple[int, int] | None = None
+        self._prompts_stamp: int | None = None
+        self._max_prompt_file = -1
+        self._reserved: set[int] = set()
+
+    def _load(self) -> AgentsYamlDocument:
+        stamp = _stamp(self.path)
+        if self._document is None or stamp != self._stamp:
+            text = self.path.read_text(encoding="utf-8") if stamp else ""
+            self._document = AgentsYamlDocument(text)
+            self._stamp = stamp
+        return self._document
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._load()
+
+    def get(self, name: str) -> AgentConfig | None:
+        with self._lock:
+            return self._load().get(name)
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return list(self._load().agents)
+
+    def document(self) -> AgentsYamlDocument:
+        """A private copy of the parsed file, to stage edits on."""
+        with self._lock:
+            return copy.deepcopy(self._load())
+
+    def update(self, document: AgentsYamlDocument) -> None:
+        """Adopt a document just written to agents.yaml, without re-reading the file."""
+        with self._lock:
+            self._document = copy.deepcopy(document)
+            self._stamp = _stamp(self.path)
+
+    def _prompt_file_max(self) -> int:
+        try:
+            stamp = self.prompts_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return -1
+        if stamp != self._prompts_stamp:
+            numbers = [
+                int(match.group(1))
+                for file in self.prompts_dir.glob("*.md")
+                if (match := _PROMPT_NUMBER_RE.match(file.name))
+            ]
+            self._max_prompt_file = max(numbers, default=-1)
+            self._prompts_stamp = stamp
+        return self._max_prompt_file
+
+    def next_prompt_number(self) -> int:
+        """The number the next reserve_prompt_number call will return."""
+        with self._lock:
+            return max(self._prompt_file_max(), max(self._reserved, default=-1)) + 1
+
+    def reserve_prompt_number(self) -> int:
+        """Allocate a prompt number no other caller in this process will get.
+
+        The number stays taken until release_prompt_number, so reservations that are
+        given back (e.g. by a rolled-back transaction) leave no gap.
+        """
+        with self._lock:
+            number = self.next_prompt_number()
+            self._reserved.add(number)
+            return number
+
+    def release_prompt_number(self, number: int) -> None:
+        """Give back a reservation once its prompt file is written or abandoned."""
+        with self._lock:
+            self._reserved.discard(number)
+
+
+_registries: dict[Path, AgentRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_agent_registry(domain_path: str | Path) -> AgentRegistry:
+    """Shared AgentRegistry for a domain directory."""
+    key = Path(domain_path).resolve()
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = AgentRegistry(key)
+        return registry
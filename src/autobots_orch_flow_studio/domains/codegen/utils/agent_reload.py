@@ -0,0 +1,197 @@
+# ABOUTME: Hot reload of agents.yaml, prompts and schemas into the running process.
+# ABOUTME: Checks changed config in the background and reloads it between chat turns.
+
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import autobots_devtools_shared_lib.dynagent.agents.agent_config_utils as _agent_config
+import yaml
+from autobots_devtools_shared_lib.common.observability import get_logger
+from autobots_devtools_shared_lib.dynagent.tools.tool_registry import get_all_tools
+
+from autobots_orch_flow_studio.domains.codegen.utils.agent_cache import (
+    CONFIG_SUFFIXES,
+    AgentGraphCache,
+    get_agent_cache,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.file_watch import (
+    DEFAULT_DEBOUNCE_SECONDS,
+    DebouncedWatcher,
+)
+
+logger = get_logger(__name__)
+
+AgentConfigs = dict[str, _agent_config.AgentConfig]
+
+
+@dataclass
+class ReloadPlan:
+    """What one batch of config changes invalidated."""
+
+    configs: AgentConfigs
+    agents: set[str] = field(default_factory=set)  # new or changed
+    removed: set[str] = field(default_factory=set)
+    rebuild_graph: bool = False
+
+    def is_empty(self) -> bool:
+        return not (self.agents or self.removed or self.rebuild_graph)
+
+
+def load_agent_configs(config_dir: Path) -> AgentConfigs:
+    """Parse agents.yaml without touching the shared-lib config cache.
+
+    Raises:
+        ValueError: If agents.yaml is missing or not valid YAML.
+    """
+    try:
+        data = yaml.safe_load((config_dir / "agents.yaml").read_text(encoding="utf-8")) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise ValueError(f"Cannot load {config_dir / 'agents.yaml'}: {e}") from e
+    return {
+        str(name): _agent_config.AgentConfig.from_dict(str(name), entry or {})
+        for name, entry in (data.get("agents") or {}).items()
+    }
+
+
+def _referenced_files(cfg: _agent_config.AgentConfig) -> set[str]:
+    """Stems of the prompt, schema and directive files an agent is built from."""
+    names = [cfg.prompt, *cfg.inputs, *cfg.inputs.values()]
+    if cfg.output:
+        names += [*cfg.output, *cfg.output.values()]
+    return {Path(name).stem for name in names if name}
+
+
+def default_agent(configs: AgentConfigs) -> str | None:
+    return next((name for name, cfg in configs.items() if cfg.is_default), None)
+
+
+def plan_reload(old: AgentConfigs, new: AgentConfigs, changed: set[Path]) -> ReloadPlan:
+    """Work out which agents a batch of changed files affects.
+
+    An agent is affected when its agents.yaml entry changed or when one of the prompt,
+    schema or directive files it references changed. A non-empty plan reloads the
+    metadata of every agent (see AgentGraphCache.reload_config); the affected agents
+    are what the reload reports.
+    """
+    plan = ReloadPlan(configs=new, removed=set(old) - set(new))
+    stems = {path.stem for path in changed if path.name != "agents.yaml"}
+    for name, cfg in new.items():
+        if old.get(name) != cfg or _referenced_files(cfg) & stems:
+            plan.agents.add(name)
+    plan.rebuild_graph = default_agent(old) != default_agent(new)
+    return plan
+
+
+def _json_name(name: str) -> str:
+    return name if name.endswith(".json") else f"{name}.json"
+
+
+def check_agent_configs(configs: AgentConfigs, config_dir: Path) -> None:
+    """Fail on what would stop shared-lib from loading configs, before anything is swapped.
+
+    Raises:
+        ValueError: If an agent references a tool that is not registered.
+        FileNotFoundError: If a referenced schema or directive does not exist.
+    """
+    tool_names = {t.name for t in get_all_tools()}
+    schema_dirs = (config_dir.parent / "common" / "schemas", config_dir / "schemas")
+    for name, cfg in configs.items():
+        missing = [t for t in cfg.tools if t not in tool_names]
+        if missing:
+            raise ValueError(f"Unresolved tools for agent '{name}': {', '.join(missing)}")
+        # Input schemas without a directive are not resolved by shared-lib
+        pairs = [(s, d) for s, d in cfg.inputs.items() if d] + list((cfg.output or {}).items())
+        for schema, directive in pairs:
+            if schema and not any((d / _json_name(schema)).exists() for d in schema_dirs):
+                raise FileNotFoundError(f"Schema '{schema}' of agent '{name}' not found")
+            if directive and not (config_dir / "directives" / _json_name(directive)).exists():
+                raise FileNotFoundError(f"Directive '{directive}' of agent '{name}' not found")
+
+
+class AgentConfigReloader:
+    """Watch the agent config directory and hot-swap changes into an AgentGraphCache.
+
+    Runs on a daemon thread. A change that fails to load (invalid YAML, unknown tool,
+    missing schema) is logged and the running config is kept. Changes are checked
+    while turns keep running and swapped in only between them.
+    """
+
+    def __init__(
+        self,
+        cache: AgentGraphCache | None = None,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    ) -> None:
+        self.cache = cache or get_agent_cache()
+        self.config_dir = self.cache.config_dir
+        common_schemas = self.config_dir.parent / "common" / "schemas"
+        self.watcher = DebouncedWatcher(
+            [self.config_dir, common_schemas],
+            suffixes=CONFIG_SUFFIXES,
+            debounce_seconds=debounce_seconds,
+        )
+        self._configs = load_agent_configs(self.config_dir)
+        self._unapplied: set[Path] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def reload(self, changed: set[Path]) -> ReloadPlan | None:
+        """Reload the config if the changed files affect an agent; None if loading failed."""
+        started = time.perf_counter()
+        try:
+            # Files of a failed reload stay pending until one succeeds
+            changed = self._unapplied = self._unapplied | changed
+            plan = plan_reload(self._configs, load_agent_configs(self.config_dir), changed)
+            if not plan.is_empty():
+                check_agent_configs(plan.configs, self.config_dir)
+                self.cache.reload_config(plan.configs, rebuild_graph=plan.rebuild_graph)
+        except Exception:
+            logger.exception("Agent config reload failed; keeping the running config")
+            return None
+        self._configs = plan.configs
+        self._unapplied = set()
+        if plan.is_empty():
+            return plan
+        logger.info(
+            f"Reloaded agent config in {time.perf_counter() - started:.2f}s: "
+            f"changed {sorted(plan.agents)}, removed {sorted(plan.removed)}, "
+            f"graph rebuilt: {plan.rebuild_graph}"
+        )
+        return plan
+
+    def run(self) -> None:
+        """Block, reloading after each debounced batch of changes until stop() is called."""
+        logger.info(f"Watching {self.config_dir} for agent config changes")
+        for changes in self.watcher.batches(self._stop):
+            self.reload(set(changes))
+
+    def start(self) -> "AgentConfigReloader":
+        """Run on a daemon thread; the cache stops re-checking its fingerprint meanwhile."""
+        if self._thread is None:
+            self.cache.watched = True
+            self._thread = threading.Thread(
+                target=self.run, name="agent-config-reloader", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.cache.watched = False
+
+
+_reloader: AgentConfigReloader | None = None
+_reloader_lock = threading.Lock()
+
+
+def start_agent_config_reloader() -> AgentConfigReloader:
+    """Start (once per process) hot reload for the shared agent cache."""
+    global _reloader
+    with _reloader_lock:
+        if _reloader is None:
+            _reloader = AgentConfigReloader().start()
+        return _reloader
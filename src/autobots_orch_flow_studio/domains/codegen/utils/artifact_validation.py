@@ -0,0 +1,316 @@
+# ABOUTME: Schema validation stage for generated artifacts (model OAS specs and flow KGs).
+# ABOUTME: Schemas are dereferenced and compiled once; invalid records are requeued with their errors.
+
+import argparse
+import json
+import threading
+import time
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import fastjsonschema
+from autobots_devtools_shared_lib.common.observability import TraceMetadata, get_logger
+from autobots_devtools_shared_lib.dynagent import BatchResult, RecordResult, batch_invoker
+from jsonschema import Draft7Validator
+
+from autobots_orch_flow_studio.configs.constants import AGENT_SCHEMAS_DIR
+from autobots_orch_flow_studio.domains.codegen.utils.kb_refs import KbRefResolver
+from autobots_orch_flow_studio.domains.codegen.utils.record_packing import parse_json_reply
+
+logger = get_logger(__name__)
+
+# Artifact kind -> schema file under agent_configs/<app>/schemas.
+ARTIFACT_SCHEMAS: dict[str, str] = {
+    "model_oas": "model_oas_spec.json",
+    "flow_kg": "node-red-kg-schema-spec.json",
+}
+DEFAULT_MAX_ATTEMPTS = 2
+# Errors quoted back to the agent on requeue (the rest are summarised as a count).
+MAX_REPORTED_ERRORS = 10
+# Some schemas still carry "pattern": "TODO"; as a regex it would reject every real value.
+_PLACEHOLDER_PATTERN = "TODO"
+
+_REQUEUE_NOTE = (
+    "Your previous output for this record failed validation against {schema}. "
+    "Fix these errors and produce the complete output again:\n{errors}"
+)
+
+ArtifactLoader = Callable[[str, str | None], Any]
+Check = Callable[[Any], Any]
+
+
+def _drop_placeholder_patterns(node: Any) -> Any:
+    if isinstance(node, dict):
+        return {
+            k: _drop_placeholder_patterns(v)
+            for k, v in node.items()
+            if not (k == "pattern" and v == _PLACEHOLDER_PATTERN)
+        }
+    if isinstance(node, list):
+        return [_drop_placeholder_patterns(v) for v in node]
+    return node
+
+
+def load_reply_json(_record: str, output: str | None) -> Any:
+    """Default artifact loader: the agent reply parsed as JSON (```json fences allowed).
+
+    Raises:
+        ValueError: If the reply is empty or not JSON.
+    """
+    artifact = parse_json_reply(output)
+    if artifact is None:
+        raise ValueError("output is not a JSON document")
+    return artifact
+
+
+class SchemaRegistry:
+    """Compiled validators for the artifact schemas, built once per registry.
+
+    Each schema has its cross-file $refs inlined (KbRefResolver) and is then compiled
+    to Python code by fastjsonschema, which decides valid/invalid. jsonschema only runs
+    to explain documents that fail (or for schemas fastjsonschema cannot compile).
+    Validators are compiled lazily on first use, or eagerly with compile_all(), and are
+    safe to share across threads.
+
+    Args:
+        schemas_dir: Folder holding the schema files (default AGENT_SCHEMAS_DIR).
+        schema_files: Artifact kind -> schema file name.
+    """
+
+    def __init__(
+        self,
+        schemas_dir: str | Path = AGENT_SCHEMAS_DIR,
+        schema_files: dict[str, str] | None = None,
+    ) -> None:
+        self.schemas_dir = Path(schemas_dir)
+        self.schema_files = dict(schema_files or ARTIFACT_SCHEMAS)
+        self._validators: dict[str, Draft7Validator] = {}
+        self._checks: dict[str, Check | None] = {}
+        self._lock = threading.Lock()
+        self.compile_seconds: dict[str, float] = {}
+
+    def validator(self, kind: str) -> Draft7Validator:
+        """Compiled validator for an artifact kind.
+
+        Raises:
+            KeyError: If kind is not registered.
+            jsonschema.SchemaError: If the schema itself is invalid.
+        """
+        if kind in self._validators:
+            return self._validators[kind]
+        with self._lock:
+            if kind not in self._validators:
+                t0 = time.perf_counter()
+                resolver = KbRefResolver(self.schemas_dir)
+                schema = _drop_placeholder_patterns(resolver.dereference(self.schema_files[kind]))
+                Draft7Validator.check_schema(schema)
+                try:
+                    # No defaults filled in and no format checks, matching Draft7Validator
+                    self._checks[kind] = fastjsonschema.compile(
+                        schema, use_default=False, use_formats=False
+                    )
+                except fastjsonschema.JsonSchemaDefinitionException as e:
+                    logger.info(f"{kind}: using jsonschema only ({e})")
+                    self._checks[kind] = None
+                self._validators[kind] = Draft7Validator(schema)
+                self.compile_seconds[kind] = time.perf_counter() - t0
+                for ref in resolver.unresolved:
+                    logger.warning(f"{kind}: unresolved schema $ref {ref.ref} ({ref.reason})")
+        return self._validators[kind]
+
+    def compile_all(self) -> None:
+        """Compile every registered schema now (e.g. before a batch starts)."""
+        for kind in self.schema_files:
+            self.validator(kind)
+
+    def validate(self, kind: str, artifact: Any) -> list[str]:
+        """Return violations as "path: message" strings (empty when valid)."""
+        validator = self.validator(kind)
+        check = self._checks[kind]
+        if check is not None:
+            try:
+                check(artifact)
+            except fastjsonschema.JsonSchemaValueException:
+                pass
+            else:
+                return []
+        errors = validator.iter_errors(artifact)
+        return [
+            f"{'/'.join(str(p) for p in err.absolute_path) or '<root>'}: {err.message}"
+            for err in sorted(errors, key=lambda e: list(map(str, e.absolute_path)))
+        ]
+
+
+@cache
+def default_registry() -> SchemaRegistry:
+    """Process-wide registry over AGENT_SCHEMAS_DIR."""
+    return SchemaRegistry()
+
+
+def check_output(
+    kind: str,
+    record: str,
+    output: str | None,
+    registry: SchemaRegistry | None = None,
+    load_artifact: ArtifactLoader = load_reply_json,
+) -> list[str]:
+    """Validate one agent output; load failures are reported as errors."""
+    try:
+        artifact = load_artifact(record, output)
+    except (OSError, ValueError) as e:
+        return [f"<artifact>: {e}"]
+    return (registry or default_registry()).validate(kind, artifact)
+
+
+def requeue_record(record: str, kind: str, errors: list[str]) -> str:
+    """record with the validation errors of its previous output attached."""
+    shown = [f"- {e}" for e in errors[:MAX_REPORTED_ERRORS]]
+    if len(errors) > MAX_REPORTED_ERRORS:
+        shown.append(f"- ... and {len(errors) - MAX_REPORTED_ERRORS} more")
+    note = _REQUEUE_NOTE.format(schema=ARTIFACT_SCHEMAS.get(kind, kind), errors="\n".join(shown))
+    return f"{record}\n\n{note}"
+
+
+def validated_batch_invoker(
+    agent_name: str,
+    records: list[str],
+    kind: str,
+    trace_metadata: TraceMetadata | None = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    registry: SchemaRegistry | None = None,
+    load_artifact: ArtifactLoader = load_reply_json,
+    invoker: Callable[..., BatchResult] = batch_invoker,
+) -> BatchResult:
+    """batch_invoker drop-in that validates every output and requeues invalid records.
+
+    Outputs are validated inline as each batch returns; a compiled check takes
+    microseconds per document, far below one agent call. Records whose output fails the
+    kind's schema are sent again, in one batch per attempt, with the errors appended to
+    the record. Records still invalid after max_attempts are failures (output kept,
+    errors in error).
+
+    Args:
+        agent_name: Batch-enabled agent from agents.yaml.
+        records: Non-empty list of plain-string prompts.
+        kind: Artifact kind in ARTIFACT_SCHEMAS (e.g. "model_oas").
+        trace_metadata: Forwarded to the invoker.
+        max_attempts: Agent calls per record, including the first.
+        registry: Compiled schemas (default: process-wide registry).
+        load_artifact: (record, output) -> artifact; defaults to the reply parsed as JSON.
+        invoker: Batch function to call (defaults to dynagent's batch_invoker).
+
+    Returns:
+        BatchResult with one RecordResult per original record, indexed like records.
+    """
+    registry = registry or default_registry()
+    registry.validator(kind)  # compile before the first batch returns
+    results: dict[int, RecordResult] = {}
+    pending = list(range(len(records)))
+    prompts = list(records)
+
+    for attempt in range(1, max_attempts + 1):
+        batch = invoker(agent_name, [prompts[i] for i in pending], trace_metadata=trace_metadata)
+        by_index = {pending[r.index]: r for r in batch.results}
+
+        invalid: list[int] = []
+        for i in pending:
+            r = by_index.get(i)
+            if r is None:
+                results[i] = RecordResult(index=i, success=False, error="No result returned")
+                continue
+            errors = (
+                check_output(kind, records[i], r.output, registry, load_artifact)
+                if r.success
+                else []
+            )
+            if errors:
+                invalid.append(i)
+                prompts[i] = requeue_record(records[i], kind, errors)
+                error = f"schema validation failed ({len(errors)}): " + "; ".join(errors)
+                results[i] = RecordResult(index=i, success=False, output=r.output, error=error)
+            else:
+                results[i] = RecordResult(
+                    index=i, success=r.success, output=r.output, error=r.error
+                )
+        logger.info(
+            f"{agent_name}: attempt {attempt}, {len(pending) - len(invalid)} of "
+            f"{len(pending)} outputs valid against {kind}"
+        )
+        if not invalid:
+            break
+        pending = invalid
+
+    return BatchResult(
+        agent_name=agent_name,
+        total=len(records),
+        results=[results[i] for i in range(len(records))],
+    )
+
+
+def benchmark(
+    registry: SchemaRegistry, samples: dict[str, list[Any]], min_seconds: float = 0.5
+) -> list[dict[str, Any]]:
+    """Measure validation throughput per schema on sample artifacts.
+
+    Each kind's samples are validated repeatedly for at least min_seconds.
+    """
+    report: list[dict[str, Any]] = []
+    for kind, docs in samples.items():
+        if not docs:
+            continue
+        registry.validator(kind)
+        validated, invalid = 0, 0
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < min_seconds:
+            for doc in docs:
+                invalid += bool(registry.validate(kind, doc))
+                validated += 1
+        seconds = time.perf_counter() - t0
+        report.append(
+            {
+                "kind": kind,
+                "samples": len(docs),
+                "compile_ms": round(registry.compile_seconds.get(kind, 0.0) * 1000, 2),
+                "docs_per_second": round(validated / seconds),
+                "us_per_doc": round(seconds / validated * 1e6, 1),
+                "invalid_ratio": round(invalid / validated, 3),
+            }
+        )
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI: validate artifact files against a schema, or benchmark validation throughput."""
+    parser = argparse.ArgumentParser(description="Generated artifact schema validation.")
+    parser.add_argument("command", choices=["validate", "bench"])
+    parser.add_argument("kind", choices=sorted(ARTIFACT_SCHEMAS))
+    parser.add_argument("files", nargs="+", help="Artifact JSON files")
+    parser.add_argument("--schemas", default=AGENT_SCHEMAS_DIR, help="Schema folder")
+    parser.add_argument("--seconds", type=float, default=0.5, help="Benchmark duration")
+    args = parser.parse_args(argv)
+
+    registry = SchemaRegistry(args.schemas)
+    docs = [(f, json.loads(Path(f).read_text(encoding="utf-8"))) for f in args.files]
+    if args.command == "validate":
+        failed = 0
+        for name, doc in docs:
+            errors = registry.validate(args.kind, doc)
+            failed += bool(errors)
+            print(f"{'FAIL' if errors else 'ok  '} {name}")
+            for e in errors[:MAX_REPORTED_ERRORS]:
+                print(f"     {e}")
+        return 1 if failed else 0
+
+    for row in benchmark(registry, {args.kind: [d for _, d in docs]}, args.seconds):
+        print(
+            f"{row['kind']:<20} {row['samples']:>4} samples  compile {row['compile_ms']:>7} ms  "
+            f"{row['docs_per_second']:>8} docs/s  {row['us_per_doc']:>8} us/doc  "
+            f"invalid {row['invalid_ratio']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+# ABOUTME: Polling file watcher that coalesces bursts of saves into one debounced change batch.
+# ABOUTME: Stdlib only (stat snapshots), so it behaves the same on every OS and inside containers.
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+CHANGE_ADDED = "added"
+CHANGE_MODIFIED = "modified"
+CHANGE_DELETED = "deleted"
+
+DEFAULT_SUFFIXES = (".md", ".json")
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+DEFAULT_POLL_INTERVAL = 0.2
+# Flush a batch after this long even if saves keep arriving (e.g. an autosaving editor).
+DEFAULT_MAX_DELAY_SECONDS = 5.0
+
+# Editor swap/backup files and our own atomic-write temp files are never changes.
+_IGNORED_SUFFIXES = (".tmp", ".swp", ".swx", "~")
+
+Snapshot = dict[Path, tuple[int, int]]
+
+
+def _is_watched(name: str, suffixes: tuple[str, ...]) -> bool:
+    if name.startswith(".") or name.endswith(_IGNORED_SUFFIXES):
+        return False
+    return not suffixes or name.endswith(suffixes)
+
+
+def scan(roots: Iterable[str | Path], suffixes: tuple[str, ...] = DEFAULT_SUFFIXES) -> Snapshot:
+    """Snapshot {path: (mtime_ns, size)} of matching files under roots (recursive).
+
+    Missing roots are skipped, so a folder that does not exist yet is picked up once
+    it is created.
+    """
+    snapshot: Snapshot = {}
+    stack = [Path(r) for r in roots]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        stack.append(Path(entry.path))
+                elif _is_watched(entry.name, suffixes):
+                    st = entry.stat()
+                    snapshot[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                continue  # deleted between scandir and stat
+    return snapshot
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> dict[Path, str]:
+    """Return {path: CHANGE_*} for files added, modified or deleted between two snapshots."""
+    changes = dict.fromkeys(new.keys() - old.keys(), CHANGE_ADDED)
+    changes.update(dict.fromkeys(old.keys() - new.keys(), CHANGE_DELETED))
+    changes.update({p: CHANGE_MODIFIED for p in new.keys() & old.keys() if new[p] != old[p]})
+    return changes
+
+
+def _coalesce(previous: str | None, current: str) -> str | None:
+    """Fold two consecutive changes to one path into the net change (None = no change)."""
+    if previous is None:
+        return current
+    if previous == CHANGE_ADDED:
+        return None if current == CHANGE_DELETED else CHANGE_ADDED
+    if previous == CHANGE_DELETED and current == CHANGE_ADDED:
+        return CHANGE_MODIFIED
+    return current
+
+
+class DebouncedWatcher:
+    """Poll roots for changes and release them as one batch once saves stop for a moment.
+
+    A batch is released when no new change has been seen for debounce_seconds, or when
+    max_delay_seconds have passed since its first change. Changes to the same file in a
+    batch are folded (added + deleted cancels out, deleted + added is a modification).
+    """
+
+    def __init__(
+        self,
+        roots: Iterable[str | Path],
+        suffixes: tuple[str, ...] = DEFAULT_SUFFIXES,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.roots = [Path(r) for r in roots]
+        self.suffixes = suffixes
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._clock = clock
+        self._snapshot = scan(self.roots, suffixes)
+        self._pending: dict[Path, str] = {}
+        self._first_change = 0.0
+        self._last_change = 0.0
+
+    def poll(self) -> dict[Path, str] | None:
+        """Scan once; return the pending batch if it is ready to be released, else None."""
+        snapshot = scan(self.roots, self.suffixes)
+        changes = diff_snapshots(self._snapshot, snapshot)
+        self._snapshot = snapshot
+        now = self._clock()
+        if changes:
+            if not self._pending:
+                self._first_change = now
+            self._last_change = now
+            for path, kind in changes.items():
+                net = _coalesce(self._pending.get(path), kind)
+                if net is None:
+                    self._pending.pop(path, None)
+                else:
+                    self._pending[path] = net
+
+        if not self._pending:
+            return None
+        quiet = now - self._last_change >= self.debounce_seconds
+        overdue = now - self._first_change >= self.max_delay_seconds
+        if not (quiet or overdue):
+            return None
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def batches(
+        self,
+        stop: threading.Event | None = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> Iterator[dict[Path, str]]:
+        """Yield debounced change batches until stop is set (forever if stop is None)."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            batch = self.poll()
+            if batch:
+                yield batch
+            stop.wait(poll_interval)
@@ -0,0 +1,426 @@
+# ABOUTME: SQLite FTS5 + structured index over the KB and designer flows for snippet search.
+# ABOUTME: Incremental by mtime/size then sha256; includes a CLI with build, search and benchmark.
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+from autobots_orch_flow_studio.configs.constants import INPUT_DATA_BASE_PATH, KB_INDEX_DB_PATH
+from autobots_orch_flow_studio.domains.codegen.utils.record_packing import estimate_tokens
+
+logger = get_logger(__name__)
+
+INDEXED_SUFFIXES = (".json", ".md")
+SNIPPET_TOKENS = 24
+DEFAULT_SEARCH_LIMIT = 8
+
+KIND_DESIGNER_FLOW = "designer_flow"
+KIND_FLOW = "flow"
+KIND_INTERFACE = "interface"
+KIND_MODEL = "model"
+KIND_LLD_MODELS = "lld_models"
+KIND_LLD_BEHAVIOURS = "lld_behaviours"
+KIND_PROCESSING_UNIT = "processing_unit"
+KIND_DOCUMENT = "document"
+
+_SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY, kind TEXT NOT NULL, mtime REAL NOT NULL,
+    size INTEGER NOT NULL, sha256 TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS kb_fts USING fts5(
+    path UNINDEXED, kind UNINDEXED, name, body, tokenize = "unicode61 tokenchars '-_'"
+);
+CREATE TABLE IF NOT EXISTS models (name TEXT, path TEXT, description TEXT);
+CREATE TABLE IF NOT EXISTS fields (model TEXT, name TEXT, type TEXT, path TEXT);
+CREATE TABLE IF NOT EXISTS interfaces (name TEXT, kind TEXT, path TEXT);
+CREATE TABLE IF NOT EXISTS processing_units (name TEXT, path TEXT);
+CREATE TABLE IF NOT EXISTS flows (name TEXT, path TEXT);
+CREATE TABLE IF NOT EXISTS node_types (flow_path TEXT, node_id TEXT, type TEXT, name TEXT);
+CREATE INDEX IF NOT EXISTS models_name ON models(name);
+CREATE INDEX IF NOT EXISTS fields_model ON fields(model);
+CREATE INDEX IF NOT EXISTS node_types_type ON node_types(type);
+"""
+_SEARCH_SQL = (
+    "SELECT path, kind, name, snippet(kb_fts, 3, '[', ']', '…', ?) FROM kb_fts "
+    "WHERE kb_fts MATCH ? ORDER BY rank LIMIT ?"
+)
+_SEARCH_BY_KIND_SQL = (
+    "SELECT path, kind, name, snippet(kb_fts, 3, '[', ']', '…', ?) FROM kb_fts "
+    "WHERE kb_fts MATCH ? AND kind = ? ORDER BY rank LIMIT ?"
+)
+_STRUCTURED_TABLES = ("models", "fields", "interfaces", "processing_units", "flows")
+
+
+@dataclass
+class KbHit:
+    """One search result: where it is and just the matching snippet."""
+
+    path: str
+    kind: str
+    name: str
+    snippet: str
+
+
+@dataclass
+class IndexStats:
+    """What a refresh did."""
+
+    scanned: int = 0
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+
+def classify_kb_path(rel_path: str) -> str:
+    """Document kind from its path relative to the indexed root."""
+    parts = Path(rel_path).parts
+    name = parts[-1]
+    if "designer_flows" in parts:
+        return KIND_DESIGNER_FLOW
+    if name == "1-models.json":
+        return KIND_LLD_MODELS
+    if name == "4-behaviours.json":
+        return KIND_LLD_BEHAVIOURS
+    if "interfaces" in parts:
+        return KIND_INTERFACE
+    if "processing-units" in parts:
+        return KIND_PROCESSING_UNIT
+    if "flows" in parts:
+        return KIND_FLOW
+    if "models" in parts and "specs" in parts:
+        return KIND_MODEL
+    return KIND_DOCUMENT
+
+
+def _iter_flow_nodes(node: Any) -> Iterator[dict]:
+    """Yield Node-RED style nodes (dicts with string id and type) anywhere in a document."""
+    if isinstance(node, dict):
+        if isinstance(node.get("id"), str) and isinstance(node.get("type"), str):
+            yield node
+        for v in node.values():
+            yield from _iter_flow_nodes(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _iter_flow_nodes(v)
+
+
+def _structured_rows(rel_path: str, kind: str, data: Any) -> dict[str, list[tuple]]:
+    """Rows for the structured tables, keyed by table name."""
+    rows: dict[str, list[tuple]] = {t: [] for t in (*_STRUCTURED_TABLES, "node_types")}
+    stem = Path(rel_path).stem
+    obj = data if isinstance(data, dict) else {}
+
+    if kind == KIND_MODEL:
+        for name, schema in ((obj.get("components") or {}).get("schemas") or {}).items():
+            schema = schema if isinstance(schema, dict) else {}
+            rows["models"].append((name, rel_path, str(schema.get("description", ""))))
+            for field, spec in (schema.get("properties") or {}).items():
+                ftype = spec.get("type", "") if isinstance(spec, dict) else ""
+                rows["fields"].append((name, field, str(ftype), rel_path))
+    elif kind == KIND_LLD_MODELS:
+        for name, model in obj.items():
+            model = model if isinstance(model, dict) else {}
+            rows["models"].append((name, rel_path, str(model.get("description", ""))))
+            for field, spec in (model.get("fields") or {}).items():
+                ftype = spec.get("type", "") if isinstance(spec, dict) else ""
+                rows["fields"].append((name, field, str(ftype), rel_path))
+    elif kind == KIND_INTERFACE:
+        side = "async" if "async" in Path(rel_path).parts else "sync"
+        title = (obj.get("info") or {}).get("title") if isinstance(obj.get("info"), dict) else None
+        rows["interfaces"].append((title or stem, side, rel_path))
+    elif kind == KIND_PROCESSING_UNIT:
+        rows["processing_units"].append((obj.get("nodeName") or stem, rel_path))
+    elif kind == KIND_LLD_BEHAVIOURS:
+        for node in obj.get("nodes") or []:
+            if isinstance(node, dict) and (node.get("nodeName") or node.get("behaviourName")):
+                rows["processing_units"].append(
+                    (node.get("nodeName") or node.get("behaviourName"), rel_path)
+                )
+
+    if kind in (KIND_FLOW, KIND_DESIGNER_FLOW):
+        rows["flows"].append((obj.get("componentName") or stem, rel_path))
+        for node in _iter_flow_nodes(data):
+            rows["node_types"].append((rel_path, node["id"], node["type"], node.get("name") or ""))
+    return rows
+
+
+def _indexed_files(root: Path) -> list[Path]:
+    """JSON/MD files under root, skipping hidden pipeline state (snapshots, manifests)."""
+    return sorted(
+        p
+        for p in root.rglob("*")
+        if p.suffix in INDEXED_SUFFIXES
+        and not any(part.startswith(".") for part in p.relative_to(root).parts)
+        and p.is_file()
+    )
+
+
+def _fts_query(query: str, any_term: bool = False) -> str:
+    """Quote each whitespace-separated term so '-' and ':' are taken literally."""
+    terms = [t.replace('"', '""') for t in query.split() if t.strip()]
+    return (" OR " if any_term else " ").join(f'"{t}"' for t in terms)
+
+
+class KbIndex:
+    """Local search index for one root folder (KB and/or data workspace with designer_flows).
+
+    Paths are stored relative to the root, i.e. exactly what read_file_tool expects.
+    """
+
+    def __init__(self, root: str | Path, db_path: str | Path) -> None:
+        self.root = Path(root).resolve()
+        self.db_path = Path(db_path)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.executescript(_SCHEMA)
+            with conn:
+                yield conn
+
+    def _delete(self, conn: sqlite3.Connection, rel_path: str) -> None:
+        conn.execute("DELETE FROM documents WHERE path = ?", (rel_path,))
+        conn.execute("DELETE FROM kb_fts WHERE path = ?", (rel_path,))
+        conn.execute("DELETE FROM node_types WHERE flow_path = ?", (rel_path,))
+        for table in _STRUCTURED_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE path = ?", (rel_path,))  # noqa: S608
+
+    def refresh(self) -> IndexStats:
+        """Bring the index up to date with the files under root.
+
+        Paths with a dot-prefixed component (.generated-snapshots, .lld-manifest.json)
+        are pipeline state, not KB content, and are left out. Files whose mtime and
+        size match the index are skipped without reading; files whose content hash
+        still matches only get their mtime updated. Removed files are dropped from
+        every table.
+        """
+        start = time.perf_counter()
+        stats = IndexStats()
+        files = _indexed_files(self.root)
+        with self._connect() as conn:
+            known = {
+                row[0]: row[1:]
+                for row in conn.execute("SELECT path, mtime, size, sha256 FROM documents")
+            }
+            seen: set[str] = set()
+            for path in files:
+                rel = path.relative_to(self.root).as_posix()
+                seen.add(rel)
+                stats.scanned += 1
+                st = path.stat()
+                entry = known.get(rel)
+                if entry and entry[0] == st.st_mtime and entry[1] == st.st_size:
+                    stats.unchanged += 1
+                    continue
+                raw = path.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                if entry and entry[2] == digest:
+                    conn.execute(
+                        "UPDATE documents SET mtime = ?, size = ? WHERE path = ?",
+                        (st.st_mtime, st.st_size, rel),
+                    )
+                    stats.unchanged += 1
+                    continue
+                if entry:
+                    self._delete(conn, rel)
+                self._index(conn, rel, raw.decode("utf-8", errors="replace"), st, digest)
+                stats.indexed += 1
+            for rel in set(known) - seen:
+                self._delete(conn, rel)
+                stats.removed += 1
+        stats.seconds = time.perf_counter() - start
+        logger.info(
+            "KB index %s: %d scanned, %d indexed, %d unchanged, %d removed in %.3fs",
+            self.root,
+            stats.scanned,
+            stats.indexed,
+            stats.unchanged,
+            stats.removed,
+            stats.seconds,
+        )
+        return stats
+
+    def _index(self, conn: sqlite3.Connection, rel: str, text: str, st: Any, digest: str) -> None:
+        kind = classify_kb_path(rel)
+        data: Any = None
+        if rel.endswith(".json"):
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                logger.warning("KB index: %s is not valid JSON; indexing text only", rel)
+        conn.execute(
+            "INSERT INTO documents (path, kind, mtime, size, sha256) VALUES (?, ?, ?, ?, ?)",
+            (rel, kind, st.st_mtime, st.st_size, digest),
+        )
+        conn.execute(
+            "INSERT INTO kb_fts (path, kind, name, body) VALUES (?, ?, ?, ?)",
+            (rel, kind, Path(rel).stem, text),
+        )
+        if data is None:
+            return
+        for table, rows in _structured_rows(rel, kind, data).items():
+            if rows:
+                marks = ", ".join("?" * len(rows[0]))
+                conn.executemany(f"INSERT INTO {table} VALUES ({marks})", rows)  # noqa: S608
+
+    def search(
+        self, query: str, limit: int = DEFAULT_SEARCH_LIMIT, kind: str | None = None
+    ) -> list[KbHit]:
+        """Full-text search returning only matching snippets, best matches first.
+
+        All terms must match; if nothing does, any-term matches are returned instead.
+        """
+        if not query.split():
+            return []
+        sql = _SEARCH_BY_KIND_SQL if kind else _SEARCH_SQL
+        with self._connect() as conn:
+            for any_term in (False, True):
+                params: list[Any] = [SNIPPET_TOKENS, _fts_query(query, any_term)]
+                params += [kind] if kind else []
+                rows = conn.execute(sql, [*params, limit]).fetchall()
+                if rows:
+                    return [KbHit(*row) for row in rows]
+        return []
+
+    def query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """Run a read-only query against the structured tables (models, fields, ...)."""
+        with self._connect() as conn:
+            return conn.execute(sql, params).fetchall()
+
+
+def format_hits(hits: list[KbHit]) -> str:
+    """Render hits compactly for an agent: one header line plus snippet per hit."""
+    if not hits:
+        return "No matches in the knowledge base."
+    return "\n".join(f"- {h.path} ({h.kind}): {' '.join(h.snippet.split())}" for h in hits)
+
+
+_default_index: KbIndex | None = None
+_default_refreshed_at = 0.0
+_default_refreshing = False
+_default_lock = threading.Lock()
+REFRESH_INTERVAL_SECONDS = 30.0
+
+
+def _refresh_default_index(index: KbIndex) -> None:
+    global _default_refreshed_at, _default_refreshing
+    try:
+        index.refresh()
+    except Exception:
+        logger.exception("KB index refresh failed; serving the previous index")
+    finally:
+        with _default_lock:
+            _default_refreshed_at = time.monotonic()
+            _default_refreshing = False
+
+
+def get_kb_index() -> KbIndex:
+    """Process-wide index over INPUT_DATA_BASE_PATH, at most about 30 seconds stale.
+
+    The first call builds the index. Later calls return at once; when the last refresh
+    is older than REFRESH_INTERVAL_SECONDS they start one on a background thread, and
+    searches keep reading the previous state until it commits (WAL mode).
+    """
+    global _default_index, _default_refreshed_at, _default_refreshing
+    with _default_lock:
+        if _default_index is None:
+            index = KbIndex(INPUT_DATA_BASE_PATH, KB_INDEX_DB_PATH)
+            index.refresh()
+            _default_index, _default_refreshed_at = index, time.monotonic()
+        elif (
+            not _default_refreshing
+            and time.monotonic() - _default_refreshed_at > REFRESH_INTERVAL_SECONDS
+        ):
+            _default_refreshing = True
+            threading.Thread(
+                target=_refresh_default_index,
+                args=(_default_index,),
+                name="kb-index-refresh",
+                daemon=True,
+            ).start()
+        return _default_index
+
+
+def benchmark(index: KbIndex) -> list[dict[str, Any]]:
+    """Compare search_kb against whole-file exploration for each indexed model and flow.
+
+    The baseline is what an agent does today to find an artifact: read every document
+    mentioning its name in full. Tokens use the same chars/4 estimate as record packing.
+    """
+    artifacts = index.query(
+        "SELECT DISTINCT name FROM models UNION SELECT DISTINCT name FROM flows"
+    )
+    report: list[dict[str, Any]] = []
+    for (name,) in artifacts:
+        t0 = time.perf_counter()
+        hits = index.search(name)
+        search_seconds = time.perf_counter() - t0
+        search_tokens = estimate_tokens(format_hits(hits))
+
+        t0 = time.perf_counter()
+        read_tokens = 0
+        for path in _indexed_files(index.root):
+            text = path.read_text(encoding="utf-8", errors="replace")
+            if name in text:
+                read_tokens += estimate_tokens(text)
+        read_seconds = time.perf_counter() - t0
+        report.append(
+            {
+                "artifact": name,
+                "read_tokens": read_tokens,
+                "search_tokens": search_tokens,
+                "read_ms": round(read_seconds * 1000, 2),
+                "search_ms": round(search_seconds * 1000, 2),
+            }
+        )
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI: build/refresh the index, search it, or benchmark it against whole-file reads."""
+    parser = argparse.ArgumentParser(description="Knowledge-base search index.")
+    parser.add_argument("command", choices=["build", "search", "bench"])
+    parser.add_argument("query", nargs="*", help="Search terms (search only)")
+    parser.add_argument("--root", default=INPUT_DATA_BASE_PATH, help="Folder to index")
+    parser.add_argument("--db", default=KB_INDEX_DB_PATH, help="SQLite index file")
+    parser.add_argument("--kind", default=None, help="Restrict search to one document kind")
+    parser.add_argument("--limit", type=int, default=DEFAULT_SEARCH_LIMIT)
+    args = parser.parse_args(argv)
+
+    index = KbIndex(args.root, args.db)
+    stats = index.refresh()
+    if args.command == "build":
+        print(f"{stats.scanned} scanned, {stats.indexed} indexed, {stats.removed} removed")
+    elif args.command == "search":
+        print(format_hits(index.search(" ".join(args.query), args.limit, args.kind)))
+    else:
+        report = benchmark(index)
+        for row in report:
+            print(
+                f"{row['artifact']:<40} tokens {row['read_tokens']:>8} -> "
+                f"{row['search_tokens']:>6}   ms {row['read_ms']:>8} -> {row['search_ms']:>6}"
+            )
+        if report:
+            n = len(report)
+            saved = sum(r["read_tokens"] - r["search_tokens"] for r in report) / n
+            ms = sum(r["read_ms"] - r["search_ms"] for r in report) / n
+            print(f"{n} artifacts: avg {saved:.0f} tokens and {ms:.2f} ms saved per artifact")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
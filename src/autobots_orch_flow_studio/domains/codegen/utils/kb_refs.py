@@ -0,0 +1,207 @@
+# ABOUTME: Local $ref resolver for knowledge-base JSON (interfaces, model specs, flow KGs).
+# ABOUTME: Loads each document once, resolves JSON-pointer fragments and memoizes dereferenced subtrees.
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+logger = get_logger(__name__)
+
+REF_KEY = "$ref"
+
+
+@dataclass(frozen=True)
+class UnresolvedRef:
+    """A $ref left in place because its target could not be loaded or its pointer is missing."""
+
+    source: str
+    ref: str
+    reason: str
+
+
+class KbRefResolver:
+    """Resolve relative and fragment $refs across the JSON documents of one KB root.
+
+    Documents are parsed at most once. Fully dereferenced subtrees are memoized by
+    (document, JSON pointer) so shared targets such as a common model spec are expanded
+    once per resolver. Refs that point back into their own expansion (cycles) and refs
+    whose target is missing are left as the original {"$ref": ...} node and recorded in
+    ``unresolved``.
+
+    Dereferenced values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root).resolve()
+        self._docs: dict[Path, Any] = {}
+        self._memo: dict[tuple[Path, str], Any] = {}
+        self._unresolved: dict[tuple[str, str], UnresolvedRef] = {}
+
+    @property
+    def unresolved(self) -> list[UnresolvedRef]:
+        """Refs that could not be resolved so far, in discovery order."""
+        return list(self._unresolved.values())
+
+    def _path(self, path: str | Path) -> Path:
+        p = Path(path)
+        return (p if p.is_absolute() else self.root / p).resolve()
+
+    def load(self, path: str | Path) -> Any:
+        """Return the parsed document at path (relative to the KB root), parsing it once.
+
+        Raises:
+            OSError: If the file cannot be read.
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        doc_path = self._path(path)
+        if doc_path not in self._docs:
+            self._docs[doc_path] = json.loads(doc_path.read_bytes())
+        return self._docs[doc_path]
+
+    @staticmethod
+    def resolve_pointer(doc: Any, pointer: str) -> Any:
+        """Resolve an RFC 6901 JSON pointer ("" or "/a/b~1c/0") inside doc.
+
+        Raises:
+            KeyError: If a pointer segment does not exist.
+        """
+        node = doc
+        if not pointer:
+            return node
+        if not pointer.startswith("/"):
+            raise KeyError(pointer)
+        for raw in pointer[1:].split("/"):
+            token = raw.replace("~1", "/").replace("~0", "~")
+            if isinstance(node, list):
+                if not token.isdigit() or int(token) >= len(node):
+                    raise KeyError(token)
+                node = node[int(token)]
+            elif isinstance(node, dict) and token in node:
+                node = node[token]
+            else:
+                raise KeyError(token)
+        return node
+
+    def _target(self, ref: str, base: Path) -> tuple[Path, str]:
+        file_part, _, fragment = ref.partition("#")
+        doc_path = (base.parent / file_part).resolve() if file_part else base
+        return doc_path, fragment
+
+    def ref_graph(self, pattern: str = "**/*.json") -> dict[str, set[str]]:
+        """Map each KB document (relative path) to the documents its $refs point at.
+
+        Unreadable documents are skipped; targets are reported even if they do not exist.
+        """
+        graph: dict[str, set[str]] = {}
+        for path in sorted(self.root.glob(pattern)):
+            try:
+                doc = self.load(path)
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping KB document %s: %s", path, e)
+                continue
+            targets: set[str] = set()
+            for ref in _iter_refs(doc):
+                target, _ = self._target(ref, path)
+                if target != path.resolve():
+                    targets.add(_relative(target, self.root))
+            graph[_relative(path, self.root)] = targets
+        return graph
+
+    def dereference(self, path: str | Path, pointer: str = "") -> Any:
+        """Return the subtree at path#pointer with every resolvable $ref inlined.
+
+        Raises:
+            OSError, json.JSONDecodeError: If the starting document cannot be loaded.
+            KeyError: If pointer does not exist in the starting document.
+        """
+        doc_path = self._path(path)
+        value, _ = self._deref_target(doc_path, pointer, ())
+        return value
+
+    def dereference_document(self, path: str | Path) -> Any:
+        """Return the whole document at path with every resolvable $ref inlined."""
+        return self.dereference(path)
+
+    def dereference_json(self, path: str | Path, indent: int | None = 2) -> str:
+        """Dereferenced document serialized for inlining into an agent prompt."""
+        return json.dumps(self.dereference_document(path), indent=indent, ensure_ascii=False)
+
+    def _deref_target(
+        self, doc_path: Path, pointer: str, stack: tuple[tuple[Path, str], ...]
+    ) -> tuple[Any, bool]:
+        """Dereference doc_path#pointer; the flag is True if a cycle cut the expansion short."""
+        key = (doc_path, pointer)
+        if key in self._memo:
+            return self._memo[key], False
+        node = self.resolve_pointer(self.load(doc_path), pointer)
+        value, cut = self._deref_node(node, doc_path, (*stack, key))
+        if not cut:
+            # Results truncated by a cycle depend on the entry point, so only memoize clean ones.
+            self._memo[key] = value
+        return value, cut
+
+    def _deref_node(
+        self, node: Any, base: Path, stack: tuple[tuple[Path, str], ...]
+    ) -> tuple[Any, bool]:
+        if isinstance(node, list):
+            items = [self._deref_node(item, base, stack) for item in node]
+            return [v for v, _ in items], any(c for _, c in items)
+        if not isinstance(node, dict):
+            return node, False
+
+        ref = node.get(REF_KEY)
+        if isinstance(ref, str):
+            return self._deref_ref(node, ref, base, stack)
+
+        out: dict[str, Any] = {}
+        cut = False
+        for k, v in node.items():
+            out[k], c = self._deref_node(v, base, stack)
+            cut = cut or c
+        return out, cut
+
+    def _deref_ref(
+        self, node: dict, ref: str, base: Path, stack: tuple[tuple[Path, str], ...]
+    ) -> tuple[Any, bool]:
+        target = self._target(ref, base)
+        if target in stack:
+            return node, True
+        source = _relative(base, self.root)
+        try:
+            value, cut = self._deref_target(*target, stack)
+        except (OSError, ValueError) as e:
+            return self._unresolvable(node, source, ref, f"{type(e).__name__}: {e}"), False
+        except KeyError as e:
+            return self._unresolvable(node, source, ref, f"pointer segment {e} not found"), False
+
+        siblings = {k: v for k, v in node.items() if k != REF_KEY}
+        if siblings and isinstance(value, dict):
+            extra, c = self._deref_node(siblings, base, stack)
+            return {**value, **extra}, cut or c
+        return value, cut
+
+    def _unresolvable(self, node: dict, source: str, ref: str, reason: str) -> dict:
+        self._unresolved.setdefault((source, ref), UnresolvedRef(source, ref, reason))
+        return node
+
+
+def _iter_refs(node: Any):
+    if isinstance(node, dict):
+        ref = node.get(REF_KEY)
+        if isinstance(ref, str):
+            yield ref
+        for v in node.values():
+            yield from _iter_refs(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _iter_refs(v)
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return path.resolve().relative_to(root).as_posix()
+    except ValueError:
+        return str(path)
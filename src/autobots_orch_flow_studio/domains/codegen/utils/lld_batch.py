@@ -0,0 +1,273 @@
+# ABOUTME: Convert many feature LLD markdown files to structured JSON across a process pool.
+# ABOUTME: Skips sources whose hash matches the manifest and only rewrites files whose content changed.
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+from autobots_orch_flow_studio.configs.constants import (
+    INPUT_DATA_BASE_PATH,
+    LLD_JSON_SUBDIR,
+    LLD_SPLIT_MD_SUBDIR,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_models_to_json import (
+    convert_lld_section_to_json,
+    dump_structured_json,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_pipeline import write_text_if_changed
+from autobots_orch_flow_studio.domains.codegen.utils.lld_processor import split_lld_md_content
+
+logger = get_logger(__name__)
+
+# Output layout per feature: {out_root}/{md_stem}/json/*.json (+ lld-split/*.md when requested)
+MANIFEST_FILENAME = ".lld-manifest.json"
+DEFAULT_OUTPUT_ROOT = Path(INPUT_DATA_BASE_PATH)
+
+STATUS_CONVERTED = "converted"
+STATUS_UNCHANGED = "unchanged"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class LldConversionResult:
+    """Outcome of converting one LLD source."""
+
+    source: str
+    status: str
+    seconds: float = 0.0
+    sha256: str = ""
+    written: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def collect_lld_sources(inputs: list[str | Path]) -> list[Path]:
+    """Expand files and folders into a sorted, de-duplicated list of LLD markdown files.
+
+    Folders contribute their top-level *.md files (one feature LLD per file).
+
+    Raises:
+        FileNotFoundError: If an input is neither a file nor a directory.
+    """
+    sources: set[Path] = set()
+    for item in inputs:
+        path = Path(item).resolve()
+        if path.is_dir():
+            sources.update(p for p in path.glob("*.md") if p.is_file())
+        elif path.is_file():
+            sources.add(path)
+        else:
+            raise FileNotFoundError(f"LLD source not found: {path}")
+    return sorted(sources)
+
+
+def load_manifest(manifest_path: Path) -> dict[str, dict]:
+    """Load {source path: {sha256, outputs}} from the manifest; empty if missing or unreadable."""
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_manifest(manifest_path: Path, manifest: dict[str, dict]) -> None:
+    """Write the manifest atomically (temp file + rename)."""
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_suffix(f"{manifest_path.suffix}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(manifest_path)
+
+
+def _is_up_to_date(entry: dict | None, sha256: str) -> bool:
+    if not entry or entry.get("sha256") != sha256:
+        return False
+    return all(Path(p).is_file() for p in entry.get("outputs") or [])
+
+
+def _prune_sections(directory: Path, suffix: str, keep: set[str]) -> list[str]:
+    """Delete section files in directory that this conversion did not write."""
+    removed: list[str] = []
+    for path in sorted(directory.glob(f"*{suffix}")) if directory.is_dir() else []:
+        if str(path) not in keep:
+            path.unlink()
+            removed.append(str(path))
+    return removed
+
+
+def convert_lld_source(
+    source: str, out_root: str, write_split: bool = False
+) -> LldConversionResult:
+    """Convert one LLD markdown file into {out_root}/{stem}/json, writing only changed files.
+
+    Section files left from an earlier conversion whose section is gone are deleted
+    (lld-split only when write_split is set). Runs inside pool workers, so it never
+    raises: failures come back as STATUS_FAILED.
+    """
+    start = time.perf_counter()
+    src = Path(source)
+    try:
+        raw = src.read_bytes()
+        sections = split_lld_md_content(raw.decode("utf-8"))
+        feature_dir = Path(out_root, src.stem)
+
+        outputs: list[str] = []
+        written: list[str] = []
+        for slug, text in sections.items():
+            targets = [
+                (
+                    feature_dir / LLD_JSON_SUBDIR / f"{slug}.json",
+                    dump_structured_json(convert_lld_section_to_json(slug, text)),
+                )
+            ]
+            if write_split:
+                targets.append((feature_dir / LLD_SPLIT_MD_SUBDIR / f"{slug}.md", text))
+            for path, content in targets:
+                outputs.append(str(path))
+                if write_text_if_changed(path, content):
+                    written.append(str(path))
+
+        keep = set(outputs)
+        removed = _prune_sections(feature_dir / LLD_JSON_SUBDIR, ".json", keep)
+        if write_split:
+            removed += _prune_sections(feature_dir / LLD_SPLIT_MD_SUBDIR, ".md", keep)
+
+        return LldConversionResult(
+            source=source,
+            status=STATUS_CONVERTED if written or removed else STATUS_UNCHANGED,
+            seconds=time.perf_counter() - start,
+            sha256=hashlib.sha256(raw).hexdigest(),
+            written=written,
+            outputs=outputs,
+            removed=removed,
+        )
+    except Exception as e:
+        return LldConversionResult(
+            source=source,
+            status=STATUS_FAILED,
+            seconds=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+
+
+def convert_lld_sources(
+    inputs: list[str | Path],
+    out_root: str | Path = DEFAULT_OUTPUT_ROOT,
+    manifest_path: str | Path | None = None,
+    max_workers: int | None = None,
+    write_split: bool = False,
+    force: bool = False,
+) -> list[LldConversionResult]:
+    """Convert many LLD sources in parallel, skipping those whose hash matches the manifest.
+
+    Each source is written to {out_root}/{stem}, so sources sharing a file name stem
+    (e.g. a/MER-1.md and b/MER-1.md) would overwrite each other; they fail instead.
+
+    Args:
+        inputs: LLD markdown files and/or folders containing them.
+        out_root: Root under which each feature gets {stem}/json (and {stem}/lld-split).
+        manifest_path: Manifest location (default {out_root}/.lld-manifest.json).
+        max_workers: Process pool size (default: os.cpu_count()).
+        write_split: Also write the split section markdown files.
+        force: Ignore the manifest and convert every source.
+
+    Returns:
+        One result per source, in source order.
+    """
+    out_root = Path(out_root).resolve()
+    manifest_file = Path(manifest_path) if manifest_path else out_root / MANIFEST_FILENAME
+    manifest = load_manifest(manifest_file)
+
+    sources = collect_lld_sources(inputs)
+    by_stem: dict[str, list[Path]] = {}
+    for src in sources:
+        by_stem.setdefault(src.stem, []).append(src)
+
+    results: dict[str, LldConversionResult] = {}
+    pending: list[str] = []
+    for src in sources:
+        key = str(src)
+        if len(by_stem[src.stem]) > 1:
+            others = ", ".join(str(p) for p in by_stem[src.stem] if p != src)
+            error = f"Feature folder '{src.stem}' is also the output of {others}"
+            results[key] = LldConversionResult(source=key, status=STATUS_FAILED, error=error)
+            continue
+        try:
+            digest = _sha256(src)
+        except OSError as e:
+            results[key] = LldConversionResult(source=key, status=STATUS_FAILED, error=str(e))
+            continue
+        if not force and _is_up_to_date(manifest.get(key), digest):
+            results[key] = LldConversionResult(source=key, status=STATUS_SKIPPED, sha256=digest)
+        else:
+            pending.append(key)
+
+    if pending:
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(convert_lld_source, key, str(out_root), write_split) for key in pending
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.source] = result
+                if result.status != STATUS_FAILED:
+                    manifest[result.source] = {"sha256": result.sha256, "outputs": result.outputs}
+        save_manifest(manifest_file, manifest)
+
+    ordered = [results[key] for key in sorted(results)]
+    for r in ordered:
+        if r.status == STATUS_FAILED:
+            logger.error("LLD %s failed after %.3fs: %s", r.source, r.seconds, r.error)
+        else:
+            logger.info(
+                "LLD %s %s in %.3fs (%d files written)",
+                r.source,
+                r.status,
+                r.seconds,
+                len(r.written),
+            )
+    return ordered
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI entry point. Returns a non-zero exit code if any source failed."""
+    parser = argparse.ArgumentParser(description="Convert feature LLD markdown files to JSON.")
+    parser.add_argument("inputs", nargs="+", help="LLD .md files or folders containing them")
+    parser.add_argument("--out-dir", default=str(DEFAULT_OUTPUT_ROOT), help="Output root folder")
+    parser.add_argument("--manifest", default=None, help="Manifest path (default: in out-dir)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--split", action="store_true", help="Also write lld-split/*.md")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest")
+    args = parser.parse_args(argv)
+
+    results = convert_lld_sources(
+        args.inputs,
+        out_root=args.out_dir,
+        manifest_path=args.manifest,
+        max_workers=args.workers,
+        write_split=args.split,
+        force=args.force,
+    )
+    for r in results:
+        detail = r.error if r.error else f"{len(r.written)} written"
+        print(f"{r.status:<10} {r.seconds:8.3f}s  {r.source}  ({detail})")
+    failed = sum(r.status == STATUS_FAILED for r in results)
+    print(f"{len(results)} sources, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
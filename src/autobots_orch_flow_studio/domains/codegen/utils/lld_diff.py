@@ -0,0 +1,206 @@
+# ABOUTME: Structural diff of LLD JSON (1-models.json, 2-sync-methods.json) against the last
+# ABOUTME: successfully generated snapshot, so generators only re-run added and changed units.
+
+import json
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+from autobots_devtools_shared_lib.dynagent import BatchResult
+
+from autobots_orch_flow_studio.configs.constants import (
+    GENERATION_SNAPSHOT_SUBDIR,
+    INPUT_DATA_BASE_PATH,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.model_graph import model_dependencies
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class StructuralDiff:
+    """Top-level units (models, endpoints) of a source JSON compared with its snapshot.
+
+    changed maps each changed unit to the dotted paths that differ, e.g.
+    "fields.partyId.type" or "fields.status (added)".
+    """
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: dict[str, list[str]] = field(default_factory=dict)
+    unchanged: list[str] = field(default_factory=list)
+    order: list[str] = field(default_factory=list, repr=False)
+
+    @property
+    def regenerate(self) -> list[str]:
+        """Units that need a generator run, in source order (added and changed)."""
+        added = set(self.added)
+        return [u for u in self.order if u in added or u in self.changed]
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.added)} added, {len(self.changed)} changed, "
+            f"{len(self.removed)} removed, {len(self.unchanged)} unchanged"
+        )
+
+
+def diff_paths(old: Any, new: Any, prefix: str = "") -> list[str]:
+    """Dotted paths at which two JSON values differ; objects are compared key by key."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        paths: list[str] = []
+        for key in old.keys() | new.keys():
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if key not in old:
+                paths.append(f"{path} (added)")
+            elif key not in new:
+                paths.append(f"{path} (removed)")
+            else:
+                paths.extend(diff_paths(old[key], new[key], path))
+        return sorted(paths)
+    return [] if old == new else [prefix or "(root)"]
+
+
+def diff_units(old: dict | None, new: dict) -> StructuralDiff:
+    """Compare top-level units of new against old; with no snapshot everything is added."""
+    old = old or {}
+    diff = StructuralDiff(order=list(new))
+    for unit, value in new.items():
+        if unit not in old:
+            diff.added.append(unit)
+            continue
+        paths = diff_paths(old[unit], value)
+        if paths:
+            diff.changed[unit] = paths
+        else:
+            diff.unchanged.append(unit)
+    diff.removed = [unit for unit in old if unit not in new]
+    return diff
+
+
+def diff_models(old: dict | None, new: dict) -> StructuralDiff:
+    """diff_units for 1-models.json, plus models whose references an add/remove re-targets.
+
+    A field typed as another model renders as a $ref only while that model exists, so a
+    model referencing an added or removed model changes even if its own JSON did not.
+    """
+    diff = diff_units(old, new)
+    touched = set(diff.added) | set(diff.removed)
+    if not touched:
+        return diff
+    old_deps = model_dependencies(old or {})
+    new_deps = model_dependencies(new)
+    for unit in list(diff.unchanged):
+        refs = sorted((new_deps.get(unit, set()) | old_deps.get(unit, set())) & touched)
+        if refs:
+            diff.unchanged.remove(unit)
+            diff.changed[unit] = [f"references {ref}" for ref in refs]
+    return diff
+
+
+def commit_snapshot(
+    old: dict | None, new: dict, regenerated: Iterable[str], succeeded: Iterable[str]
+) -> dict:
+    """Snapshot to store after a run: new for unchanged and succeeded units.
+
+    A unit that was regenerated but failed keeps its previous value when that differs,
+    and is left out otherwise (new, or only changed through references), so the next
+    run picks it up again. Removed units are dropped.
+    """
+    old = old or {}
+    failed = set(regenerated) - set(succeeded)
+    snapshot: dict = {}
+    for unit, value in new.items():
+        if unit not in failed:
+            snapshot[unit] = value
+        elif unit in old and old[unit] != value:
+            snapshot[unit] = old[unit]
+    return snapshot
+
+
+class SnapshotStore:
+    """Last successfully generated copy of each LLD source JSON for one feature folder.
+
+    Stored as {base_path}/{filename}/.generated-snapshots/{source name}.
+    """
+
+    def __init__(self, filename: str, base_path: str | Path = INPUT_DATA_BASE_PATH) -> None:
+        self.dir = Path(base_path, filename, GENERATION_SNAPSHOT_SUBDIR)
+
+    def load(self, source: str) -> dict | None:
+        """Snapshot for source (e.g. "1-models.json"), or None if there is none."""
+        try:
+            data = json.loads((self.dir / source).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {self.dir / source}: {e}")
+            return None
+        return data if isinstance(data, dict) else None
+
+    def save(self, source: str, data: dict) -> None:
+        """Write the snapshot atomically (temp file + rename)."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.dir / source
+        tmp = path.with_suffix(f"{path.suffix}.tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+
+def remove_outputs(paths: Iterable[Path]) -> list[Path]:
+    """Delete generated files for removed units; returns the files that existed."""
+    removed: list[Path] = []
+    for path in paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        removed.append(path)
+        logger.info(f"Removed stale output {path}")
+    return removed
+
+
+@dataclass
+class IncrementalRun:
+    """One generator run over the units of a source JSON that differ from its snapshot.
+
+    Build it with start_incremental, generate records for diff.regenerate (in that
+    order), then call finish with the batch result to store the new snapshot.
+    """
+
+    store: SnapshotStore
+    source: str
+    previous: dict | None
+    current: dict
+    diff: StructuralDiff
+
+    def finish(self, result: BatchResult) -> None:
+        """Record units whose record succeeded as generated; failed ones stay pending."""
+        regenerate = self.diff.regenerate
+        succeeded = [
+            regenerate[r.index] for r in result.results if r.success and r.index < len(regenerate)
+        ]
+        snapshot = commit_snapshot(self.previous, self.current, regenerate, succeeded)
+        self.store.save(self.source, snapshot)
+        logger.info(
+            f"Snapshot {self.source}: {len(succeeded)}/{len(regenerate)} regenerated units stored"
+        )
+
+
+def start_incremental(
+    filename: str,
+    source: str,
+    current: dict,
+    differ: Callable[[dict | None, dict], StructuralDiff] = diff_units,
+    base_path: str | Path = INPUT_DATA_BASE_PATH,
+) -> IncrementalRun:
+    """Diff current (the parsed source JSON) against the feature's stored snapshot."""
+    store = SnapshotStore(filename, base_path)
+    previous = store.load(source)
+    diff = differ(previous, current)
+    logger.info(f"{filename}/{source} vs last generated snapshot: {diff.summary()}")
+    return IncrementalRun(store, source, previous, current, diff)
@@ -287,15 +287,12 @@ def convert_models_md_to_json(md_path: Path) -> dict:
     return _parse_models_md(text)
 
 
-def _convert_lld_md_to_structured_json(md_path: Path) -> dict:
-    """Convert a single LLD markdown file to a structured object (no raw content string).
+def convert_lld_section_to_json(stem: str, text: str) -> dict:
+    """Convert one LLD section's markdown text to a structured object (no raw content string).
 
-    Dispatches by file stem: models -> model schema; 0-background, 2-sync-methods, etc.
+    Dispatches by section stem: 1-models -> model schema; 0-background, 2-sync-methods, etc.
     -> typed object with sections or table rows as arrays of objects.
     """
-    text = md_path.read_text(encoding="utf-8")
-    stem = md_path.stem
-
     # 1-models: model schema (existing parser)
     if stem == "1-models":
         data = _parse_models_md(text)
@@ -316,6 +313,16 @@ def _convert_lld_md_to_structured_json(md_path: Path) -> dict:
     return {"type": "markdown", "content": text}
 
 
+def dump_structured_json(data: dict) -> str:
+    """Serialize a structured LLD object the way the json/ folder stores it."""
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _convert_lld_md_to_structured_json(md_path: Path) -> dict:
+    """Convert a single LLD markdown file to a structured object, dispatching on its stem."""
+    return convert_lld_section_to_json(md_path.stem, md_path.read_text(encoding="utf-8"))
+
+
 def lld_folder_to_json_folder(input_folder: str | Path) -> Path:
     """Convert all markdown files in input_folder to JSON in a sibling json/ folder.
 
@@ -349,10 +356,7 @@ def lld_folder_to_json_folder(input_folder: str | Path) -> Path:
         json_file = out_dir / f"{md_file.stem}.json"
         try:
             data = _convert_lld_md_to_structured_json(md_file)
-            json_file.write_text(
-                json.dumps(data, indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            json_file.write_text(dump_structured_json(data), encoding="utf-8")
         except Exception as e:
             warnings.warn(f"Skipping {md_file}: {e}", stacklevel=0)
 
@@ -0,0 +1,92 @@
+# ABOUTME: In-memory LLD pipeline: source MD -> structured JSON dict per first-level section.
+# ABOUTME: Split MD and JSON files are optional sinks; nothing is re-read from disk.
+
+from pathlib import Path
+
+from autobots_orch_flow_studio.domains.codegen.utils.lld_models_to_json import (
+    convert_lld_section_to_json,
+    dump_structured_json,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_processor import (
+    resolve_lld_md_path,
+    split_lld_md_content,
+    write_lld_sections,
+)
+
+
+def convert_lld_content(content: str) -> dict[str, dict]:
+    """Convert LLD markdown content to {section slug: structured JSON} entirely in memory.
+
+    Sections are split with split_by_first_level_headers and each one is dispatched on its
+    slug (0-background, 1-models, 2-sync-methods, ...) exactly like the on-disk pipeline.
+
+    Args:
+        content: Full LLD markdown text.
+
+    Returns:
+        Ordered dict keyed by section slug (the stem the split file would have had).
+    """
+    sections = split_lld_md_content(content)
+    return {slug: convert_lld_section_to_json(slug, text) for slug, text in sections.items()}
+
+
+def write_text_if_changed(path: Path, text: str) -> bool:
+    """Write text to path unless the file already holds exactly that text.
+
+    Leaving unchanged files untouched keeps their mtime stable, so file watchers and
+    generators downstream do not re-trigger. Returns True if the file was written.
+    """
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def write_structured_json(data: dict[str, dict], json_dir: str | Path) -> list[Path]:
+    """Write {slug: structured JSON} as {json_dir}/{slug}.json, skipping unchanged files.
+
+    Returns:
+        Paths of the files that were actually written.
+    """
+    out_dir = Path(json_dir)
+    written: list[Path] = []
+    for slug, obj in data.items():
+        json_file = out_dir / f"{slug}.json"
+        if write_text_if_changed(json_file, dump_structured_json(obj)):
+            written.append(json_file)
+    return written
+
+
+def convert_lld_md(
+    filename: str | Path,
+    split_dir: str | Path | None = None,
+    json_dir: str | Path | None = None,
+) -> dict[str, dict]:
+    """Read one LLD markdown file and return its structured JSON per section.
+
+    The source is read once; split MD and JSON files are only written when the
+    corresponding sink directory is given.
+
+    Args:
+        filename: Source markdown file, relative to INPUT_LLD_DIR or absolute.
+        split_dir: Optional directory to write {slug}.md sections to (e.g. .../lld-split).
+        json_dir: Optional directory to write {slug}.json objects to (e.g. .../json).
+
+    Returns:
+        Ordered dict keyed by section slug.
+
+    Raises:
+        FileNotFoundError: If the source file does not exist.
+    """
+    content = resolve_lld_md_path(filename).read_text(encoding="utf-8")
+    sections = split_lld_md_content(content)
+    if split_dir is not None:
+        write_lld_sections(sections, split_dir)
+
+    data = {slug: convert_lld_section_to_json(slug, text) for slug, text in sections.items()}
+    if json_dir is not None:
+        write_structured_json(data, json_dir)
+    return data
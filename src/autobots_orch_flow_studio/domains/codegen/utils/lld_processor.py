@@ -46,47 +46,65 @@ def split_by_first_level_headers(content: str) -> list[tuple[str, str]]:
     return sections
 
 
-def process_lld_md(filename: str | Path) -> Path:
-    """Read an MD file, split by first-level headers, write one MD per section into a named folder.
-
-    Output folder is {LLD_SPLIT_OUTPUT_BASE_DIR}/{md_stem}/. Each section is written as
-    {slug}.md. Returns the output directory path.
-
-    Args:
-        md_path: Path to the source markdown file.
-
-    Returns:
-        Path to the created output directory (named after the MD file).
+def resolve_lld_md_path(filename: str | Path) -> Path:
+    """Resolve an LLD markdown filename against INPUT_LLD_DIR (absolute paths pass through).
 
     Raises:
-        FileNotFoundError: If md_path does not exist.
+        FileNotFoundError: If the resolved path does not exist.
     """
-    md_path = Path(INPUT_LLD_DIR, filename)
-    path = Path(md_path)
+    path = Path(INPUT_LLD_DIR, filename)
     if not path.exists():
         raise FileNotFoundError(f"MD file not found: {path}")
+    return path
 
-    content = path.read_text(encoding="utf-8")
-    sections = split_by_first_level_headers(content)
 
-    stem = path.stem
-    out_dir = Path(LLD_SPLIT_OUTPUT_BASE_DIR, stem)
-    out_dir.mkdir(parents=True, exist_ok=True)
+def split_lld_md_content(content: str) -> dict[str, str]:
+    """Split markdown content into {slug: section markdown}, in document order, without disk I/O.
 
-    for i, (title, body) in enumerate(sections):
+    Slugs are derived from the H1 title (e.g. "1. Models" -> "1-models"). Duplicate slugs
+    get a -1, -2, ... suffix, resolved in memory.
+    """
+    out: dict[str, str] = {}
+    for i, (title, body) in enumerate(split_by_first_level_headers(content)):
         slug = _slugify(title) if title else "intro"
         if not slug:
             slug = f"section-{i:02d}"
-        out_file = out_dir / f"{slug}.md"
+        unique = slug
         counter = 0
-        while out_file.exists():
+        while unique in out:
             counter += 1
-            out_file = out_dir / f"{slug}-{counter}.md"
+            unique = f"{slug}-{counter}"
+        out[unique] = f"# {title}\n\n{body}\n" if title else f"{body}\n"
+    return out
+
+
+def write_lld_sections(sections: dict[str, str], out_dir: str | Path) -> Path:
+    """Write {slug: markdown} sections as {out_dir}/{slug}.md. Returns out_dir."""
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    for slug, text in sections.items():
+        (out_path / f"{slug}.md").write_text(text, encoding="utf-8")
+    return out_path
 
-        full_content = f"# {title}\n\n{body}\n" if title else f"{body}\n"
-        out_file.write_text(full_content, encoding="utf-8")
 
-    return out_dir
+def process_lld_md(filename: str | Path) -> Path:
+    """Read an MD file, split by first-level headers, write one MD per section into a named folder.
+
+    Output folder is {LLD_SPLIT_OUTPUT_BASE_DIR}/{md_stem}/. Each section is written as
+    {slug}.md. Returns the output directory path.
+
+    Args:
+        filename: Source markdown file, relative to INPUT_LLD_DIR or absolute.
+
+    Returns:
+        Path to the created output directory (named after the MD file).
+
+    Raises:
+        FileNotFoundError: If the source file does not exist.
+    """
+    path = resolve_lld_md_path(filename)
+    sections = split_lld_md_content(path.read_text(encoding="utf-8"))
+    return write_lld_sections(sections, Path(LLD_SPLIT_OUTPUT_BASE_DIR, path.stem))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+# ABOUTME: Model reference graph for 1-models.json: which models a model's field types point at.
+# ABOUTME: Produces topological generation levels and reports reference cycles.
+
+import re
+from dataclasses import dataclass, field
+
+# Identifiers inside a type string, e.g. "List<PartyDtl>", "PartyDtl[]", "Map<String, Addr>".
+_TYPE_TOKEN_RE = re.compile(r"[A-Za-z_]\w*")
+
+
+@dataclass
+class ModelSchedule:
+    """Generation order for a set of models.
+
+    levels: Models grouped so every model's references appear in an earlier level.
+        Models in one level are independent and can be generated in parallel.
+    cycles: Models on (or between) reference cycles. They are scheduled together in
+        the last level since no order satisfies their references.
+    dependencies: Model name -> names of other models its fields reference.
+    """
+
+    levels: list[list[str]] = field(default_factory=list)
+    cycles: list[str] = field(default_factory=list)
+    dependencies: dict[str, set[str]] = field(default_factory=dict)
+
+
+def referenced_models(type_str: str, model_names: set[str]) -> set[str]:
+    """Return the model names mentioned in a field type string."""
+    return {t for t in _TYPE_TOKEN_RE.findall(type_str or "") if t in model_names}
+
+
+def model_dependencies(models: dict) -> dict[str, set[str]]:
+    """Build {model: referenced models} from parsed 1-models.json (self-references ignored)."""
+    names = set(models)
+    deps: dict[str, set[str]] = {}
+    for name, model in models.items():
+        fields = (model or {}).get("fields") or {}
+        refs: set[str] = set()
+        for spec in fields.values():
+            if isinstance(spec, dict):
+                refs |= referenced_models(str(spec.get("type", "")), names)
+        refs.discard(name)
+        deps[name] = refs
+    return deps
+
+
+def _cycle_members(remaining: set[str], deps: dict[str, set[str]]) -> set[str]:
+    """Strip nodes that only hang off cycles (nothing left depends on them); the rest are cyclic."""
+    members = set(remaining)
+    changed = True
+    while changed:
+        changed = False
+        for node in list(members):
+            if not any(node in deps[other] for other in members if other != node):
+                members.discard(node)
+                changed = True
+    return members
+
+
+def schedule_models(models: dict) -> ModelSchedule:
+    """Compute topological generation levels (Kahn's algorithm) for parsed 1-models.json.
+
+    Level order follows the input order of the models inside each level, so runs are
+    deterministic. Models that cannot be ordered because of reference cycles go in a
+    final level and are listed in ModelSchedule.cycles.
+    """
+    deps = model_dependencies(models)
+    order = {name: i for i, name in enumerate(models)}
+    pending = {name: set(refs) for name, refs in deps.items()}
+    dependants: dict[str, set[str]] = {name: set() for name in deps}
+    for name, refs in deps.items():
+        for ref in refs:
+            dependants[ref].add(name)
+
+    levels: list[list[str]] = []
+    ready = sorted((n for n, refs in pending.items() if not refs), key=order.__getitem__)
+    done: set[str] = set()
+    while ready:
+        levels.append(ready)
+        done.update(ready)
+        nxt: set[str] = set()
+        for name in ready:
+            for dependant in dependants[name]:
+                pending[dependant].discard(name)
+                if not pending[dependant] and dependant not in done:
+                    nxt.add(dependant)
+        ready = sorted(nxt, key=order.__getitem__)
+
+    remaining = set(deps) - done
+    cycles: list[str] = []
+    if remaining:
+        cycles = sorted(_cycle_members(remaining, deps), key=order.__getitem__)
+        levels.append(sorted(remaining, key=order.__getitem__))
+    return ModelSchedule(levels=levels, cycles=cycles, dependencies=deps)
@@ -0,0 +1,195 @@
+# ABOUTME: Deterministic model OAS spec generation from parsed 1-models.json (no LLM).
+# ABOUTME: Maps types and constraints, builds required lists and x-fbp-params, validates the result.
+
+import json
+import re
+from typing import Any
+
+from jsonschema import Draft7Validator
+
+from autobots_orch_flow_studio.domains.codegen.utils.artifact_validation import default_registry
+
+MODEL_OAS_KIND = "model_oas"
+
+# LLD type (lower-cased, generics stripped) -> (OAS type, format)
+_SCALAR_TYPES: dict[str, tuple[str, str | None]] = {
+    "string": ("string", None),
+    "str": ("string", None),
+    "char": ("string", None),
+    "text": ("string", None),
+    "uuid": ("string", "uuid"),
+    "date": ("string", "date"),
+    "datetime": ("string", "date-time"),
+    "timestamp": ("string", "date-time"),
+    "time": ("string", "time"),
+    "int": ("integer", None),
+    "integer": ("integer", None),
+    "long": ("integer", None),
+    "short": ("integer", None),
+    "number": ("number", None),
+    "decimal": ("number", None),
+    "bigdecimal": ("number", None),
+    "double": ("number", None),
+    "float": ("number", None),
+    "boolean": ("boolean", None),
+    "bool": ("boolean", None),
+    "object": ("object", None),
+    "map": ("object", None),
+    "json": ("object", None),
+    "array": ("array", None),
+    "list": ("array", None),
+}
+_ARRAY_RE = re.compile(r"^(?:list|array|set)\s*<\s*(.+)\s*>$|^(.+)\[\]$", re.IGNORECASE)
+_INT_CONSTRAINTS = ("maxLength", "minLength", "maxItems", "minItems")
+_NUM_CONSTRAINTS = ("maximum", "minimum")
+_STR_CONSTRAINTS = ("format", "pattern")
+_CONSTRAINT_KEYS = {k.lower(): k for k in (*_INT_CONSTRAINTS, *_NUM_CONSTRAINTS, *_STR_CONSTRAINTS)}
+
+
+def parse_field_properties(raw: Any) -> dict[str, Any]:
+    """Parse loose LLD constraint strings such as "{maxLength: 12, format: date-time}".
+
+    Accepts dicts, strict JSON and the unquoted key: value form. Values become int,
+    float, bool or string; unparseable parts are ignored.
+    """
+    if isinstance(raw, dict):
+        return dict(raw)
+    text = str(raw or "").strip()
+    if not text:
+        return {}
+    try:
+        parsed = json.loads(text)
+        return parsed if isinstance(parsed, dict) else {}
+    except json.JSONDecodeError:
+        pass
+    out: dict[str, Any] = {}
+    for part in text.strip("{} ").split(","):
+        key, sep, value = part.partition(":")
+        if not sep:
+            continue
+        key, value = key.strip().strip("'\""), value.strip().strip("'\"")
+        out[key] = _coerce(value)
+    return out
+
+
+def _coerce(value: str) -> Any:
+    lowered = value.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            continue
+    return value
+
+
+def map_field_type(type_str: str, model_names: set[str] | frozenset[str] = frozenset()) -> dict:
+    """Map an LLD field type to OAS type (+format, +items for arrays).
+
+    Known models map to "object"; unknown type names fall back to "string".
+    """
+    t = (type_str or "").strip()
+    array = _ARRAY_RE.match(t)
+    if array:
+        inner = (array.group(1) or array.group(2) or "").strip()
+        return {"type": "array", "items": map_field_type(inner, model_names)}
+    if t in model_names:
+        return {"type": "object"}
+    oas_type, fmt = _SCALAR_TYPES.get(t.lower().replace("_", ""), ("string", None))
+    return {"type": oas_type, **({"format": fmt} if fmt else {})}
+
+
+def _flag(value: Any) -> bool:
+    return value is True or str(value).strip().lower() in ("true", "yes", "y", "1")
+
+
+def build_property_spec(field: dict, model_names: set[str] | frozenset[str] = frozenset()) -> dict:
+    """Build one propertySpec from an LLD field definition."""
+    spec = map_field_type(str(field.get("type", "")), model_names)
+    for key, value in parse_field_properties(field.get("properties")).items():
+        canonical = _CONSTRAINT_KEYS.get(key.lower())
+        if canonical in _INT_CONSTRAINTS and isinstance(value, int | float):
+            spec[canonical] = int(value)
+        elif canonical in _NUM_CONSTRAINTS and isinstance(value, int | float):
+            spec[canonical] = value
+        elif canonical in _STR_CONSTRAINTS:
+            spec[canonical] = str(value)
+
+    description = str(field.get("description") or "").strip()
+    spec["description"] = description
+    required = _flag(field.get("mandatory"))
+    if required:
+        spec["required"] = True
+    if description:
+        spec["businessName"] = description
+
+    fbp: dict[str, Any] = {"businessKey": _flag(field.get("businessKey")), "mandatory": required}
+    if description:
+        fbp["businessName"] = description
+    if "type" in field:
+        fbp["sourceType"] = field["type"]
+    spec["x-fbp-params"] = fbp
+    return spec
+
+
+def build_model_oas_spec(
+    name: str, model: dict, model_names: set[str] | frozenset[str] = frozenset()
+) -> dict:
+    """Build the model OAS spec (modelName, description, required, properties) for one model.
+
+    Descriptions come from the LLD; empty ones are left "" for describe_missing to fill.
+    """
+    fields = (model or {}).get("fields") or {}
+    properties = {
+        field_name: build_property_spec(field if isinstance(field, dict) else {}, model_names)
+        for field_name, field in fields.items()
+    }
+    return {
+        "modelName": name,
+        "description": str((model or {}).get("description") or "").strip(),
+        "required": [n for n, spec in properties.items() if spec.get("required")],
+        "properties": properties,
+    }
+
+
+def build_model_oas_specs(models: dict) -> dict[str, dict]:
+    """Model OAS spec per model in parsed 1-models.json, in source order."""
+    names = set(models)
+    return {name: build_model_oas_spec(name, model, names) for name, model in models.items()}
+
+
+def missing_descriptions(spec: dict) -> list[str]:
+    """Free-text gaps an LLM should fill: "" for the model, else property names."""
+    gaps = [""] if not spec.get("description") else []
+    gaps += [n for n, p in spec.get("properties", {}).items() if not p.get("description")]
+    return gaps
+
+
+def apply_descriptions(spec: dict, descriptions: dict[str, str]) -> dict:
+    """Fill empty descriptions from {"" or property name: text}; never overwrites LLD text."""
+    if not spec.get("description") and descriptions.get(""):
+        spec["description"] = descriptions[""].strip()
+    for name, prop in spec.get("properties", {}).items():
+        text = (descriptions.get(name) or "").strip()
+        if not prop.get("description") and text:
+            prop["description"] = text
+    return spec
+
+
+def model_oas_validator() -> Draft7Validator:
+    """Validator for schemas/model_oas_spec.json, compiled once per process."""
+    return default_registry().validator(MODEL_OAS_KIND)
+
+
+def validate_model_oas_spec(spec: dict, validator: Draft7Validator | None = None) -> list[str]:
+    """Return schema violations as "path: message" strings (empty when valid).
+
+    Without an explicit validator the process-wide artifact registry is used.
+    """
+    if validator is None:
+        return default_registry().validate(MODEL_OAS_KIND, spec)
+    return [
+        f"{'/'.join(str(p) for p in err.absolute_path) or '<root>'}: {err.message}"
+        for err in sorted(validator.iter_errors(spec), key=lambda e: list(e.absolute_path))
+    ]
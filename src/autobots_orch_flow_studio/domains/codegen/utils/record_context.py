@@ -0,0 +1,143 @@
+# ABOUTME: Pre-slices each generator record's source context (model, endpoint row, behaviour node).
+# ABOUTME: Source JSON is loaded once per feature; slices are embedded in the record under a size cap.
+
+import json
+from pathlib import Path
+from typing import Any
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+from autobots_orch_flow_studio.configs.constants import INPUT_DATA_BASE_PATH, LLD_JSON_SUBDIR
+from autobots_orch_flow_studio.domains.codegen.utils.model_graph import model_dependencies
+
+logger = get_logger(__name__)
+
+MODELS_JSON = "1-models.json"
+SYNC_METHODS_JSON = "2-sync-methods.json"
+BEHAVIOURS_JSON = "4-behaviours.json"
+
+# Upper bound on the embedded JSON per record (characters, ~4 per token).
+DEFAULT_MAX_CONTEXT_CHARS = 12000
+
+_CONTEXT_HEADER = (
+    "Context (pre-extracted from {source}; use it instead of reading the source file):"
+)
+_CONTEXT_OMITTED = (
+    "Context omitted: the {source} slice is {size} characters, above the {cap} cap. "
+    "Read it from the source file."
+)
+
+
+class RecordContextBuilder:
+    """Build context-carrying records for one feature folder.
+
+    Each source file is parsed once per builder, so slicing is a dict lookup per record.
+    Model slices include the models directly referenced by the model's field types.
+
+    Args:
+        filename: Feature folder under base_path (e.g. MER-12345---Party-Feature).
+        base_path: Data workspace root (default INPUT_DATA_BASE_PATH).
+        max_chars: Cap on the embedded JSON per record; referenced sub-models are
+            dropped first, then the context is omitted with a pointer to the source.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        base_path: str | Path = INPUT_DATA_BASE_PATH,
+        max_chars: int = DEFAULT_MAX_CONTEXT_CHARS,
+    ) -> None:
+        self.filename = filename
+        self.json_dir = Path(base_path, filename, LLD_JSON_SUBDIR)
+        self.max_chars = max_chars
+        self._docs: dict[str, Any] = {}
+        self._deps: dict[str, set[str]] | None = None
+
+    def _load(self, name: str) -> Any:
+        if name not in self._docs:
+            with (self.json_dir / name).open(encoding="utf-8") as f:
+                self._docs[name] = json.load(f)
+        return self._docs[name]
+
+    def _source(self, name: str) -> str:
+        return f"{self.filename}/{LLD_JSON_SUBDIR}/{name}"
+
+    def _model_deps(self) -> dict[str, set[str]]:
+        if self._deps is None:
+            self._deps = model_dependencies(self._load(MODELS_JSON))
+        return self._deps
+
+    def model_slice(self, model: str, with_references: bool = True) -> dict[str, Any]:
+        """{model: definition} plus directly referenced models when with_references is set.
+
+        Raises:
+            KeyError: If the model is not in 1-models.json.
+        """
+        models = self._load(MODELS_JSON)
+        sliced = {model: models[model]}
+        if with_references:
+            for ref in sorted(self._model_deps().get(model, ())):
+                sliced[ref] = models[ref]
+        return sliced
+
+    def endpoint_slice(self, endpoint: str) -> dict[str, Any]:
+        """The 2-sync-methods.json row for endpoint (it carries the row's modelName).
+
+        Raises:
+            KeyError: If the endpoint is not in 2-sync-methods.json.
+        """
+        return {endpoint: self._load(SYNC_METHODS_JSON)[endpoint]}
+
+    def behaviour_slice(self, name: str) -> dict[str, Any]:
+        """The 4-behaviours.json node whose nodeName or behaviourName is name.
+
+        Raises:
+            KeyError: If no node matches.
+        """
+        for node in self._load(BEHAVIOURS_JSON).get("nodes") or []:
+            if name in (node.get("nodeName"), node.get("behaviourName")):
+                return node
+        raise KeyError(name)
+
+    def embed(self, record: str, source: str, *candidates: dict[str, Any]) -> str:
+        """Append the first candidate slice that fits max_chars to the record text.
+
+        Candidates go from richest to leanest (e.g. model with references, then alone).
+        """
+        size = 0
+        for context in candidates:
+            text = json.dumps(context, indent=1, ensure_ascii=False)
+            size = len(text)
+            if size <= self.max_chars:
+                header = _CONTEXT_HEADER.format(source=self._source(source))
+                return f"{record}\n\n{header}\n```json\n{text}\n```"
+        logger.info(f"{record!r}: context of {size} chars exceeds cap {self.max_chars}")
+        omitted = _CONTEXT_OMITTED.format(
+            source=self._source(source), size=size, cap=self.max_chars
+        )
+        return f"{record}\n\n{omitted}"
+
+    def model_record(self, record: str, model: str) -> str:
+        """record with the model's slice (and its direct sub-models when they fit)."""
+        return self.embed(
+            record,
+            MODELS_JSON,
+            self.model_slice(model),
+            self.model_slice(model, with_references=False),
+        )
+
+    def endpoint_record(self, record: str, endpoint: str) -> str:
+        """record with its endpoint row, plus the row's model when it fits."""
+        row = self.endpoint_slice(endpoint)
+        model_name = row[endpoint].get("modelName") if isinstance(row[endpoint], dict) else None
+        if not isinstance(model_name, str):
+            return self.embed(record, SYNC_METHODS_JSON, row)
+        models = self._load(MODELS_JSON) if (self.json_dir / MODELS_JSON).is_file() else {}
+        if model_name not in models:
+            return self.embed(record, SYNC_METHODS_JSON, row)
+        with_model = {**row, "model": self.model_slice(model_name, with_references=False)}
+        return self.embed(record, SYNC_METHODS_JSON, with_model, row)
+
+    def behaviour_record(self, record: str, name: str) -> str:
+        """record with its behaviour node."""
+        return self.embed(record, BEHAVIOURS_JSON, self.behaviour_slice(name))
@@ -0,0 +1,189 @@
+# ABOUTME: Pack many small generator records into one agent call up to a token budget.
+# ABOUTME: Splits packed responses back into per-record results; retries missing ones singly.
+
+import json
+import re
+from collections.abc import Callable
+
+from autobots_devtools_shared_lib.common.observability import TraceMetadata, get_logger
+from autobots_devtools_shared_lib.dynagent import (
+    AgentMeta,
+    BatchResult,
+    RecordResult,
+    batch_invoker,
+)
+
+logger = get_logger(__name__)
+
+# Rough chars-per-token ratio used for budgeting; exact counts are not needed here.
+CHARS_PER_TOKEN = 4
+# Per-record wrapper overhead (record tags + index) in estimated tokens.
+RECORD_OVERHEAD_TOKENS = 16
+DEFAULT_TOKEN_BUDGET = 2000
+DEFAULT_MAX_RECORDS_PER_PACK = 8
+
+_PACK_HEADER = (
+    "You are given {count} independent records. Handle each record exactly as if it had been "
+    "sent to you on its own, including any files you would write for it.\n"
+    'When done, reply with ONLY a JSON object: {{"results": [{{"index": <record index>, '
+    '"output": <your final answer for that record>}}, ...]}} with one entry per record index.\n'
+)
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for packing decisions."""
+    return len(text) // CHARS_PER_TOKEN + RECORD_OVERHEAD_TOKENS
+
+
+def plan_packs(
+    records: list[str],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    max_records_per_pack: int = DEFAULT_MAX_RECORDS_PER_PACK,
+) -> list[list[int]]:
+    """Greedily group consecutive record indices into packs within the token budget.
+
+    A record larger than the budget gets a pack of its own.
+    """
+    packs: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for i, record in enumerate(records):
+        cost = estimate_tokens(record)
+        if current and (used + cost > token_budget or len(current) >= max_records_per_pack):
+            packs.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_packed_prompt(records: list[str], indices: list[int]) -> str:
+    """Render the records at indices into one prompt asking for an indexed JSON reply."""
+    parts = [_PACK_HEADER.format(count=len(indices))]
+    parts.extend(f'<record index="{i}">\n{records[i]}\n</record>' for i in indices)
+    return "\n".join(parts)
+
+
+def parse_json_reply(output: str | None) -> object | None:
+    """Parse an agent reply that should be JSON, tolerating a ```json fence; None if invalid."""
+    if not output:
+        return None
+    try:
+        return json.loads(_FENCE_RE.sub("", output.strip()))
+    except json.JSONDecodeError:
+        return None
+
+
+def split_packed_output(output: str | None, indices: list[int]) -> dict[int, str] | None:
+    """Parse a packed reply into {record index: output} for the indices it answers.
+
+    Entries for indices outside the pack are ignored; None if the reply is not a
+    well-formed results list.
+    """
+    data = parse_json_reply(output)
+    items = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return None
+
+    wanted = set(indices)
+    split: dict[int, str] = {}
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("index"), int):
+            return None
+        if item["index"] not in wanted:
+            continue
+        value = item.get("output")
+        split[item["index"]] = value if isinstance(value, str) else json.dumps(value)
+    return {i: split[i] for i in indices if i in split}
+
+
+def _has_output_schema(agent_name: str) -> bool:
+    return AgentMeta.instance().schema_map.get(agent_name) is not None
+
+
+def packed_batch_invoker(
+    agent_name: str,
+    records: list[str],
+    trace_metadata: TraceMetadata | None = None,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    max_records_per_pack: int = DEFAULT_MAX_RECORDS_PER_PACK,
+    invoker: Callable[..., BatchResult] = batch_invoker,
+) -> BatchResult:
+    """batch_invoker drop-in that sends several small records per agent call.
+
+    Packs are run through one batch call. Records a pack's reply does not answer (or
+    whose pack failed) are retried as single-record calls; only those records are
+    resent, so only their files are written twice (overwriting the same paths).
+
+    Args:
+        agent_name: Batch-enabled agent from agents.yaml, without an output_schema.
+        records: Non-empty list of plain-string prompts.
+        trace_metadata: Forwarded to the invoker.
+        token_budget: Estimated input-token budget per packed call.
+        max_records_per_pack: Upper bound on records per packed call.
+        invoker: Batch function to call (defaults to dynagent's batch_invoker).
+
+    Returns:
+        BatchResult with one RecordResult per original record, indexed like records.
+
+    Raises:
+        ValueError: If the agent has an output_schema. Its structured reply has to match
+            that schema, so it can never carry the packed {"results": [...]} envelope.
+    """
+    if _has_output_schema(agent_name):
+        raise ValueError(f"Agent '{agent_name}' has an output_schema; its replies cannot be packed")
+    packs = plan_packs(records, token_budget, max_records_per_pack)
+    prompts = [records[p[0]] if len(p) == 1 else build_packed_prompt(records, p) for p in packs]
+    packed = invoker(agent_name, prompts, trace_metadata=trace_metadata)
+    pack_results = {r.index: r for r in packed.results}
+
+    results: dict[int, RecordResult] = {}
+    fallback: list[int] = []
+    for k, pack in enumerate(packs):
+        pack_result = pack_results.get(k)
+        if pack_result is not None and len(pack) == 1:
+            results[pack[0]] = RecordResult(
+                index=pack[0],
+                success=pack_result.success,
+                output=pack_result.output,
+                error=pack_result.error,
+            )
+            continue
+        split = (
+            split_packed_output(pack_result.output, pack)
+            if pack_result is not None and pack_result.success
+            else None
+        ) or {}
+        for i, output in split.items():
+            results[i] = RecordResult(index=i, success=True, output=output)
+        fallback.extend(i for i in pack if i not in split)
+
+    if fallback:
+        logger.warning(
+            "%s: %d packed records were not answered; retrying as single calls",
+            agent_name,
+            len(fallback),
+        )
+        single = invoker(agent_name, [records[i] for i in fallback], trace_metadata=trace_metadata)
+        for r in single.results:
+            i = fallback[r.index]
+            results[i] = RecordResult(index=i, success=r.success, output=r.output, error=r.error)
+
+    logger.info(
+        "%s: %d records sent as %d agent calls (%d single-call fallbacks)",
+        agent_name,
+        len(records),
+        len(packs) + len(fallback),
+        len(fallback),
+    )
+    return BatchResult(
+        agent_name=agent_name,
+        total=len(records),
+        results=[
+            results.get(i) or RecordResult(index=i, success=False, error="No result returned")
+            for i in range(len(records))
+        ],
+    )
@@ -0,0 +1,187 @@
+# ABOUTME: Producer/consumer runner for generator stages without phase barriers.
+# ABOUTME: Each artifact is published to an in-process queue; dependants start as soon as inputs land.
+
+import queue
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class StageTask:
+    """One unit of work in a streaming pipeline.
+
+    key: Unique artifact key this task publishes (e.g. "pu:cover-sttlmtacct-derivation").
+    stage: Stage name, used for the stage's runner and for logging.
+    record: Plain-string record handed to the stage runner.
+    needs: Artifact keys that must be published successfully before this task starts.
+    """
+
+    key: str
+    stage: str
+    record: str
+    needs: set[str] = field(default_factory=set)
+
+
+@dataclass
+class StageArtifact:
+    """Outcome of one StageTask, as published on the pipeline queue."""
+
+    key: str
+    stage: str
+    success: bool
+    output: str | None = None
+    error: str | None = None
+    started: float = 0.0
+    finished: float = 0.0
+
+
+def _run_task(task: StageTask, runner: Callable[[str], str], t0: float) -> StageArtifact:
+    started = time.perf_counter() - t0
+    try:
+        output = runner(task.record)
+        success, error = True, None
+    except Exception as e:
+        output, success, error = None, False, f"{type(e).__name__}: {e}"
+    return StageArtifact(
+        key=task.key,
+        stage=task.stage,
+        success=success,
+        output=output,
+        error=error,
+        started=started,
+        finished=time.perf_counter() - t0,
+    )
+
+
+def _check_acyclic(by_key: dict[str, StageTask]) -> None:
+    """Raise ValueError if task needs form a cycle (the pipeline would never drain)."""
+    remaining = {key: {n for n in t.needs if n in by_key} for key, t in by_key.items()}
+    while remaining:
+        ready = [key for key, needs in remaining.items() if not needs]
+        if not ready:
+            raise ValueError(f"Stage tasks depend on each other in a cycle: {sorted(remaining)}")
+        for key in ready:
+            del remaining[key]
+        for needs in remaining.values():
+            needs.difference_update(ready)
+
+
+def run_streaming_stages(
+    tasks: Iterable[StageTask],
+    runners: dict[str, Callable[[str], str]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    on_artifact: Callable[[StageArtifact], None] | None = None,
+) -> dict[str, StageArtifact]:
+    """Run stage tasks as soon as their own inputs are published.
+
+    Workers publish finished artifacts to a queue; the coordinating thread consumes it
+    and submits every task whose needs are now all satisfied. A task whose input failed
+    (or was never scheduled) is not run and is published as a failure naming the input,
+    so failures propagate down the graph without blocking unrelated work.
+
+    Args:
+        tasks: Tasks across all stages; order decides submission order among ready tasks.
+        runners: Stage name -> callable turning a record into the stage output. Runners
+            may raise; the exception becomes the artifact error.
+        max_workers: Thread pool size shared by all stages.
+        on_artifact: Optional callback for each artifact as it is published.
+
+    Returns:
+        Artifacts keyed by task key, in task order.
+
+    Raises:
+        ValueError: If task keys repeat, a task's stage has no runner, or needs form a cycle.
+    """
+    task_list = list(tasks)
+    by_key: dict[str, StageTask] = {}
+    for task in task_list:
+        if task.key in by_key:
+            raise ValueError(f"Duplicate stage task key: {task.key}")
+        if task.stage not in runners:
+            raise ValueError(f"No runner for stage '{task.stage}' (task {task.key})")
+        by_key[task.key] = task
+
+    _check_acyclic(by_key)
+
+    order = {task.key: i for i, task in enumerate(task_list)}
+    waiting: dict[str, set[str]] = {t.key: set(t.needs) for t in task_list}
+    dependants: dict[str, list[str]] = {key: [] for key in by_key}
+    for task in task_list:
+        for need in task.needs:
+            dependants.setdefault(need, []).append(task.key)
+
+    published: queue.Queue[StageArtifact] = queue.Queue()
+    artifacts: dict[str, StageArtifact] = {}
+    t0 = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        def submit(keys: Iterable[str]) -> None:
+            for key in sorted(keys, key=order.__getitem__):
+                task = by_key[key]
+                pool.submit(_run_task, task, runners[task.stage], t0).add_done_callback(
+                    lambda f: published.put(f.result())
+                )
+
+        def publish_failure(key: str, missing: str) -> None:
+            task = by_key[key]
+            published.put(
+                StageArtifact(
+                    key=key,
+                    stage=task.stage,
+                    success=False,
+                    error=f"input '{missing}' unavailable",
+                    started=time.perf_counter() - t0,
+                    finished=time.perf_counter() - t0,
+                )
+            )
+
+        in_flight = len(task_list)
+        initial: list[str] = []
+        for key, needs in waiting.items():
+            missing = next((n for n in sorted(needs) if n not in by_key), None)
+            if missing is not None:
+                needs.clear()
+                publish_failure(key, missing)
+            elif not needs:
+                initial.append(key)
+        submit(initial)
+
+        while in_flight:
+            artifact = published.get()
+            in_flight -= 1
+            artifacts[artifact.key] = artifact
+            if on_artifact is not None:
+                on_artifact(artifact)
+            level = logger.info if artifact.success else logger.warning
+            level(
+                "stage %s published %s at %.3fs%s",
+                artifact.stage,
+                artifact.key,
+                artifact.finished,
+                "" if artifact.success else f" (failed: {artifact.error})",
+            )
+
+            ready: list[str] = []
+            for dependant in dependants.get(artifact.key, []):
+                needs = waiting[dependant]
+                if artifact.key not in needs or dependant in artifacts:
+                    continue
+                if not artifact.success:
+                    needs.clear()
+                    publish_failure(dependant, artifact.key)
+                    continue
+                needs.discard(artifact.key)
+                if not needs:
+                    ready.append(dependant)
+            submit(ready)
+
+    return {key: artifacts[key] for key in sorted(artifacts, key=order.__getitem__)}
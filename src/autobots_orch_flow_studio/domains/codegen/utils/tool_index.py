@@ -0,0 +1,238 @@
+# ABOUTME: AST index of a tools module: its @tool functions and register_usecase_tools list.
+# ABOUTME: Cached by mtime; adds generated tools with one parse and one write per batch.
+
+import ast
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from autobots_devtools_shared_lib.common.observability import get_logger
+
+logger = get_logger(__name__)
+
+REGISTER_CALL = "register_usecase_tools"
+AUTO_GENERATED_COMMENT = "# Auto-generated tool"
+
+
+def _is_tool_decorator(node: ast.expr) -> bool:
+    target = node.func if isinstance(node, ast.Call) else node
+    if isinstance(target, ast.Name):
+        return target.id == "tool"
+    return isinstance(target, ast.Attribute) and target.attr == "tool"
+
+
+def _register_list(func: ast.FunctionDef) -> ast.List | None:
+    for node in ast.walk(func):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id == REGISTER_CALL
+            and node.args
+            and isinstance(node.args[0], ast.List)
+        ):
+            return node.args[0]
+    return None
+
+
+@dataclass
+class _ParsedTools:
+    """What the index keeps of one parse of the module."""
+
+    text: str
+    tools: dict[str, int]  # @tool function name -> end line (1-based)
+    registered: list[str]
+    register_func: ast.FunctionDef | None
+    register_list: ast.List | None
+
+
+def _parse(text: str) -> _ParsedTools:
+    tree = ast.parse(text)
+    tools: dict[str, int] = {}
+    register_func = register_list = None
+    for node in tree.body:
+        if not isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            continue
+        if any(_is_tool_decorator(d) for d in node.decorator_list):
+            tools[node.name] = node.end_lineno or node.lineno
+        elif register_list is None and isinstance(node, ast.FunctionDef):
+            register_list = _register_list(node)
+            register_func = node if register_list is not None else None
+    registered = (
+        [e.id for e in register_list.elts if isinstance(e, ast.Name)] if register_list else []
+    )
+    return _ParsedTools(text, tools, registered, register_func, register_list)
+
+
+class ToolModuleIndex:
+    """@tool functions and registered tools of one module, re-parsed only when it changes.
+
+    add_tools inserts generated functions after the last @tool defined before the
+    registration function and appends their names to the register_usecase_tools list.
+    Insertion points come from the syntax tree, the result is parsed again before it
+    is written, and the file is written once per call.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._parsed: _ParsedTools | None = None
+        self._stamp: tuple[int, int] | None = None
+
+    def _load(self) -> _ParsedTools:
+        stat = self.path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._parsed is None or stamp != self._stamp:
+            self._parsed = _parse(self.path.read_text(encoding="utf-8"))
+            self._stamp = stamp
+        return self._parsed
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._load().tools
+
+    def tools(self) -> list[str]:
+        """Names of @tool functions, in file order."""
+        with self._lock:
+            return list(self._load().tools)
+
+    def registered(self) -> list[str]:
+        """Names passed to register_usecase_tools, in list order."""
+        with self._lock:
+            return list(self._load().registered)
+
+    def render_with_tools(self, tool_code: dict[str, str]) -> tuple[str | None, list[str]]:
+        """Text of the module with the tools that are not defined yet added; nothing is written.
+
+        Args:
+            tool_code: Tool name -> generated source of its @tool function
+
+        Returns:
+            Tuple of (new module text, or None if every tool exists; names added)
+
+        Raises:
+            ValueError: If the module has no register_usecase_tools list or the edited
+                module does not parse.
+        """
+        with self._lock:
+            text, _, new = self._render(tool_code)
+            return text, new
+
+    def _render(
+        self, tool_code: dict[str, str]
+    ) -> tuple[str | None, _ParsedTools | None, list[str]]:
+        parsed = self._load()
+        new = {name: code for name, code in tool_code.items() if name not in parsed.tools}
+        if not new:
+            return None, None, []
+        text = _insert_tools(parsed, new)
+        try:
+            result = _parse(text)
+        except SyntaxError as e:
+            raise ValueError(f"Adding tools to {self.path.name} breaks its syntax: {e}") from e
+        missing = [n for n in new if n not in result.tools or n not in result.registered]
+        if missing:
+            raise ValueError(f"Could not add tools to {self.path.name}: {', '.join(missing)}")
+        return text, result, list(new)
+
+    def add_tools(self, tool_code: dict[str, str]) -> list[str]:
+        """Insert and register generated tools that are not defined yet.
+
+        Args:
+            tool_code: Tool name -> generated source of its @tool function
+
+        Returns:
+            Names that were added, in the given order
+
+        Raises:
+            ValueError: If the module has no register_usecase_tools list or the edited
+                module does not parse.
+        """
+        with self._lock:
+            text, result, new = self._render(tool_code)
+            if text is None:
+                return []
+            tmp = self.path.with_name(f".{self.path.name}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(self.path)
+            stat = self.path.stat()
+            self._parsed, self._stamp = result, (stat.st_mtime_ns, stat.st_size)
+            logger.info(f"Added {len(new)} tool(s) to {self.path.name}: {', '.join(new)}")
+            return new
+
+
+def _end(node: ast.expr) -> tuple[int, int]:
+    """End (line, column) of a node; ast.parse always records both."""
+    if node.end_lineno is None or node.end_col_offset is None:
+        raise ValueError(f"{type(node).__name__} node has no end position")
+    return node.end_lineno, node.end_col_offset
+
+
+def _insert_tools(parsed: _ParsedTools, new: dict[str, str]) -> str:
+    """Text of the module with the new functions and registrations spliced in."""
+    func, reg_list = parsed.register_func, parsed.register_list
+    if func is None or reg_list is None:
+        raise ValueError(f"No function calling {REGISTER_CALL}([...]) found")
+    lines = parsed.text.splitlines(keepends=True)
+    starts = [0]
+    for line in lines:
+        starts.append(starts[-1] + len(line))
+
+    def offset(lineno: int, col: int) -> int:
+        # ast column offsets count UTF-8 bytes
+        line = lines[lineno - 1]
+        return starts[lineno - 1] + len(line.encode("utf-8")[:col].decode("utf-8", "ignore"))
+
+    text = parsed.text
+    edits: list[tuple[int, str]] = []
+
+    # Registration list: append after the last item, adding its missing comma
+    end_lineno, end_col = _end(reg_list)
+    close = offset(end_lineno, end_col - 1)
+    line_start = starts[end_lineno - 1]
+    after_last = close
+    has_comma = True
+    indent = " " * (reg_list.col_offset + 4)
+    if reg_list.elts:
+        last = reg_list.elts[-1]
+        after_last = offset(*_end(last))
+        has_comma = text[after_last:close].lstrip().startswith(",")
+        indent = " " * last.col_offset
+    if text[line_start:close].strip():
+        # "[a, b]" on one line: keep it on one line
+        items = ", ".join(new)
+        if not has_comma:
+            edits.append((after_last, f", {items}"))
+        else:
+            edits.append((close, f" {items}" if reg_list.elts else items))
+    else:
+        if not has_comma:
+            edits.append((after_last, ","))
+        entries = "".join(f"{indent}{name},  {AUTO_GENERATED_COMMENT}\n" for name in new)
+        edits.append((line_start, entries))
+
+    # Functions: after the last @tool defined before the registration function
+    before = [end for end in parsed.tools.values() if end < func.lineno]
+    code = "".join(c.rstrip("\n") + "\n\n\n" for c in new.values())
+    if before:
+        edits.append((starts[max(before)], "\n\n" + code.rstrip("\n") + "\n"))
+    else:
+        first = min([func.lineno, *(d.lineno for d in func.decorator_list)])
+        edits.append((starts[first - 1], code))
+
+    for position, insert in sorted(edits, key=lambda e: e[0], reverse=True):
+        text = text[:position] + insert + text[position:]
+    return text
+
+
+_indexes: dict[Path, ToolModuleIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_tool_index(path: str | Path) -> ToolModuleIndex:
+    """Shared ToolModuleIndex for a tools module path."""
+    key = Path(path).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ToolModuleIndex(key)
+        return index
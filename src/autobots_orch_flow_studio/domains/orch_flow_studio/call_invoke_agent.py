@@ -3,17 +3,19 @@
 
 import asyncio
 import uuid
+from collections.abc import AsyncGenerator, Generator, Iterable
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
-    init_tracing,
     set_conversation_id,
 )
 from autobots_devtools_shared_lib.dynagent import ainvoke_agent, invoke_agent
 from dotenv import load_dotenv
 
+from autobots_orch_flow_studio.common.utils.trace_export import setup_tracing
 from autobots_orch_flow_studio.domains.orch_flow_studio.tools import register_orch_flow_studio_tools
 
 if TYPE_CHECKING:
@@ -24,38 +26,38 @@ load_dotenv()
 
 
 register_orch_flow_studio_tools()
-init_tracing()
+setup_tracing()
 
 APP_NAME = "orch_flow_studio-invoke-demo"
+# Requests call_invoke_agents_many() keeps in flight at once
+DEFAULT_CONCURRENCY = 8
 
+# (agent_name, user_message, session_id); session_id None means a new session
+AgentRequest = tuple[str, str, str | None]
 
-def call_invoke_agent_sync(
-    agent_name: str,
-    user_message: str,
-    session_id: str | None = None,
-    enable_tracing: bool = True,
-) -> dict:
-    """
-    Synchronously invoke an agent and log the results.
 
-    This function demonstrates how to use invoke_agent() for programmatic
-    orchestration workflows. It creates an agent, invokes it with a message,
-    and logs the results.
+@dataclass
+class AgentInvocation:
+    """Outcome of one request of call_invoke_agents_many()."""
 
-    Args:
-        agent_name: Name of the agent to invoke (e.g., "joke_agent", "coordinator")
-        user_message: Message to send to the agent
-        session_id: Optional session ID for tracking (auto-generated if None)
-        enable_tracing: Whether to enable Langfuse tracing (default True)
+    index: int  # position of the request in the input
+    agent_name: str
+    session_id: str
+    result: dict | None = None
+    error: str | None = None
 
-    Returns:
-        dict: The complete final state from the agent execution
+    @property
+    def success(self) -> bool:
+        return self.error is None
 
-    Example:
-        >>> result = call_invoke_agent_sync("joke_agent", "Tell me a joke")
-        >>> print(result["structured_response"])
-    """
 
+def _prepare_invocation(
+    agent_name: str,
+    user_message: str,
+    session_id: str | None,
+    mode: str,
+) -> tuple[str, "RunnableConfig", dict, TraceMetadata]:
+    """Session id, config, input state and trace metadata for one agent call."""
     if not session_id:
         session_id = str(uuid.uuid4())
     set_conversation_id(session_id)
@@ -81,18 +83,12 @@ def call_invoke_agent_sync(
         session_id=session_id,
         app_name=APP_NAME,
         user_id=APP_NAME,
-        tags=[APP_NAME, agent_name, "sync"],
+        tags=[APP_NAME, agent_name, mode],
     )
+    return session_id, config, input_state, trace_metadata
 
-    logger.info(f"Invoking SYNC agent '{agent_name}'")
-    result = invoke_agent(
-        agent_name=agent_name,
-        input_state=input_state,
-        config=config,
-        trace_metadata=trace_metadata,
-        enable_tracing=enable_tracing,
-    )
 
+def _log_result(result: dict) -> None:
     messages = result.get("messages") or []
     logger.debug(f"#Messages: {len(messages)}")
 
@@ -102,6 +98,48 @@ def call_invoke_agent_sync(
     else:
         logger.info("💬 No structured response (text-only agent)")
 
+
+def call_invoke_agent_sync(
+    agent_name: str,
+    user_message: str,
+    session_id: str | None = None,
+    enable_tracing: bool = True,
+) -> dict:
+    """
+    Synchronously invoke an agent and log the results.
+
+    This function demonstrates how to use invoke_agent() for programmatic
+    orchestration workflows. It creates an agent, invokes it with a message,
+    and logs the results.
+
+    Args:
+        agent_name: Name of the agent to invoke (e.g., "joke_agent", "coordinator")
+        user_message: Message to send to the agent
+        session_id: Optional session ID for tracking (auto-generated if None)
+        enable_tracing: Whether to enable Langfuse tracing (default True)
+
+    Returns:
+        dict: The complete final state from the agent execution
+
+    Example:
+        >>> result = call_invoke_agent_sync("joke_agent", "Tell me a joke")
+        >>> print(result["structured_response"])
+    """
+
+    _, config, input_state, trace_metadata = _prepare_invocation(
+        agent_name, user_message, session_id, "sync"
+    )
+
+    logger.info(f"Invoking SYNC agent '{agent_name}'")
+    result = invoke_agent(
+        agent_name=agent_name,
+        input_state=input_state,
+        config=config,
+        trace_metadata=trace_metadata,
+        enable_tracing=enable_tracing,
+    )
+
+    _log_result(result)
     return result
 
 
@@ -132,32 +170,8 @@ async def call_invoke_agent_async(
         >>> print(result["structured_response"])
     """
 
-    if not session_id:
-        session_id = str(uuid.uuid4())
-    set_conversation_id(session_id)
-
-    logger.info(f"🔑 Generated session_id: {session_id}")
-
-    config: RunnableConfig = {
-        "configurable": {
-            "thread_id": session_id,
-            "agent_name": agent_name,
-            "app_name": APP_NAME,
-        },
-    }
-
-    input_state: dict = {
-        "messages": [{"role": "user", "content": user_message}],
-        "agent_name": agent_name,
-        "session_id": session_id,
-    }
-
-    # Prepare trace metadata
-    trace_metadata = TraceMetadata(
-        session_id=session_id,
-        app_name=APP_NAME,
-        user_id=APP_NAME,
-        tags=[APP_NAME, agent_name, "async"],
+    _, config, input_state, trace_metadata = _prepare_invocation(
+        agent_name, user_message, session_id, "async"
     )
 
     logger.info(f"Invoking ASYNC agent '{agent_name}'")
@@ -169,16 +183,117 @@ async def call_invoke_agent_async(
         enable_tracing=enable_tracing,
     )
 
-    messages = result.get("messages") or []
-    logger.debug(f"#Messages: {len(messages)}")
+    _log_result(result)
+    return result
 
-    if "structured_response" in result:
-        logger.info("📦 Structured response received:")
-        logger.info(f"   {result['structured_response']}")
-    else:
-        logger.info("💬 No structured response (text-only agent)")
 
-    return result
+async def _invoke_one(
+    index: int,
+    request: AgentRequest,
+    semaphore: asyncio.Semaphore,
+    enable_tracing: bool,
+) -> AgentInvocation:
+    agent_name, user_message, session_id = request
+    async with semaphore:
+        # Runs in this request's own task context, so the conversation id and the
+        # trace metadata set here do not leak into concurrent requests
+        session_id, config, input_state, trace_metadata = _prepare_invocation(
+            agent_name, user_message, session_id, "fan-out"
+        )
+        try:
+            result = await ainvoke_agent(
+                agent_name=agent_name,
+                input_state=input_state,
+                config=config,
+                trace_metadata=trace_metadata,
+                enable_tracing=enable_tracing,
+            )
+        except Exception as e:
+            logger.exception(f"Request {index} to agent '{agent_name}' failed")
+            return AgentInvocation(index, agent_name, session_id, error=str(e))
+    _log_result(result)
+    return AgentInvocation(index, agent_name, session_id, result=result)
+
+
+async def call_invoke_agents_many(
+    requests: Iterable[AgentRequest],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    enable_tracing: bool = True,
+) -> AsyncGenerator[AgentInvocation, None]:
+    """
+    Invoke agents for many requests concurrently and yield each result as it completes.
+
+    Requests may target different agents and sessions. They run on the current event
+    loop with at most concurrency in flight, so total time follows the slowest calls
+    rather than the sum of them. Each request gets its own session (when session_id
+    is None) and its own trace metadata, tagged "fan-out". A failed request yields an
+    AgentInvocation with error set instead of stopping the others. Requests that share
+    a session_id are not ordered relative to each other.
+
+    Args:
+        requests: (agent_name, user_message, session_id) tuples
+        concurrency: Maximum number of agent calls in flight (default 8)
+        enable_tracing: Whether to enable Langfuse tracing (default True)
+
+    Yields:
+        AgentInvocation: One per request, in completion order; index is the
+        request's position in requests
+
+    Example:
+        >>> requests = [("joke_agent", "Tell me a joke", None), ("welcome_agent", "Hi", None)]
+        >>> async for done in call_invoke_agents_many(requests, concurrency=4):
+        ...     print(done.index, done.agent_name, done.success)
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [
+        asyncio.create_task(_invoke_one(index, request, semaphore, enable_tracing))
+        for index, request in enumerate(requests)
+    ]
+    logger.info(f"Invoking {len(tasks)} agent requests, {concurrency} at a time")
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The caller stopped early or was cancelled; don't leave calls running
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def call_invoke_agents_many_sync(
+    requests: Iterable[AgentRequest],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    enable_tracing: bool = True,
+) -> Generator[AgentInvocation, None, None]:
+    """
+    Synchronous form of call_invoke_agents_many() for scripts without an event loop.
+
+    Drives one event loop and yields each result as it completes. Requests in flight
+    only make progress while the caller is waiting for the next result.
+
+    Example:
+        >>> for done in call_invoke_agents_many_sync(requests):
+        ...     print(done.index, done.success)
+    """
+    loop = asyncio.new_event_loop()
+    results = call_invoke_agents_many(requests, concurrency, enable_tracing)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(results))
+            except StopAsyncIteration:
+                return
+    finally:
+        try:
+            loop.run_until_complete(results.aclose())
+            # Let anything still pending unwind before the loop goes away
+            pending = asyncio.all_tasks(loop)
+            if pending:
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        finally:
+            loop.close()
 
 
 def call_invoke_agent(
@@ -268,4 +383,16 @@ if __name__ == "__main__":
 
     asyncio.run(async_example())
 
+    # Example 5: Fan-out over several agents and sessions at once
+    logger.info("\n\n🔹 Example 5: Fan-out with call_invoke_agents_many_sync")
+    for done in call_invoke_agents_many_sync(
+        [
+            ("joke_agent", "Tell me a joke about concurrency", None),
+            ("joke_agent", "Tell me a knock-knock joke", None),
+            ("welcome_agent", "What agents are available in this system?", None),
+        ],
+        concurrency=3,
+    ):
+        logger.info(f"Request {done.index} ({done.agent_name}) success={done.success}")
+
     logger.info("\n✅ All examples completed!")
@@ -0,0 +1,310 @@
+# ABOUTME: Deterministic merge of an actual Node-RED flow with its converted designer version.
+# ABOUTME: Restores designer_node_existing placeholders, remaps references, reports true conflicts.
+
+import json
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from autobots_orch_flow_studio.domains.orch_flow_studio.flow_conversion import ensure_flow_order
+
+PLACEHOLDER_TYPE = "designer_node_existing"
+NEW_NODE_TYPE = "designer_node_new"
+_CONTAINER_TYPES = frozenset({"tab", "subflow"})
+# _replace_node_if_unknown names placeholders "<original name> (<original type>)".
+_PLACEHOLDER_NAME_RE = re.compile(r"^(?P<name>.*) \((?P<type>[^()]+)\)$")
+# Placeholder fields the designer may edit; everything else comes from the actual node.
+_LAYOUT_FIELDS = ("z", "g", "x", "y", "wires", "disabled")
+# List-of-id properties: link targets, group members, catch/status/complete scopes.
+_ID_LIST_FIELDS = frozenset({"links", "nodes", "scope"})
+
+
+@dataclass
+class MergeConflict:
+    """A converted node the merge could not settle; left as-is for LLM resolution."""
+
+    node_id: str
+    kind: str  # unmatched_existing | ambiguous_match | output_mismatch
+    detail: str
+
+
+@dataclass
+class MergeStats:
+    """Counters describing one merge."""
+
+    converted_nodes: int = 0
+    actual_nodes: int = 0
+    matched_by_id: int = 0
+    matched_by_key: int = 0
+    placeholders_restored: int = 0
+    new_nodes_materialized: int = 0
+    config_nodes_added: int = 0
+    references_remapped: int = 0
+    dangling_wires_dropped: int = 0
+    conflicts: int = 0
+
+
+@dataclass
+class FlowMergeResult:
+    """Merged flat flow, statistics and the conflicts left for the LLM."""
+
+    flow: list[dict[str, Any]]
+    stats: MergeStats
+    conflicts: list[MergeConflict] = field(default_factory=list)
+
+    def report(self) -> dict[str, Any]:
+        """Stats and conflicts as plain JSON-serialisable data."""
+        return {"stats": asdict(self.stats), "conflicts": [asdict(c) for c in self.conflicts]}
+
+
+def _display_name(node: dict[str, Any]) -> str:
+    """Name used for key matching, mirroring _replace_node_if_unknown."""
+    return str(node.get("name") or node.get("label") or node.get("type") or "")
+
+
+def _match_key(node: dict[str, Any], z: str | None) -> tuple[str, str, str | None]:
+    """(type, name, tab) key; placeholders are keyed by the original type and name."""
+    if node.get("type") == PLACEHOLDER_TYPE:
+        parsed = _PLACEHOLDER_NAME_RE.match(str(node.get("name") or ""))
+        if parsed:
+            return parsed["type"], parsed["name"], z
+    return str(node.get("type")), _display_name(node), z
+
+
+def _outputs(node: dict[str, Any]) -> int:
+    wires = node.get("wires")
+    return len(wires) if isinstance(wires, list) and wires else 1
+
+
+class _Matcher:
+    """Match converted nodes to actual nodes: by id first, then by (type, name, tab).
+
+    The key index is only built if some node fails to match by id.
+    """
+
+    def __init__(self, actual: list[dict[str, Any]]) -> None:
+        self.actual = actual
+        self.by_id = {n["id"]: n for n in actual}
+        self._by_key: dict[tuple[str, str, str | None], list[str]] | None = None
+        self.used: set[str] = set()
+
+    def take(self, node_id: str) -> dict[str, Any] | None:
+        if node_id in self.by_id and node_id not in self.used:
+            self.used.add(node_id)
+            return self.by_id[node_id]
+        return None
+
+    def candidates(self, key: tuple[str, str, str | None]) -> list[str]:
+        if self._by_key is None:
+            self._by_key = {}
+            for n in self.actual:
+                self._by_key.setdefault(_match_key(n, n.get("z")), []).append(n["id"])
+        return [i for i in self._by_key.get(key, ()) if i not in self.used]
+
+
+def _flat_nodes(flow: Any) -> list[dict[str, Any]]:
+    items = flow.get("flows", []) if isinstance(flow, dict) else flow
+    if not isinstance(items, list):
+        return []
+    return [n for n in items if isinstance(n, dict) and isinstance(n.get("id"), str)]
+
+
+def _materialize_new(node: dict[str, Any]) -> dict[str, Any] | None:
+    """designer_node_new whose config names a node type -> that node; else None."""
+    config = node.get("config")
+    if isinstance(config, str):
+        try:
+            config = json.loads(config or "{}")
+        except ValueError:
+            return None
+    if not isinstance(config, dict) or not isinstance(config.get("type"), str):
+        return None
+    keep = {k: node[k] for k in ("id", "z", "g", "x", "y", "wires") if k in node}
+    return {**config, **keep, "name": node.get("name") or config.get("name", "")}
+
+
+def _restore_placeholder(
+    placeholder: dict[str, Any], actual: dict[str, Any]
+) -> tuple[dict[str, Any], MergeConflict | None]:
+    """Actual node with the designer's layout and wiring edits applied (three-way per field).
+
+    The base is the placeholder conversion would have produced from the actual node,
+    so a field that differs from the actual value was edited by the designer and wins.
+    """
+    merged = dict(actual)
+    for key in _LAYOUT_FIELDS:
+        if key in placeholder and placeholder[key] != actual.get(key):
+            merged[key] = placeholder[key]
+
+    conflict = None
+    if "wires" in actual and _outputs(placeholder) != _outputs(actual):
+        conflict = MergeConflict(
+            placeholder["id"],
+            "output_mismatch",
+            f"designer wired {_outputs(placeholder)} outputs, "
+            f"actual {actual.get('type')} has {_outputs(actual)}",
+        )
+    return merged, conflict
+
+
+def _remap_references(
+    flow: list[dict[str, Any]], id_map: dict[str, str], stats: MergeStats
+) -> None:
+    """Point wires, link/group/scope lists, z, g and subflow instances at merged ids.
+
+    Wires and list entries that point at nodes missing from the merged flow are dropped.
+    """
+    present = {n["id"] for n in flow}
+
+    def remap(ref: Any) -> Any:
+        if ref in id_map:
+            stats.references_remapped += 1
+            return id_map[ref]
+        return ref
+
+    for node in flow:
+        if id_map:
+            for key in ("z", "g"):
+                if isinstance(node.get(key), str):
+                    node[key] = remap(node[key])
+            node_type = node.get("type")
+            if isinstance(node_type, str) and node_type.startswith("subflow:"):
+                node["type"] = f"subflow:{remap(node_type[len('subflow:') :])}"
+
+        wires = node.get("wires")
+        if isinstance(wires, list):
+            if id_map:
+                wires = [[remap(t) for t in p] if isinstance(p, list) else [] for p in wires]
+            new_wires = [
+                [t for t in p if t in present] if isinstance(p, list) else [] for p in wires
+            ]
+            stats.dangling_wires_dropped += sum(map(len, wires)) - sum(map(len, new_wires))
+            node["wires"] = new_wires
+
+        for key in _ID_LIST_FIELDS.intersection(node):
+            refs = node[key]
+            if isinstance(refs, list) and all(isinstance(r, str) for r in refs):
+                node[key] = [r for r in map(remap, refs) if r in present]
+        if "g" in node and node["g"] not in present:
+            node.pop("g")
+
+
+def _add_referenced_config_nodes(
+    flow: list[dict[str, Any]], actual: list[dict[str, Any]], stats: MergeStats
+) -> None:
+    """Append actual config nodes (no z, no wires) that merged nodes reference by id."""
+    present = {n["id"] for n in flow}
+    configs = {
+        n["id"]: n
+        for n in actual
+        if n["id"] not in present
+        and "wires" not in n
+        and not n.get("z")
+        and n.get("type") not in _CONTAINER_TYPES
+    }
+    if not configs:
+        return
+    referenced = {v for node in flow for v in node.values() if isinstance(v, str) and v in configs}
+    for config_id in sorted(referenced):
+        flow.append(dict(configs[config_id]))
+        stats.config_nodes_added += 1
+
+
+def merge_actual_converted(actual_flow: Any, converted_flow: Any) -> FlowMergeResult:
+    """Merge an actual flow (sample_flows) into its converted designer flow (designer_flows).
+
+    The converted flow is the base: its node set and order are kept. Each converted node
+    is matched to an actual node by id, then, once every exact id is claimed, by
+    (type, name, tab) among the unclaimed actual nodes, where placeholders
+    use the original type and name encoded by _replace_node_if_unknown. Matches are
+    resolved as follows:
+
+    - designer_node_existing: replaced by the actual node; designer edits to z, x, y,
+      wires, disabled and g are kept.
+    - designer_node_new whose config names a node type: materialized as that node.
+    - Native nodes: the designer version is kept, under the actual id.
+
+    Converted ids are then remapped to the matched actual ids in wires, link targets,
+    z, g and group members, wires to missing nodes are dropped, and actual config nodes
+    referenced by merged nodes are appended. Only unmatched or ambiguous placeholders
+    and output-count mismatches are reported as conflicts; those nodes stay unchanged.
+    Runs in time linear in the size of both flows.
+
+    Args:
+        actual_flow: Actual Node-RED flow (flat node list or {"flows": [...]}).
+        converted_flow: Converted flow with designer placeholders.
+
+    Returns:
+        FlowMergeResult with the merged flat flow (tabs first), stats and conflicts.
+
+    Raises:
+        ValueError: If the merged flow would contain duplicate node ids.
+    """
+    actual = _flat_nodes(actual_flow)
+    converted = _flat_nodes(converted_flow)
+    stats = MergeStats(converted_nodes=len(converted), actual_nodes=len(actual))
+    conflicts: list[MergeConflict] = []
+    matcher = _Matcher(actual)
+    id_map: dict[str, str] = {}
+
+    # Tabs and subflows first, so (type, name, tab) keys of their nodes use actual tab ids.
+    ordered = [n for n in converted if n.get("type") in _CONTAINER_TYPES]
+    ordered += [n for n in converted if n.get("type") not in _CONTAINER_TYPES]
+    # All exact-id matches are claimed before any key match, so a key match can never
+    # take an actual id that a later converted node carries itself.
+    found_by_id: dict[str, dict[str, Any] | None] = {
+        n["id"]: matcher.take(n["id"]) for n in ordered
+    }
+    stats.matched_by_id = sum(found is not None for found in found_by_id.values())
+
+    def match(node: dict[str, Any]) -> tuple[dict[str, Any] | None, list[str]]:
+        """(matched actual node, unused actual candidates when the key was ambiguous)."""
+        found = found_by_id[node["id"]]
+        if found is not None:
+            return found, []
+        z = node.get("z")
+        tab = id_map.get(z, z) if isinstance(z, str) else None
+        candidates = matcher.candidates(_match_key(node, tab))
+        if len(candidates) == 1:
+            stats.matched_by_key += 1
+            return matcher.take(candidates[0]), []
+        return None, candidates
+
+    merged_by_id: dict[str, dict[str, Any]] = {}
+    for node in ordered:
+        node_type = node.get("type")
+        found, ambiguous = match(node)
+        merged: dict[str, Any] = dict(node)
+        if node_type == PLACEHOLDER_TYPE and found is None:
+            conflicts.append(
+                MergeConflict(
+                    node["id"], "ambiguous_match", f"actual candidates: {', '.join(ambiguous)}"
+                )
+                if ambiguous
+                else MergeConflict(node["id"], "unmatched_existing", str(node.get("name")))
+            )
+        elif node_type == PLACEHOLDER_TYPE and found is not None:
+            merged, conflict = _restore_placeholder(node, found)
+            stats.placeholders_restored += 1
+            if conflict:
+                conflicts.append(conflict)
+        elif node_type == NEW_NODE_TYPE:
+            materialized = _materialize_new(node)
+            if materialized is not None:
+                merged = materialized
+                stats.new_nodes_materialized += 1
+        if found is not None and found["id"] != node["id"]:
+            id_map[node["id"]] = found["id"]
+            merged["id"] = found["id"]
+        merged_by_id[node["id"]] = merged
+
+    flow = [merged_by_id[n["id"]] for n in converted]
+    _remap_references(flow, id_map, stats)
+    _add_referenced_config_nodes(flow, actual, stats)
+    ensure_flow_order(flow)
+    duplicates = sorted(i for i, count in Counter(n["id"] for n in flow).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Merged flow has duplicate node ids: {', '.join(duplicates)}")
+    stats.conflicts = len(conflicts)
+    return FlowMergeResult(flow=flow, stats=stats, conflicts=conflicts)
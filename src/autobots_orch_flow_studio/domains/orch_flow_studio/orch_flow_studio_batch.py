@@ -6,12 +6,12 @@ import uuid
 from autobots_devtools_shared_lib.common.observability import (
     TraceMetadata,
     get_logger,
-    init_tracing,
     set_conversation_id,
 )
 from autobots_devtools_shared_lib.dynagent import BatchResult, batch_invoker
 from dotenv import load_dotenv
 
+from autobots_orch_flow_studio.common.utils.trace_export import setup_tracing
 from autobots_orch_flow_studio.domains.orch_flow_studio.settings import init_orch_flow_studio_settings
 
 logger = get_logger(__name__)
@@ -65,7 +65,7 @@ def orch_flow_studio_batch(agent_name: str, records: list[str], user_id: str) ->
     if not records:
         raise ValueError("records must not be empty")
 
-    init_tracing()
+    setup_tracing()
 
     trace_metadata = TraceMetadata.create(
         session_id=session_id,
@@ -5,6 +5,7 @@ from autobots_devtools_shared_lib.common.observability import get_logger, set_co
 from autobots_devtools_shared_lib.dynagent import Dynagent
 from langchain.tools import ToolRuntime, tool
 
+from autobots_orch_flow_studio.common.tools.kb_tools import search_kb
 from autobots_orch_flow_studio.common.tools.validation_tools import validate_email
 from autobots_orch_flow_studio.domains.orch_flow_studio.services import get_forecast as weather_get_forecast
 from autobots_orch_flow_studio.domains.orch_flow_studio.services import get_joke, list_categories
@@ -105,7 +106,8 @@ def get_forecast(runtime: ToolRuntime[None, Dynagent], location: str, days: int
 def register_orch_flow_studio_tools() -> None:
     """Register all Orch Flow Studio tools into the dynagent usecase pool.
 
-    Includes joke and weather tools plus shared validation tools (validate_email).
+    Includes joke and weather tools, the knowledge-base search tool and shared
+    validation tools (validate_email).
     """
     from autobots_devtools_shared_lib.dynagent import register_usecase_tools
 
@@ -115,6 +117,7 @@ def register_orch_flow_studio_tools() -> None:
             get_joke_categories,
             get_weather,
             get_forecast,
+            search_kb,
             validate_email,
         ]
     )
@@ -0,0 +1,29 @@
+# ABOUTME: Unit tests for the common knowledge-base tools.
+# ABOUTME: Checks that register_kb_tools alone lets every configured agent resolve its tools.
+
+import pytest
+from autobots_devtools_shared_lib.dynagent.agents.agent_config_utils import get_tool_map
+from autobots_devtools_shared_lib.dynagent.tools.tool_registry import _reset_usecase_tools
+
+from autobots_orch_flow_studio.common.tools.kb_tools import register_kb_tools
+
+
+@pytest.fixture
+def no_usecase_tools():
+    _reset_usecase_tools()
+    yield
+    _reset_usecase_tools()
+
+
+def test_codegen_agents_need_search_kb_registered(no_usecase_tools):
+    with pytest.raises(ValueError, match="search_kb"):
+        get_tool_map()
+
+
+def test_register_kb_tools_resolves_every_configured_agent(no_usecase_tools):
+    register_kb_tools()
+
+    tools = get_tool_map()
+
+    for agent in ("model_oas_generator", "flow_generator", "processing_unit_oas_generator"):
+        assert "search_kb" in [t.name for t in tools[agent]]
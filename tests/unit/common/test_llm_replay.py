@@ -0,0 +1,117 @@
+# ABOUTME: Unit tests for the LLM record/replay harness and the fake chat model.
+# ABOUTME: Covers record->replay round trips, match modes, latency, lm() override and install.
+
+import asyncio
+import time
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+
+from autobots_orch_flow_studio.common.utils.llm_replay import (
+    MATCH_EXACT,
+    MATCH_SEQUENCE,
+    Cassette,
+    CassetteMissError,
+    FakeChatModel,
+    RecordingChatModel,
+    ReplayChatModel,
+    chat_model_override,
+    install_llm_replay,
+    set_chat_model,
+)
+from autobots_orch_flow_studio.configs.settings import AppSettings
+
+
+@tool
+def get_weather(city: str) -> str:
+    """Return the weather for a city."""
+    return f"Sunny in {city}"
+
+
+def _scripted() -> FakeChatModel:
+    return FakeChatModel(
+        responses=[
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "get_weather", "args": {"city": "Pune"}, "id": "c1"}],
+            ),
+            "It is sunny in Pune.",
+        ]
+    )
+
+
+def _ask(model) -> list:
+    agent = create_agent(model, tools=[get_weather])
+    return agent.invoke({"messages": [HumanMessage("Weather in Pune?")]})["messages"]
+
+
+def test_agent_run_records_and_replays_identically_offline(tmp_path):
+    path = tmp_path / "llm.jsonl"
+    inner = _scripted()
+    recorded = _ask(RecordingChatModel(inner=inner, cassette=Cassette(path)))
+    assert len(inner.calls) == 2
+    assert recorded[-1].content == "It is sunny in Pune."
+
+    replayed = _ask(ReplayChatModel(cassette=Cassette(path), match=MATCH_EXACT))
+    assert [m.content for m in replayed] == [m.content for m in recorded]
+    assert replayed[1].tool_calls[0]["args"] == {"city": "Pune"}
+    assert replayed[-1].usage_metadata["output_tokens"] > 0
+
+    replay = ReplayChatModel(cassette=Cassette(path), match=MATCH_EXACT)
+    with pytest.raises(CassetteMissError):
+        replay.invoke("something never recorded")
+    sequence = ReplayChatModel(cassette=Cassette(path), match=MATCH_SEQUENCE)
+    assert sequence.invoke("anything").tool_calls[0]["name"] == "get_weather"
+    assert sequence.invoke("anything else").content == "It is sunny in Pune."
+
+
+def test_replay_applies_synthetic_latency_sync_and_async(tmp_path):
+    path = tmp_path / "llm.jsonl"
+    RecordingChatModel(inner=FakeChatModel(responses=["x" * 400]), cassette=Cassette(path)).invoke(
+        "hi"
+    )
+    replay = ReplayChatModel(cassette=Cassette(path), latency_ms=20, ms_per_token=0.2)
+
+    started = time.perf_counter()
+    assert replay.invoke("hi").content == "x" * 400
+    assert time.perf_counter() - started >= 0.04  # 20ms + 100 tokens * 0.2ms
+
+    async def fan_out():
+        return await asyncio.gather(*(replay.ainvoke("hi") for _ in range(10)))
+
+    started = time.perf_counter()
+    assert len(asyncio.run(fan_out())) == 10
+    assert time.perf_counter() - started < 0.3  # async replays overlap
+
+
+def test_chat_model_override_swaps_dynagent_lm():
+    import autobots_devtools_shared_lib.dynagent.agents.base_agent as base_agent
+
+    original = base_agent.lm
+    fake = FakeChatModel(responses=["hello"])
+    with chat_model_override(fake):
+        assert base_agent.lm() is fake
+    assert base_agent.lm is original
+
+
+def test_install_uses_the_given_settings_and_installs_once(tmp_path, monkeypatch):
+    import autobots_devtools_shared_lib.dynagent.agents.base_agent as base_agent
+
+    path = tmp_path / "llm.jsonl"
+    RecordingChatModel(inner=FakeChatModel(responses=["hi"]), cassette=Cassette(path)).invoke("hi")
+    settings = AppSettings(
+        llm_replay_mode="replay", llm_cassette_path=str(path), llm_replay_latency_ms=5
+    )
+    monkeypatch.setenv("LLM_REPLAY_MODE", "off")  # the given settings win over the environment
+    try:
+        model = install_llm_replay(settings=settings)
+        assert isinstance(model, ReplayChatModel)
+        assert model.latency_ms == 5
+        assert install_llm_replay(settings=settings) is model
+        assert base_agent.lm() is model
+        assert install_llm_replay(settings=settings, latency_ms=0) is not model
+    finally:
+        set_chat_model(None)
+    assert install_llm_replay() is None
@@ -0,0 +1,171 @@
+# ABOUTME: Unit tests for the background tracing export pipeline.
+# ABOUTME: Covers non-blocking queueing with drop counters, per-app sampling and the JSONL sink.
+
+import json
+import threading
+import time
+
+import pytest
+from opentelemetry.sdk.trace import SpanProcessor
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from autobots_orch_flow_studio.common.utils.trace_export import (
+    AppSampler,
+    JsonlSpanExporter,
+    QueuedTracerProvider,
+    SpanExportQueue,
+    app_sampler,
+    parse_sample_rates,
+)
+
+
+class _SlowProcessor(SpanProcessor):
+    def __init__(self):
+        self.gate = threading.Event()
+        self.ended = []
+        self.flushes = 0
+
+    def on_end(self, span):
+        self.gate.wait()
+        self.ended.append(span.name)
+
+    def force_flush(self, timeout_millis=30000):
+        self.flushes += 1
+        return True
+
+
+def test_on_end_never_waits_for_the_sink_and_counts_drops():
+    queue = SpanExportQueue(max_queue_size=10, max_batch_size=4, schedule_delay=0.01)
+    provider = QueuedTracerProvider(queue, shutdown_on_exit=False)
+    sink = _SlowProcessor()
+    provider.add_span_processor(sink)
+    tracer = provider.get_tracer(__name__)
+
+    started = time.perf_counter()
+    for i in range(50):
+        with tracer.start_as_current_span(f"span-{i}"):
+            pass
+    assert time.perf_counter() - started < 1.0  # the sink is blocked the whole time
+
+    sink.gate.set()
+    assert queue.force_flush(5000)
+    stats = queue.stats
+    assert stats.queued + stats.dropped == 50
+    assert stats.dropped > 0
+    assert stats.exported == stats.queued == len(sink.ended)
+    assert sink.ended[0] == "span-0"
+    assert sink.flushes >= 1
+    provider.shutdown()
+
+
+def test_sampling_per_app_and_children_follow_their_root(tmp_path):
+    sampler = AppSampler({"batch_app": 0.0, "chat": 1.0}, default_rate=1.0)
+    provider = QueuedTracerProvider(
+        SpanExportQueue(schedule_delay=0.01, stats=sampler.stats),
+        sampler=app_sampler(sampler),
+        shutdown_on_exit=False,
+    )
+    provider.add_span_processor(SimpleSpanProcessor(JsonlSpanExporter(tmp_path / "t.jsonl")))
+    tracer = provider.get_tracer(__name__)
+
+    for _ in range(5):
+        with (
+            tracer.start_as_current_span("batch_app-writer-batch"),
+            tracer.start_as_current_span("llm"),
+        ):
+            pass
+    with tracer.start_as_current_span("chat-stream"), tracer.start_as_current_span("llm"):
+        pass
+    with tracer.start_as_current_span("other"):
+        pass
+    assert provider.export_queue.force_flush(5000)
+    provider.shutdown()
+
+    spans = [json.loads(line) for line in (tmp_path / "t.jsonl").read_text().splitlines()]
+    assert sorted(s["name"] for s in spans) == ["chat-stream", "llm", "other"]
+    assert sampler.stats.sampled_out == {"batch_app": 5}
+    assert sampler.stats.queued == 3
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates(" a=0.5, b_c=1 ,") == {"a": 0.5, "b_c": 1.0}
+    assert parse_sample_rates("") == {}
+    with pytest.raises(ValueError, match="expected app=rate"):
+        parse_sample_rates("a0.5")
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        parse_sample_rates("a=2")
+
+
+@pytest.fixture
+def fresh_tracing(monkeypatch):
+    """Langfuse keys set, module state reset and the global provider left untouched."""
+    import autobots_devtools_shared_lib.dynagent.config.dynagent_settings as settings_module
+    from langfuse._client.resource_manager import LangfuseResourceManager
+
+    from autobots_orch_flow_studio.common.utils import trace_export
+
+    monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk-lf-test-setup-tracing")
+    monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk-lf-test")
+    monkeypatch.setenv("LANGFUSE_HOST", "http://127.0.0.1:9")
+    monkeypatch.setattr(settings_module, "_settings", None)
+    monkeypatch.setattr(trace_export, "_provider", None)
+    monkeypatch.setattr(trace_export, "_enabled", False)
+    installed = []
+    monkeypatch.setattr(trace_export.trace, "set_tracer_provider", installed.append)
+    LangfuseResourceManager.reset()
+    yield trace_export, installed
+    if trace_export._provider is not None:
+        trace_export._provider.export_queue.shutdown()
+    LangfuseResourceManager.reset()
+
+
+def test_setup_tracing_queues_the_langfuse_processor(fresh_tracing, monkeypatch):
+    trace_export, installed = fresh_tracing
+    monkeypatch.setattr(trace_export, "TRACE_EXPORT", "langfuse")
+
+    assert trace_export.setup_tracing() is True
+    provider = trace_export._provider
+    assert installed == [provider]
+    processors = provider.export_queue._processors
+    assert [type(p).__name__ for p in processors] == ["LangfuseSpanProcessor"]
+
+    from autobots_devtools_shared_lib.common.observability import get_langfuse_handler
+
+    assert get_langfuse_handler() is not None  # shared-lib client shares the queued provider
+    assert trace_export.setup_tracing() is True
+    assert trace_export._provider is provider
+    assert len(provider.export_queue._processors) == 1
+
+
+def test_setup_tracing_failure_installs_nothing_and_can_retry(fresh_tracing, monkeypatch):
+    trace_export, installed = fresh_tracing
+    monkeypatch.setattr(trace_export, "TRACE_EXPORT", "langfuse")
+    import langfuse
+
+    real = langfuse.Langfuse
+
+    def broken(**kwargs):
+        raise TypeError("unexpected keyword argument")
+
+    monkeypatch.setattr(langfuse, "Langfuse", broken)
+    assert trace_export.setup_tracing() is False
+    assert trace_export._provider is None
+    assert installed == []
+
+    monkeypatch.setattr(langfuse, "Langfuse", real)
+    assert trace_export.setup_tracing() is True
+    assert installed == [trace_export._provider]
+
+
+def test_setup_tracing_jsonl_only_with_span_exporter_support(fresh_tracing, monkeypatch, tmp_path):
+    trace_export, installed = fresh_tracing
+    monkeypatch.setattr(trace_export, "TRACE_EXPORT", "jsonl")
+    monkeypatch.setattr(trace_export, "TRACE_JSONL_PATH", str(tmp_path / "t.jsonl"))
+
+    if trace_export._langfuse_accepts_span_exporter():
+        assert trace_export.setup_tracing() is True
+        assert installed == [trace_export._provider]
+    else:
+        assert trace_export.setup_tracing() is False
+        assert trace_export._provider is None
+        assert installed == []
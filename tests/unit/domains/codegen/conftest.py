@@ -0,0 +1,25 @@
+# ABOUTME: Pytest fixtures for codegen unit tests.
+# ABOUTME: Points agent_builder at a temporary agent_configs tree and a copy of tools.py.
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from autobots_orch_flow_studio.domains.codegen.services import agent_builder
+
+REPO_TOOLS = (
+    Path(__file__).parents[4] / "src/autobots_orch_flow_studio/domains/codegen/services/tools.py"
+)
+
+
+@pytest.fixture
+def agent_configs(tmp_path, monkeypatch) -> Path:
+    """Temporary AGENT_CONFIGS_BASE; agent_builder writes domains and tools.py under it."""
+    base = tmp_path / "agent_configs"
+    base.mkdir()
+    tools_file = tmp_path / "tools.py"
+    shutil.copy(REPO_TOOLS, tools_file)
+    monkeypatch.setattr(agent_builder, "AGENT_CONFIGS_BASE", base)
+    monkeypatch.setattr(agent_builder, "get_tools_file_path", lambda: tools_file)
+    return base
@@ -0,0 +1,302 @@
+# ABOUTME: Unit tests for agent_builder prompt generation and AgentCreationTransaction.
+# ABOUTME: Covers the LLM client cache and limits, and all-or-nothing agent commits.
+
+import asyncio
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from autobots_orch_flow_studio.domains.codegen.services import agent_builder
+from autobots_orch_flow_studio.domains.codegen.services.agent_builder import (
+    AgentCreationError,
+    AgentCreationTransaction,
+)
+
+
+class FakeLLM:
+    """Stands in for ChatGoogleGenerativeAI; records how many calls overlap."""
+
+    def __init__(self, delay: float = 0.05, **kwargs):
+        self.kwargs = kwargs
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def _exit(self):
+        with self._lock:
+            self.running -= 1
+
+    def invoke(self, _messages):
+        self._enter()
+        try:
+            time.sleep(self.delay)
+        finally:
+            self._exit()
+        return type("Reply", (), {"content": "# Generated\n"})()
+
+    async def ainvoke(self, _messages):
+        self._enter()
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self._exit()
+        return type("Reply", (), {"content": "# Generated\n"})()
+
+
+@pytest.fixture
+def llm(monkeypatch) -> FakeLLM:
+    """get_llm_client() returns one FakeLLM; the cap is lowered to 2 slots."""
+    client = FakeLLM()
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(agent_builder, "get_llm_client", lambda *_args, **_kwargs: client)
+    monkeypatch.setattr(agent_builder, "_prompt_slots", threading.BoundedSemaphore(2))
+    monkeypatch.setattr(agent_builder, "PROMPT_SLOT_POLL_SECONDS", 0.005)
+    return client
+
+
+def test_llm_client_is_shared_per_model_and_temperature(monkeypatch):
+    monkeypatch.setattr(agent_builder, "ChatGoogleGenerativeAI", FakeLLM)
+    monkeypatch.setattr(agent_builder, "_llm_clients", {})
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    assert agent_builder.get_llm_client() is None
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    client = agent_builder.get_llm_client("gemini-x")
+
+    assert agent_builder.get_llm_client("gemini-x") is client
+    assert agent_builder.get_llm_client("gemini-x", temperature=0.1) is not client
+    assert client.kwargs["timeout"] == agent_builder.PROMPT_LLM_TIMEOUT_SECONDS
+
+
+async def test_generation_past_the_deadline_falls_back_to_the_template(llm):
+    llm.delay = 5
+
+    prompt = await agent_builder.acreate_agent_prompt_content(
+        "joke_agent", "tells jokes", timeout=0.05
+    )
+
+    assert prompt.startswith("# Joke Agent\n\nYou are **Joke Agent**, tells jokes.")
+    assert (
+        await agent_builder.acreate_agent_prompt_content("joke_agent", "tells jokes", use_llm=False)
+        == prompt
+    )
+
+
+async def test_sync_and_async_generations_share_one_cap(llm):
+    sync_prompts = []
+    threads = [
+        threading.Thread(
+            target=lambda: sync_prompts.append(
+                agent_builder.create_agent_prompt_content("a", "does a")
+            )
+        )
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    prompts = await asyncio.gather(
+        *(agent_builder.acreate_agent_prompt_content(f"agent_{i}", "does b") for i in range(6))
+    )
+    for thread in threads:
+        await asyncio.to_thread(thread.join, 5)
+
+    assert prompts == ["# Generated"] * 6
+    assert sync_prompts == ["# Generated"] * 3
+    assert llm.peak == 2
+    assert agent_builder._prompt_slots.acquire(blocking=False)
+
+
+async def test_wait_cancelled_at_the_deadline_leaves_no_slot_taken(llm):
+    llm.delay = 0.2
+    first = asyncio.create_task(agent_builder.acreate_agent_prompt_content("a", "does a"))
+    second = asyncio.create_task(agent_builder.acreate_agent_prompt_content("b", "does b"))
+    await asyncio.sleep(0.01)
+
+    # Both slots are taken, so this one times out while still waiting for a slot
+    prompt = await agent_builder.acreate_agent_prompt_content("c", "does c", timeout=0.05)
+    await asyncio.gather(first, second)
+
+    assert prompt.startswith("# C\n")
+    assert llm.peak == 2
+    for _ in range(2):
+        assert agent_builder._prompt_slots.acquire(blocking=False)
+    assert not agent_builder._prompt_slots.acquire(blocking=False)
+
+
+def _files(root: Path) -> dict[str, str]:
+    return {str(p.relative_to(root)): p.read_text() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+def test_failed_commit_restores_the_files_it_already_replaced(agent_configs, monkeypatch):
+    with AgentCreationTransaction("sales") as txn:
+        txn.add_agent("faq_agent", "# FAQ\n", ["handoff"])
+        txn.commit()
+    before = _files(agent_configs)
+
+    real_replace = Path.replace
+
+    def replace(self, target):
+        # agents.yaml is renamed last; fail there, after prompt and services file
+        if Path(target).name == agent_builder.AGENTS_YAML_FILENAME:
+            raise OSError("disk full")
+        return real_replace(self, target)
+
+    monkeypatch.setattr(Path, "replace", replace)
+    with AgentCreationTransaction("sales") as txn:
+        txn.add_agent("faq_agent", "# FAQ, reworded\n", ["handoff"], replace=True)
+        txn.add_agent("quote_agent", "# Quotes\n", ["handoff"])
+        with pytest.raises(AgentCreationError, match="disk full"):
+            txn.commit()
+
+    assert _files(agent_configs) == before
+
+
+def test_validation_failure_writes_nothing(agent_configs):
+    with AgentCreationTransaction("sales") as txn:
+        txn.add_agent("faq_agent", "  \n", ["handoff"])
+        with pytest.raises(AgentCreationError, match="cannot be empty"):
+            txn.commit()
+    with AgentCreationTransaction("sales") as txn:
+        txn.add_agent("quote_agent", "# Quotes\n", [])
+        with pytest.raises(AgentCreationError, match="at least one tool"):
+            txn.commit()
+
+    assert list(_files(agent_configs)) == [f"sales/{agent_builder.AGENT_BUILDER_LOCK_FILENAME}"]
+
+
+def test_duplicate_agent_names_are_rejected(agent_configs):
+    with AgentCreationTransaction("sales") as txn:
+        number = txn.add_agent("faq_agent", "# FAQ\n", ["handoff"])
+        with pytest.raises(AgentCreationError, match="already exists"):
+            txn.add_agent("faq_agent", "# FAQ again\n", ["handoff"])
+        txn.commit()
+
+    with (
+        AgentCreationTransaction("sales") as txn,
+        pytest.raises(AgentCreationError, match="already exists"),
+    ):
+        txn.add_agent("faq_agent", "# FAQ again\n", ["handoff"])
+    prompt = agent_configs / "sales" / "prompts" / f"{number:02d}-faq-agent.md"
+    assert prompt.read_text() == "# FAQ\n"
+
+
+def test_transactions_without_a_commit_give_back_their_prompt_numbers(agent_configs):
+    with AgentCreationTransaction("sales") as txn:
+        abandoned = txn.add_agent("faq_agent", "# FAQ\n", ["handoff"])
+    with AgentCreationTransaction("sales") as txn:
+        txn.add_agent("faq_agent", "  \n", ["handoff"])
+        with pytest.raises(AgentCreationError):
+            txn.commit()
+    with AgentCreationTransaction("sales") as txn:
+        committed = txn.add_agent("faq_agent", "# FAQ\n", ["handoff"])
+        txn.commit()
+    with AgentCreationTransaction("sales") as txn:
+        after = txn.add_agent("quote_agent", "# Quotes\n", ["handoff"])
+
+    assert committed == abandoned
+    assert after == committed + 1
+
+
+def _load_services_module(batch_enabled: bool, ainvoke_agent) -> types.ModuleType:
+    """Compile a generated services file and swap its ainvoke_agent for a stub."""
+    source = agent_builder.create_services_file_content("sales", "faq_agent", batch_enabled)
+    module = types.ModuleType(f"generated_faq_agent_{batch_enabled}")
+    exec(compile(source, f"{module.__name__}.py", "exec"), module.__dict__)  # noqa: S102
+    module._initialized = True
+    module.ainvoke_agent = ainvoke_agent
+    return module
+
+
+class StubAgent:
+    """Stands in for ainvoke_agent: sleeps per record, fails on "fail", tracks overlap."""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.started = 0
+        self.finished = 0
+        self.completed: list[str] = []
+
+    async def __call__(self, *, input_state, **_kwargs):
+        record = input_state["messages"][0]["content"]
+        self.started += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.05 if record == "slow" else 0.01)
+            if record == "fail":
+                raise RuntimeError("boom")
+            self.completed.append(record)
+            return {"messages": [{"role": "ai", "content": record.upper()}]}
+        finally:
+            self.running -= 1
+            self.finished += 1
+
+
+@pytest.mark.parametrize("batch_enabled", [False, True])
+async def test_generated_abatch_keeps_input_order_within_the_concurrency_bound(batch_enabled):
+    stub = StubAgent()
+    module = _load_services_module(batch_enabled, stub)
+
+    result = await module.faq_agent_abatch(["slow", "a", "fail", "b", "c"], concurrency=2)
+
+    assert [r.index for r in result.results] == [0, 1, 2, 3, 4]
+    assert [r.output for r in result.successes] == ["SLOW", "A", "B", "C"]
+    assert [(r.index, r.error) for r in result.failures] == [(2, "boom")]
+    assert stub.peak == 2
+
+
+@pytest.mark.parametrize("batch_enabled", [False, True])
+async def test_generated_as_completed_cancels_the_rest_on_early_exit(batch_enabled):
+    stub = StubAgent()
+    module = _load_services_module(batch_enabled, stub)
+
+    results = module.faq_agent_as_completed(["a", "slow", "slow", "slow"], concurrency=3)
+    first = await anext(results)
+    await results.aclose()
+
+    assert (first.index, first.output) == (0, "A")
+    # Cancelled records have already unwound by the time aclose() returns
+    assert stub.completed == ["a"]
+    assert stub.running == 0
+    assert stub.finished == stub.started
+
+
+def test_validation_does_not_write_tools(agent_configs):
+    tools_file = agent_builder.get_tools_file_path()
+    before = tools_file.read_text()
+
+    assert agent_builder.validate_agent_config("sales", "faq_agent", "# FAQ\n", ["lookup_faq"]) == (
+        True,
+        "",
+    )
+    assert tools_file.read_text() == before
+
+
+def test_failed_commit_leaves_no_generated_tools(agent_configs, monkeypatch):
+    tools_file = agent_builder.get_tools_file_path()
+    before = tools_file.read_text()
+    real_replace = Path.replace
+
+    def replace(self, target):
+        if Path(target).name == agent_builder.AGENTS_YAML_FILENAME:
+            raise OSError("disk full")
+        return real_replace(self, target)
+
+    monkeypatch.setattr(Path, "replace", replace)
+    with AgentCreationTransaction("sales") as txn:
+        assert txn.stage_tools(["handoff", "lookup_faq"]) == ["lookup_faq"]
+        txn.add_agent("faq_agent", "# FAQ\n", ["handoff", "lookup_faq"])
+        with pytest.raises(AgentCreationError, match="disk full"):
+            txn.commit()
+
+    assert tools_file.read_text() == before
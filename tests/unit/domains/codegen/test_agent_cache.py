@@ -0,0 +1,108 @@
+# ABOUTME: Unit tests for the process-wide compiled agent graph cache.
+# ABOUTME: Covers sharing, fingerprinting, rebuild on change and per-session checkpoint cleanup.
+
+import os
+import threading
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from autobots_orch_flow_studio.domains.codegen.utils.agent_cache import (
+    AgentGraphCache,
+    config_fingerprint,
+)
+
+
+def _config(tmp_path):
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "schemas").mkdir()
+    (tmp_path / "agents.yaml").write_text('agents:\n  a:\n    prompt: "00-a"\n')
+    (tmp_path / "prompts" / "00-a.md").write_text("# A\n")
+    (tmp_path / "schemas" / "a.json").write_text("{}")
+    return tmp_path
+
+
+class _Factory:
+    def __init__(self):
+        self.checkpointers = []
+
+    def __call__(self, checkpointer):
+        self.checkpointers.append(checkpointer)
+        return object()
+
+
+def test_sessions_share_one_graph_and_checkpointer(tmp_path):
+    factory = _Factory()
+    cache = AgentGraphCache(factory, config_dir=_config(tmp_path), check_interval=0)
+
+    agents = {id(cache.get()) for _ in range(200)}
+
+    assert len(agents) == 1
+    assert cache.builds == 1
+    assert factory.checkpointers == [cache.checkpointer]
+
+
+def test_config_changes_rebuild_and_keep_the_checkpointer(tmp_path):
+    config = _config(tmp_path)
+    factory = _Factory()
+    cache = AgentGraphCache(factory, config_dir=config, check_interval=0)
+    first = cache.get()
+
+    (config / "prompts" / "00-a.md").write_text("# A, reworded\n")
+    os.utime(config / "prompts" / "00-a.md", ns=(1, 1))
+    second = cache.get()
+    assert second is not first
+    assert cache.get() is second
+
+    (config / "prompts" / "01-b.md").write_text("# B\n")
+    cache.get()
+    (config / "agents.yaml").unlink()
+    cache.get()
+    assert cache.builds == 4
+    assert factory.checkpointers == [cache.checkpointer] * 4
+
+    cache.invalidate()
+    cache.get()
+    assert cache.builds == 5
+
+
+def test_fingerprint_covers_config_files_and_tools_only(tmp_path):
+    config = _config(tmp_path)
+    base = config_fingerprint(config, ["handoff", "get_agent_list"])
+
+    assert config_fingerprint(config, ["get_agent_list", "handoff"]) == base
+    assert config_fingerprint(config, ["handoff", "get_agent_list", "new_tool"]) != base
+
+    (config / "invoke_agent_sample.py").write_text("print()")
+    (config / ".agent-builder.lock").write_text("")
+    (config / "agents.yaml.tmp").write_text("")
+    assert config_fingerprint(config, ["handoff", "get_agent_list"]) == base
+
+    (config / "schemas" / "b.json").write_text("{}")
+    assert config_fingerprint(config, ["handoff", "get_agent_list"]) != base
+
+
+async def test_aget_builds_off_the_event_loop(tmp_path):
+    built_on = []
+    cache = AgentGraphCache(
+        lambda _checkpointer: built_on.append(threading.current_thread()) or object(),
+        config_dir=_config(tmp_path),
+        check_interval=60,
+    )
+
+    agent = await cache.aget()
+
+    assert built_on and built_on[0] is not threading.current_thread()
+    assert await cache.aget() is agent
+    assert cache.builds == 1
+
+
+async def test_aforget_drops_only_that_sessions_checkpoints(tmp_path):
+    cache = AgentGraphCache(_Factory(), config_dir=_config(tmp_path))
+    for thread_id in ("a", "b"):
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        cache.checkpointer.put(config, empty_checkpoint(), {}, {})
+
+    await cache.aforget("a")
+
+    assert cache.checkpointer.get_tuple({"configurable": {"thread_id": "a"}}) is None
+    assert cache.checkpointer.get_tuple({"configurable": {"thread_id": "b"}}) is not None
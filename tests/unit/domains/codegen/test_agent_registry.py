@@ -0,0 +1,94 @@
+# ABOUTME: Unit tests for the cached agents.yaml registry and its round-tripping writer.
+# ABOUTME: Covers verbatim preservation of untouched entries, mtime caching and prompt numbering.
+
+import os
+import threading
+from pathlib import Path
+
+import yaml
+
+from autobots_orch_flow_studio.domains.codegen.utils.agent_registry import (
+    AgentConfig,
+    AgentRegistry,
+    AgentsYamlDocument,
+)
+
+REPO_AGENTS_YAML = Path(__file__).parents[4] / "agent_configs/orch_flow_studio/agents.yaml"
+
+
+def test_document_round_trips_and_rewrites_only_changed_entries():
+    text = REPO_AGENTS_YAML.read_text(encoding="utf-8")
+    doc = AgentsYamlDocument(text)
+    assert doc.render() == text
+    assert doc.get("coordinator").is_default  # hand-written "is_default: Y"
+    assert doc.get("model_oas_generator").output_schema == "model_oas_spec.json"
+
+    doc.set(AgentConfig(name="new_agent", prompt="07-new-agent", tools=["handoff"]))
+    flow = doc.get("flow_generator")
+    flow.tools = ["read_file_tool"]
+    doc.set(flow)
+    doc.remove("flow_purpose_writer")
+    rendered = doc.render()
+
+    before, after = yaml.safe_load(text)["agents"], yaml.safe_load(rendered)["agents"]
+    assert list(after) == [n for n in before if n != "flow_purpose_writer"] + ["new_agent"]
+    assert after["flow_generator"]["tools"] == ["read_file_tool"]
+    assert after["flow_generator"]["prompt"] == "flow_merge_actual_converted"
+    assert after["new_agent"] == {
+        "prompt": "07-new-agent",
+        "batch_enabled": False,
+        "tools": ["handoff"],
+    }
+    # untouched entries keep their exact text, comments included
+    assert rendered.startswith(text[: text.index("  flow_purpose_writer:")] + "  flow_generator:")
+    assert text[text.index("  processing_unit_oas_generator:") :].rstrip() in rendered
+
+
+def test_registry_reparses_only_when_agents_yaml_changes(tmp_path):
+    path = tmp_path / "agents.yaml"
+    path.write_text('# header\nagents:\n  a:\n    prompt: "00-a"\n', encoding="utf-8")
+    registry = AgentRegistry(tmp_path)
+
+    assert "a" in registry
+    cached = registry._document
+    assert "b" not in registry
+    assert registry._document is cached
+
+    path.write_text(path.read_text() + '  b:\n    prompt: "01-b"\n', encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert registry.names() == ["a", "b"]
+    assert registry.get("b").prompt_number == 1
+
+
+def test_prompt_numbers_are_unique_across_threads_and_follow_new_files(tmp_path):
+    prompts = tmp_path / "prompts"
+    prompts.mkdir()
+    (prompts / "04-existing.md").write_text("x")
+    registry = AgentRegistry(tmp_path)
+    assert registry.next_prompt_number() == 5
+
+    numbers: list[int] = []
+    threads = [
+        threading.Thread(target=lambda: numbers.append(registry.reserve_prompt_number()))
+        for _ in range(20)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(numbers) == list(range(5, 25))
+
+    (prompts / "40-copied-in.md").write_text("x")
+    os.utime(prompts, ns=(1, 1))
+    assert registry.reserve_prompt_number() == 41
+
+
+def test_released_prompt_numbers_are_handed_out_again(tmp_path):
+    registry = AgentRegistry(tmp_path)
+    first, second = registry.reserve_prompt_number(), registry.reserve_prompt_number()
+    assert (first, second) == (0, 1)
+
+    registry.release_prompt_number(first)
+    assert registry.next_prompt_number() == 2  # 1 is still held
+    registry.release_prompt_number(second)
+    assert registry.reserve_prompt_number() == 0
@@ -0,0 +1,190 @@
+# ABOUTME: Unit tests for hot reload of agent config into the shared agent cache.
+# ABOUTME: Covers change planning, swaps between turns only and failed reloads.
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+from autobots_devtools_shared_lib.dynagent import AgentMeta
+
+from autobots_orch_flow_studio.domains.codegen.utils.agent_cache import AgentGraphCache
+from autobots_orch_flow_studio.domains.codegen.utils.agent_reload import (
+    AgentConfigReloader,
+    load_agent_configs,
+    plan_reload,
+)
+
+AGENTS = {
+    "coordinator": {"prompt": "00-coordinator", "is_default": True, "tools": ["handoff"]},
+    "writer": {
+        "prompt": "01-writer",
+        "tools": ["handoff", "get_agent_list"],
+        "output": {"schema": "writer-output.json"},
+    },
+}
+
+
+def _write_agents(config: Path, agents: dict) -> None:
+    (config / "agents.yaml").write_text(yaml.safe_dump({"agents": agents}))
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setenv("DYNAGENT_CONFIG_ROOT_DIR", str(tmp_path))
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "schemas").mkdir()
+    (tmp_path / "prompts" / "00-coordinator.md").write_text("# Coordinator\n")
+    (tmp_path / "prompts" / "01-writer.md").write_text("# Writer\n")
+    (tmp_path / "schemas" / "writer-output.json").write_text(json.dumps({"type": "object"}))
+    _write_agents(tmp_path, AGENTS)
+    AgentMeta.reset()
+    yield tmp_path
+    AgentMeta.reset()
+
+
+@pytest.fixture
+def cache(config):
+    cache = AgentGraphCache(lambda _checkpointer: object(), config_dir=config, check_interval=0)
+    cache.get()
+    return cache
+
+
+def test_plan_rebuilds_only_agents_that_reference_changed_files(config):
+    old = load_agent_configs(config)
+
+    plan = plan_reload(old, old, {config / "prompts" / "01-writer.md"})
+    assert plan.agents == {"writer"}
+    assert not plan.rebuild_graph
+    plan = plan_reload(old, old, {config / "schemas" / "writer-output.json"})
+    assert plan.agents == {"writer"}
+    assert plan_reload(old, old, {config / "prompts" / "99-unused.md"}).is_empty()
+
+    agents = {
+        "coordinator": {**AGENTS["coordinator"], "is_default": False},
+        "reviewer": {"prompt": "02-reviewer", "is_default": True, "tools": ["handoff"]},
+    }
+    _write_agents(config, agents)
+    plan = plan_reload(old, load_agent_configs(config), {config / "agents.yaml"})
+    assert plan.agents == {"coordinator", "reviewer"}
+    assert plan.removed == {"writer"}
+    assert plan.rebuild_graph
+
+
+def test_reload_swaps_in_new_metadata_and_keeps_the_graph(config, cache):
+    reloader = AgentConfigReloader(cache)
+    before = AgentMeta.instance()
+    graph = cache.get()
+
+    (config / "prompts" / "01-writer.md").write_text("# Writer, reworded\n")
+    reloader.reload({config / "prompts" / "01-writer.md"})
+
+    meta = AgentMeta.instance()
+    assert meta is not before
+    assert meta.prompt_map["writer"] == "# Writer, reworded\n"
+    assert before.prompt_map["writer"] == "# Writer\n"  # the old view is left intact
+    assert cache.get() is graph
+
+    (config / "prompts" / "02-reviewer.md").write_text("# Reviewer\n")
+    agents = {
+        **AGENTS,
+        "coordinator": {**AGENTS["coordinator"], "is_default": False},
+        "reviewer": {"prompt": "02-reviewer", "is_default": True, "tools": ["get_agent_list"]},
+    }
+    _write_agents(config, agents)
+    plan = reloader.reload({config / "agents.yaml", config / "prompts" / "02-reviewer.md"})
+
+    meta = AgentMeta.instance()
+    assert plan.agents == {"coordinator", "reviewer"}
+    assert meta.default_agent == "reviewer"
+    assert [t.name for t in meta.tool_map["reviewer"]] == ["get_agent_list"]
+    assert cache.get() is not graph
+    assert cache.builds == 2
+
+
+def test_failed_reload_keeps_running_config_and_retries_its_files(config, cache):
+    reloader = AgentConfigReloader(cache)
+    before = AgentMeta.instance()
+
+    (config / "prompts" / "01-writer.md").write_text("# Writer v2\n")
+    _write_agents(config, {**AGENTS, "broken": {"prompt": "00-coordinator", "tools": ["nope"]}})
+    assert reloader.reload({config / "agents.yaml", config / "prompts" / "01-writer.md"}) is None
+    assert AgentMeta.instance() is before
+
+    _write_agents(
+        config,
+        {**AGENTS, "broken": {"prompt": "00-coordinator", "output": {"schema": "gone.json"}}},
+    )
+    assert reloader.reload({config / "agents.yaml"}) is None
+    assert AgentMeta.instance() is before
+
+    _write_agents(config, AGENTS)
+    plan = reloader.reload({config / "agents.yaml"})
+    assert plan.agents == {"writer"}
+    assert AgentMeta.instance().prompt_map["writer"] == "# Writer v2\n"
+
+
+async def test_reload_waits_for_the_running_turn(config, cache):
+    reloader = AgentConfigReloader(cache)
+    cache.watched = True  # as while the reloader thread runs
+    before = AgentMeta.instance()
+    (config / "prompts" / "01-writer.md").write_text("# Writer, reworded\n")
+    reloaded = threading.Event()
+
+    async with cache.turn():
+        thread = threading.Thread(
+            target=lambda: reloader.reload({config / "prompts" / "01-writer.md"}) and reloaded.set()
+        )
+        thread.start()
+        await asyncio.sleep(0.2)
+        assert not reloaded.is_set()
+        assert AgentMeta.instance() is before  # nothing changes under a running turn
+
+    await asyncio.to_thread(thread.join, 5)
+    assert reloaded.is_set()
+    assert AgentMeta.instance().prompt_map["writer"] == "# Writer, reworded\n"
+
+
+async def test_turns_started_during_a_swap_wait_off_the_event_loop(cache):
+    swapping = threading.Event()
+    release = threading.Event()
+
+    def swap():
+        with cache.gate.swap():
+            swapping.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=swap)
+    thread.start()
+    await asyncio.to_thread(swapping.wait, 5)
+
+    entered = asyncio.Event()
+
+    async def turn():
+        async with cache.turn():
+            entered.set()
+
+    task = asyncio.create_task(turn())
+    await asyncio.sleep(0.1)
+    assert not entered.is_set()  # held back, yet the loop still runs this test
+    release.set()
+    await asyncio.wait_for(task, 5)
+    await asyncio.to_thread(thread.join, 5)
+    assert entered.is_set()
+
+    # A turn cancelled while held back does not leave the gate closed to swaps
+    release.clear()
+    swapping.clear()
+    thread = threading.Thread(target=swap)
+    thread.start()
+    await asyncio.to_thread(swapping.wait, 5)
+    task = asyncio.create_task(turn())
+    await asyncio.sleep(0.1)
+    task.cancel()
+    release.set()
+    await asyncio.to_thread(thread.join, 5)
+    await asyncio.sleep(0.1)
+    with cache.gate.swap():
+        pass
@@ -0,0 +1,164 @@
+# ABOUTME: Unit tests for bulk agent scaffolding from YAML/CSV spec files.
+# ABOUTME: Covers spec parsing, hash-based skipping, replacement and failure reporting.
+
+import json
+
+import pytest
+import yaml
+
+from autobots_orch_flow_studio.domains.codegen.services import agent_builder
+from autobots_orch_flow_studio.domains.codegen.services.agent_builder import (
+    AgentCreationTransaction,
+)
+from autobots_orch_flow_studio.domains.codegen.services.agent_scaffold import (
+    SPEC_HASHES_FILENAME,
+    STATUS_CREATED,
+    STATUS_FAILED,
+    STATUS_UNCHANGED,
+    STATUS_UPDATED,
+    AgentSpec,
+    load_agent_specs,
+    scaffold_agents,
+)
+
+
+def _spec(name: str, purpose: str = "Answers questions", tools=("handoff",)) -> AgentSpec:
+    return AgentSpec(name=name, purpose=purpose, tools=list(tools))
+
+
+def _statuses(report) -> dict[str, str]:
+    return {r.name: r.status for r in report.results}
+
+
+def test_load_yaml_specs_as_list_or_mapping(tmp_path):
+    listed = tmp_path / "agents.yaml"
+    listed.write_text(
+        yaml.safe_dump(
+            {
+                "domain": "sales",
+                "agents": [
+                    {
+                        "name": "quote_agent",
+                        "purpose": "Quotes",
+                        "tools": "handoff; quote_tool",
+                        "batch_enabled": "yes",
+                        "output_schema_fields": {"price": "number"},
+                    }
+                ],
+            }
+        )
+    )
+    mapped = tmp_path / "agents.yml"
+    mapped.write_text("agents:\n  faq_agent:\n    purpose: FAQ\n    tools: [handoff]\n")
+
+    domain, specs = load_agent_specs(listed)
+    assert domain == "sales"
+    assert specs == [
+        AgentSpec(
+            name="quote_agent",
+            purpose="Quotes",
+            tools=["handoff", "quote_tool"],
+            batch_enabled=True,
+            output_schema_fields={"price": "number"},
+        )
+    ]
+    assert load_agent_specs(mapped) == (None, [_spec("faq_agent", "FAQ")])
+
+
+def test_load_csv_specs(tmp_path):
+    path = tmp_path / "agents.csv"
+    path.write_text(
+        "name,purpose,tools,is_default,output_schema_fields\n"
+        'faq_agent,FAQ,"handoff, read_file_tool",Y,answer:string; score:number\n'
+        "quote_agent,Quotes,handoff,,\n"
+    )
+
+    domain, specs = load_agent_specs(path)
+
+    assert domain is None
+    assert specs[0].tools == ["handoff", "read_file_tool"]
+    assert specs[0].is_default
+    assert specs[0].output_schema_fields == {"answer": "string", "score": "number"}
+    assert specs[1] == _spec("quote_agent", "Quotes")
+
+
+def test_load_specs_rejects_other_file_types(tmp_path):
+    path = tmp_path / "agents.json"
+    path.write_text("[]")
+    with pytest.raises(ValueError, match="Unsupported"):
+        load_agent_specs(path)
+
+
+def test_unchanged_specs_are_skipped_and_changed_ones_replaced(agent_configs):
+    report = scaffold_agents("sales", [_spec("faq_agent"), _spec("quote_agent")], use_llm=False)
+    assert _statuses(report) == {"faq_agent": STATUS_CREATED, "quote_agent": STATUS_CREATED}
+    hashes = json.loads((agent_configs / "sales" / SPEC_HASHES_FILENAME).read_text())
+    assert set(hashes) == {"faq_agent", "quote_agent"}
+    numbers = {r.name: r.prompt_number for r in report.results}
+
+    report = scaffold_agents(
+        "sales", [_spec("faq_agent"), _spec("quote_agent", "Quotes prices")], use_llm=False
+    )
+
+    assert _statuses(report) == {"faq_agent": STATUS_UNCHANGED, "quote_agent": STATUS_UPDATED}
+    assert report.results[1].prompt_number == numbers["quote_agent"]
+    prompt = agent_configs / "sales" / "prompts" / f"{numbers['quote_agent']:02d}-quote-agent.md"
+    assert "Quotes prices" in prompt.read_text()
+
+
+def test_hand_built_agents_are_only_replaced_with_force(agent_configs):
+    with AgentCreationTransaction("sales") as txn:
+        number = txn.add_agent("faq_agent", "Hand-written prompt", ["handoff"])
+        txn.commit()
+    prompt = agent_configs / "sales" / "prompts" / f"{number:02d}-faq-agent.md"
+
+    report = scaffold_agents("sales", [_spec("faq_agent"), _spec("quote_agent")], use_llm=False)
+
+    assert _statuses(report) == {"faq_agent": STATUS_FAILED, "quote_agent": STATUS_CREATED}
+    assert "--force" in report.results[0].error
+    assert prompt.read_text() == "Hand-written prompt"
+
+    report = scaffold_agents("sales", [_spec("faq_agent")], use_llm=False, force=True)
+
+    assert _statuses(report) == {"faq_agent": STATUS_UPDATED}
+    assert prompt.read_text() != "Hand-written prompt"
+
+
+def test_invalid_specs_fail_alone_and_tools_are_committed_with_the_agents(agent_configs):
+    tools_file = agent_builder.get_tools_file_path()
+    specs = [
+        _spec("Bad Name"),
+        _spec("faq_agent", tools=["handoff", "faq_lookup"]),
+        _spec("faq_agent"),
+        _spec("empty_agent", purpose=""),
+    ]
+
+    report = scaffold_agents("sales", specs, use_llm=False)
+
+    assert [r.status for r in report.results] == [
+        STATUS_FAILED,
+        STATUS_CREATED,
+        STATUS_FAILED,
+        STATUS_FAILED,
+    ]
+    assert "listed more than once" in report.results[2].error
+    assert report.created_tools == ["faq_lookup"]
+    assert "def faq_lookup(" in tools_file.read_text()
+
+
+def test_failed_commit_leaves_tools_py_untouched(agent_configs, monkeypatch):
+    tools_file = agent_builder.get_tools_file_path()
+    before = tools_file.read_text()
+    monkeypatch.setattr(
+        agent_builder,
+        "create_services_file_content",
+        lambda *_args: "def broken(:\n",
+    )
+
+    report = scaffold_agents("sales", [_spec("faq_agent", tools=["faq_lookup"])], use_llm=False)
+
+    assert _statuses(report) == {"faq_agent": STATUS_FAILED}
+    assert "does not compile" in report.results[0].error
+    assert report.created_tools == []
+    assert tools_file.read_text() == before
+    assert not (agent_configs / "sales" / "agents.yaml").exists()
@@ -0,0 +1,134 @@
+# ABOUTME: Unit tests for the artifact schema validation stage.
+# ABOUTME: Covers compiled-vs-jsonschema agreement, the jsonschema fallback and batch requeue.
+
+import copy
+import json
+from pathlib import Path
+
+import fastjsonschema
+import pytest
+from autobots_devtools_shared_lib.dynagent import BatchResult, RecordResult
+
+from autobots_orch_flow_studio.domains.codegen.utils.artifact_validation import (
+    ARTIFACT_SCHEMAS,
+    SchemaRegistry,
+    validated_batch_invoker,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.flow_kg import extract_flow_kgs
+from autobots_orch_flow_studio.domains.codegen.utils.model_oas_template import (
+    build_model_oas_specs,
+)
+
+SCHEMAS_DIR = Path(__file__).parents[4] / "agent_configs/orch_flow_studio/schemas"
+REGISTRY = SchemaRegistry(SCHEMAS_DIR)
+
+MODEL_SPEC = build_model_oas_specs(
+    {
+        "Party": {
+            "description": "A party",
+            "fields": {"partyId": {"type": "String", "mandatory": "Y", "description": "Id"}},
+        }
+    }
+)["Party"]
+FLOW_KG = extract_flow_kgs(
+    [
+        {"id": "t", "type": "tab", "label": "Main"},
+        {"id": "a", "type": "mq in", "z": "t", "name": "IN", "wires": [["b"]]},
+        {"id": "b", "type": "enrich", "z": "t", "name": "enrich", "wires": [["c"]]},
+        {"id": "c", "type": "mq out", "z": "t", "name": "OUT", "wires": []},
+    ],
+    "main.json",
+    generated_at="2026-01-08T00:00:00.000Z",
+)[0]
+
+
+def _broken(doc: dict, path: list, value) -> dict:
+    doc = copy.deepcopy(doc)
+    node = doc
+    for key in path[:-1]:
+        node = node[key]
+    if value is KeyError:
+        del node[path[-1]]
+    else:
+        node[path[-1]] = value
+    return doc
+
+
+@pytest.mark.parametrize(
+    ("kind", "doc"),
+    [
+        ("model_oas", MODEL_SPEC),
+        ("model_oas", _broken(MODEL_SPEC, ["modelName"], KeyError)),
+        ("model_oas", _broken(MODEL_SPEC, ["properties", "partyId", "type"], 7)),
+        ("flow_kg", FLOW_KG),
+        ("flow_kg", _broken(FLOW_KG, ["kgId"], "no-colons")),
+        ("flow_kg", _broken(FLOW_KG, ["pathType"], "SAD")),
+        ("flow_kg", _broken(FLOW_KG, ["flowPaths", "other"], [])),
+        ("flow_kg", _broken(FLOW_KG, ["entryPoint"], {"node": {}, "connector": {}})),
+        ("flow_kg", _broken(FLOW_KG, ["flowPaths", "path_1", 0, "stepNumber"], 0)),
+        ("flow_kg", []),
+    ],
+)
+def test_compiled_check_agrees_with_jsonschema(kind, doc):
+    expected = not list(REGISTRY.validator(kind).iter_errors(doc))
+    assert (REGISTRY.validate(kind, doc) == []) is expected
+    assert REGISTRY._checks[kind] is not None
+
+
+def test_every_artifact_schema_compiles():
+    registry = SchemaRegistry(SCHEMAS_DIR)
+    registry.compile_all()
+    assert set(registry.compile_seconds) == set(ARTIFACT_SCHEMAS)
+
+
+def test_batch_invoker_requeues_invalid_records_with_errors():
+    calls: list[list[str]] = []
+    bad = json.dumps({"modelName": "Party"})
+    good = json.dumps(MODEL_SPEC)
+
+    def invoker(agent_name, records, trace_metadata=None):
+        calls.append(records)
+        outputs = [good if "failed validation" in r or r == "ok" else bad for r in records]
+        return BatchResult(
+            agent_name=agent_name,
+            total=len(records),
+            results=[RecordResult(index=i, success=True, output=o) for i, o in enumerate(outputs)],
+        )
+
+    result = validated_batch_invoker(
+        "model_oas_generator", ["ok", "fix me"], "model_oas", registry=REGISTRY, invoker=invoker
+    )
+    assert [r.success for r in result.results] == [True, True]
+    assert len(calls) == 2
+    assert calls[1][0].startswith("fix me") and "required property" in calls[1][0]
+
+    stubborn = validated_batch_invoker(
+        "model_oas_generator",
+        ["fix me"],
+        "model_oas",
+        registry=REGISTRY,
+        max_attempts=1,
+        invoker=lambda a, _records, **_kw: BatchResult(
+            agent_name=a, total=1, results=[RecordResult(index=0, success=True, output="nope")]
+        ),
+    )
+    assert not stubborn.results[0].success
+    assert "not a JSON document" in stubborn.results[0].error
+
+
+def test_uncompilable_schema_falls_back_to_jsonschema(monkeypatch):
+    def refuse(*_args, **_kwargs):
+        raise fastjsonschema.JsonSchemaDefinitionException("unsupported")
+
+    monkeypatch.setattr(fastjsonschema, "compile", refuse)
+    registry = SchemaRegistry(SCHEMAS_DIR)
+
+    assert registry.validate("model_oas", MODEL_SPEC) == []
+    assert registry._checks["model_oas"] is None
+    assert any("modelName" in e for e in registry.validate("model_oas", {"type": "object"}))
+
+
+def test_validation_does_not_fill_in_defaults():
+    doc = copy.deepcopy(FLOW_KG)
+    REGISTRY.validate("flow_kg", doc)
+    assert doc == FLOW_KG
@@ -0,0 +1,75 @@
+# ABOUTME: Unit tests for the debounced polling file watcher.
+# ABOUTME: Covers burst coalescing, net-change folding, ignored files and the max-delay flush.
+
+import os
+
+from autobots_orch_flow_studio.domains.codegen.utils.file_watch import (
+    CHANGE_ADDED,
+    CHANGE_DELETED,
+    CHANGE_MODIFIED,
+    DebouncedWatcher,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _save(path, text: str, mtime_ns: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_burst_of_saves_is_released_once_after_quiet_period(tmp_path):
+    lld, flows = tmp_path / "lld", tmp_path / "flows"
+    lld.mkdir()
+    _save(lld / "feature.md", "# A", 1)
+    clock = FakeClock()
+    watcher = DebouncedWatcher([lld, flows], debounce_seconds=0.5, clock=clock)
+    assert watcher.poll() is None
+
+    for i in range(5):  # an editor saving repeatedly
+        clock.now += 0.1
+        _save(lld / "feature.md", f"# A{i}", 10 + i)
+        assert watcher.poll() is None
+    flows.mkdir()  # a root created after the watcher started
+    _save(flows / "main.json", "[]", 20)
+    (flows / ".main.json.swp").write_text("x")
+    _save(flows / "scratch.json", "[]", 21)
+    assert watcher.poll() is None
+    (flows / "scratch.json").unlink()  # added then deleted within the burst: no change
+    assert watcher.poll() is None
+
+    clock.now += 0.6
+    assert watcher.poll() == {
+        lld / "feature.md": CHANGE_MODIFIED,
+        flows / "main.json": CHANGE_ADDED,
+    }
+    clock.now += 1
+    assert watcher.poll() is None
+
+    (lld / "feature.md").unlink()
+    clock.now += 1
+    assert watcher.poll() is None
+    clock.now += 1
+    assert watcher.poll() == {lld / "feature.md": CHANGE_DELETED}
+
+
+def test_continuous_saves_flush_after_max_delay(tmp_path):
+    clock = FakeClock()
+    watcher = DebouncedWatcher([tmp_path], debounce_seconds=0.5, max_delay_seconds=2.0, clock=clock)
+    batches = []
+    for i in range(20):  # a save every 0.3s never leaves a 0.5s quiet gap
+        clock.now += 0.3
+        _save(tmp_path / "models.json", str(i), 100 + i)
+        batch = watcher.poll()
+        if batch:
+            batches.append(batch)
+    assert batches == [
+        {tmp_path / "models.json": CHANGE_ADDED},
+        {tmp_path / "models.json": CHANGE_MODIFIED},
+    ]
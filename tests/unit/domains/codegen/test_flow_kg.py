@@ -0,0 +1,180 @@
+# ABOUTME: Unit tests for deterministic flow KG extraction from Node-RED flow JSON.
+# ABOUTME: Covers entry/exit detection, link hops, branching, file names, schema shape and scale.
+
+import time
+from pathlib import Path
+
+from jsonschema import Draft7Validator
+
+from autobots_orch_flow_studio.domains.codegen.utils import flow_kg
+from autobots_orch_flow_studio.domains.codegen.utils.flow_kg import (
+    build_flow_graph,
+    entry_nodes,
+    exit_nodes,
+    extract_flow_kgs,
+    kg_file_names,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.kb_refs import KbRefResolver
+
+SCHEMAS_DIR = Path(__file__).parents[4] / "agent_configs/orch_flow_studio/schemas"
+
+FLOW = [
+    {"id": "t1", "type": "tab", "label": "Reject"},
+    {"id": "t2", "type": "tab", "label": "RRS Enrich"},
+    {"id": "sf", "type": "subflow", "name": "audit-log"},
+    {"id": "cfg", "type": "mq-config", "name": "broker"},
+    {"id": "in", "type": "mq in", "z": "t1", "name": "INPY-RRS", "wires": [["map"]]},
+    {"id": "map", "type": "map-iso", "z": "t1", "name": "map-rrs", "wires": [["sw"]]},
+    {"id": "sw", "type": "switch", "z": "t1", "name": "valid?", "wires": [["lo"], ["err"]]},
+    {"id": "lo", "type": "link out", "z": "t1", "name": "to-enrich", "links": ["li"]},
+    {"id": "err", "type": "mq out", "z": "t1", "name": "RRS-ERROR", "wires": []},
+    {"id": "li", "type": "link in", "z": "t2", "name": "from-reject", "wires": [["enr"]]},
+    {"id": "enr", "type": "enrich", "z": "t2", "name": "enrich-party", "wires": [["aud"]]},
+    {"id": "aud", "type": "subflow:sf", "z": "t2", "wires": [["out"]]},
+    {"id": "out", "type": "mq out", "z": "t2", "name": "REJ-RET", "wires": []},
+]
+
+
+def _drop_placeholder_patterns(node):
+    # common-specs.json still has "pattern": "TODO" on nodeKgId.
+    if isinstance(node, dict):
+        return {
+            k: _drop_placeholder_patterns(v)
+            for k, v in node.items()
+            if not (k == "pattern" and v == "TODO")
+        }
+    if isinstance(node, list):
+        return [_drop_placeholder_patterns(v) for v in node]
+    return node
+
+
+def _kg_validator() -> Draft7Validator:
+    schema = KbRefResolver(SCHEMAS_DIR).dereference("node-red-kg-schema-spec.json")
+    return Draft7Validator(_drop_placeholder_patterns(schema))
+
+
+def test_entries_exits_and_link_hops():
+    graph = build_flow_graph(FLOW)
+    assert "cfg" not in graph.nodes
+    assert graph.succ["lo"] == ["li"]
+    assert entry_nodes(graph) == ["in"]
+    assert exit_nodes(graph) == ["err", "out"]
+
+
+def test_extract_flow_kgs_structure_and_schema():
+    kgs = extract_flow_kgs(FLOW, "reject.json", generated_at="2026-01-08T00:00:00.000Z")
+    by_name = {kg["componentName"]: kg for kg in kgs}
+    assert set(by_name) == {"INPY-RRS_to_RRS-ERROR", "INPY-RRS_to_REJ-RET"}
+
+    happy = by_name["INPY-RRS_to_REJ-RET"]
+    assert happy["kgId"] == "Reject:INPY-RRS::RRS Enrich:REJ-RET"
+    assert happy["pathType"] == "HAPPY"
+    assert happy["businessPurpose"] == ""
+    assert [n["name"] for n in happy["processingNodes"]] == ["map-rrs", "enrich-party"]
+    assert happy["processingFlows"] == [{"kgId": "audit-log", "id": "sf", "type": "SUBFLOW"}]
+    steps = happy["flowPaths"]["path_1"]
+    assert [s["to"]["node"]["id"] for s in steps] == ["map", "sw", "lo", "li", "enr", "aud", "out"]
+    assert by_name["INPY-RRS_to_RRS-ERROR"]["pathType"] == "ERROR"
+
+    validator = _kg_validator()
+    for kg in kgs:
+        assert list(validator.iter_errors(kg)) == []
+
+
+def test_branching_flow_gives_each_entry_exit_pair_only_its_own_nodes():
+    flow = [
+        {"id": "t", "type": "tab", "label": "Branch"},
+        {"id": "a1", "type": "http in", "z": "t", "name": "A1", "wires": [["x"]]},
+        {"id": "a2", "type": "http in", "z": "t", "name": "A2", "wires": [["y"]]},
+        {"id": "x", "type": "function", "z": "t", "name": "x", "wires": [["shared"]]},
+        {"id": "y", "type": "function", "z": "t", "name": "y", "wires": [["shared"]]},
+        {"id": "shared", "type": "function", "z": "t", "name": "shared", "wires": [["sw"]]},
+        {"id": "sw", "type": "switch", "z": "t", "wires": [["e1"], ["z"]]},
+        {"id": "z", "type": "function", "z": "t", "name": "z", "wires": [["e2"]]},
+        {"id": "e1", "type": "http response", "z": "t", "name": "E1", "wires": []},
+        {"id": "e2", "type": "http response", "z": "t", "name": "E2", "wires": []},
+    ]
+
+    kgs = extract_flow_kgs(flow, "branch.json")
+
+    nodes = {kg["componentName"]: [n["id"] for n in kg["processingNodes"]] for kg in kgs}
+    assert nodes == {
+        "A1_to_E1": ["x", "shared"],
+        "A1_to_E2": ["x", "shared", "z"],
+        "A2_to_E1": ["y", "shared"],
+        "A2_to_E2": ["y", "shared", "z"],
+    }
+
+
+def test_fan_in_fan_out_walks_the_graph_once_per_entry_and_exit(monkeypatch):
+    k, m = 30, 200
+    flow = [{"id": "t", "type": "tab", "label": "Hub"}]
+    flow += [
+        {"id": f"a{i}", "type": "http in", "z": "t", "name": f"A{i}", "wires": [["c0"]]}
+        for i in range(k)
+    ]
+    flow += [
+        {"id": f"c{j}", "type": "function", "z": "t", "wires": [[f"c{j + 1}"]]}
+        for j in range(m - 1)
+    ]
+    flow.append(
+        {"id": f"c{m - 1}", "type": "function", "z": "t", "wires": [[f"e{i}" for i in range(k)]]}
+    )
+    flow += [
+        {"id": f"e{i}", "type": "http response", "z": "t", "name": f"E{i}", "wires": []}
+        for i in range(k)
+    ]
+    calls = {"forward": 0, "backward": 0}
+    real_bfs, real_reaching = flow_kg._bfs, flow_kg._reaching
+
+    def bfs(*args):
+        calls["forward"] += 1
+        return real_bfs(*args)
+
+    def reaching(*args):
+        calls["backward"] += 1
+        return real_reaching(*args)
+
+    monkeypatch.setattr(flow_kg, "_bfs", bfs)
+    monkeypatch.setattr(flow_kg, "_reaching", reaching)
+
+    kgs = extract_flow_kgs(flow, "hub.json")
+
+    assert len(kgs) == k * k
+    assert calls == {"forward": k, "backward": k + 1}
+    chain = [f"c{j}" for j in range(m)]
+    assert all([n["id"] for n in kg["processingNodes"]] == chain for kg in kgs)
+
+
+def test_kg_file_names_are_path_safe_and_distinct():
+    kgs = [
+        {"sourceFile": "a.json", "componentName": "in/put_to_out"},
+        {"sourceFile": "a.json", "componentName": "in/put_to_out"},
+        {"sourceFile": "b.json", "componentName": "in/put_to_out"},
+        {"sourceFile": "a.json", "componentName": "../.."},
+    ]
+
+    assert kg_file_names(kgs) == [
+        "a--in_put_to_out.json",
+        "a--in_put_to_out-2.json",
+        "b--in_put_to_out.json",
+        "a--.json",
+    ]
+
+
+def test_unconnected_link_nodes_are_connectors_and_long_chains_are_fast():
+    n = 100_000
+    flow = [{"id": "t", "type": "tab", "label": "Big"}]
+    flow.append({"id": "n0", "type": "link in", "z": "t", "name": "start", "wires": [["n1"]]})
+    flow += [
+        {"id": f"n{i}", "type": "function", "z": "t", "wires": [[f"n{i + 1}"]]} for i in range(1, n)
+    ]
+    flow.append({"id": f"n{n}", "type": "link out", "z": "t", "name": "end", "links": []})
+
+    started = time.perf_counter()
+    (kg,) = extract_flow_kgs(flow, "big.json")
+    assert time.perf_counter() - started < 10
+    assert kg["entryPoint"] == {"connector": {"id": "start", "type": "LINK", "direction": "INWARD"}}
+    assert kg["exitPoint"]["connector"]["direction"] == "OUTWARD"
+    assert len(kg["processingNodes"]) == n - 1
+    assert len(kg["flowPaths"]["path_1"]) == n
@@ -0,0 +1,131 @@
+# ABOUTME: Unit tests for the SQLite FTS5 knowledge-base index.
+# ABOUTME: Covers structured tables, snippet search, incremental and background refresh.
+
+import json
+import threading
+from pathlib import Path
+
+from autobots_orch_flow_studio.domains.codegen.utils import kb_index
+from autobots_orch_flow_studio.domains.codegen.utils.kb_index import KbIndex, format_hits
+
+
+def _write(root: Path, rel: str, data: object) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return path
+
+
+def _seed(root: Path) -> None:
+    _write(
+        root,
+        "kb/models/specs/Party.json",
+        {"components": {"schemas": {"Party": {"properties": {"partyId": {"type": "string"}}}}}},
+    )
+    _write(
+        root,
+        "designer_flows/party_flow.json",
+        [{"id": "n1", "type": "cover-sttlmtacct-derivation", "name": "derive cover"}],
+    )
+    _write(root, "kb/interfaces/async/INPY-RRS.json", {"info": {"title": "INPY-RRS"}})
+
+
+def test_structured_tables_and_snippet_search(tmp_path: Path):
+    _seed(tmp_path / "data")
+    index = KbIndex(tmp_path / "data", tmp_path / "kb.sqlite")
+    index.refresh()
+
+    assert index.query("SELECT model, name, type FROM fields") == [("Party", "partyId", "string")]
+    assert index.query("SELECT type FROM node_types") == [("cover-sttlmtacct-derivation",)]
+    assert index.query("SELECT name, kind FROM interfaces") == [("INPY-RRS", "async")]
+
+    hits = index.search("cover-sttlmtacct-derivation")
+    assert [h.path for h in hits] == ["designer_flows/party_flow.json"]
+    assert "[cover-sttlmtacct-derivation]" in format_hits(hits)
+    assert index.search("partyId", kind="designer_flow") == []
+
+
+def test_refresh_is_incremental(tmp_path: Path):
+    root = tmp_path / "data"
+    _seed(root)
+    index = KbIndex(root, tmp_path / "kb.sqlite")
+
+    assert index.refresh().indexed == 3
+    assert index.refresh().indexed == 0
+
+    _write(root, "kb/models/specs/Party.json", {"components": {"schemas": {"Party2": {}}}})
+    (root / "kb/interfaces/async/INPY-RRS.json").unlink()
+    stats = index.refresh()
+
+    assert (stats.indexed, stats.removed) == (1, 1)
+    assert index.query("SELECT name FROM models") == [("Party2",)]
+    assert index.search("INPY-RRS") == []
+
+
+def test_hidden_pipeline_state_is_not_indexed(tmp_path: Path):
+    root = tmp_path / "data"
+    models = {"PaymentOrder": {"fields": {"orderId": {"type": "string"}}}}
+    _write(root, "MER-1/json/1-models.json", models)
+    _write(root, "MER-1/.generated-snapshots/1-models.json", models)
+    _write(root, "MER-1/.lld-manifest.json", {"PaymentOrder": "sha"})
+    index = KbIndex(root, tmp_path / "kb.sqlite")
+
+    assert index.refresh().indexed == 1
+    assert index.query("SELECT path FROM models") == [("MER-1/json/1-models.json",)]
+    assert [h.path for h in index.search("PaymentOrder")] == ["MER-1/json/1-models.json"]
+
+
+def test_new_files_are_indexed_without_deleting(tmp_path: Path, monkeypatch):
+    root = tmp_path / "data"
+    _seed(root)
+    index = KbIndex(root, tmp_path / "kb.sqlite")
+    deleted: list[str] = []
+    real_delete = KbIndex._delete
+    monkeypatch.setattr(
+        KbIndex,
+        "_delete",
+        lambda self, conn, rel: deleted.append(rel) or real_delete(self, conn, rel),
+    )
+
+    index.refresh()
+    _write(root, "kb/models/specs/Party.json", {"components": {"schemas": {"Party2": {}}}})
+    index.refresh()
+
+    assert deleted == ["kb/models/specs/Party.json"]
+
+
+def test_default_index_refreshes_in_the_background(tmp_path: Path, monkeypatch):
+    root = tmp_path / "data"
+    _seed(root)
+    monkeypatch.setattr(kb_index, "INPUT_DATA_BASE_PATH", root)
+    monkeypatch.setattr(kb_index, "KB_INDEX_DB_PATH", tmp_path / "kb.sqlite")
+    monkeypatch.setattr(kb_index, "_default_index", None)
+    monkeypatch.setattr(kb_index, "REFRESH_INTERVAL_SECONDS", 0.0)
+
+    index = kb_index.get_kb_index()
+    assert index.search("INPY-RRS") != []  # the first call builds the index
+
+    started, release = threading.Event(), threading.Event()
+    real_refresh = KbIndex.refresh
+
+    calls = []
+
+    def slow_refresh(self):
+        calls.append(self)
+        started.set()
+        release.wait(5)
+        return real_refresh(self)
+
+    monkeypatch.setattr(KbIndex, "refresh", slow_refresh)
+    (root / "kb/interfaces/async/INPY-RRS.json").unlink()
+
+    assert kb_index.get_kb_index() is index  # returns without waiting for the refresh
+    assert started.wait(5)
+    assert kb_index.get_kb_index() is index
+    assert calls == [index]  # no second refresh while one runs
+    assert index.search("INPY-RRS") != []
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "kb-index-refresh":
+            thread.join(5)
+    assert index.search("INPY-RRS") == []
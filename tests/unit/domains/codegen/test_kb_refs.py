@@ -0,0 +1,64 @@
+# ABOUTME: Unit tests for the knowledge-base $ref resolver.
+# ABOUTME: Covers cross-file fragments, memoization, cycles and unresolvable refs.
+
+import json
+from pathlib import Path
+
+from autobots_orch_flow_studio.domains.codegen.utils.kb_refs import KbRefResolver
+
+
+def _write(root: Path, rel: str, data: object) -> None:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_cross_file_fragment_refs_are_inlined_once(tmp_path: Path):
+    party = {"type": "object", "properties": {"id": {"type": "string"}}}
+    _write(tmp_path, "models/specs/Party.json", {"components": {"schemas": {"Party": party}}})
+    ref = "../../models/specs/Party.json#/components/schemas/Party"
+    _write(
+        tmp_path,
+        "interfaces/sync/Party.json",
+        {"request": {"$ref": ref}, "response": {"$ref": ref, "description": "out"}},
+    )
+
+    resolver = KbRefResolver(tmp_path)
+    doc = resolver.dereference_document("interfaces/sync/Party.json")
+
+    assert doc["request"] == party
+    assert doc["response"] == {**party, "description": "out"}
+    assert doc["request"] is resolver.dereference(
+        "models/specs/Party.json", "/components/schemas/Party"
+    )
+    assert resolver.ref_graph() == {
+        "interfaces/sync/Party.json": {"models/specs/Party.json"},
+        "models/specs/Party.json": set(),
+    }
+
+
+def test_local_pointer_escapes_and_cycles(tmp_path: Path):
+    _write(
+        tmp_path,
+        "node.json",
+        {
+            "defs": {"a/b": {"x": 1}, "Node": {"child": {"$ref": "#/defs/Node"}}},
+            "item": {"$ref": "#/defs/a~1b"},
+            "tree": {"$ref": "#/defs/Node"},
+        },
+    )
+
+    doc = KbRefResolver(tmp_path).dereference_document("node.json")
+
+    assert doc["item"] == {"x": 1}
+    assert doc["tree"] == {"child": {"$ref": "#/defs/Node"}}
+
+
+def test_unresolvable_refs_are_kept_and_reported(tmp_path: Path):
+    _write(tmp_path, "flow.json", {"a": {"$ref": "TODO"}, "b": {"$ref": "#/missing"}})
+
+    resolver = KbRefResolver(tmp_path)
+    doc = resolver.dereference_document("flow.json")
+
+    assert doc == {"a": {"$ref": "TODO"}, "b": {"$ref": "#/missing"}}
+    assert [u.ref for u in resolver.unresolved] == ["TODO", "#/missing"]
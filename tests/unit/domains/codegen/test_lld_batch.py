@@ -0,0 +1,94 @@
+# ABOUTME: Unit tests for the parallel multi-LLD conversion entry point.
+
+from pathlib import Path
+
+from autobots_orch_flow_studio.domains.codegen.utils.lld_batch import (
+    STATUS_CONVERTED,
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    STATUS_UNCHANGED,
+    convert_lld_source,
+    convert_lld_sources,
+)
+
+LLD_MD = """# 0. Background
+
+## Purpose
+Party feature.
+
+# 2. Sync Methods
+
+| Method Name | Model Name |
+| --- | --- |
+| getParty | Party |
+"""
+
+
+def test_convert_lld_sources_skips_unchanged_sources(tmp_path):
+    """A second run with the same source hash is skipped via the manifest."""
+    lld_dir = tmp_path / "lld"
+    lld_dir.mkdir()
+    (lld_dir / "MER-1.md").write_text(LLD_MD, encoding="utf-8")
+    out = tmp_path / "data"
+
+    first = convert_lld_sources([lld_dir], out_root=out, max_workers=1)
+    assert [r.status for r in first] == [STATUS_CONVERTED]
+    assert (out / "MER-1" / "json" / "2-sync-methods.json").is_file()
+    assert (out / ".lld-manifest.json").is_file()
+
+    second = convert_lld_sources([lld_dir], out_root=out, max_workers=1)
+    assert [r.status for r in second] == [STATUS_SKIPPED]
+
+
+def test_convert_lld_source_rewrites_only_changed_sections(tmp_path):
+    """Only sections whose JSON changed are rewritten."""
+    src = tmp_path / "MER-1.md"
+    src.write_text(LLD_MD, encoding="utf-8")
+    convert_lld_source(str(src), str(tmp_path))
+
+    src.write_text(LLD_MD.replace("getParty", "getParties"), encoding="utf-8")
+    result = convert_lld_source(str(src), str(tmp_path))
+    assert result.status == STATUS_CONVERTED
+    assert [p.rsplit("/", 1)[-1] for p in result.written] == ["2-sync-methods.json"]
+
+    again = convert_lld_source(str(src), str(tmp_path))
+    assert again.status == STATUS_UNCHANGED
+
+
+def test_convert_lld_source_reports_failures(tmp_path):
+    """Unreadable sources are reported as failures instead of raising."""
+    result = convert_lld_source(str(tmp_path / "missing.md"), str(tmp_path))
+    assert result.status == STATUS_FAILED
+    assert "FileNotFoundError" in (result.error or "")
+
+
+def test_convert_lld_source_removes_dropped_sections(tmp_path):
+    """A section deleted from the LLD loses its JSON file."""
+    src = tmp_path / "MER-1.md"
+    src.write_text(LLD_MD, encoding="utf-8")
+    convert_lld_source(str(src), str(tmp_path))
+
+    src.write_text(LLD_MD.split("# 2. Sync Methods")[0], encoding="utf-8")
+    result = convert_lld_source(str(src), str(tmp_path))
+
+    assert result.status == STATUS_CONVERTED
+    assert [p.rsplit("/", 1)[-1] for p in result.removed] == ["2-sync-methods.json"]
+    assert sorted(p.name for p in (tmp_path / "MER-1" / "json").iterdir()) == ["0-background.json"]
+
+
+def test_convert_lld_sources_rejects_duplicate_stems(tmp_path):
+    """Two sources with the same stem would share one feature folder; both fail."""
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "MER-1.md").write_text(LLD_MD, encoding="utf-8")
+    (tmp_path / "a" / "MER-2.md").write_text(LLD_MD, encoding="utf-8")
+    out = tmp_path / "data"
+
+    results = convert_lld_sources([tmp_path / "a", tmp_path / "b"], out_root=out, max_workers=1)
+
+    by_name = {(Path(r.source).parent.name, Path(r.source).name): r for r in results}
+    assert by_name["a", "MER-2.md"].status == STATUS_CONVERTED
+    assert by_name["a", "MER-1.md"].status == STATUS_FAILED
+    assert by_name["b", "MER-1.md"].status == STATUS_FAILED
+    assert "b/MER-1.md" in (by_name["a", "MER-1.md"].error or "")
+    assert not (out / "MER-1").exists()
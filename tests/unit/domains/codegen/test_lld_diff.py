@@ -0,0 +1,83 @@
+# ABOUTME: Unit tests for structural diffing of LLD JSON against the last generated snapshot.
+# ABOUTME: Covers field-level paths, reference re-targeting, snapshot commits and removed outputs.
+
+import copy
+
+from autobots_devtools_shared_lib.dynagent import BatchResult, RecordResult
+
+from autobots_orch_flow_studio.domains.codegen.utils.lld_diff import (
+    commit_snapshot,
+    diff_models,
+    diff_units,
+    remove_outputs,
+    start_incremental,
+)
+
+MODELS = {
+    "Party": {"fields": {"partyId": {"type": "String"}, "addr": {"type": "Address"}}},
+    "Address": {"fields": {"line1": {"type": "String"}}},
+    "Account": {"fields": {"accNo": {"type": "String"}}},
+    "Ledger": {"fields": {"entries": {"type": "List<Entry>"}}},
+}
+
+
+def test_diff_reports_minimal_units_with_field_paths():
+    new = copy.deepcopy(MODELS)
+    new["Account"]["fields"]["accNo"]["type"] = "Number"
+    new["Account"]["fields"]["iban"] = {"type": "String"}
+    del new["Address"]
+    new["Entry"] = {"fields": {"amount": {"type": "Number"}}}
+
+    diff = diff_models(MODELS, new)
+
+    assert diff.added == ["Entry"]
+    assert diff.removed == ["Address"]
+    assert diff.changed == {
+        "Party": ["references Address"],  # its addr field no longer resolves to a model
+        "Account": ["fields.accNo.type", "fields.iban (added)"],
+        "Ledger": ["references Entry"],
+    }
+    assert diff.unchanged == []
+    assert diff.regenerate == ["Party", "Account", "Ledger", "Entry"]
+    assert diff_units(None, MODELS).added == list(MODELS)
+    assert diff_units(MODELS, copy.deepcopy(MODELS)).is_empty()
+
+
+def test_failed_units_stay_pending_in_committed_snapshot():
+    new = copy.deepcopy(MODELS)
+    new["Party"]["fields"]["partyId"]["type"] = "Number"
+    new["Account"]["fields"]["accNo"]["type"] = "Number"
+    new["Entry"] = {"fields": {}}
+    regenerate = diff_models(MODELS, new).regenerate
+    assert regenerate == ["Party", "Account", "Ledger", "Entry"]
+
+    snapshot = commit_snapshot(MODELS, new, regenerate, succeeded=["Party"])
+
+    assert snapshot["Party"] == new["Party"]
+    assert snapshot["Account"] == MODELS["Account"]  # failed change: keep the old value
+    assert "Ledger" not in snapshot  # failed, only changed through a reference
+    assert "Entry" not in snapshot  # failed addition
+    assert diff_models(snapshot, new).regenerate == ["Account", "Ledger", "Entry"]
+
+
+def test_incremental_run_stores_snapshot_and_prunes_removed_outputs(tmp_path):
+    run = start_incremental("feat", "1-models.json", MODELS, diff_models, base_path=tmp_path)
+    assert run.diff.regenerate == list(MODELS)
+    run.finish(
+        BatchResult(
+            agent_name="model_oas_generator",
+            total=4,
+            results=[RecordResult(index=i, success=i != 3) for i in range(4)],
+        )
+    )
+
+    new = {k: v for k, v in MODELS.items() if k != "Account"}
+    rerun = start_incremental("feat", "1-models.json", new, diff_models, base_path=tmp_path)
+    assert rerun.diff.regenerate == ["Ledger"]
+    assert rerun.diff.removed == ["Account"]
+
+    out = tmp_path / "generate_model"
+    out.mkdir()
+    (out / "Account.json").write_text("{}")
+    assert remove_outputs([out / "Account.json", out / "Ghost.json"]) == [out / "Account.json"]
+    assert not (out / "Account.json").exists()
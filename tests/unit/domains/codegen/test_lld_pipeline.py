@@ -0,0 +1,62 @@
+# ABOUTME: Unit tests for the in-memory LLD pipeline.
+
+from autobots_orch_flow_studio.domains.codegen.utils.lld_pipeline import (
+    convert_lld_content,
+    convert_lld_md,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.lld_processor import split_lld_md_content
+
+LLD_MD = """# 0. Background
+
+## Purpose
+Party feature.
+
+# 1. Models
+
+## 1.1 PaymentOrder
+### Is New Model: False
+### Model Structure:
+| Column Name | Data Type | Business Key [Y/N] | Mandatory [Y/N] | Properties | Description |
+| --- | --- | --- | --- | --- | --- |
+| coverPaysysId | String | Y | N | {maxLength: 12} | Cover paysys id |
+
+# 4. Behaviours:
+
+| behaviour name | node name |
+| --- | --- |
+| enrichCovSttlmtAcct | cover-sttlmtacct-derivation |
+"""
+
+
+def test_split_lld_md_content_dedupes_slugs_in_memory():
+    """Duplicate H1 titles get numbered slugs without touching disk."""
+    sections = split_lld_md_content("# Notes\n\na\n\n# Notes\n\nb\n")
+    assert list(sections) == ["notes", "notes-1"]
+    assert sections["notes-1"] == "# Notes\n\nb\n"
+
+
+def test_convert_lld_content_dispatches_by_section():
+    """Each H1 section is converted with the parser matching its slug."""
+    data = convert_lld_content(LLD_MD)
+    assert list(data) == ["0-background", "1-models", "4-behaviours"]
+    assert data["0-background"]["type"] == "background"
+    field = data["1-models"]["PaymentOrder"]["fields"]["coverPaysysId"]
+    assert field["businessKey"] is True
+    assert field["properties"] == "{maxLength: 12}"
+    assert data["4-behaviours"]["nodes"][0]["nodeName"] == "cover-sttlmtacct-derivation"
+
+
+def test_convert_lld_md_writes_only_requested_sinks(tmp_path):
+    """Split MD and JSON files are written only when their directory is given."""
+    source = tmp_path / "MER-1.md"
+    source.write_text(LLD_MD, encoding="utf-8")
+
+    data = convert_lld_md(source, json_dir=tmp_path / "json")
+
+    assert sorted(p.name for p in (tmp_path / "json").iterdir()) == [
+        "0-background.json",
+        "1-models.json",
+        "4-behaviours.json",
+    ]
+    assert not (tmp_path / "lld-split").exists()
+    assert "PaymentOrder" in data["1-models"]
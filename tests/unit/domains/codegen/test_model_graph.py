@@ -0,0 +1,49 @@
+# ABOUTME: Unit tests for the 1-models.json reference graph and generation levels.
+# ABOUTME: Covers collection type references, self-references and reference cycles.
+
+from autobots_orch_flow_studio.domains.codegen.utils.model_graph import (
+    model_dependencies,
+    schedule_models,
+)
+
+
+def _model(**field_types: str) -> dict:
+    return {"fields": {name: {"type": t} for name, t in field_types.items()}}
+
+
+def test_levels_follow_references():
+    models = {
+        "Order": _model(lines="List<OrderLine>", party="Party"),
+        "OrderLine": _model(item="Item", qty="Integer"),
+        "Party": _model(name="String"),
+        "Item": _model(code="String"),
+    }
+
+    schedule = schedule_models(models)
+
+    assert schedule.levels == [["Party", "Item"], ["OrderLine"], ["Order"]]
+    assert schedule.cycles == []
+
+
+def test_array_and_self_references():
+    models = {
+        "Node": _model(children="Node[]", tag="Tag[]"),
+        "Tag": _model(value="String"),
+    }
+
+    assert model_dependencies(models) == {"Node": {"Tag"}, "Tag": set()}
+    assert schedule_models(models).levels == [["Tag"], ["Node"]]
+
+
+def test_cycles_go_in_final_level():
+    models = {
+        "A": _model(b="B"),
+        "B": _model(a="A"),
+        "C": _model(a="A"),
+        "D": _model(name="String"),
+    }
+
+    schedule = schedule_models(models)
+
+    assert schedule.levels == [["D"], ["A", "B", "C"]]
+    assert schedule.cycles == ["A", "B"]
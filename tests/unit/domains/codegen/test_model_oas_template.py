@@ -0,0 +1,86 @@
+# ABOUTME: Unit tests for deterministic model OAS generation.
+# ABOUTME: Covers constraint parsing, type mapping, required lists and schema validation.
+
+import json
+from pathlib import Path
+
+from jsonschema import Draft7Validator
+
+from autobots_orch_flow_studio.domains.codegen.utils.model_oas_template import (
+    apply_descriptions,
+    build_model_oas_specs,
+    map_field_type,
+    missing_descriptions,
+    parse_field_properties,
+    validate_model_oas_spec,
+)
+
+SCHEMA_PATH = (
+    Path(__file__).parents[4] / "agent_configs/orch_flow_studio/schemas/model_oas_spec.json"
+)
+VALIDATOR = Draft7Validator(json.loads(SCHEMA_PATH.read_text(encoding="utf-8")))
+
+
+def test_parse_field_properties_loose_and_json():
+    assert parse_field_properties("{maxLength: 12}") == {"maxLength": 12}
+    assert parse_field_properties("{minLength: 1, format: 'date-time', nullable: true}") == {
+        "minLength": 1,
+        "format": "date-time",
+        "nullable": True,
+    }
+    assert parse_field_properties('{"maximum": 9.5}') == {"maximum": 9.5}
+    assert parse_field_properties("") == {}
+
+
+def test_map_field_type():
+    assert map_field_type("String") == {"type": "string"}
+    assert map_field_type("DateTime") == {"type": "string", "format": "date-time"}
+    assert map_field_type("BigDecimal") == {"type": "number"}
+    assert map_field_type("List<Party>", {"Party"}) == {
+        "type": "array",
+        "items": {"type": "object"},
+    }
+    assert map_field_type("Integer[]") == {"type": "array", "items": {"type": "integer"}}
+
+
+def test_specs_from_models_json_are_valid():
+    models = {
+        "PaymentOrder": {
+            "isNewModel": False,
+            "fields": {
+                "coverPaysysId": {
+                    "type": "String",
+                    "businessKey": True,
+                    "mandatory": True,
+                    "properties": "{maxLength: 12}",
+                    "description": "Business-assigned coverPaysysId",
+                },
+                "amount": {"type": "Decimal", "mandatory": False, "properties": "{minimum: 0}"},
+            },
+        }
+    }
+
+    spec = build_model_oas_specs(models)["PaymentOrder"]
+
+    assert spec["required"] == ["coverPaysysId"]
+    cover = spec["properties"]["coverPaysysId"]
+    assert (cover["type"], cover["maxLength"], cover["required"]) == ("string", 12, True)
+    assert cover["x-fbp-params"]["businessKey"] is True
+    assert spec["properties"]["amount"]["minimum"] == 0
+    assert missing_descriptions(spec) == ["", "amount"]
+
+    apply_descriptions(spec, {"": "Payment order.", "amount": "Amount.", "coverPaysysId": "x"})
+    assert missing_descriptions(spec) == []
+    assert cover["description"] == "Business-assigned coverPaysysId"
+    assert validate_model_oas_spec(spec, VALIDATOR) == []
+
+
+def test_validation_reports_violations():
+    spec = build_model_oas_specs({"M": {"fields": {"a": {"type": "String"}}}})["M"]
+    spec["properties"]["a"]["type"] = "text"
+    spec["extra"] = 1
+
+    errors = validate_model_oas_spec(spec, VALIDATOR)
+
+    assert any(e.startswith("properties/a/type") for e in errors)
+    assert any(e.startswith("<root>") for e in errors)
@@ -0,0 +1,70 @@
+# ABOUTME: Unit tests for per-record context pre-slicing.
+# ABOUTME: Covers referenced sub-models, endpoint rows, behaviour nodes and the size cap.
+
+import json
+from pathlib import Path
+
+import pytest
+
+from autobots_orch_flow_studio.domains.codegen.utils.record_context import RecordContextBuilder
+
+FEATURE = "MER-1---Feature"
+
+
+@pytest.fixture
+def data_root(tmp_path: Path) -> Path:
+    json_dir = tmp_path / FEATURE / "json"
+    json_dir.mkdir(parents=True)
+    models = {
+        "Order": {"fields": {"party": {"type": "Party"}, "lines": {"type": "List<Line>"}}},
+        "Party": {"fields": {"id": {"type": "String"}}},
+        "Line": {"fields": {"qty": {"type": "Integer"}}},
+        "Unrelated": {"fields": {"x": {"type": "String"}}},
+    }
+    (json_dir / "1-models.json").write_text(json.dumps(models), encoding="utf-8")
+    sync = {"/orders": {"modelName": "Party", "method": "GET"}, "/ping": {"method": "GET"}}
+    (json_dir / "2-sync-methods.json").write_text(json.dumps(sync), encoding="utf-8")
+    behaviours = {"nodes": [{"nodeName": "derive-cover", "behaviourName": "deriveCover"}]}
+    (json_dir / "4-behaviours.json").write_text(json.dumps(behaviours), encoding="utf-8")
+    return tmp_path
+
+
+def _context(record: str) -> dict:
+    return json.loads(record.split("```json\n", 1)[1].rsplit("\n```", 1)[0])
+
+
+def test_model_slice_includes_direct_references_only(data_root: Path):
+    builder = RecordContextBuilder(FEATURE, base_path=data_root)
+
+    record = builder.model_record("file: f, model: Order", "Order")
+
+    assert record.startswith("file: f, model: Order\n\nContext (pre-extracted from ")
+    assert list(_context(record)) == ["Order", "Line", "Party"]
+
+
+def test_endpoint_and_behaviour_slices(data_root: Path):
+    builder = RecordContextBuilder(FEATURE, base_path=data_root)
+
+    endpoint = _context(builder.endpoint_record("r", "/orders"))
+    behaviour = _context(builder.behaviour_record("r", "deriveCover"))
+
+    assert endpoint["/orders"]["modelName"] == "Party"
+    assert list(endpoint["model"]) == ["Party"]
+    assert behaviour["nodeName"] == "derive-cover"
+
+
+def test_endpoint_without_model_name_gets_only_its_row(data_root: Path):
+    builder = RecordContextBuilder(FEATURE, base_path=data_root)
+
+    assert _context(builder.endpoint_record("r", "/ping")) == {"/ping": {"method": "GET"}}
+
+
+def test_cap_drops_references_then_omits_context(data_root: Path):
+    lean = len(json.dumps({"Order": {}}, indent=1)) + 120
+    builder = RecordContextBuilder(FEATURE, base_path=data_root, max_chars=lean)
+    assert list(_context(builder.model_record("r", "Order"))) == ["Order"]
+
+    tiny = RecordContextBuilder(FEATURE, base_path=data_root, max_chars=10)
+    record = tiny.model_record("r", "Order")
+    assert "```json" not in record
+    assert "Context omitted" in record
@@ -0,0 +1,117 @@
+# ABOUTME: Unit tests for multi-record packing of generator prompts.
+
+import json
+
+import pytest
+from autobots_devtools_shared_lib.dynagent import BatchResult, RecordResult
+
+from autobots_orch_flow_studio.domains.codegen.utils import record_packing
+from autobots_orch_flow_studio.domains.codegen.utils.record_packing import (
+    packed_batch_invoker,
+    plan_packs,
+    split_packed_output,
+)
+
+
+class FakeInvoker:
+    """Stands in for batch_invoker; answers packed prompts via a reply function."""
+
+    def __init__(self, reply, reverse=False):
+        self.reply = reply
+        self.reverse = reverse  # return results out of order, like a concurrent batch
+        self.calls: list[list[str]] = []
+
+    def __call__(self, agent_name, records, trace_metadata=None):
+        self.calls.append(records)
+        results = [
+            RecordResult(index=i, success=True, output=self.reply(r)) for i, r in enumerate(records)
+        ]
+        if self.reverse:
+            results.reverse()
+        return BatchResult(agent_name=agent_name, total=len(records), results=results)
+
+
+@pytest.fixture(autouse=True)
+def _no_output_schemas(monkeypatch):
+    monkeypatch.setattr(record_packing, "_has_output_schema", lambda name: name == "with_schema")
+
+
+def _answer_packed(prompt: str) -> str:
+    if "<record index=" not in prompt:
+        return f"single:{prompt}"
+    indices = [int(chunk.split('"')[0]) for chunk in prompt.split('<record index="')[1:]]
+    return json.dumps({"results": [{"index": i, "output": f"packed:{i}"} for i in indices]})
+
+
+def test_plan_packs_respects_budget_and_max_records():
+    """Records are grouped greedily without exceeding the budget or pack size."""
+    records = ["x" * 40] * 5
+    assert plan_packs(records, token_budget=60, max_records_per_pack=10) == [[0, 1], [2, 3], [4]]
+    assert plan_packs(records, token_budget=10_000, max_records_per_pack=2) == [[0, 1], [2, 3], [4]]
+
+
+def test_split_packed_output_returns_the_answered_indices():
+    """Missing indices are left out, foreign indices ignored, malformed replies rejected."""
+    reply = '```json\n{"results": [{"index": 0, "output": "a"}, {"index": 7, "output": "z"}]}\n```'
+    assert split_packed_output(reply, [0]) == {0: "a"}
+    assert split_packed_output(reply, [0, 1]) == {0: "a"}
+    assert split_packed_output("not json", [0]) is None
+
+
+def test_packed_batch_invoker_splits_results_per_record():
+    """Packed replies are mapped back onto the original record indices."""
+    invoker = FakeInvoker(_answer_packed)
+    result = packed_batch_invoker("processing_unit_oas_generator", ["a", "b", "c"], invoker=invoker)
+
+    assert len(invoker.calls) == 1
+    assert len(invoker.calls[0]) == 1
+    assert [r.output for r in result.results] == ["packed:0", "packed:1", "packed:2"]
+    assert result.total == 3
+
+
+def test_packed_batch_invoker_falls_back_to_single_calls():
+    """Unparseable packed replies are retried one record per call."""
+    invoker = FakeInvoker(lambda prompt: "oops" if "<record" in prompt else f"single:{prompt}")
+    result = packed_batch_invoker("processing_unit_oas_generator", ["a", "b"], invoker=invoker)
+
+    assert invoker.calls[1] == ["a", "b"]
+    assert [r.output for r in result.results] == ["single:a", "single:b"]
+    assert all(r.success for r in result.results)
+
+
+def test_packed_batch_invoker_retries_only_unanswered_records():
+    """A partial packed reply keeps its answers; only the missing record is resent."""
+
+    def reply(prompt):
+        if "<record" not in prompt:
+            return f"single:{prompt}"
+        return json.dumps({"results": [{"index": 0, "output": "packed:0"}]})
+
+    invoker = FakeInvoker(reply)
+    result = packed_batch_invoker("processing_unit_oas_generator", ["a", "b"], invoker=invoker)
+
+    assert invoker.calls[1] == ["b"]
+    assert [r.output for r in result.results] == ["packed:0", "single:b"]
+
+
+def test_packed_batch_invoker_matches_results_by_index():
+    """Batch results are paired with packs and records by RecordResult.index, not order."""
+    invoker = FakeInvoker(
+        lambda prompt: "oops" if "<record" in prompt else f"single:{prompt}", reverse=True
+    )
+    records = ["x" * 40, "y" * 40, "z" * 40]
+    result = packed_batch_invoker(
+        "processing_unit_oas_generator", records, token_budget=60, invoker=invoker
+    )
+
+    assert invoker.calls[1] == records[:2]
+    assert [r.index for r in result.results] == [0, 1, 2]
+    assert [r.output for r in result.results] == [f"single:{r}" for r in records]
+
+
+def test_packed_batch_invoker_refuses_agents_with_output_schema():
+    """Structured replies cannot carry the packed envelope, so packing is refused."""
+    invoker = FakeInvoker(_answer_packed)
+    with pytest.raises(ValueError, match="output_schema"):
+        packed_batch_invoker("with_schema", ["a", "b"], invoker=invoker)
+    assert invoker.calls == []
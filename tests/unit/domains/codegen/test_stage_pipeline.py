@@ -0,0 +1,74 @@
+# ABOUTME: Unit tests for the streaming stage runner.
+# ABOUTME: Checks dependants start before unrelated slow work ends and that failures propagate.
+
+import threading
+
+import pytest
+
+from autobots_orch_flow_studio.domains.codegen.utils.stage_pipeline import (
+    StageTask,
+    run_streaming_stages,
+)
+
+
+def test_dependant_starts_before_unrelated_slow_task_finishes():
+    release_slow = threading.Event()
+
+    def pu(record: str) -> str:
+        if record == "slow":
+            assert release_slow.wait(5)
+        return f"pu-{record}"
+
+    def flow(record: str) -> str:
+        release_slow.set()
+        return f"flow-{record}"
+
+    tasks = [
+        StageTask(key="pu:slow", stage="pu", record="slow"),
+        StageTask(key="pu:fast", stage="pu", record="fast"),
+        StageTask(key="flow:a", stage="flow", record="a", needs={"pu:fast"}),
+    ]
+
+    artifacts = run_streaming_stages(tasks, {"pu": pu, "flow": flow}, max_workers=3)
+
+    assert list(artifacts) == ["pu:slow", "pu:fast", "flow:a"]
+    assert all(a.success for a in artifacts.values())
+    assert artifacts["flow:a"].finished <= artifacts["pu:slow"].finished
+
+
+def test_failed_input_propagates_without_running_dependant():
+    calls: list[str] = []
+
+    def pu(record: str) -> str:
+        if record == "bad":
+            raise RuntimeError("boom")
+        return record
+
+    def flow(record: str) -> str:
+        calls.append(record)
+        return record
+
+    tasks = [
+        StageTask(key="pu:bad", stage="pu", record="bad"),
+        StageTask(key="pu:ok", stage="pu", record="ok"),
+        StageTask(key="flow:x", stage="flow", record="x", needs={"pu:bad", "pu:ok"}),
+        StageTask(key="flow:y", stage="flow", record="y", needs={"pu:missing"}),
+        StageTask(key="flow:z", stage="flow", record="z", needs={"pu:ok"}),
+    ]
+
+    artifacts = run_streaming_stages(tasks, {"pu": pu, "flow": flow})
+
+    assert artifacts["pu:bad"].error == "RuntimeError: boom"
+    assert not artifacts["flow:x"].success
+    assert "pu:bad" in (artifacts["flow:x"].error or "")
+    assert not artifacts["flow:y"].success
+    assert calls == ["z"]
+
+
+def test_cycle_is_rejected():
+    tasks = [
+        StageTask(key="a", stage="s", record="a", needs={"b"}),
+        StageTask(key="b", stage="s", record="b", needs={"a"}),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        run_streaming_stages(tasks, {"s": str})
@@ -0,0 +1,79 @@
+# ABOUTME: Unit tests for the AST tool index over a tools module.
+# ABOUTME: Covers @tool discovery, mtime caching and batched tool insertion.
+
+import ast
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from autobots_orch_flow_studio.domains.codegen.utils.tool_index import ToolModuleIndex
+
+REPO_TOOLS = (
+    Path(__file__).parents[4] / "src/autobots_orch_flow_studio/domains/codegen/services/tools.py"
+)
+
+
+def _tool(name: str) -> str:
+    return f'''# --- Auto-generated tool: {name} ---
+
+@tool
+def {name}(runtime: ToolRuntime[None, Dynagent]) -> str:
+    """{name} tool."""
+    return "{name}"
+
+
+'''
+
+
+def test_index_lists_tools_and_registrations_and_caches_by_mtime(tmp_path):
+    path = tmp_path / "tools.py"
+    shutil.copy(REPO_TOOLS, path)
+    index = ToolModuleIndex(path)
+
+    assert "create_agent" in index
+    assert "register_concierge_tools" not in index
+    assert index.tools()[:2] == ["tell_joke", "get_joke_categories"]
+    assert index.registered()[-1] == "get_time"
+    cached = index._parsed
+    assert "nope" not in index
+    assert index._parsed is cached
+
+    path.write_text(path.read_text() + "\n\n@tool\ndef late() -> str:\n    return ''\n")
+    os.utime(path, ns=(1, 1))
+    assert "late" in index
+
+
+def test_batch_insert_is_one_write_and_keeps_module_valid(tmp_path):
+    path = tmp_path / "tools.py"
+    shutil.copy(REPO_TOOLS, path)
+    index = ToolModuleIndex(path)
+    before = index.registered()
+
+    added = index.add_tools({"tool_a": _tool("tool_a"), "get_time": "x", "tool_b": _tool("tool_b")})
+
+    assert added == ["tool_a", "tool_b"]  # existing get_time is left alone
+    text = path.read_text()
+    ast.parse(text)
+    assert index.registered() == [*before, "tool_a", "tool_b"]
+    assert index.tools()[-2:] == ["tool_a", "tool_b"]
+    assert text.index("def tool_b(") < text.index("def register_concierge_tools(")
+    assert "get_time,  # Auto-generated tool\n            tool_a,  # Auto-generated tool\n" in text
+    assert index.add_tools({"tool_a": _tool("tool_a")}) == []
+
+
+def test_one_line_registration_list_and_missing_registration(tmp_path):
+    path = tmp_path / "tools.py"
+    path.write_text(
+        "@tool\ndef a() -> str:\n    return 'a'\n\n\n"
+        "def register() -> None:\n    register_usecase_tools([a])\n"
+    )
+    index = ToolModuleIndex(path)
+    index.add_tools({"b": _tool("b"), "c": _tool("c")})
+    assert "register_usecase_tools([a, b, c])" in path.read_text()
+    assert index.tools() == ["a", "b", "c"]
+
+    path.write_text("@tool\ndef a() -> str:\n    return 'a'\n")
+    with pytest.raises(ValueError, match="register_usecase_tools"):
+        index.add_tools({"b": _tool("b")})
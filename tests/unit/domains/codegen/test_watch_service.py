@@ -0,0 +1,124 @@
+# ABOUTME: Unit tests for the watch service's regeneration plan and step selection.
+# ABOUTME: Generator steps are stubbed; only what plan() picks and regenerate() runs is checked.
+
+import json
+
+import pytest
+
+from autobots_orch_flow_studio.domains.codegen.services import flow_generator, watch_service
+from autobots_orch_flow_studio.domains.codegen.services.watch_service import (
+    RegenerationPlan,
+    WatchService,
+)
+from autobots_orch_flow_studio.domains.codegen.utils.file_watch import (
+    CHANGE_DELETED,
+    CHANGE_MODIFIED,
+)
+
+LLD_MD = """# 1. Models
+
+## 1.1 Party
+### Is New Model: True
+### Model Structure:
+| Column Name | Data Type | Business Key [Y/N] | Mandatory [Y/N] | Properties | Description |
+| --- | --- | --- | --- | --- | --- |
+| partyId | String | Y | Y | {maxLength: 12} | Party id |
+
+# 2. Sync Methods
+
+| Method Name | Model Name |
+| --- | --- |
+| getParty | Party |
+"""
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch) -> WatchService:
+    data = tmp_path / "data"
+    monkeypatch.setattr(watch_service, "INPUT_DATA_BASE_PATH", str(data))
+    monkeypatch.setattr(flow_generator, "INPUT_DATA_BASE_PATH", str(data))
+    return WatchService("MER-1", lld_dir=tmp_path / "lld", use_llm=False)
+
+
+@pytest.fixture
+def calls(monkeypatch) -> list[tuple[str, list[str] | None]]:
+    """Record each stubbed generator step with the files or models it was given."""
+    seen: list[tuple[str, list[str] | None]] = []
+
+    def stub(name, key):
+        return lambda *_args, **kwargs: seen.append((name, kwargs.get(key)))
+
+    monkeypatch.setattr(watch_service, "merge_flows_deterministic", stub("merge", "files"))
+    monkeypatch.setattr(watch_service, "build_flow_kgs_deterministic", stub("kgs", "files"))
+    monkeypatch.setattr(watch_service, "build_model_oas_deterministic", stub("models", "models"))
+    return seen
+
+
+def test_plan_sorts_flow_saves_and_deletions_by_folder(service):
+    changes = {
+        service.flows_dir / "a.json": CHANGE_MODIFIED,
+        service.flows_dir / "b.json": CHANGE_DELETED,
+        service.actual_dir / "c.json": CHANGE_MODIFIED,
+        service.actual_dir / "d.json": CHANGE_DELETED,
+        service.flows_dir / "notes.txt": CHANGE_MODIFIED,
+    }
+
+    plan = service.plan(changes)
+
+    assert plan.flow_files == {"a.json"}
+    assert plan.deleted_flows == {"b.json"}
+    assert plan.actual_files == {"c.json"}
+    assert plan.deleted_actual == {"d.json"}
+    assert not plan.sections
+
+
+def test_only_deletions_are_not_an_empty_plan():
+    assert RegenerationPlan().is_empty()
+    assert not RegenerationPlan(deleted_actual={"a.json"}).is_empty()
+
+
+def test_plan_converts_lld_and_lists_changed_sections_and_models(service):
+    service.lld_dir.mkdir()
+    source = service.lld_dir / "MER-1.md"
+    source.write_text(LLD_MD, encoding="utf-8")
+
+    plan = service.plan({source: CHANGE_MODIFIED})
+
+    assert plan.sections["MER-1"] == {"1-models", "2-sync-methods"}
+    assert plan.models["MER-1"] == {"Party"}
+    # Saving the same content again changes no section.
+    assert service.plan({source: CHANGE_MODIFIED}).is_empty()
+
+
+def test_regenerate_merges_sample_changes_without_extracting_kgs(service, calls):
+    plan = RegenerationPlan(flow_files={"a.json"}, actual_files={"c.json"})
+
+    service.regenerate(plan, session_id="s")
+
+    assert calls == [("merge", ["a.json", "c.json"]), ("kgs", ["a.json"])]
+
+
+def test_regenerate_runs_model_step_for_changed_models_only(service, calls):
+    plan = RegenerationPlan(sections={"MER-1": {"1-models"}}, models={"MER-1": {"Party"}})
+
+    service.regenerate(plan, session_id="s")
+
+    assert calls == [("models", ["Party"])]
+
+
+def test_regenerate_removes_outputs_of_deleted_flows(service, calls):
+    merged = service.data_root / "generated_flows"
+    kg_dir = service.data_root / "MER-1" / "flows"
+    merged.mkdir(parents=True)
+    kg_dir.mkdir(parents=True)
+    for name in ("a.json", "b.json", "c.json"):
+        (merged / name).write_text("[]", encoding="utf-8")
+    (kg_dir / "a--x.json").write_text(json.dumps({"sourceFile": "a.json"}), encoding="utf-8")
+    (kg_dir / "b--y.json").write_text(json.dumps({"sourceFile": "b.json"}), encoding="utf-8")
+
+    plan = RegenerationPlan(deleted_flows={"a.json"}, deleted_actual={"c.json"})
+    service.regenerate(plan, session_id="s")
+
+    assert sorted(p.name for p in merged.iterdir()) == ["b.json"]
+    assert sorted(p.name for p in kg_dir.iterdir()) == ["b--y.json"]
+    assert calls == []
@@ -0,0 +1,113 @@
+# ABOUTME: Unit tests for the call_invoke_agents_many fan-out helpers.
+# ABOUTME: Covers completion order, the concurrency bound, errors, early exit and tracing.
+
+import asyncio
+
+import pytest
+
+from autobots_orch_flow_studio.domains.orch_flow_studio import call_invoke_agent
+
+
+class StubAgent:
+    """Stands in for ainvoke_agent: sleeps per message, fails on "fail", tracks overlap."""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.started = 0
+        self.finished = 0
+        self.completed: list[str] = []
+        self.calls: list[dict] = []
+
+    async def __call__(self, *, agent_name, input_state, config, trace_metadata, **_kwargs):
+        message = input_state["messages"][0]["content"]
+        self.calls.append(
+            {
+                "agent_name": agent_name,
+                "thread_id": config["configurable"]["thread_id"],
+                "session_id": input_state["session_id"],
+                "trace_session_id": trace_metadata.session_id,
+                "tags": trace_metadata.tags,
+            }
+        )
+        self.started += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.05 if message == "slow" else 0.01)
+            if message == "fail":
+                raise RuntimeError("boom")
+            self.completed.append(message)
+            return {"messages": [{"role": "ai", "content": message.upper()}]}
+        finally:
+            self.running -= 1
+            self.finished += 1
+
+
+@pytest.fixture
+def agent(monkeypatch) -> StubAgent:
+    stub = StubAgent()
+    monkeypatch.setattr(call_invoke_agent, "ainvoke_agent", stub)
+    return stub
+
+
+async def test_results_arrive_in_completion_order_within_the_bound(agent):
+    requests = [
+        ("joke_agent", "slow", None),
+        ("joke_agent", "a", None),
+        ("welcome_agent", "fail", None),
+        ("welcome_agent", "b", "shared-session"),
+    ]
+
+    done = [d async for d in call_invoke_agent.call_invoke_agents_many(requests, concurrency=2)]
+
+    assert [d.index for d in done] == [1, 2, 3, 0]
+    assert agent.peak == 2
+    assert [d.success for d in done] == [True, False, True, True]
+    assert done[1].error == "boom"
+    assert done[3].result == {"messages": [{"role": "ai", "content": "SLOW"}]}
+
+
+async def test_each_request_gets_its_own_session_and_trace_metadata(agent):
+    requests = [
+        ("joke_agent", "a", None),
+        ("joke_agent", "b", None),
+        ("welcome_agent", "c", "shared-session"),
+    ]
+
+    done = [d async for d in call_invoke_agent.call_invoke_agents_many(requests)]
+
+    calls = {call["agent_name"] + call["session_id"]: call for call in agent.calls}
+    assert len({d.session_id for d in done}) == 3
+    assert "shared-session" in {d.session_id for d in done}
+    for d in done:
+        call = calls[d.agent_name + d.session_id]
+        assert call["thread_id"] == call["trace_session_id"] == d.session_id
+        assert call["tags"] == [call_invoke_agent.APP_NAME, d.agent_name, "fan-out"]
+
+
+async def test_stopping_early_cancels_the_remaining_requests(agent):
+    requests = [("joke_agent", m, None) for m in ("a", "slow", "slow", "slow")]
+
+    results = call_invoke_agent.call_invoke_agents_many(requests, concurrency=3)
+    first = await anext(results)
+    await results.aclose()
+
+    assert first.index == 0
+    # Cancelled requests have already unwound by the time aclose() returns
+    assert agent.completed == ["a"]
+    assert agent.running == 0
+    assert agent.finished == agent.started
+
+
+def test_sync_form_leaves_nothing_running_when_the_loop_closes(agent):
+    requests = [("joke_agent", m, None) for m in ("a", "slow", "slow")]
+
+    results = call_invoke_agent.call_invoke_agents_many_sync(requests, concurrency=3)
+    first = next(results)
+    results.close()
+
+    assert first.index == 0
+    assert agent.completed == ["a"]
+    assert agent.running == 0
+    assert agent.finished == agent.started == 3
@@ -0,0 +1,162 @@
+# ABOUTME: Unit tests for the deterministic actual-vs-converted flow merge.
+# ABOUTME: Covers placeholder restoration, id remapping, conflicts and large flows.
+
+import copy
+
+import pytest
+
+from autobots_orch_flow_studio.domains.orch_flow_studio.flow_conversion import (
+    convert_unknown_nodes_to_designer,
+)
+from autobots_orch_flow_studio.domains.orch_flow_studio.flow_merge import merge_actual_converted
+
+ACTUAL = [
+    {"id": "tab1", "type": "tab", "label": "Returns"},
+    {"id": "grp", "type": "group", "z": "tab1", "nodes": ["rcv", "val"]},
+    {"id": "mq", "type": "rabbit-mq-config", "host": "broker"},
+    {
+        "id": "rcv",
+        "type": "receive-message",
+        "z": "tab1",
+        "g": "grp",
+        "name": "Sanction Response",
+        "queue": "SANCTIONS.RES",
+        "broker": "mq",
+        "x": 110,
+        "y": 700,
+        "wires": [["val"]],
+    },
+    {
+        "id": "val",
+        "type": "return-lead-day-val",
+        "z": "tab1",
+        "g": "grp",
+        "rules": ["lead-day"],
+        "x": 300,
+        "y": 700,
+        "wires": [["dbg"]],
+    },
+    {"id": "dbg", "type": "debug", "z": "tab1", "x": 500, "y": 700, "wires": []},
+]
+
+
+def _converted() -> list[dict]:
+    return convert_unknown_nodes_to_designer(copy.deepcopy(ACTUAL))
+
+
+def _by_id(flow: list[dict]) -> dict[str, dict]:
+    return {n["id"]: n for n in flow}
+
+
+def test_placeholders_restored_with_designer_edits_and_new_nodes():
+    converted = _converted()
+    nodes = _by_id(converted)
+    # Designer moves the validator, rewires it through a new node and drops the config node.
+    nodes["val"]["x"] = 420
+    nodes["val"]["wires"] = [["new1"]]
+    converted.append(
+        {
+            "id": "new1",
+            "type": "designer_node_new",
+            "z": "tab1",
+            "name": "audit",
+            "config": '{"type": "function", "func": "return msg;"}',
+            "wires": [["dbg"]],
+        }
+    )
+    converted = [n for n in converted if n["id"] != "mq"]
+
+    result = merge_actual_converted(ACTUAL, converted)
+    merged = _by_id(result.flow)
+
+    assert result.conflicts == []
+    assert merged["rcv"]["type"] == "receive-message"
+    assert merged["rcv"]["queue"] == "SANCTIONS.RES"
+    assert merged["val"]["rules"] == ["lead-day"]
+    assert (merged["val"]["x"], merged["val"]["wires"]) == (420, [["new1"]])
+    assert merged["new1"]["type"] == "function"
+    assert merged["new1"]["func"] == "return msg;"
+    assert "mq" in merged  # referenced config node comes back from the actual flow
+    assert result.flow[0]["type"] == "tab"
+    assert result.stats.placeholders_restored == 2
+    assert result.stats.new_nodes_materialized == 1
+    assert result.stats.config_nodes_added == 1
+    assert ACTUAL[4]["wires"] == [["dbg"]]  # inputs are not mutated
+
+
+def test_key_matching_remaps_ids_and_reports_true_conflicts():
+    converted = _converted()
+    nodes = _by_id(converted)
+    # Designer re-created the receiver (new id) and added an unknown placeholder.
+    nodes["rcv"]["id"] = "rcv-copy"
+    nodes["grp"]["nodes"] = ["rcv-copy", "val"]
+    nodes["dbg"]["wires"] = [["ghost"]]
+    converted.append(
+        {
+            "id": "x9",
+            "type": "designer_node_existing",
+            "z": "tab1",
+            "name": "Missing (send-message)",
+            "wires": [[]],
+        }
+    )
+    nodes["val"]["wires"] = [["dbg"], ["dbg"]]
+
+    result = merge_actual_converted(ACTUAL, converted)
+    merged = _by_id(result.flow)
+
+    assert "rcv-copy" not in merged
+    assert merged["rcv"]["queue"] == "SANCTIONS.RES"
+    assert merged["grp"]["nodes"] == ["rcv", "val"]
+    assert merged["dbg"]["wires"] == [[]]
+    assert result.stats.matched_by_key == 1
+    assert result.stats.dangling_wires_dropped == 1
+    assert {(c.node_id, c.kind) for c in result.conflicts} == {
+        ("x9", "unmatched_existing"),
+        ("val", "output_mismatch"),
+    }
+    assert result.report()["stats"]["conflicts"] == 2
+
+
+def test_key_match_never_takes_an_id_claimed_exactly_later():
+    actual = [
+        {"id": "t", "type": "tab", "label": "T"},
+        {"id": "A", "type": "function", "z": "t", "name": "f", "wires": [[]]},
+    ]
+    converted = [
+        {"id": "t", "type": "tab", "label": "T"},
+        {"id": "c1", "type": "function", "z": "t", "name": "f", "wires": [["A"]]},
+        {"id": "A", "type": "function", "z": "t", "name": "f", "wires": [[]]},
+    ]
+
+    result = merge_actual_converted(actual, converted)
+
+    assert [n["id"] for n in result.flow] == ["t", "c1", "A"]
+    assert _by_id(result.flow)["c1"]["wires"] == [["A"]]
+    assert result.stats.matched_by_id == 2
+    assert result.stats.matched_by_key == 0
+
+
+@pytest.mark.slow
+def test_merge_50k_nodes():
+    n = 50_000
+    actual = [{"id": "t", "type": "tab", "label": "Big"}]
+    actual += [
+        {
+            "id": f"n{i}",
+            "type": "custom-step",
+            "z": "t",
+            "name": f"step-{i}",
+            "wires": [[f"n{i + 1}"]],
+        }
+        for i in range(n)
+    ]
+    actual[-1]["wires"] = [[]]
+    converted = convert_unknown_nodes_to_designer(copy.deepcopy(actual))
+
+    result = merge_actual_converted(actual, converted)
+
+    assert result.stats.placeholders_restored == n
+    assert result.stats.matched_by_id == n + 1
+    assert result.conflicts == []
+    assert [node["id"] for node in result.flow] == [node["id"] for node in actual]